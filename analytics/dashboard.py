@@ -0,0 +1,463 @@
+"""
+Precomputed analytics dashboard payloads.
+
+``analytics.views.dashboard`` runs well over a dozen aggregate queries. The
+computed chart payload for each (start, end, util range, finalized_only)
+combination is stored in ``DashboardSnapshot`` so page loads read one row
+instead. Snapshots live in the database rather than the Django cache so the
+``warm_analytics_dashboard`` cron job and every web pod share them.
+
+Snapshots are dropped when a logsheet is finalized or unfinalized (see
+``analytics/signals.py``) and otherwise expire after a fixed age: duty
+rosters and "today" still move underneath finalized data, and the
+all-flights view changes with every logsheet edit.
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, cast
+
+from django.utils import timezone
+
+from . import queries
+from .engine import flight_metrics
+from .models import DashboardSnapshot
+
+# Finalized-only payloads only change on finalize/unfinalize (invalidated
+# explicitly); the age limit picks up roster edits and the rolling YTD range.
+DASHBOARD_SNAPSHOT_MAX_AGE = timedelta(hours=6)
+# The all-flights view includes open logsheets, which change constantly.
+DASHBOARD_ALL_FLIGHTS_MAX_AGE = timedelta(minutes=5)
+# Every distinct parameter combination stores a row, so requested ranges are
+# clamped to this many years back and the table is capped; the least recently
+# computed rows are pruned first.
+DASHBOARD_MAX_YEARS_BACK = 100
+DASHBOARD_SNAPSHOT_MAX_ROWS = 200
+
+
+def _parse_dt(s: str | None) -> date | None:
+    if not s:
+        return None
+    try:
+        return datetime.fromisoformat(s).date()
+    except (ValueError, TypeError):
+        return None
+
+
+def _parse_year(s: str | None) -> int | None:
+    try:
+        return int(s) if s else None
+    except (ValueError, TypeError):
+        return None
+
+
+def _clamp(value, low, high):
+    return None if value is None else max(low, min(value, high))
+
+
+def dashboard_params(params, today: date | None = None):
+    """
+    Resolve dashboard query parameters to
+    ``(start, end, util_start, util_end, finalized_only)``.
+
+    ``params`` is ``request.GET`` (or any mapping); missing or malformed
+    values fall back to the defaults: the last 15 years, YTD utilization,
+    finalized only. Other parameters are ignored, and years and dates are
+    clamped to the last ``DASHBOARD_MAX_YEARS_BACK`` years so the result
+    (and the snapshot key built from it) only takes bounded values.
+    """
+    today = today or date.today()
+    first_year = today.year - DASHBOARD_MAX_YEARS_BACK
+    start = _clamp(_parse_year(params.get("start")), first_year, today.year)
+    end = _clamp(_parse_year(params.get("end")), first_year, today.year)
+    if start is None:
+        start = today.year - 14
+    if end is None:
+        end = today.year
+    start = min(start, end)
+    finalized_only = params.get("all") != "1"
+    first_day, last_day = date(first_year, 1, 1), date(today.year, 12, 31)
+    util_start = _clamp(_parse_dt(params.get("util_start")), first_day, last_day)
+    util_end = _clamp(_parse_dt(params.get("util_end")), first_day, last_day)
+    util_start = util_start or date(today.year, 1, 1)
+    util_end = util_end or today
+    return start, end, util_start, util_end, finalized_only
+
+
+def dashboard_snapshot_key(start, end, util_start, util_end, finalized_only) -> str:
+    scope = "finalized" if finalized_only else "all"
+    return f"{start}-{end}:{util_start.isoformat()}:{util_end.isoformat()}:{scope}"
+
+
+def build_dashboard_payload(
+    start: int,
+    end: int,
+    util_start: date,
+    util_end: date,
+    finalized_only: bool,
+) -> Dict[str, Any]:
+    """
+    Run every dashboard query and return the template context (including
+    ``analytics_data`` for the charts). The result is JSON-serializable.
+    """
+    today = date.today()
+
+    # --- cumulative flights (defensive) ---
+    cumu_raw: Dict[str, Any] = (
+        queries.cumulative_flights_by_year(start, end, finalized_only=finalized_only)
+        or {}
+    )  # <- ensure dict, never None
+
+    labels = cast(list[int], cumu_raw.get("labels") or [])
+    years_list = cast(list[int], cumu_raw.get("years") or [])
+    data_map = cast(Dict[int, list[int]], cumu_raw.get("data") or {})
+    totals_map = cast(Dict[int, int], cumu_raw.get("totals") or {})
+    instr_map = cast(Dict[int, int], cumu_raw.get("instr_counts") or {})
+    ops_days_map = cast(Dict[int, int], cumu_raw.get("ops_days") or {})
+
+    # JSON-safe keys for template
+    data_json = {str(y): (data_map.get(y) or [0] * 365) for y in years_list}
+    totals_json = {str(k): int(v) for k, v in totals_map.items()}
+    instr_json = {str(k): int(v) for k, v in instr_map.items()}
+
+    # pick a current year that actually exists in the dataset
+    if years_list:
+        current_year = today.year if today.year in years_list else years_list[-1]
+    else:
+        current_year = today.year
+
+    # --- flights by year by aircraft (defensive) ---
+    by_acft_raw = cast(
+        Dict[str, Any],
+        queries.flights_by_year_by_aircraft(
+            start, end, finalized_only=finalized_only, top_n=10
+        )
+        or {},
+    )
+    # Per-flight charts over the utilization range come from one scan.
+    metrics = flight_metrics(util_start, util_end, finalized_only=finalized_only)
+    util = metrics["util"]
+    util_private = metrics["util_private"]
+
+    fy_years = cast(list[int], by_acft_raw.get("years") or [])
+    fy_categories = cast(list[str], by_acft_raw.get("categories") or [])
+    fy_matrix = cast(Dict[str, list[int]], by_acft_raw.get("matrix") or {})
+    fdays = metrics["flying_days"]
+    dur = metrics["durations"]
+    pgf = metrics["pilot_glider"]
+    inst = metrics["instructors"]
+    tow = metrics["tow_pilots"]
+    long3h = metrics["long_flights"]
+    duty = (
+        queries.duty_days_by_member(
+            util_start, util_end, finalized_only=finalized_only, top_n=30
+        )
+        or {}
+    )
+
+    # Tow pilot scheduled vs unscheduled chart data
+    tow_sched = (
+        queries.tow_pilot_schedule_vs_actual(
+            util_start, util_end, finalized_only=finalized_only, top_n=20
+        )
+        or {}
+    )
+
+    # Instructor scheduled vs unscheduled chart data
+    instructor_sched = (
+        queries.instructor_schedule_vs_actual(
+            util_start, util_end, finalized_only=finalized_only, top_n=20
+        )
+        or {}
+    )
+
+    # Combined duty days chart data
+    combined_duty = (
+        queries.combined_duty_days_vs_actual(
+            util_start, util_end, finalized_only=finalized_only, top_n=20
+        )
+        or {}
+    )
+
+    # Time of day operations for yearly view (using start/end years)
+    time_ops = (
+        queries.time_of_day_operations(start, end, finalized_only=finalized_only) or {}
+    )
+
+    ctx = {
+        "year": end,
+        "start": start,
+        "end": end,
+        "finalized": finalized_only,
+        "labels": labels,
+        "years": years_list,
+        "data": data_json,
+        "totals": totals_json,
+        "instr": instr_json,
+        "ops_days": ops_days_map,
+        "current_year": current_year,
+        "fy_years": fy_years,
+        "fy_categories": fy_categories,
+        "fy_matrix": fy_matrix,
+        "util_names": util.get("names", []),
+        "util_flights": util.get("flights", []),
+        "util_hours": util.get("hours", []),
+        "util_avg_minutes": util.get("avg_minutes", []),
+        "util_start": util_start.isoformat(),
+        "util_end": util_end.isoformat(),
+        "utilp_names": util_private.get("names", []),
+        "utilp_flights": util_private.get("flights", []),
+        "utilp_hours": util_private.get("hours", []),
+        "utilp_avg_minutes": util_private.get("avg_minutes", []),
+        # flying days
+        "fd_names": fdays.get("names", []),
+        "fd_days": fdays.get("days", []),
+        "fd_ops_total": fdays.get("ops_days_total", 0),
+        # duration distribution
+        "dur_x_hours": dur.get("x_hours", []),
+        "dur_cdf_pct": dur.get("cdf_pct", []),
+        "dur_median_min": dur.get("median_min", 0),
+        "dur_pct_gt": dur.get("pct_gt", {1: 0.0, 2: 0.0, 3: 0.0}),
+        "dur_points": dur.get("points", []),
+        # pilot flights (non-instruction)
+        "pgf_names": pgf.get("names", []),
+        "pgf_counts": pgf.get("counts", []),
+        "inst_names": inst.get("names", []),
+        "inst_labels": inst.get("labels", []),
+        "inst_matrix": inst.get("matrix", {}),
+        "inst_totals": inst.get("totals", []),
+        "inst_total": inst.get("inst_total", 0),
+        "all_total": inst.get("all_total", 0),
+        "tow_names": tow.get("names", []),
+        "tow_labels": tow.get("labels", []),
+        "tow_matrix": tow.get("matrix", {}),
+        "tow_totals": tow.get("totals", []),
+        "tow_total": tow.get("tow_total", 0),
+        "long3h_names": long3h.get("names", []),
+        "long3h_counts": long3h.get("counts", []),
+        "long3h_longest_min": long3h.get("longest_min", 0),
+        "long3h_thresh": long3h.get("threshold_hours", 3.0),
+        "duty_names": duty.get("names", []),
+        "duty_labels": duty.get("labels", ["DO", "ADO"]),
+        "duty_matrix": duty.get("matrix", {"DO": [], "ADO": []}),
+        "duty_totals": duty.get("totals", []),
+        "duty_do_total": duty.get("do_total", 0),
+        "duty_ado_total": duty.get("ado_total", 0),
+        "duty_ops_days_total": duty.get("ops_days_total", 0),
+        # Tow pilot scheduled vs unscheduled
+        "tow_sched_names": tow_sched.get("names", []),
+        "tow_sched_scheduled": tow_sched.get("scheduled", []),
+        "tow_sched_unscheduled": tow_sched.get("unscheduled", []),
+        "tow_sched_labels": tow_sched.get(
+            "labels", ["Scheduled (Blue)", "Unscheduled (Burnt Orange)"]
+        ),
+        # Instructor scheduled vs unscheduled
+        "instructor_sched_names": instructor_sched.get("names", []),
+        "instructor_sched_scheduled": instructor_sched.get("scheduled", []),
+        "instructor_sched_unscheduled": instructor_sched.get("unscheduled", []),
+        "instructor_sched_labels": instructor_sched.get(
+            "labels", ["Scheduled (Blue)", "Unscheduled (Burnt Orange)"]
+        ),
+        # Combined duty days chart
+        "combined_duty_names": combined_duty.get("names", []),
+        "combined_duty_tow_days": combined_duty.get("tow_days", []),
+        "combined_duty_inst_days": combined_duty.get("inst_days", []),
+        "combined_duty_both_days": combined_duty.get("both_days", []),
+        "combined_duty_labels": combined_duty.get(
+            "labels", ["Tow Pilot Days", "Instructor Days", "Both Roles"]
+        ),
+        "combined_duty_dual_role": combined_duty.get("dual_role", []),
+        "tow_sched_italicize": tow_sched.get("italicize", []),
+        "instructor_sched_italicize": instructor_sched.get("italicize", []),
+        # Time of day operations
+        "timeops_takeoff_points": time_ops.get("takeoff_points", []),
+        "timeops_landing_points": time_ops.get("landing_points", []),
+        "timeops_mean_earliest_takeoff": time_ops.get("mean_earliest_takeoff", []),
+        "timeops_mean_latest_landing": time_ops.get("mean_latest_landing", []),
+        "timeops_start_year": time_ops.get("start_year", start),
+        "timeops_end_year": time_ops.get("end_year", end),
+        "timeops_total_flight_days": time_ops.get("total_flight_days", 0),
+    }
+
+    analytics_data = {
+        "cumulative": {
+            "labels": labels,
+            "years": years_list,
+            "data": data_json,
+            "totals": totals_json,
+            "instr": instr_json,
+            "current_year": current_year,
+        },
+        "by_acft": {
+            "years": ctx.get("fy_years", []),
+            "cats": ctx.get("fy_categories", []),
+            "matrix": ctx.get("fy_matrix", {}),
+        },
+        "util": {
+            "names": ctx.get("util_names", []),
+            "flights": ctx.get("util_flights", []),
+            "hours": ctx.get("util_hours", []),
+            "avgm": ctx.get("util_avg_minutes", []),
+        },
+        "util_priv": {
+            "names": ctx.get("utilp_names", []),
+            "flights": ctx.get("utilp_flights", []),
+            "hours": ctx.get("utilp_hours", []),
+            "avgm": ctx.get("utilp_avg_minutes", []),
+        },
+        "fdays": {
+            "names": ctx.get("fd_names", []),
+            "days": ctx.get("fd_days", []),
+            "ops_total": ctx.get("fd_ops_total", 0),
+        },
+        "pgf": {
+            "names": ctx.get("pgf_names", []),
+            "counts": ctx.get("pgf_counts", []),
+        },
+        "duration": {
+            "points": ctx.get("dur_points", []),
+            "x_hours": ctx.get("dur_x_hours", []),
+            "cdf_pct": ctx.get("dur_cdf_pct", []),
+            "median_min": ctx.get("dur_median_min", 0),
+            "pct_gt": ctx.get("dur_pct_gt", {"1": 0, "2": 0, "3": 0}),
+        },
+        "instructors": {
+            "names": ctx.get("inst_names", []),
+            "labels": ctx.get("inst_labels", []),
+            "matrix": ctx.get("inst_matrix", {}),
+            "totals": ctx.get("inst_totals", []),
+            "inst_total": ctx.get("inst_total", 0),
+            "all_total": ctx.get("all_total", 0),
+        },
+        "tows": {
+            "names": ctx.get("tow_names", []),
+            "labels": ctx.get("tow_labels", []),
+            "matrix": ctx.get("tow_matrix", {}),
+            "totals": ctx.get("tow_totals", []),
+            "tow_total": ctx.get("tow_total", 0),
+        },
+        "long3h": {
+            "names": ctx.get("long3h_names", []),
+            "counts": ctx.get("long3h_counts", []),
+            "longest_min": ctx.get("long3h_longest_min", 0),
+            "threshold_hours": ctx.get("long3h_thresh", 3.0),
+        },
+        "duty": {
+            "names": ctx.get("duty_names", []),
+            "labels": ctx.get("duty_labels", ["DO", "ADO"]),
+            "matrix": ctx.get("duty_matrix", {"DO": [], "ADO": []}),
+            "totals": ctx.get("duty_totals", []),
+            "do_total": ctx.get("duty_do_total", 0),
+            "ado_total": ctx.get("duty_ado_total", 0),
+            "ops_days_total": ctx.get("duty_ops_days_total", 0),
+        },
+        "tow_sched": {
+            "names": ctx.get("tow_sched_names", []),
+            "scheduled": ctx.get("tow_sched_scheduled", []),
+            "unscheduled": ctx.get("tow_sched_unscheduled", []),
+            "labels": ctx.get("tow_sched_labels", []),
+            "italicize": ctx.get("tow_sched_italicize", []),
+        },
+        "instructor_sched": {
+            "names": ctx.get("instructor_sched_names", []),
+            "scheduled": ctx.get("instructor_sched_scheduled", []),
+            "unscheduled": ctx.get("instructor_sched_unscheduled", []),
+            "labels": ctx.get("instructor_sched_labels", []),
+            "italicize": ctx.get("instructor_sched_italicize", []),
+        },
+        "combined_duty": {
+            "names": ctx.get("combined_duty_names", []),
+            "tow_days": ctx.get("combined_duty_tow_days", []),
+            "inst_days": ctx.get("combined_duty_inst_days", []),
+            "both_days": ctx.get("combined_duty_both_days", []),
+            "labels": ctx.get("combined_duty_labels", []),
+            "dual_role": ctx.get("combined_duty_dual_role", []),
+        },
+        "time_ops": {
+            "takeoff_points": ctx.get("timeops_takeoff_points", []),
+            "landing_points": ctx.get("timeops_landing_points", []),
+            "mean_earliest_takeoff": ctx.get("timeops_mean_earliest_takeoff", []),
+            "mean_latest_landing": ctx.get("timeops_mean_latest_landing", []),
+            "start_year": ctx.get("timeops_start_year", start),
+            "end_year": ctx.get("timeops_end_year", end),
+            "total_flight_days": ctx.get("timeops_total_flight_days", 0),
+        },
+    }
+
+    ctx["analytics_data"] = analytics_data
+    return ctx
+
+
+def get_dashboard_payload(
+    start: int,
+    end: int,
+    util_start: date,
+    util_end: date,
+    finalized_only: bool,
+    *,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """
+    Return the dashboard payload, from a fresh snapshot when one exists.
+
+    Missing or expired snapshots (or ``refresh=True``) are recomputed and
+    stored. A finalize landing mid-computation can leave a snapshot built
+    from the old data; the age limit bounds how long it survives.
+    """
+    key = dashboard_snapshot_key(start, end, util_start, util_end, finalized_only)
+    max_age = (
+        DASHBOARD_SNAPSHOT_MAX_AGE if finalized_only else DASHBOARD_ALL_FLIGHTS_MAX_AGE
+    )
+    if not refresh:
+        snapshot = DashboardSnapshot.objects.filter(
+            cache_key=key, computed_at__gte=timezone.now() - max_age
+        ).first()
+        if snapshot is not None:
+            return snapshot.payload
+
+    computed_at = timezone.now()
+    # Round-trip through JSON so a fresh payload looks exactly like a stored
+    # one (integer dict keys become strings).
+    payload = json.loads(
+        json.dumps(
+            build_dashboard_payload(start, end, util_start, util_end, finalized_only)
+        )
+    )
+    DashboardSnapshot.objects.update_or_create(
+        cache_key=key,
+        defaults={
+            "payload": payload,
+            "finalized_only": finalized_only,
+            "computed_at": computed_at,
+        },
+    )
+    prune_dashboard_snapshots()
+    return payload
+
+
+def prune_dashboard_snapshots() -> int:
+    """
+    Delete expired snapshots and all but the ``DASHBOARD_SNAPSHOT_MAX_ROWS``
+    most recently computed ones; returns the number removed.
+    """
+    now = timezone.now()
+    expired = DashboardSnapshot.objects.filter(
+        computed_at__lt=now - DASHBOARD_SNAPSHOT_MAX_AGE
+    ) | DashboardSnapshot.objects.filter(
+        finalized_only=False, computed_at__lt=now - DASHBOARD_ALL_FLIGHTS_MAX_AGE
+    )
+    deleted, _ = expired.delete()
+    overflow = list(
+        DashboardSnapshot.objects.order_by("-computed_at", "-pk").values_list(
+            "pk", flat=True
+        )[DASHBOARD_SNAPSHOT_MAX_ROWS:]
+    )
+    if overflow:
+        deleted += DashboardSnapshot.objects.filter(pk__in=overflow).delete()[0]
+    return deleted
+
+
+def invalidate_dashboard_snapshots() -> int:
+    """Drop every stored dashboard payload; returns the number removed."""
+    deleted, _ = DashboardSnapshot.objects.all().delete()
+    return deleted
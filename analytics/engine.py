@@ -0,0 +1,232 @@
+"""
+Single-scan computation of the dashboard's per-flight metrics.
+
+The dashboard asks ``analytics.queries`` for glider utilization (club and
+private), flying days, the duration distribution, pilot/instructor/tow-pilot
+breakdowns and long flights, all over the same utilization date range. Run
+separately that is a dozen-plus round trips over the same flights.
+``flight_metrics`` streams the landed flights in the range once with
+``values_list().iterator()``, feeds every accumulator from the same row, and
+hands the accumulated data to the same ``_shape_*`` helpers the individual
+query functions use, so each result has exactly the shape the
+corresponding function returns. Member display names are looked up in one
+query for all charts.
+
+``time_of_day_operations`` and the cumulative/by-aircraft charts use the
+year range rather than the utilization range, and duty/schedule charts read
+logsheets and duty assignments, so those stay in ``analytics.queries``.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict
+
+from django.db.models import DurationField, F
+from django.db.models.expressions import ExpressionWrapper
+from django.db.models.functions import Coalesce
+
+from logsheet.models import Flight
+
+from .queries import (
+    FINALIZED_ONLY,
+    LANDED_ONLY,
+    _display_name_map,
+    _ranked_ids,
+    _shape_duration_distribution,
+    _shape_flying_days,
+    _shape_glider_utilization,
+    _shape_instructor_flights,
+    _shape_long_flights,
+    _shape_pilot_glider_flights,
+    _shape_towpilot_flights,
+)
+
+GLIDER_FIELDS = (
+    "glider__club_owned",
+    "glider__competition_number",
+    "glider__n_number",
+    "glider__make",
+    "glider__model",
+)
+
+
+def _django_week_day(d: date) -> int:
+    # ExtractWeekDay numbering: Sunday=1 .. Saturday=7
+    return d.isoweekday() % 7 + 1
+
+
+def flight_metrics(
+    start_date: date,
+    end_date: date,
+    *,
+    finalized_only: bool = True,
+    util_top_n: int = 12,
+    min_flying_days: int = 2,
+    min_pilot_flights: int = 2,
+    crew_top_n: int = 20,
+    long_threshold_hours: float = 3.0,
+    long_top_n: int = 30,
+    chunk_size: int = 2000,
+) -> Dict[str, Any]:
+    """
+    Compute the per-flight dashboard metrics for a date range in one scan.
+
+    Returns a dict with keys ``util``, ``util_private``, ``flying_days``,
+    ``durations``, ``pilot_glider``, ``instructors``, ``tow_pilots`` and
+    ``long_flights``, each equal to what the matching ``analytics.queries``
+    function returns for the same arguments.
+    """
+    qs = Flight.objects.filter(LANDED_ONLY)
+    if finalized_only:
+        qs = qs.filter(FINALIZED_ONLY)
+    rows = (
+        qs.filter(logsheet__log_date__gte=start_date, logsheet__log_date__lte=end_date)
+        .annotate(
+            dur=Coalesce(
+                F("duration"),
+                ExpressionWrapper(
+                    F("landing_time") - F("launch_time"),
+                    output_field=DurationField(),
+                ),
+            )
+        )
+        .values_list(
+            "logsheet__log_date",
+            "glider_id",
+            *GLIDER_FIELDS,
+            "pilot_id",
+            "instructor_id",
+            "tow_pilot_id",
+            "dur",
+        )
+        .order_by()
+        .iterator(chunk_size=chunk_size)
+    )
+
+    long_threshold = timedelta(hours=long_threshold_hours)
+    gliders: Dict[Any, Dict[str, Any]] = {}
+    ops_days = set()
+    days_by_member: Dict[int, set] = defaultdict(set)
+    duration_secs = []
+    solo_counts: Dict[int, int] = defaultdict(int)
+    inst_totals: Dict[int, int] = defaultdict(int)
+    inst_wdays: Dict[tuple, int] = defaultdict(int)
+    tow_totals: Dict[int, int] = defaultdict(int)
+    tow_wdays: Dict[tuple, int] = defaultdict(int)
+    long_counts: Dict[int, int] = defaultdict(int)
+    longest = None
+    all_flights = 0
+
+    for (
+        ops_date,
+        glider_id,
+        club_owned,
+        comp_number,
+        n_number,
+        make,
+        model,
+        pilot_id,
+        instructor_id,
+        tow_pilot_id,
+        dur,
+    ) in rows:
+        all_flights += 1
+        ops_days.add(ops_date)
+        wday = _django_week_day(ops_date)
+
+        g = gliders.get(glider_id)
+        if g is None:
+            g = gliders[glider_id] = {
+                "glider_id": glider_id,
+                "glider__club_owned": club_owned,
+                "glider__competition_number": comp_number,
+                "glider__n_number": n_number,
+                "glider__make": make,
+                "glider__model": model,
+                "flights": 0,
+                "total_dur": None,
+            }
+        g["flights"] += 1
+        if dur is not None:
+            g["total_dur"] = dur if g["total_dur"] is None else g["total_dur"] + dur
+            if dur.total_seconds() > 0:
+                duration_secs.append(float(dur.total_seconds()))
+
+        if pilot_id is not None:
+            days_by_member[pilot_id].add(ops_date)
+            if instructor_id is None:
+                solo_counts[pilot_id] += 1
+            if dur is not None and dur >= long_threshold:
+                long_counts[pilot_id] += 1
+                if longest is None or dur > longest:
+                    longest = dur
+        if instructor_id is not None:
+            days_by_member[instructor_id].add(ops_date)
+            inst_totals[instructor_id] += 1
+            inst_wdays[(instructor_id, wday)] += 1
+        if tow_pilot_id is not None:
+            days_by_member[tow_pilot_id].add(ops_date)
+            tow_totals[tow_pilot_id] += 1
+            tow_wdays[(tow_pilot_id, wday)] += 1
+
+    inst_ids = _ranked_ids(inst_totals, minimum=1)[:crew_top_n]
+    tow_ids = _ranked_ids(tow_totals, minimum=1)[:crew_top_n]
+
+    # One name lookup covering every member that can appear in a chart.
+    named = set(inst_ids) | set(tow_ids)
+    named |= {m for m, days in days_by_member.items() if len(days) >= min_flying_days}
+    named |= {m for m, n in solo_counts.items() if n >= min_pilot_flights}
+    named |= set(_ranked_ids(long_counts, minimum=1)[:long_top_n])
+    name_map = _display_name_map(list(named)) if named else {}
+
+    glider_rows = list(gliders.values())
+    # Mirrors glider_utilization(fleet="private"): the club_owned=False filter
+    # also drops flights without a glider.
+    private_rows = [r for r in glider_rows if r["glider__club_owned"] is False]
+
+    return {
+        "util": _shape_glider_utilization(
+            glider_rows,
+            start_date,
+            end_date,
+            top_n=util_top_n,
+            bucket_private=True,
+            include_unknown=True,
+        ),
+        "util_private": _shape_glider_utilization(
+            private_rows,
+            start_date,
+            end_date,
+            top_n=util_top_n,
+            bucket_private=False,
+            include_unknown=False,
+        ),
+        "flying_days": _shape_flying_days(
+            days_by_member,
+            len(ops_days),
+            min_days=min_flying_days,
+            name_map=name_map,
+        ),
+        "durations": _shape_duration_distribution(sorted(duration_secs)),
+        "pilot_glider": _shape_pilot_glider_flights(
+            solo_counts, min_flights=min_pilot_flights, name_map=name_map
+        ),
+        "instructors": _shape_instructor_flights(
+            inst_totals,
+            inst_wdays,
+            inst_ids,
+            all_total=all_flights,
+            name_map=name_map,
+        ),
+        "tow_pilots": _shape_towpilot_flights(
+            tow_totals, tow_wdays, tow_ids, name_map=name_map
+        ),
+        "long_flights": _shape_long_flights(
+            long_counts,
+            longest,
+            threshold_hours=long_threshold_hours,
+            min_count=1,
+            top_n=long_top_n,
+            name_map=name_map,
+        ),
+    }
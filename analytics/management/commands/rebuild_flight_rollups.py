@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from analytics.rollups import rebuild_all_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the analytics DailyFlightRollup table from all flights. "
+        "Normally kept current by signals; run after loading fixtures or bulk imports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Logsheets aggregated per query (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_all_rollups(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt flight rollups: {written} row(s) written.")
+        )
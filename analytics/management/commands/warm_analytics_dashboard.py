@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from analytics.dashboard import dashboard_params, get_dashboard_payload
+from utils.management.commands.base_cronjob import BaseCronJobCommand
+
+
+class Command(BaseCronJobCommand):
+    help = (
+        "Precompute the default analytics dashboard views so the first visitor "
+        "after a logsheet is finalized does not pay for the full query set."
+    )
+    job_name = "warm_analytics_dashboard"
+    max_execution_time = timedelta(minutes=15)
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--include-all-flights",
+            action="store_true",
+            help="Also warm the 'include non-finalized logsheets' view",
+        )
+        parser.add_argument(
+            "--refresh",
+            action="store_true",
+            help="Recompute even if a fresh snapshot already exists",
+        )
+
+    def execute_job(self, *args, **options):
+        variants = [{}]
+        if options.get("include_all_flights"):
+            variants.append({"all": "1"})
+
+        for params in variants:
+            start, end, util_start, util_end, finalized_only = dashboard_params(params)
+            label = (
+                f"{start}-{end}, utilization {util_start}..{util_end}, "
+                f"{'finalized only' if finalized_only else 'all flights'}"
+            )
+            if self.dry_run:
+                self.log_info(f"Would warm dashboard ({label})")
+                continue
+            get_dashboard_payload(
+                start,
+                end,
+                util_start,
+                util_end,
+                finalized_only,
+                refresh=options.get("refresh", False),
+            )
+            self.log_info(f"Warmed dashboard ({label})")
+
+        self.log_success("Analytics dashboard warm-up complete.")
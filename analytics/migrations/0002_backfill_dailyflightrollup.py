@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from django.db import migrations
+from django.db.models import Count, DurationField, F, Max, Min, Q, Sum
+from django.db.models.expressions import ExpressionWrapper
+from django.db.models.functions import Coalesce
+
+
+def backfill_rollups(apps, schema_editor):
+    """Populate DailyFlightRollup from existing landed flights."""
+    Flight = apps.get_model("logsheet", "Flight")
+    DailyFlightRollup = apps.get_model("analytics", "DailyFlightRollup")
+
+    rows = (
+        Flight.objects.filter(
+            Q(landing_time__isnull=False) & Q(launch_time__isnull=False)
+        )
+        .annotate(
+            dur=Coalesce(
+                F("duration"),
+                ExpressionWrapper(
+                    F("landing_time") - F("launch_time"),
+                    output_field=DurationField(),
+                ),
+            )
+        )
+        .values(
+            "logsheet_id",
+            "logsheet__log_date",
+            "logsheet__finalized",
+            "glider_id",
+            "pilot_id",
+            "instructor_id",
+            "tow_pilot_id",
+        )
+        .annotate(
+            n=Count("id"),
+            total_dur=Sum("dur"),
+            max_dur=Max("dur"),
+            first_launch=Min("launch_time"),
+            last_landing=Max("landing_time"),
+        )
+        .order_by()
+    )
+
+    batch = []
+    for row in rows.iterator(chunk_size=2000):
+        batch.append(
+            DailyFlightRollup(
+                logsheet_id=row["logsheet_id"],
+                log_date=row["logsheet__log_date"],
+                finalized=row["logsheet__finalized"],
+                glider_id=row["glider_id"],
+                pilot_id=row["pilot_id"],
+                instructor_id=row["instructor_id"],
+                tow_pilot_id=row["tow_pilot_id"],
+                flights=row["n"],
+                total_duration=row["total_dur"] or timedelta(0),
+                max_duration=row["max_dur"],
+                first_launch=row["first_launch"],
+                last_landing=row["last_landing"],
+            )
+        )
+        if len(batch) >= 1000:
+            DailyFlightRollup.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        DailyFlightRollup.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.16 on 2026-10-16 20:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0002_backfill_dailyflightrollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DashboardSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("cache_key", models.CharField(max_length=128, unique=True)),
+                ("finalized_only", models.BooleanField(default=True)),
+                ("payload", models.JSONField()),
+                ("computed_at", models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -1 +1,88 @@
-# Create your models here.
+from datetime import timedelta
+
+from django.db import models
+
+
+class DailyFlightRollup(models.Model):
+    """
+    Pre-aggregated landed flights for the analytics dashboard.
+
+    One row per (logsheet, glider, pilot, instructor, tow pilot) holding the
+    flight count and duration totals for that crew/aircraft on that ops day.
+    Rows are rebuilt a logsheet at a time by ``analytics.rollups`` whenever a
+    flight or its logsheet is saved (see ``analytics/signals.py``), so the
+    dashboard queries scan ops days instead of individual flights.
+
+    ``log_date`` and ``finalized`` are copied from the logsheet so date-range
+    and finalized-only filters do not need a join.
+    """
+
+    logsheet = models.ForeignKey(
+        "logsheet.Logsheet",
+        on_delete=models.CASCADE,
+        related_name="flight_rollups",
+    )
+    log_date = models.DateField()
+    finalized = models.BooleanField(default=False)
+    glider = models.ForeignKey(
+        "logsheet.Glider",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    pilot = models.ForeignKey(
+        "members.Member",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    instructor = models.ForeignKey(
+        "members.Member",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    tow_pilot = models.ForeignKey(
+        "members.Member",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    flights = models.PositiveIntegerField(default=0)
+    # Sum/max of Coalesce(duration, landing - launch) over the flights.
+    total_duration = models.DurationField(default=timedelta(0))
+    max_duration = models.DurationField(null=True, blank=True)
+    first_launch = models.TimeField(null=True, blank=True)
+    last_landing = models.TimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["log_date", "finalized"]),
+        ]
+
+    def __str__(self):
+        return f"DailyFlightRollup({self.log_date}, logsheet={self.logsheet_id}, flights={self.flights})"
+
+
+class DashboardSnapshot(models.Model):
+    """
+    Precomputed analytics dashboard payload for one parameter combination.
+
+    Written and read by ``analytics.dashboard``; rows are deleted when a
+    logsheet is finalized or unfinalized and are otherwise treated as stale
+    after a fixed age.
+    """
+
+    cache_key = models.CharField(max_length=128, unique=True)
+    finalized_only = models.BooleanField(default=True)
+    payload = models.JSONField()
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return (
+            f"DashboardSnapshot({self.cache_key} @ {self.computed_at:%Y-%m-%d %H:%M})"
+        )
@@ -5,12 +5,40 @@ from itertools import chain
 from typing import Any, Dict, List, TypedDict
 
 from django.contrib.auth import get_user_model
-from django.db.models import Avg, Count, DurationField, F, Max, Q, Sum
+from django.db.models import Count, DurationField, F, Max, Min, Q, Sum
 from django.db.models.expressions import ExpressionWrapper
-from django.db.models.functions import Coalesce, ExtractWeekDay, ExtractYear
+from django.db.models.functions import (
+    Coalesce,
+    Extract,
+    ExtractWeekDay,
+    ExtractYear,
+)
 
 from logsheet.models import Flight
 
+from . import vectorized
+from .models import DailyFlightRollup
+
+
+def _rollup_qs(start_date: date, end_date: date, finalized_only: bool = True):
+    """
+    DailyFlightRollup rows (landed flights only) for an ops-date range.
+
+    Each row stands for ``flights`` flights, so counts are ``Sum("flights")``
+    rather than ``Count("id")``.
+    """
+    qs = DailyFlightRollup.objects.filter(
+        log_date__gte=start_date, log_date__lte=end_date
+    )
+    if finalized_only:
+        qs = qs.filter(finalized=True)
+    return qs
+
+
+def _rollup_years_qs(start_year: int, end_year: int, finalized_only: bool = True):
+    """DailyFlightRollup rows for whole calendar years."""
+    return _rollup_qs(date(start_year, 1, 1), date(end_year, 12, 31), finalized_only)
+
 
 def instructor_schedule_vs_actual(
     start_date: date, end_date: date, *, finalized_only=True, top_n=20, min_total=1
@@ -36,30 +64,26 @@ def instructor_schedule_vs_actual(
         if ls.surge_instructor_id:
             scheduled_days[ls.surge_instructor_id].add(ls.log_date)
 
-    # 2. Get all actual instructor days (from flights)
-    qs = Flight.objects.filter(LANDED_ONLY)
-    if finalized_only:
-        qs = qs.filter(FINALIZED_ONLY)
-    qs = qs.annotate(ops_date=F("logsheet__log_date")).filter(
-        ops_date__gte=start_date, ops_date__lte=end_date, instructor__isnull=False
-    )
+    # 2. Get all actual instructor days (from the flight rollup)
+    rollup = _rollup_qs(start_date, end_date, finalized_only)
     # Map: instructor_id -> set of days they instructed
     actual_days = defaultdict(set)
-    for row in qs.values("instructor_id", "ops_date").distinct():
-        if row["instructor_id"]:
-            actual_days[row["instructor_id"]].add(row["ops_date"])
+    for row in (
+        rollup.filter(instructor__isnull=False)
+        .values("instructor_id", "log_date")
+        .distinct()
+    ):
+        actual_days[row["instructor_id"]].add(row["log_date"])
 
     # Find instructors who also towed during the period
-    tow_qs = Flight.objects.filter(LANDED_ONLY)
-    if finalized_only:
-        tow_qs = tow_qs.filter(FINALIZED_ONLY)
-    tow_qs = tow_qs.annotate(ops_date=F("logsheet__log_date")).filter(
-        ops_date__gte=start_date, ops_date__lte=end_date, tow_pilot__isnull=False
-    )
     tow_counts = defaultdict(int)
-    for row in tow_qs.values("tow_pilot_id").annotate(n=Count("id")):
-        if row["tow_pilot_id"]:
-            tow_counts[row["tow_pilot_id"]] += row["n"]
+    for row in (
+        rollup.filter(tow_pilot__isnull=False)
+        .values("tow_pilot_id")
+        .annotate(n=Sum("flights"))
+        .order_by()
+    ):
+        tow_counts[row["tow_pilot_id"]] += row["n"]
 
     # 3. For each instructor, count scheduled and unscheduled days
     all_ids = set(scheduled_days.keys()) | set(actual_days.keys())
@@ -116,30 +140,26 @@ def tow_pilot_schedule_vs_actual(
         if ls.surge_tow_pilot_id:
             scheduled_days[ls.surge_tow_pilot_id].add(ls.log_date)
 
-    # 2. Get all actual tow pilot days (from flights)
-    qs = Flight.objects.filter(LANDED_ONLY)
-    if finalized_only:
-        qs = qs.filter(FINALIZED_ONLY)
-    qs = qs.annotate(ops_date=F("logsheet__log_date")).filter(
-        ops_date__gte=start_date, ops_date__lte=end_date, tow_pilot__isnull=False
-    )
+    # 2. Get all actual tow pilot days (from the flight rollup)
+    rollup = _rollup_qs(start_date, end_date, finalized_only)
     # Map: tow_pilot_id -> set of days they towed
     actual_days = defaultdict(set)
-    for row in qs.values("tow_pilot_id", "ops_date").distinct():
-        if row["tow_pilot_id"]:
-            actual_days[row["tow_pilot_id"]].add(row["ops_date"])
+    for row in (
+        rollup.filter(tow_pilot__isnull=False)
+        .values("tow_pilot_id", "log_date")
+        .distinct()
+    ):
+        actual_days[row["tow_pilot_id"]].add(row["log_date"])
 
     # Find tow pilots who also instructed during the period
-    inst_qs = Flight.objects.filter(LANDED_ONLY)
-    if finalized_only:
-        inst_qs = inst_qs.filter(FINALIZED_ONLY)
-    inst_qs = inst_qs.annotate(ops_date=F("logsheet__log_date")).filter(
-        ops_date__gte=start_date, ops_date__lte=end_date, instructor__isnull=False
-    )
     inst_counts = defaultdict(int)
-    for row in inst_qs.values("instructor_id").annotate(n=Count("id")):
-        if row["instructor_id"]:
-            inst_counts[row["instructor_id"]] += row["n"]
+    for row in (
+        rollup.filter(instructor__isnull=False)
+        .values("instructor_id")
+        .annotate(n=Sum("flights"))
+        .order_by()
+    ):
+        inst_counts[row["instructor_id"]] += row["n"]
 
     # 3. For each tow pilot, count scheduled and unscheduled days
     all_ids = set(scheduled_days.keys()) | set(actual_days.keys())
@@ -205,28 +225,27 @@ def combined_duty_days_vs_actual(
             if pid:
                 scheduled_by_member[pid].add(ls.log_date)
 
-    # 2. Get all actual tow pilot and instructor days (from flights)
-    qs = Flight.objects.filter(LANDED_ONLY)
-    if finalized_only:
-        qs = qs.filter(FINALIZED_ONLY)
-    qs = qs.annotate(ops_date=F("logsheet__log_date")).filter(
-        ops_date__gte=start_date, ops_date__lte=end_date
+    # 2. Get all actual tow pilot and instructor days (from the flight rollup)
+    crew_days = list(
+        _rollup_qs(start_date, end_date, finalized_only)
+        .values("tow_pilot_id", "instructor_id", "log_date")
+        .distinct()
     )
     actual_by_member = defaultdict(set)
-    for row in qs.values("tow_pilot_id", "instructor_id", "ops_date").distinct():
+    for row in crew_days:
         for pid in [row["tow_pilot_id"], row["instructor_id"]]:
             if pid:
-                actual_by_member[pid].add(row["ops_date"])
+                actual_by_member[pid].add(row["log_date"])
 
     # 3. For each member, count tow pilot and instructor days (no double-counting per day)
     all_ids = set(scheduled_by_member.keys()) | set(actual_by_member.keys())
     tow_days = defaultdict(set)
     inst_days = defaultdict(set)
-    for row in qs.values("tow_pilot_id", "instructor_id", "ops_date").distinct():
+    for row in crew_days:
         if row["tow_pilot_id"]:
-            tow_days[row["tow_pilot_id"]].add(row["ops_date"])
+            tow_days[row["tow_pilot_id"]].add(row["log_date"])
         if row["instructor_id"]:
-            inst_days[row["instructor_id"]].add(row["ops_date"])
+            inst_days[row["instructor_id"]].add(row["log_date"])
 
     # Also include scheduled days from logsheets
     for ls in logsheet_qs:
@@ -291,51 +310,57 @@ def cumulative_flights_by_year(
     if start_year is None:
         start_year = max(2000, end_year - max_years + 1)
 
-    # Base queryset: landed flights within year range
-    qs = Flight.objects.filter(LANDED_ONLY)
-
-    if finalized_only:
-        qs = qs.filter(FINALIZED_ONLY)
-
-    # ✅ Alias the related field and its year using the correct field name
-    qs = qs.annotate(ops_date=F("logsheet__log_date"))
-    qs = qs.annotate(ops_year=ExtractYear("ops_date"))
-    qs = qs.filter(ops_year__gte=start_year, ops_year__lte=end_year)
-
-    # Per (year, day-of-year) counts using SQLite-compatible approach
-    # Group by date and year, then calculate day of year in Python
+    # Per-day flight and instructional-flight counts from the rollup; year
+    # totals, ops days and day-of-year are derived in Python.
     per_day_raw = (
-        qs.values("ops_year", "ops_date")
-        .annotate(n=Count("id"))
-        .order_by("ops_year", "ops_date")
+        _rollup_years_qs(start_year, end_year, finalized_only)
+        .values("log_date")
+        .annotate(
+            n=Sum("flights"),
+            instr=Sum("flights", filter=Q(instructor__isnull=False)),
+        )
+        .order_by("log_date")
     )
 
-    # Convert to the format expected by the rest of the function
     per_day = []
+    totals = {}
+    ops_days = {}
+    instr_counts = {}
     for row in per_day_raw:
-        year = row["ops_year"]
-        date_obj = row["ops_date"]
-        # Python built-in day of year calculation
-        day_of_year = date_obj.timetuple().tm_yday
+        year = row["log_date"].year
+        day_of_year = row["log_date"].timetuple().tm_yday
         per_day.append({"y": year, "d": day_of_year, "n": row["n"]})
+        totals[year] = totals.get(year, 0) + row["n"]
+        ops_days[year] = ops_days.get(year, 0) + 1
+        if row["instr"]:
+            instr_counts[year] = instr_counts.get(year, 0) + row["instr"]
 
-    # Totals per year
-    totals_qs = qs.values("ops_year").annotate(n=Count("id"))
-    totals = {row["ops_year"]: row["n"] for row in totals_qs}
+    # Build cumulative arrays (1..365)
+    labels = list(range(1, 366))
+    if vectorized.available():
+        data = vectorized.cumulative_by_year(
+            [row["y"] for row in per_day],
+            [row["d"] for row in per_day],
+            [row["n"] for row in per_day],
+            start_year,
+            end_year,
+        )
+    else:
+        data = _cumulative_by_year_loops(per_day, start_year, end_year)
 
-    # Ops days per year
-    ops_days = {}
-    for row in per_day:
-        ops_days[row["y"]] = ops_days.get(row["y"], 0) + 1
+    years = [y for y in range(start_year, end_year + 1) if totals.get(y, 0) > 0]
+    return {
+        "labels": labels,
+        "years": years,
+        "data": data,
+        "totals": totals,
+        "ops_days": ops_days,
+        "instr_counts": instr_counts,
+    }
 
-    # Instructional flights per year
-    instr_qs = (
-        qs.filter(instructor__isnull=False).values("ops_year").annotate(n=Count("id"))
-    )
-    instr_counts = {row["ops_year"]: row["n"] for row in instr_qs}
 
-    # Build cumulative arrays (1..365)
-    labels = list(range(1, 366))
+def _cumulative_by_year_loops(per_day, start_year, end_year):
+    """Pure-Python twin of ``vectorized.cumulative_by_year``."""
     data = {y: [0] * 365 for y in range(start_year, end_year + 1)}
     tmp = {}
 
@@ -352,16 +377,7 @@ def cumulative_flights_by_year(
         for d in range(1, 366):
             running += daymap.get(d, 0)
             arr[d - 1] = running
-
-    years = [y for y in range(start_year, end_year + 1) if totals.get(y, 0) > 0]
-    return {
-        "labels": labels,
-        "years": years,
-        "data": data,
-        "totals": totals,
-        "ops_days": ops_days,
-        "instr_counts": instr_counts,
-    }
+    return data
 
 
 def flights_by_year_by_aircraft(
@@ -377,16 +393,8 @@ def flights_by_year_by_aircraft(
     # Buckets non-club ships (glider.club_owned == False) into "Private".
     # Low-volume ships beyond top_n are grouped under "Other".
 
-    qs = Flight.objects.filter(LANDED_ONLY)
-    if finalized_only:
-        qs = qs.filter(FINALIZED_ONLY)
-
-    qs = qs.annotate(
-        ops_date=F("logsheet__log_date"),
-        ops_year=ExtractYear("ops_date"),
-    ).filter(
-        ops_year__gte=start_year,
-        ops_year__lte=end_year,
+    qs = _rollup_years_qs(start_year, end_year, finalized_only).annotate(
+        ops_year=ExtractYear("log_date")
     )
 
     rows = (
@@ -399,7 +407,7 @@ def flights_by_year_by_aircraft(
             "glider__model",
             "glider__make",
         )
-        .annotate(n=Count("id"))
+        .annotate(n=Sum("flights"))
         .order_by("ops_year")
     )
 
@@ -499,26 +507,8 @@ def glider_utilization(
     # - When bucket_private=False, private ships are listed individually (no "Private" bucket).
     # - Ships beyond top_n (by flights) grouped as "Other".
 
-    qs = Flight.objects.filter(LANDED_ONLY)
-    if finalized_only:
-        qs = qs.filter(FINALIZED_ONLY)
-
-    # Date filtering + duration choice
-    qs = (
-        qs.annotate(
-            ops_date=F("logsheet__log_date"),
-            dur_diff=ExpressionWrapper(
-                F("landing_time") - F("launch_time"), output_field=DurationField()
-            ),
-        )
-        .annotate(
-            dur=Coalesce(F("duration"), F("dur_diff")),
-        )
-        .filter(
-            ops_date__gte=start_date,
-            ops_date__lte=end_date,
-        )
-    )
+    # Rollup rows already carry Coalesce(duration, landing - launch) totals.
+    qs = _rollup_qs(start_date, end_date, finalized_only)
 
     # Fleet filter
     if fleet == "club":
@@ -538,13 +528,38 @@ def glider_utilization(
             "glider__model",
         )
         .annotate(
-            flights=Count("id"),
-            total_dur=Sum("dur"),
-            avg_dur=Avg("dur"),
+            flights=Sum("flights"),
+            total_dur=Sum("total_duration"),
         )
         .order_by()
     )
 
+    return _shape_glider_utilization(
+        rows,
+        start_date,
+        end_date,
+        top_n=top_n,
+        bucket_private=bucket_private,
+        include_unknown=include_unknown,
+    )
+
+
+def _shape_glider_utilization(
+    rows,
+    start_date: date,
+    end_date: date,
+    *,
+    top_n: int,
+    bucket_private: bool,
+    include_unknown: bool,
+) -> GliderUtilization:
+    """
+    Label, bucket and rank per-glider rows for ``glider_utilization``.
+
+    ``rows`` are dicts with the ``glider_*`` fields plus ``flights`` and
+    ``total_dur`` (a timedelta or None).
+    """
+
     def label_from_row(r: Dict[str, Any]) -> str:
         # Unknown (null glider)
         if r["glider_id"] is None:
@@ -673,28 +688,20 @@ def flying_days_by_member(
     Count distinct ops days per member where they flew as pilot OR instructor OR tow pilot.
     Returns { "names": [...], "days": [...], "ops_days_total": int }
     """
-    from logsheet.models import Flight
-
-    qs = Flight.objects.filter(LANDED_ONLY)
-    if finalized_only:
-        qs = qs.filter(FINALIZED_ONLY)
-
-    qs = qs.annotate(ops_date=F("logsheet__log_date")).filter(
-        ops_date__gte=start_date, ops_date__lte=end_date
-    )
+    qs = _rollup_qs(start_date, end_date, finalized_only)
 
     # Pull distinct (member_id, ops_date) pairs per role
     pilot_pairs = (
-        qs.filter(pilot__isnull=False).values_list("pilot_id", "ops_date").distinct()
+        qs.filter(pilot__isnull=False).values_list("pilot_id", "log_date").distinct()
     )
     instr_pairs = (
         qs.filter(instructor__isnull=False)
-        .values_list("instructor_id", "ops_date")
+        .values_list("instructor_id", "log_date")
         .distinct()
     )
     tow_pairs = (
         qs.filter(tow_pilot__isnull=False)
-        .values_list("tow_pilot_id", "ops_date")
+        .values_list("tow_pilot_id", "log_date")
         .distinct()
     )
 
@@ -704,19 +711,26 @@ def flying_days_by_member(
         if mid is not None and d is not None:
             days_by_member[int(mid)].add(d)
 
+    ops_days_total = int(qs.values("log_date").distinct().count())
+    return _shape_flying_days(days_by_member, ops_days_total, min_days=min_days)
+
+
+def _shape_flying_days(
+    days_by_member: Dict[int, set],
+    ops_days_total: int,
+    *,
+    min_days: int,
+    name_map: Dict[int, str] | None = None,
+) -> Dict[str, Any]:
+    """Threshold, name and sort {member_id: {days}} for ``flying_days_by_member``."""
     # Filter by threshold and sort desc by days, then by username
     ids = [m for m, s in days_by_member.items() if len(s) >= min_days]
     if not ids:
-        return {
-            "names": [],
-            "days": [],
-            "ops_days_total": int(qs.values("ops_date").distinct().count()),
-        }
+        return {"names": [], "days": [], "ops_days_total": ops_days_total}
 
-    # Map IDs -> usernames once
-    User = get_user_model()
     # uses full_display_name → full_name → username
-    name_map = _display_name_map(ids)
+    if name_map is None:
+        name_map = _display_name_map(ids)
 
     rows: List[tuple] = []
     for m in ids:
@@ -730,7 +744,6 @@ def flying_days_by_member(
     names = [t[0] for t in rows]
     days = [int(t[1]) for t in rows]
 
-    ops_days_total = int(qs.values("ops_date").distinct().count())
     return {"names": names, "days": days, "ops_days_total": ops_days_total}
 
 
@@ -751,12 +764,11 @@ def flight_duration_distribution(
       "pct_gt": {1: float, 2: float, 3: float},
     }
     """
-    from logsheet.models import Flight
-
     qs = Flight.objects.filter(LANDED_ONLY)
     if finalized_only:
         qs = qs.filter(FINALIZED_ONLY)
 
+    # Durations come back as seconds so they can go straight into an array.
     qs = (
         qs.annotate(
             ops_date=F("logsheet__log_date"),
@@ -766,16 +778,34 @@ def flight_duration_distribution(
         )
         .annotate(dur=Coalesce(F("duration"), F("dur_diff")))
         .filter(ops_date__gte=start_date, ops_date__lte=end_date)
-        .values_list("dur", flat=True)
+        .annotate(secs=Extract("dur", "epoch"))
+        .values_list("secs", flat=True)
     )
 
+    if vectorized.available():
+        return vectorized.duration_distribution(list(qs), max_points=max_points)
+
     secs: list[float] = []
-    for d in qs:
-        if d is not None:
-            s = float(d.total_seconds())
-            if s > 0:
-                secs.append(s)
+    for s in qs:
+        if s is not None and s > 0:
+            secs.append(float(s))
 
+    return _duration_distribution_loops(secs, max_points=max_points)
+
+
+def _shape_duration_distribution(
+    secs: List[float], *, max_points: int = 400
+) -> Dict[str, Any]:
+    """Survival curve, median and shares from positive durations in seconds."""
+    if vectorized.available():
+        return vectorized.duration_distribution(secs, max_points=max_points)
+    return _duration_distribution_loops(secs, max_points=max_points)
+
+
+def _duration_distribution_loops(
+    secs: List[float], *, max_points: int = 400
+) -> Dict[str, Any]:
+    """Pure-Python twin of ``vectorized.duration_distribution``."""
     if not secs:
         return {
             "points": [],
@@ -835,29 +865,40 @@ def pilot_glider_flights(
     # Count glider flights per pilot where no instructor is on the flight.
     # Returns { "names": [...], "counts": [...] }
 
-    qs = Flight.objects.filter(LANDED_ONLY)
-    if finalized_only:
-        qs = qs.filter(FINALIZED_ONLY)
-
     rows = (
-        qs.annotate(ops_date=F("logsheet__log_date"))
-        .filter(
-            ops_date__gte=start_date,
-            ops_date__lte=end_date,
-            pilot__isnull=False,
-            instructor__isnull=True,
-        )
+        _rollup_qs(start_date, end_date, finalized_only)
+        .filter(pilot__isnull=False, instructor__isnull=True)
         .values("pilot_id")
-        .annotate(n=Count("id"))
-        .order_by("-n", "pilot_id")
+        .annotate(n=Sum("flights"))
+        .order_by()
     )
+    counts = {r["pilot_id"]: int(r["n"]) for r in rows}
+    return _shape_pilot_glider_flights(counts, min_flights=min_flights)
+
+
+def _ranked_ids(counts: Dict[int, int], *, minimum: int) -> List[int]:
+    """Member ids with count >= minimum, by count desc then id."""
+    return [
+        mid
+        for mid, n in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        if n >= minimum
+    ]
 
-    ids = [r["pilot_id"] for r in rows if r["n"] >= min_flights]
-    name_map = _display_name_map(ids)
+
+def _shape_pilot_glider_flights(
+    counts: Dict[int, int],
+    *,
+    min_flights: int,
+    name_map: Dict[int, str] | None = None,
+) -> Dict[str, Any]:
+    """Rank and name {pilot_id: flights} for ``pilot_glider_flights``."""
+    ids = _ranked_ids(counts, minimum=min_flights)
+    if name_map is None:
+        name_map = _display_name_map(ids)
 
     names = [name_map[i] for i in ids if i in name_map]
-    counts = [int(r["n"]) for r in rows if r["pilot_id"] in name_map]
-    return {"names": names, "counts": counts}
+    counts_out = [counts[i] for i in ids if i in name_map]
+    return {"names": names, "counts": counts_out}
 
 
 # Mon..Sun (Django ExtractWeekDay: Sun=1..Sat=7)
@@ -889,77 +930,81 @@ def instructor_flights_by_member(
     """
     Horizontal stacked bars by instructor, broken down by weekday.
     """
-    from logsheet.models import Flight
-
-    qs = Flight.objects.filter(LANDED_ONLY)
-    if finalized_only:
-        qs = qs.filter(FINALIZED_ONLY)
-
-    qs = qs.annotate(ops_date=F("logsheet__log_date")).filter(
-        ops_date__gte=start_date, ops_date__lte=end_date, instructor__isnull=False
-    )
+    all_qs = _rollup_qs(start_date, end_date, finalized_only)
+    qs = all_qs.filter(instructor__isnull=False)
 
     # totals per instructor
-    totals_qs = (
-        qs.values("instructor_id")
-        .annotate(n=Count("id"))
-        .order_by("-n", "instructor_id")
-    )
-    totals_rows = list(totals_qs)
-    ids_sorted = [r["instructor_id"] for r in totals_rows if r["n"] >= min_total][
-        :top_n
-    ]
+    totals = {
+        r["instructor_id"]: int(r["n"])
+        for r in qs.values("instructor_id").annotate(n=Sum("flights")).order_by()
+    }
+    ids_sorted = _ranked_ids(totals, minimum=min_total)[:top_n]
     if not ids_sorted:
-        return {
-            "names": [],
-            "labels": WEEKDAYS_LABELS,
-            "matrix": {},
-            "totals": [],
-            "inst_total": 0,
-            "all_total": 0,
-        }
+        return _shape_instructor_flights(totals, {}, ids_sorted, all_total=0)
 
     # weekday breakdown for just those IDs
-    wday_rows = (
-        qs.filter(instructor_id__in=ids_sorted)
-        .annotate(wday=ExtractWeekDay(F("ops_date")))
+    wday_counts = {
+        (r["instructor_id"], r["wday"]): int(r["n"])
+        for r in qs.filter(instructor_id__in=ids_sorted)
+        .annotate(wday=ExtractWeekDay(F("log_date")))
         .values("instructor_id", "wday")
-        .annotate(n=Count("id"))
+        .annotate(n=Sum("flights"))
+        .order_by()
+    }
+
+    # overall count for caption
+    all_total = int(all_qs.aggregate(n=Sum("flights"))["n"] or 0)
+    return _shape_instructor_flights(
+        totals, wday_counts, ids_sorted, all_total=all_total
     )
 
-    # map ids -> display names
-    name_map = _display_name_map(ids_sorted)
-    names = [name_map.get(i, str(i)) for i in ids_sorted]
 
-    # matrix aligned to ids_sorted
+def _weekday_stack(totals, wday_counts, ids_sorted, name_map):
+    """
+    names, Mon..Sun matrix and totals aligned to ids_sorted.
+
+    ``wday_counts`` maps (member_id, Django week day) -> flights.
+    """
+    if name_map is None:
+        name_map = _display_name_map(ids_sorted)
+    names = [name_map.get(i, str(i)) for i in ids_sorted]
     matrix = _stack_by_weekday(
         [
-            {"member_id": r["instructor_id"], "wday": r["wday"], "n": r["n"]}
-            for r in wday_rows
+            {"member_id": mid, "wday": wday, "n": n}
+            for (mid, wday), n in wday_counts.items()
         ],
         ids_sorted,
     )
-    totals = [
-        int(next((t["n"] for t in totals_rows if t["instructor_id"] == i), 0))
-        for i in ids_sorted
-    ]
+    return names, matrix, [totals.get(i, 0) for i in ids_sorted]
 
-    # overall counts for caption
-    inst_total = int(qs.count())
-    all_total = int(
-        Flight.objects.filter(LANDED_ONLY)
-        .filter(FINALIZED_ONLY if finalized_only else Q())
-        .annotate(ops_date=F("logsheet__log_date"))
-        .filter(ops_date__gte=start_date, ops_date__lte=end_date)
-        .count()
-    )
 
+def _shape_instructor_flights(
+    totals: Dict[int, int],
+    wday_counts: Dict[tuple, int],
+    ids_sorted: List[int],
+    *,
+    all_total: int,
+    name_map: Dict[int, str] | None = None,
+) -> Dict[str, Any]:
+    """Result dict for ``instructor_flights_by_member``."""
+    if not ids_sorted:
+        return {
+            "names": [],
+            "labels": WEEKDAYS_LABELS,
+            "matrix": {},
+            "totals": [],
+            "inst_total": 0,
+            "all_total": 0,
+        }
+    names, matrix, totals_out = _weekday_stack(
+        totals, wday_counts, ids_sorted, name_map
+    )
     return {
         "names": names,
         "labels": WEEKDAYS_LABELS,
         "matrix": matrix,
-        "totals": totals,
-        "inst_total": inst_total,
+        "totals": totals_out,
+        "inst_total": sum(totals.values()),
         "all_total": all_total,
     }
 
@@ -970,21 +1015,36 @@ def towpilot_flights_by_member(
     """
     Horizontal stacked bars by tow pilot, broken down by weekday.
     """
-    from logsheet.models import Flight
+    qs = _rollup_qs(start_date, end_date, finalized_only).filter(
+        tow_pilot__isnull=False
+    )
 
-    qs = Flight.objects.filter(LANDED_ONLY)
-    if finalized_only:
-        qs = qs.filter(FINALIZED_ONLY)
+    totals = {
+        r["tow_pilot_id"]: int(r["n"])
+        for r in qs.values("tow_pilot_id").annotate(n=Sum("flights")).order_by()
+    }
+    ids_sorted = _ranked_ids(totals, minimum=min_total)[:top_n]
+    wday_counts = {}
+    if ids_sorted:
+        wday_counts = {
+            (r["tow_pilot_id"], r["wday"]): int(r["n"])
+            for r in qs.filter(tow_pilot_id__in=ids_sorted)
+            .annotate(wday=ExtractWeekDay(F("log_date")))
+            .values("tow_pilot_id", "wday")
+            .annotate(n=Sum("flights"))
+            .order_by()
+        }
+    return _shape_towpilot_flights(totals, wday_counts, ids_sorted)
 
-    qs = qs.annotate(ops_date=F("logsheet__log_date")).filter(
-        ops_date__gte=start_date, ops_date__lte=end_date, tow_pilot__isnull=False
-    )
 
-    totals_qs = (
-        qs.values("tow_pilot_id").annotate(n=Count("id")).order_by("-n", "tow_pilot_id")
-    )
-    totals_rows = list(totals_qs)
-    ids_sorted = [r["tow_pilot_id"] for r in totals_rows if r["n"] >= min_total][:top_n]
+def _shape_towpilot_flights(
+    totals: Dict[int, int],
+    wday_counts: Dict[tuple, int],
+    ids_sorted: List[int],
+    *,
+    name_map: Dict[int, str] | None = None,
+) -> Dict[str, Any]:
+    """Result dict for ``towpilot_flights_by_member``."""
     if not ids_sorted:
         return {
             "names": [],
@@ -993,36 +1053,15 @@ def towpilot_flights_by_member(
             "totals": [],
             "tow_total": 0,
         }
-
-    wday_rows = (
-        qs.filter(tow_pilot_id__in=ids_sorted)
-        .annotate(wday=ExtractWeekDay(F("ops_date")))
-        .values("tow_pilot_id", "wday")
-        .annotate(n=Count("id"))
-    )
-
-    name_map = _display_name_map(ids_sorted)
-    names = [name_map.get(i, str(i)) for i in ids_sorted]
-
-    matrix = _stack_by_weekday(
-        [
-            {"member_id": r["tow_pilot_id"], "wday": r["wday"], "n": r["n"]}
-            for r in wday_rows
-        ],
-        ids_sorted,
+    names, matrix, totals_out = _weekday_stack(
+        totals, wday_counts, ids_sorted, name_map
     )
-    totals = [
-        int(next((t["n"] for t in totals_rows if t["tow_pilot_id"] == i), 0))
-        for i in ids_sorted
-    ]
-
-    tow_total = int(qs.count())
     return {
         "names": names,
         "labels": WEEKDAYS_LABELS,
         "matrix": matrix,
-        "totals": totals,
-        "tow_total": tow_total,
+        "totals": totals_out,
+        "tow_total": sum(totals.values()),
     }
 
 
@@ -1039,8 +1078,6 @@ def long_flights_by_pilot(
     Count flights with duration >= threshold_hours, grouped by pilot.
     Returns names (full_display_name), counts, and the longest flight (minutes).
     """
-    from logsheet.models import Flight
-
     qs = Flight.objects.filter(LANDED_ONLY)
     if finalized_only:
         qs = qs.filter(FINALIZED_ONLY)
@@ -1060,11 +1097,30 @@ def long_flights_by_pilot(
 
     # Counts by pilot + longest overall
     rows = list(
-        qs.values("pilot_id")
-        .annotate(n=Count("id"), longest=Max("dur"))
-        .order_by("-n", "pilot_id")
+        qs.values("pilot_id").annotate(n=Count("id"), longest=Max("dur")).order_by()
+    )
+    counts = {r["pilot_id"]: int(r["n"]) for r in rows}
+    longest_any = max((r["longest"] for r in rows), default=None)
+    return _shape_long_flights(
+        counts,
+        longest_any,
+        threshold_hours=threshold_hours,
+        min_count=min_count,
+        top_n=top_n,
     )
-    ids_ordered = [r["pilot_id"] for r in rows if r["n"] >= min_count][:top_n]
+
+
+def _shape_long_flights(
+    counts: Dict[int, int],
+    longest_any: timedelta | None,
+    *,
+    threshold_hours: float,
+    min_count: int,
+    top_n: int,
+    name_map: Dict[int, str] | None = None,
+) -> Dict[str, Any]:
+    """Result dict for ``long_flights_by_pilot``."""
+    ids_ordered = _ranked_ids(counts, minimum=min_count)[:top_n]
     if not ids_ordered:
         return {
             "names": [],
@@ -1073,18 +1129,16 @@ def long_flights_by_pilot(
             "longest_min": 0,
         }
 
-    name_map = _display_name_map(ids_ordered)
+    if name_map is None:
+        name_map = _display_name_map(ids_ordered)
     names = [name_map.get(i, str(i)) for i in ids_ordered]
-    counts = [
-        int(next((r["n"] for r in rows if r["pilot_id"] == i), 0)) for i in ids_ordered
-    ]
+    counts_out = [counts[i] for i in ids_ordered]
 
-    longest_any = qs.aggregate(m=Max("dur"))["m"]
     longest_min = int(round(longest_any.total_seconds() / 60.0)) if longest_any else 0
 
     return {
         "names": names,
-        "counts": counts,
+        "counts": counts_out,
         "threshold_hours": float(threshold_hours),
         "longest_min": longest_min,
     }
@@ -1188,18 +1242,6 @@ def time_of_day_operations(
 
     Where time_decimal represents time as decimal hours (e.g., 14.5 = 2:30 PM)
     """
-    from collections import defaultdict
-
-    from logsheet.models import Flight
-
-    qs = Flight.objects.filter(LANDED_ONLY)
-    if finalized_only:
-        qs = qs.filter(FINALIZED_ONLY)
-
-    # Filter by year range - using SQLite-compatible date functions
-    qs = qs.annotate(
-        ops_date=F("logsheet__log_date"), ops_year=ExtractYear("ops_date")
-    ).filter(ops_year__gte=start_year, ops_year__lte=end_year)
 
     def time_to_decimal(time_obj):
         """Convert time object to decimal hours"""
@@ -1207,41 +1249,32 @@ def time_of_day_operations(
             return None
         return time_obj.hour + time_obj.minute / 60.0 + time_obj.second / 3600.0
 
-    # Get all flights with their dates and times
-    flights_data = list(qs.values("ops_date", "launch_time", "landing_time"))
-
-    # Group flights by Julian day and find min/max times
-    daily_data = defaultdict(lambda: {"takeoffs": [], "landings": []})
-
-    for flight in flights_data:
-        date_obj = flight["ops_date"]
-        julian_day = date_obj.timetuple().tm_yday
-
-        if flight["launch_time"]:
-            daily_data[julian_day]["takeoffs"].append(
-                time_to_decimal(flight["launch_time"])
-            )
-        if flight["landing_time"]:
-            daily_data[julian_day]["landings"].append(
-                time_to_decimal(flight["landing_time"])
-            )
+    # Earliest launch / latest landing per ops date from the rollup
+    days_data = (
+        _rollup_years_qs(start_year, end_year, finalized_only)
+        .values("log_date")
+        .annotate(first=Min("first_launch"), last=Max("last_landing"))
+        .order_by()
+    )
 
-    # Calculate extreme points and means
-    takeoff_points = []
-    landing_points = []
-    earliest_takeoff_by_day = []
-    latest_landing_by_day = []
+    doys = []
+    takeoffs = []
+    landings = []
+    for day in days_data:
+        doys.append(day["log_date"].timetuple().tm_yday)
+        takeoffs.append(time_to_decimal(day["first"]) if day["first"] else None)
+        landings.append(time_to_decimal(day["last"]) if day["last"] else None)
+
+    # Earliest takeoff / latest landing per Julian day (1-365)
+    extremes = (
+        vectorized.daily_extremes if vectorized.available() else _daily_extremes_loops
+    )
+    earliest_takeoff_by_day, latest_landing_by_day, total_flight_days = extremes(
+        doys, takeoffs, landings
+    )
 
-    for julian_day in range(1, 366):  # 1-365
-        day_data = daily_data[julian_day]
-        if day_data["takeoffs"]:
-            earliest_takeoff = min(day_data["takeoffs"])
-            takeoff_points.append({"x": julian_day, "y": round(earliest_takeoff, 2)})
-            earliest_takeoff_by_day.append((julian_day, earliest_takeoff))
-        if day_data["landings"]:
-            latest_landing = max(day_data["landings"])
-            landing_points.append({"x": julian_day, "y": round(latest_landing, 2)})
-            latest_landing_by_day.append((julian_day, latest_landing))
+    takeoff_points = [{"x": d, "y": round(t, 2)} for d, t in earliest_takeoff_by_day]
+    landing_points = [{"x": d, "y": round(t, 2)} for d, t in latest_landing_by_day]
 
     # Compute moving average for smoothing (window=7 days)
     def moving_average(points, window=7):
@@ -1266,7 +1299,34 @@ def time_of_day_operations(
         "mean_latest_landing": mean_latest_landing,
         "start_year": start_year,
         "end_year": end_year,
-        "total_flight_days": len(
-            [day for day in daily_data.values() if day["takeoffs"] or day["landings"]]
-        ),
+        "total_flight_days": total_flight_days,
     }
+
+
+def _daily_extremes_loops(doys, takeoffs, landings):
+    """
+    Pure-Python twin of ``vectorized.daily_extremes``: returns
+    ([(day, earliest)], [(day, latest)], active_days) for days 1-365.
+    """
+    daily_data = defaultdict(lambda: {"takeoffs": [], "landings": []})
+    for julian_day, takeoff, landing in zip(doys, takeoffs, landings):
+        if takeoff is not None:
+            daily_data[julian_day]["takeoffs"].append(takeoff)
+        if landing is not None:
+            daily_data[julian_day]["landings"].append(landing)
+
+    earliest_by_day = []
+    latest_by_day = []
+    for julian_day in range(1, 366):  # 1-365
+        day_data = daily_data.get(julian_day)
+        if not day_data:
+            continue
+        if day_data["takeoffs"]:
+            earliest_by_day.append((julian_day, min(day_data["takeoffs"])))
+        if day_data["landings"]:
+            latest_by_day.append((julian_day, max(day_data["landings"])))
+
+    active_days = len(
+        [day for day in daily_data.values() if day["takeoffs"] or day["landings"]]
+    )
+    return earliest_by_day, latest_by_day, active_days
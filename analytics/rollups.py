@@ -0,0 +1,151 @@
+"""
+Maintenance of the ``DailyFlightRollup`` table.
+
+The rollup is rebuilt one logsheet at a time: delete that logsheet's rows,
+then re-aggregate its landed flights with a single GROUP BY. A logsheet holds
+one ops day of flights, so each refresh is small and the result is always
+exactly what a from-scratch aggregation would produce.
+"""
+
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, DurationField, F, Max, Min, Q, Sum
+from django.db.models.expressions import ExpressionWrapper
+from django.db.models.functions import Coalesce
+
+from logsheet.models import Flight, Logsheet
+
+from .models import DailyFlightRollup
+
+# Same definition as analytics.queries.LANDED_ONLY.
+LANDED_ONLY = Q(landing_time__isnull=False) & Q(launch_time__isnull=False)
+
+# Flight fields that feed the rollup; saves touching only other fields
+# (e.g. frozen costs at finalization) leave it unchanged.
+ROLLUP_FLIGHT_FIELDS = frozenset(
+    {
+        "logsheet",
+        "glider",
+        "pilot",
+        "instructor",
+        "tow_pilot",
+        "launch_time",
+        "landing_time",
+        "duration",
+    }
+)
+ROLLUP_LOGSHEET_FIELDS = frozenset({"log_date", "finalized"})
+
+_deferred = threading.local()
+
+
+def _aggregate_rollup_rows(flights):
+    """Yield unsaved DailyFlightRollup rows for a queryset of flights."""
+    rows = (
+        flights.filter(LANDED_ONLY)
+        .annotate(
+            dur=Coalesce(
+                F("duration"),
+                ExpressionWrapper(
+                    F("landing_time") - F("launch_time"),
+                    output_field=DurationField(),
+                ),
+            )
+        )
+        .values(
+            "logsheet_id",
+            "logsheet__log_date",
+            "logsheet__finalized",
+            "glider_id",
+            "pilot_id",
+            "instructor_id",
+            "tow_pilot_id",
+        )
+        .annotate(
+            n=Count("id"),
+            total_dur=Sum("dur"),
+            max_dur=Max("dur"),
+            first_launch=Min("launch_time"),
+            last_landing=Max("landing_time"),
+        )
+        .order_by()
+    )
+    for row in rows.iterator(chunk_size=2000):
+        yield DailyFlightRollup(
+            logsheet_id=row["logsheet_id"],
+            log_date=row["logsheet__log_date"],
+            finalized=row["logsheet__finalized"],
+            glider_id=row["glider_id"],
+            pilot_id=row["pilot_id"],
+            instructor_id=row["instructor_id"],
+            tow_pilot_id=row["tow_pilot_id"],
+            flights=row["n"],
+            total_duration=row["total_dur"] or timedelta(0),
+            max_duration=row["max_dur"],
+            first_launch=row["first_launch"],
+            last_landing=row["last_landing"],
+        )
+
+
+def refresh_logsheet_rollup(logsheet_id):
+    """
+    Rebuild the rollup rows for one logsheet.
+
+    Inside ``deferred_rollup_refresh()`` the logsheet is only queued and is
+    refreshed once when the block exits.
+    """
+    pending = getattr(_deferred, "logsheet_ids", None)
+    if pending is not None:
+        pending.add(logsheet_id)
+        return
+    with transaction.atomic():
+        DailyFlightRollup.objects.filter(logsheet_id=logsheet_id).delete()
+        DailyFlightRollup.objects.bulk_create(
+            _aggregate_rollup_rows(Flight.objects.filter(logsheet_id=logsheet_id))
+        )
+
+
+@contextmanager
+def deferred_rollup_refresh():
+    """
+    Collapse rollup refreshes for a batch of flight writes.
+
+    Bulk writers (e.g. offline flight sync) send post_save for every flight;
+    wrapping them in this block refreshes each touched logsheet once instead
+    of once per flight. Nested blocks join the outermost one.
+    """
+    if getattr(_deferred, "logsheet_ids", None) is not None:
+        yield
+        return
+    _deferred.logsheet_ids = set()
+    try:
+        yield
+        logsheet_ids = _deferred.logsheet_ids
+    finally:
+        _deferred.logsheet_ids = None
+    for logsheet_id in sorted(logsheet_ids):
+        refresh_logsheet_rollup(logsheet_id)
+
+
+def rebuild_all_rollups(batch_size=500):
+    """Rebuild the whole rollup table from Flight; returns rows written."""
+    written = 0
+    with transaction.atomic():
+        DailyFlightRollup.objects.all().delete()
+        logsheet_ids = list(
+            Logsheet.objects.order_by("log_date", "pk").values_list("pk", flat=True)
+        )
+        for i in range(0, len(logsheet_ids), batch_size):
+            rows = list(
+                _aggregate_rollup_rows(
+                    Flight.objects.filter(
+                        logsheet_id__in=logsheet_ids[i : i + batch_size]
+                    )
+                )
+            )
+            DailyFlightRollup.objects.bulk_create(rows, batch_size=1000)
+            written += len(rows)
+    return written
@@ -0,0 +1,86 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from logsheet.models import Flight, Logsheet
+
+from .dashboard import invalidate_dashboard_snapshots
+from .rollups import (
+    ROLLUP_FLIGHT_FIELDS,
+    ROLLUP_LOGSHEET_FIELDS,
+    refresh_logsheet_rollup,
+)
+
+
+def _touches(update_fields, relevant):
+    return update_fields is None or bool(set(update_fields) & relevant)
+
+
+# A flight moved to another logsheet must also leave the old logsheet's
+# rollup, so remember where it was before the save.
+@receiver(pre_save, sender=Flight)
+def remember_flight_logsheet(sender, instance, raw=False, **kwargs):
+    instance._previous_logsheet_id = None
+    if raw or instance.pk is None:
+        return
+    if not _touches(kwargs.get("update_fields"), {"logsheet"}):
+        return
+    instance._previous_logsheet_id = (
+        Flight.objects.filter(pk=instance.pk)
+        .values_list("logsheet_id", flat=True)
+        .first()
+    )
+
+
+# Keep DailyFlightRollup current when flights are added, edited or removed.
+# Raw saves (loaddata) are skipped because the logsheet row may not exist
+# yet; run `manage.py rebuild_flight_rollups` after loading fixtures.
+@receiver(post_save, sender=Flight)
+def refresh_rollup_on_flight_save(sender, instance, raw=False, **kwargs):
+    if raw or not _touches(kwargs.get("update_fields"), ROLLUP_FLIGHT_FIELDS):
+        return
+    previous_logsheet_id = getattr(instance, "_previous_logsheet_id", None)
+    if previous_logsheet_id and previous_logsheet_id != instance.logsheet_id:
+        refresh_logsheet_rollup(previous_logsheet_id)
+    refresh_logsheet_rollup(instance.logsheet_id)
+
+
+@receiver(post_delete, sender=Flight)
+def refresh_rollup_on_flight_delete(sender, instance, **kwargs):
+    # Deleting the logsheet cascades to its flights and its rollup rows.
+    if Logsheet.objects.filter(pk=instance.logsheet_id).exists():
+        refresh_logsheet_rollup(instance.logsheet_id)
+
+
+# Finalizing/unfinalizing or re-dating a logsheet changes the copied
+# log_date/finalized columns.
+@receiver(post_save, sender=Logsheet)
+def refresh_rollup_on_logsheet_save(
+    sender, instance, created=False, raw=False, **kwargs
+):
+    # A new logsheet has no flights yet, so there is nothing to roll up.
+    if created or raw:
+        return
+    if not _touches(kwargs.get("update_fields"), ROLLUP_LOGSHEET_FIELDS):
+        return
+    refresh_logsheet_rollup(instance.pk)
+
+
+# Precomputed dashboard payloads only cover finalized data by default, so
+# they are dropped when a logsheet enters or leaves the finalized set.
+@receiver(post_save, sender=Logsheet)
+def invalidate_dashboard_on_finalize(
+    sender, instance, created=False, raw=False, **kwargs
+):
+    if raw:
+        return
+    was_finalized = getattr(instance, "_was_finalized", None)
+    if (created and instance.finalized) or (
+        not created and was_finalized != instance.finalized
+    ):
+        invalidate_dashboard_snapshots()
+
+
+@receiver(post_delete, sender=Logsheet)
+def invalidate_dashboard_on_logsheet_delete(sender, instance, **kwargs):
+    if instance.finalized:
+        invalidate_dashboard_snapshots()
@@ -46,3 +46,414 @@ class TimeOfDayOperationsTestCase(TestCase):
         self.assertEqual(result["start_year"], 2025)
         self.assertEqual(result["end_year"], 2025)
         self.assertEqual(result["total_flight_days"], 0)
+
+
+class DailyFlightRollupTestCase(TestCase):
+    """The rollup table tracks flight edits and backs the dashboard queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        from logsheet.models import Airfield, Glider
+        from members.models import Member
+
+        cls.pilot = Member.objects.create_user(
+            username="rollup_pilot",
+            email="rollup_pilot@test.com",
+            password="testpass123",
+            membership_status="Full Member",
+        )
+        cls.instructor = Member.objects.create_user(
+            username="rollup_instructor",
+            email="rollup_instructor@test.com",
+            password="testpass123",
+            membership_status="Full Member",
+        )
+        cls.airfield = Airfield.objects.create(identifier="KRLP", name="Rollup Field")
+        cls.glider = Glider.objects.create(
+            make="Schleicher",
+            model="ASK-21",
+            n_number="N21RL",
+            competition_number="RL",
+            club_owned=True,
+        )
+
+    def _logsheet(self, log_date, finalized=False):
+        from logsheet.models import Logsheet
+
+        return Logsheet.objects.create(
+            log_date=log_date,
+            airfield=self.airfield,
+            created_by=self.pilot,
+            finalized=finalized,
+        )
+
+    def _flight(self, logsheet, launch, landing, instructor=None):
+        from logsheet.models import Flight
+
+        return Flight.objects.create(
+            logsheet=logsheet,
+            pilot=self.pilot,
+            instructor=instructor,
+            glider=self.glider,
+            launch_time=launch,
+            landing_time=landing,
+        )
+
+    def test_rollup_groups_landed_flights(self):
+        from datetime import date, time, timedelta
+
+        from analytics.models import DailyFlightRollup
+
+        logsheet = self._logsheet(date(2025, 6, 1))
+        self._flight(logsheet, time(10, 0), time(10, 30))
+        self._flight(logsheet, time(12, 0), time(13, 0))
+        self._flight(logsheet, time(14, 0), None)  # still flying
+
+        row = DailyFlightRollup.objects.get(logsheet=logsheet)
+        self.assertEqual(row.flights, 2)
+        self.assertEqual(row.total_duration, timedelta(minutes=90))
+        self.assertEqual(row.max_duration, timedelta(hours=1))
+        self.assertEqual(row.first_launch, time(10, 0))
+        self.assertEqual(row.last_landing, time(13, 0))
+        self.assertFalse(row.finalized)
+
+    def test_rollup_follows_edits_deletes_and_finalization(self):
+        from datetime import date, time
+
+        from analytics.models import DailyFlightRollup
+
+        logsheet = self._logsheet(date(2025, 6, 2))
+        flight = self._flight(logsheet, time(10, 0), time(10, 30))
+        other = self._flight(logsheet, time(11, 0), time(11, 20))
+
+        flight.instructor = self.instructor
+        flight.save()
+        self.assertEqual(DailyFlightRollup.objects.filter(logsheet=logsheet).count(), 2)
+
+        other.delete()
+        self.assertEqual(
+            list(
+                DailyFlightRollup.objects.filter(logsheet=logsheet).values_list(
+                    "instructor_id", "flights"
+                )
+            ),
+            [(self.instructor.pk, 1)],
+        )
+
+        logsheet.finalized = True
+        logsheet.save()
+        self.assertTrue(DailyFlightRollup.objects.get(logsheet=logsheet).finalized)
+
+        logsheet.delete()
+        self.assertFalse(DailyFlightRollup.objects.exists())
+
+    def test_queries_match_flight_counts(self):
+        from datetime import date, time
+
+        from analytics.queries import (
+            cumulative_flights_by_year,
+            instructor_flights_by_member,
+            pilot_glider_flights,
+        )
+
+        day1 = self._logsheet(date(2025, 6, 7), finalized=True)
+        day2 = self._logsheet(date(2025, 6, 8), finalized=True)
+        draft = self._logsheet(date(2025, 6, 9))
+        self._flight(day1, time(10, 0), time(10, 30), instructor=self.instructor)
+        self._flight(day1, time(11, 0), time(11, 30), instructor=self.instructor)
+        self._flight(day2, time(9, 0), time(9, 45))
+        self._flight(draft, time(9, 0), time(9, 45))
+
+        cumulative = cumulative_flights_by_year(2025, 2025)
+        self.assertEqual(cumulative["totals"], {2025: 3})
+        self.assertEqual(cumulative["ops_days"], {2025: 2})
+        self.assertEqual(cumulative["instr_counts"], {2025: 2})
+
+        solo = pilot_glider_flights(
+            date(2025, 1, 1), date(2025, 12, 31), finalized_only=False, min_flights=1
+        )
+        self.assertEqual(solo["counts"], [2])
+
+        instr = instructor_flights_by_member(date(2025, 1, 1), date(2025, 12, 31))
+        self.assertEqual(instr["inst_total"], 2)
+        self.assertEqual(instr["all_total"], 3)
+
+        tod = time_of_day_operations(2025, 2025, finalized_only=True)
+        self.assertEqual(tod["total_flight_days"], 2)
+
+    def test_moving_a_flight_refreshes_both_logsheets(self):
+        from datetime import date, time
+
+        from analytics.models import DailyFlightRollup
+
+        source = self._logsheet(date(2025, 6, 4))
+        target = self._logsheet(date(2025, 6, 5))
+        flight = self._flight(source, time(10, 0), time(10, 30))
+        self._flight(source, time(11, 0), time(11, 30))
+
+        flight.logsheet = target
+        flight.save()
+
+        self.assertEqual(DailyFlightRollup.objects.get(logsheet=source).flights, 1)
+        self.assertEqual(DailyFlightRollup.objects.get(logsheet=target).flights, 1)
+
+    def test_deferred_refresh_rebuilds_once_on_exit(self):
+        from datetime import date, time
+
+        from analytics.models import DailyFlightRollup
+        from analytics.rollups import deferred_rollup_refresh
+
+        logsheet = self._logsheet(date(2025, 6, 3))
+        with deferred_rollup_refresh():
+            self._flight(logsheet, time(10, 0), time(10, 30))
+            self._flight(logsheet, time(11, 0), time(11, 30))
+            self.assertFalse(DailyFlightRollup.objects.exists())
+
+        self.assertEqual(DailyFlightRollup.objects.get(logsheet=logsheet).flights, 2)
+
+
+class DashboardSnapshotTestCase(DailyFlightRollupTestCase):
+    """Dashboard payloads are stored once and dropped on finalize/unfinalize."""
+
+    def _payload(self, **kwargs):
+        from datetime import date
+
+        from analytics.dashboard import get_dashboard_payload
+
+        return get_dashboard_payload(
+            2025, 2025, date(2025, 1, 1), date(2025, 12, 31), True, **kwargs
+        )
+
+    def test_payload_is_served_from_snapshot(self):
+        from unittest import mock
+
+        from analytics.models import DashboardSnapshot
+
+        first = self._payload()
+        self.assertEqual(DashboardSnapshot.objects.count(), 1)
+        with mock.patch("analytics.dashboard.build_dashboard_payload") as build:
+            self.assertEqual(self._payload(), first)
+        build.assert_not_called()
+
+    def test_finalize_and_unfinalize_drop_snapshots(self):
+        from datetime import date, time
+
+        from analytics.models import DashboardSnapshot
+
+        logsheet = self._logsheet(date(2025, 7, 4))
+        self._flight(logsheet, time(10, 0), time(10, 30))
+        self.assertEqual(self._payload()["totals"], {})
+
+        logsheet.finalized = True
+        logsheet.save()
+        self.assertFalse(DashboardSnapshot.objects.exists())
+        self.assertEqual(self._payload()["totals"], {"2025": 1})
+
+        # Saving without a finalized transition keeps the snapshot.
+        logsheet.save()
+        self.assertTrue(DashboardSnapshot.objects.exists())
+
+        logsheet.finalized = False
+        logsheet.save()
+        self.assertFalse(DashboardSnapshot.objects.exists())
+
+    def test_params_ignore_junk_and_clamp_to_bounded_values(self):
+        from datetime import date
+
+        from analytics.dashboard import dashboard_params
+
+        today = date(2025, 6, 15)
+        default = dashboard_params({}, today=today)
+        self.assertEqual(
+            dashboard_params(
+                {"start": "abc", "util_end": "junk", "utm_source": "x"}, today=today
+            ),
+            default,
+        )
+        start, end, util_start, util_end, _ = dashboard_params(
+            {"start": "-5000", "end": "99999", "util_start": "0001-01-01"},
+            today=today,
+        )
+        self.assertEqual((start, end), (1925, 2025))
+        self.assertEqual(util_start, date(1925, 1, 1))
+        self.assertEqual(util_end, today)
+
+    def test_snapshot_table_is_pruned(self):
+        from datetime import date, timedelta
+        from unittest import mock
+
+        from django.utils import timezone
+
+        from analytics.dashboard import get_dashboard_payload
+        from analytics.models import DashboardSnapshot
+
+        stale = DashboardSnapshot.objects.create(
+            cache_key="stale",
+            payload={},
+            computed_at=timezone.now() - timedelta(days=1),
+        )
+        with mock.patch(
+            "analytics.dashboard.build_dashboard_payload", return_value={}
+        ), mock.patch("analytics.dashboard.DASHBOARD_SNAPSHOT_MAX_ROWS", 2):
+            for year in (2021, 2022, 2023):
+                get_dashboard_payload(
+                    year, 2025, date(2025, 1, 1), date(2025, 12, 31), True
+                )
+
+        keys = set(DashboardSnapshot.objects.values_list("cache_key", flat=True))
+        self.assertNotIn(stale.cache_key, keys)
+        self.assertEqual(len(keys), 2)
+        self.assertFalse(any(key.startswith("2021-") for key in keys))
+
+    def test_warm_command_stores_default_views(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from analytics.models import DashboardSnapshot
+
+        call_command(
+            "warm_analytics_dashboard", "--include-all-flights", stdout=StringIO()
+        )
+        self.assertEqual(
+            sorted(DashboardSnapshot.objects.values_list("finalized_only", flat=True)),
+            [False, True],
+        )
+
+
+class FlightMetricsEngineTestCase(DailyFlightRollupTestCase):
+    """The single-scan engine matches the individual query functions."""
+
+    def test_engine_matches_individual_queries(self):
+        from datetime import date, time
+
+        from analytics import queries
+        from analytics.engine import flight_metrics
+        from logsheet.models import Flight, Glider
+
+        private = Glider.objects.create(
+            make="Schempp-Hirth", model="Ventus", n_number="N2PV", club_owned=False
+        )
+        for day, finalized in ((5, True), (6, True), (12, True), (13, False)):
+            logsheet = self._logsheet(date(2025, 7, day), finalized=finalized)
+            self._flight(logsheet, time(10, 0), time(10, 40))
+            self._flight(
+                logsheet, time(11, 0), time(11, 25), instructor=self.instructor
+            )
+            Flight.objects.create(
+                logsheet=logsheet,
+                pilot=self.instructor,
+                tow_pilot=self.pilot,
+                glider=private,
+                launch_time=time(12, 0),
+                landing_time=time(15, 30),
+            )
+            Flight.objects.create(
+                logsheet=logsheet,
+                pilot=self.pilot,
+                launch_time=time(13, 0),
+                landing_time=time(13, 20),
+            )
+
+        start, end = date(2025, 1, 1), date(2025, 12, 31)
+        for finalized_only in (True, False):
+            with self.assertNumQueries(2):
+                metrics = flight_metrics(start, end, finalized_only=finalized_only)
+            kw = {"finalized_only": finalized_only}
+            self.assertEqual(
+                metrics["util"], queries.glider_utilization(start, end, top_n=12, **kw)
+            )
+            self.assertEqual(
+                metrics["util_private"],
+                queries.glider_utilization(
+                    start,
+                    end,
+                    top_n=12,
+                    fleet="private",
+                    bucket_private=False,
+                    include_unknown=False,
+                    **kw,
+                ),
+            )
+            self.assertEqual(
+                metrics["flying_days"],
+                queries.flying_days_by_member(start, end, min_days=2, **kw),
+            )
+            self.assertEqual(
+                metrics["durations"],
+                queries.flight_duration_distribution(start, end, **kw),
+            )
+            self.assertEqual(
+                metrics["pilot_glider"],
+                queries.pilot_glider_flights(start, end, min_flights=2, **kw),
+            )
+            self.assertEqual(
+                metrics["instructors"],
+                queries.instructor_flights_by_member(start, end, top_n=20, **kw),
+            )
+            self.assertEqual(
+                metrics["tow_pilots"],
+                queries.towpilot_flights_by_member(start, end, top_n=20, **kw),
+            )
+            self.assertEqual(
+                metrics["long_flights"],
+                queries.long_flights_by_pilot(
+                    start, end, threshold_hours=3.0, top_n=30, **kw
+                ),
+            )
+
+
+class VectorizedSeriesTestCase(TestCase):
+    """NumPy series builders return exactly what the Python loops return."""
+
+    def setUp(self):
+        from analytics import vectorized
+
+        if not vectorized.available():
+            self.skipTest("NumPy not installed")
+
+    def test_builders_match_python_loops(self):
+        import random
+
+        from analytics import queries, vectorized
+
+        rng = random.Random(7)
+        n = 2000
+        years = [rng.randint(2020, 2024) for _ in range(n)]
+        doys = [
+            rng.choice([1, 59, 60, 200, 365, 366, rng.randint(1, 366)])
+            for _ in range(n)
+        ]
+        counts = [rng.randint(1, 9) for _ in range(n)]
+        secs = [float(rng.randint(1, 6 * 3600)) for _ in range(n)]
+        takeoffs = [None if i % 17 == 0 else rng.uniform(8, 17) for i in range(n)]
+        landings = [None if i % 13 == 0 else rng.uniform(10, 21) for i in range(n)]
+
+        per_day = [{"y": y, "d": d, "n": c} for y, d, c in zip(years, doys, counts)]
+        self.assertEqual(
+            vectorized.cumulative_by_year(years, doys, counts, 2019, 2024),
+            queries._cumulative_by_year_loops(per_day, 2019, 2024),
+        )
+        for sample in (secs, secs[:7], secs[:400], []):
+            self.assertEqual(
+                vectorized.duration_distribution(sample),
+                queries._duration_distribution_loops(sorted(sample)),
+            )
+        self.assertEqual(
+            vectorized.daily_extremes(doys, takeoffs, landings),
+            queries._daily_extremes_loops(doys, takeoffs, landings),
+        )
+
+    def test_benchmark_reports_identical_results(self):
+        from io import StringIO
+        from unittest import mock
+
+        from analytics.vectorized_benchmark import run_benchmark
+
+        with mock.patch("sys.stdout", new_callable=StringIO) as out:
+            results = run_benchmark(n_flights=500, years=3, repeat=1)
+        self.assertEqual(
+            set(results),
+            {"cumulative_by_year", "duration_distribution", "daily_extremes"},
+        )
+        self.assertNotIn("MISMATCH", out.getvalue())
@@ -0,0 +1,119 @@
+"""
+NumPy-backed builders for the analytics series.
+
+``analytics.queries`` hands these columns as arrays (year, day-of-year,
+counts, durations in seconds, decimal hours) and gets back exactly what its
+pure-Python loops produce: ``bincount``/``cumsum`` build the 365-slot
+cumulative series, a single sort plus ``searchsorted`` builds the duration
+survival curve, and ``fmin.at``/``fmax.at`` bin launch/landing times by
+Julian day. Values that end up in the payload are rounded with Python's
+``round()`` so results match the loop versions bit for bit.
+
+NumPy is installed as an OR-Tools dependency; if it is missing,
+``available()`` is False and the callers keep their Python loops.
+"""
+
+from typing import Any, Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with ortools
+    np = None
+
+DAYS = 365  # series slots; day 366 of leap years is dropped like the loops do
+
+
+def available() -> bool:
+    return np is not None
+
+
+def cumulative_by_year(
+    years, doys, counts, start_year: int, end_year: int
+) -> Dict[int, List[int]]:
+    """
+    {year: [running total for day 1..365]} for every year in the range.
+
+    ``years``/``doys``/``counts`` are parallel columns, one entry per ops day.
+    """
+    n_years = end_year - start_year + 1
+    years = np.asarray(years, dtype=np.int64)
+    doys = np.asarray(doys, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+
+    keep = (doys >= 1) & (doys <= DAYS) & (years >= start_year) & (years <= end_year)
+    slots = (years[keep] - start_year) * DAYS + (doys[keep] - 1)
+    grid = np.bincount(slots, weights=counts[keep], minlength=n_years * DAYS)
+    running = np.cumsum(grid.reshape(n_years, DAYS), axis=1).astype(np.int64)
+    return {start_year + i: running[i].tolist() for i in range(n_years)}
+
+
+def duration_distribution(secs, *, max_points: int = 400) -> Dict[str, Any]:
+    """
+    Same result as ``queries._shape_duration_distribution`` for an array of
+    durations in seconds (non-positive and NaN entries are ignored).
+    """
+    secs = np.asarray(secs, dtype=np.float64)
+    secs = np.sort(secs[secs > 0])
+    n = int(secs.size)
+    if not n:
+        return {
+            "points": [],
+            "x_hours": [],
+            "cdf_pct": [],
+            "median_min": 0,
+            "pct_gt": {1: 0.0, 2: 0.0, 3: 0.0},
+        }
+
+    step = max(1, n // max_points)
+    ranks = np.arange(0, n, step)
+    xs = (secs[ranks] / 3600.0).tolist()
+    ys = ((n - ranks) / n * 100.0).tolist()
+    points = [{"x": round(x, 3), "y": round(y, 2)} for x, y in zip(xs, ys)]
+
+    longest_h = float(secs[-1]) / 3600.0
+    if points[-1]["x"] < longest_h:
+        points.append({"x": round(longest_h, 3), "y": round(1.0 / n * 100.0, 2)})
+
+    if n % 2 == 1:
+        mid = float(secs[n // 2])
+    else:
+        mid = 0.5 * (float(secs[n // 2 - 1]) + float(secs[n // 2]))
+    median_min = int(round(mid / 60.0))
+
+    over = np.searchsorted(secs, np.array([3600.0, 7200.0, 10800.0]), side="right")
+    pct_gt = {
+        h: round((n - int(k)) / n * 100.0, 1) for h, k in zip((1, 2, 3), over.tolist())
+    }
+
+    return {
+        "points": points,
+        "x_hours": [p["x"] for p in points],
+        "cdf_pct": [round(100.0 - p["y"], 2) for p in points],
+        "median_min": median_min,
+        "pct_gt": pct_gt,
+    }
+
+
+def daily_extremes(doys, takeoffs, landings):
+    """
+    Earliest takeoff and latest landing per Julian day.
+
+    ``takeoffs``/``landings`` are decimal hours (None where missing). Returns
+    ``([(day, earliest)], [(day, latest)], active_days)`` for days 1-365,
+    where ``active_days`` counts every day of year with any data.
+    """
+    doys = np.asarray(doys, dtype=np.int64)
+    takeoffs = np.asarray(takeoffs, dtype=np.float64)
+    landings = np.asarray(landings, dtype=np.float64)
+
+    earliest = np.full(DAYS + 2, np.nan)
+    latest = np.full(DAYS + 2, np.nan)
+    np.fmin.at(earliest, doys, takeoffs)
+    np.fmax.at(latest, doys, landings)
+    active_days = int(np.count_nonzero(~np.isnan(earliest) | ~np.isnan(latest)))
+
+    def _series(values):
+        days = np.flatnonzero(~np.isnan(values[1 : DAYS + 1])) + 1
+        return list(zip(days.tolist(), values[days].tolist()))
+
+    return _series(earliest), _series(latest), active_days
@@ -0,0 +1,94 @@
+"""Benchmark: NumPy series builders vs the pure-Python loops
+
+Times the three analytics series builders on a synthetic flight history
+(100k flights over 15 years by default) and checks that both paths return
+identical results.
+
+Usage:
+    python manage.py shell
+    >>> from analytics.vectorized_benchmark import run_benchmark
+    >>> run_benchmark()
+"""
+
+import random
+import time
+
+from analytics import queries, vectorized
+
+
+def _synthetic_history(n_flights, years, seed):
+    """Per-flight columns: year, day of year, duration (s), launch/landing hours."""
+    rng = random.Random(seed)
+    end_year = 2025
+    start_year = end_year - years + 1
+    cols = {"year": [], "doy": [], "secs": [], "launch": [], "landing": []}
+    for _ in range(n_flights):
+        cols["year"].append(rng.randint(start_year, end_year))
+        # Soaring season weighting: most flights between March and October.
+        cols["doy"].append(min(366, max(1, int(rng.gauss(190, 60)))))
+        secs = max(60, int(rng.expovariate(1 / 2400)))
+        launch = round(rng.uniform(9.0, 16.0), 4)
+        cols["secs"].append(float(secs))
+        cols["launch"].append(launch)
+        cols["landing"].append(min(23.9, launch + secs / 3600.0))
+    return start_year, end_year, cols
+
+
+def _timed(fn, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_benchmark(n_flights=100_000, years=15, seed=42, repeat=3):
+    """Run the benchmark; returns {name: (python_seconds, numpy_seconds)}."""
+    if not vectorized.available():
+        print("NumPy is not installed; nothing to compare.")
+        return {}
+
+    start_year, end_year, cols = _synthetic_history(n_flights, years, seed)
+    per_flight = [{"y": y, "d": d, "n": 1} for y, d in zip(cols["year"], cols["doy"])]
+
+    cases = {
+        "cumulative_by_year": (
+            lambda: queries._cumulative_by_year_loops(per_flight, start_year, end_year),
+            lambda: vectorized.cumulative_by_year(
+                cols["year"], cols["doy"], [1] * n_flights, start_year, end_year
+            ),
+        ),
+        "duration_distribution": (
+            lambda: queries._duration_distribution_loops(list(cols["secs"])),
+            lambda: vectorized.duration_distribution(cols["secs"]),
+        ),
+        "daily_extremes": (
+            lambda: queries._daily_extremes_loops(
+                cols["doy"], cols["launch"], cols["landing"]
+            ),
+            lambda: vectorized.daily_extremes(
+                cols["doy"], cols["launch"], cols["landing"]
+            ),
+        ),
+    }
+
+    print("=" * 70)
+    print(f"Analytics series builders: {n_flights:,} flights over {years} years")
+    print("=" * 70)
+    results = {}
+    for name, (python_fn, numpy_fn) in cases.items():
+        py_time, py_result = _timed(python_fn, repeat)
+        np_time, np_result = _timed(numpy_fn, repeat)
+        same = py_result == np_result
+        results[name] = (py_time, np_time)
+        print(
+            f"  {name:<24} python {py_time * 1000:8.1f} ms   "
+            f"numpy {np_time * 1000:8.1f} ms   "
+            f"x{py_time / np_time if np_time else float('inf'):5.1f}   "
+            f"{'identical' if same else 'MISMATCH'}"
+        )
+    print()
+    return results
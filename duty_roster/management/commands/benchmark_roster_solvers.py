@@ -0,0 +1,159 @@
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from duty_roster.ortools_benchmark import (
+    CLUB_PROFILES,
+    COMPARED_METRICS,
+    SCHEDULERS,
+    BenchmarkDatabaseInUse,
+    compare_benchmarks,
+    run_benchmark,
+)
+from duty_roster.ortools_scheduler import SolverSettings
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the legacy and OR-Tools roster generators on synthetic clubs "
+        "(all data is rolled back) and optionally compare with an earlier run"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profiles",
+            nargs="+",
+            choices=sorted(CLUB_PROFILES),
+            default=["small", "medium", "large"],
+            help="Synthetic club sizes to run (default: small medium large)",
+        )
+        parser.add_argument(
+            "--months",
+            nargs="+",
+            type=int,
+            default=[1, 3],
+            help="Range lengths in calendar months (default: 1 3)",
+        )
+        parser.add_argument(
+            "--start",
+            type=date.fromisoformat,
+            help="First day of the scheduled range, YYYY-MM-DD "
+            "(default: March 1 next year)",
+        )
+        parser.add_argument(
+            "--schedulers",
+            nargs="+",
+            choices=SCHEDULERS,
+            default=list(SCHEDULERS),
+            help="Schedulers to run (default: both)",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=10.0,
+            help="OR-Tools time limit per solve in seconds (default: 10)",
+        )
+        parser.add_argument(
+            "--search-workers",
+            type=int,
+            default=SolverSettings.num_search_workers,
+            help="CP-SAT search workers (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed for club generation and both solvers (default: 0)",
+        )
+        parser.add_argument(
+            "--no-memory",
+            action="store_true",
+            help="Skip the extra traced run that measures peak memory",
+        )
+        parser.add_argument(
+            "--allow-existing-data",
+            action="store_true",
+            help="Run even though the database already has members; every "
+            "active member stays locked until the run finishes",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file")
+        parser.add_argument(
+            "--compare",
+            metavar="BASELINE",
+            help="Earlier JSON report to compare this run against",
+        )
+
+    def handle(self, *args, **options):
+        if any(months < 1 for months in options["months"]):
+            raise CommandError("--months values must be at least 1")
+
+        baseline = None
+        if options["compare"]:
+            try:
+                with open(options["compare"]) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Cannot read baseline: {exc}") from exc
+
+        try:
+            report = run_benchmark(
+                profiles=options["profiles"],
+                month_counts=options["months"],
+                start_date=options["start"],
+                schedulers=options["schedulers"],
+                timeout_seconds=options["timeout"],
+                solver_settings=SolverSettings(
+                    num_search_workers=max(1, options["search_workers"]),
+                    random_seed=options["seed"],
+                ),
+                seed=options["seed"],
+                measure_memory=not options["no_memory"],
+                on_scenario=self._write_scenario,
+                allow_existing_data=options["allow_existing_data"],
+            )
+        except BenchmarkDatabaseInUse as exc:
+            raise CommandError(
+                f"{exc} Pass --allow-existing-data to run anyway."
+            ) from exc
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+
+        if baseline is not None:
+            self._write_comparison(compare_benchmarks(baseline, report))
+
+    def _write_scenario(self, scenario):
+        self.stdout.write(
+            f"{scenario['key']}: {scenario['profile']['members']} members, "
+            f"{scenario['start_date']}..{scenario['end_date']}"
+        )
+        for name, result in scenario["results"].items():
+            memory = result["peak_memory_kb"]
+            line = (
+                f"  {name:8} time={result['wall_time']:.2f}s "
+                f"mem={memory if memory is not None else '-'}KB "
+                f"fill={result['fill_rate']:.1f}% "
+                f"stdev={result['assignments_stdev']:.2f} "
+                f"gini={result['assignments_gini']:.3f}"
+            )
+            if result["error"]:
+                line += f" error={result['error']}"
+            self.stdout.write(line)
+
+    def _write_comparison(self, rows):
+        if not rows:
+            self.stdout.write(self.style.WARNING("No matching scenarios in baseline."))
+            return
+        self.stdout.write("\nChange vs baseline:")
+        for row in rows:
+            changes = []
+            for metric in COMPARED_METRICS:
+                change = row[metric]["change_pct"]
+                if change is not None:
+                    changes.append(f"{metric}={change:+.1f}%")
+            self.stdout.write(
+                f"  {row['scenario']} {row['scheduler']:8} " + " ".join(changes)
+            )
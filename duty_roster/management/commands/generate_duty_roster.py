@@ -1,23 +1,143 @@
+import argparse
 import calendar
+from dataclasses import replace
+from datetime import date
 
 from django.core.management.base import BaseCommand
 
+from duty_roster.ortools_scheduler import (
+    ROLLING_HORIZON_MIN_MONTHS,
+    SolverSettings,
+    extract_scheduling_data,
+    solve_roster_ortools,
+    solve_roster_rolling,
+)
 from members.models import Member
-
-from . import generate_duty_roster
+from siteconfig.models import SiteConfiguration
 
 
 class Command(BaseCommand):
-    help = "Prototype scheduler to generate a duty roster for a given month/year"
+    help = (
+        "Generate a duty roster for a given month/year with the OR-Tools scheduler "
+        "and print it with solver statistics (nothing is saved)"
+    )
 
     def add_arguments(self, parser):
         parser.add_argument("year", type=int, help="Year for duty roster")
         parser.add_argument("month", type=int, help="Month for duty roster")
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=1,
+            help="Number of calendar months to schedule (default: 1)",
+        )
+        parser.add_argument(
+            "--rolling",
+            action=argparse.BooleanOptionalAction,
+            default=None,
+            help=(
+                "Solve month by month (default: on for ranges of "
+                f"{ROLLING_HORIZON_MIN_MONTHS}+ months)"
+            ),
+        )
+        parser.add_argument(
+            "--polish-seconds",
+            type=float,
+            default=0.0,
+            help="Global polish pass after a rolling solve (default: 0, off)",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=10.0,
+            help="Solver time limit in seconds (default: 10)",
+        )
+        parser.add_argument(
+            "--search-workers",
+            type=int,
+            help="CP-SAT search workers (default: site configuration)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="CP-SAT random seed (default: site configuration)",
+        )
+        parser.add_argument(
+            "--deterministic",
+            action="store_true",
+            help="Single-thread search, for reproducing a roster with --seed",
+        )
+        parser.add_argument(
+            "--log-search",
+            action="store_true",
+            help="Print the captured CP-SAT search log",
+        )
 
     def handle(self, *args, **options):
         year = options["year"]
         month = options["month"]
-        schedule = generate_duty_roster(year, month)
+
+        solver_settings = SolverSettings.from_site_configuration(
+            SiteConfiguration.objects.first()
+        )
+        if options["search_workers"]:
+            solver_settings = replace(
+                solver_settings, num_search_workers=options["search_workers"]
+            )
+        if options["deterministic"]:
+            solver_settings = replace(solver_settings, num_search_workers=1)
+        if options["seed"] is not None:
+            solver_settings = replace(solver_settings, random_seed=options["seed"])
+        if options["log_search"]:
+            solver_settings = replace(solver_settings, log_search_progress=True)
+
+        end_year, end_month = divmod(year * 12 + month - 1 + options["months"] - 1, 12)
+        end_month += 1
+        data = extract_scheduling_data(
+            start_date=date(year, month, 1),
+            end_date=date(
+                end_year, end_month, calendar.monthrange(end_year, end_month)[1]
+            ),
+        )
+        rolling = options["rolling"]
+        if rolling is None:
+            rolling = data.month_span >= ROLLING_HORIZON_MIN_MONTHS
+
+        if rolling:
+            result = solve_roster_rolling(
+                data,
+                timeout_seconds=options["timeout"],
+                polish_seconds=options["polish_seconds"],
+                solver_settings=solver_settings,
+            )
+        else:
+            result = solve_roster_ortools(
+                data,
+                timeout_seconds=options["timeout"],
+                solver_settings=solver_settings,
+            )
+        diagnostics = result["diagnostics"]
+
+        if options["log_search"] and diagnostics.get("search_log"):
+            self.stdout.write(diagnostics["search_log"])
+
+        self.stdout.write(
+            f"Solver: status={result['status']}, "
+            f"workers={diagnostics['num_search_workers']}, "
+            f"seed={diagnostics['random_seed']}, "
+            f"wall_time={diagnostics['wall_time']:.2f}s, "
+            f"branches={diagnostics['num_branches']}, "
+            f"conflicts={diagnostics['num_conflicts']}, "
+            f"objective={result['objective_value']}, "
+            f"gap={diagnostics['objective_gap']}"
+        )
+        for window in diagnostics.get("windows", []):
+            self.stdout.write(
+                f"  Window {window['start']}..{window['end']}: "
+                f"status={window['status']}, time={window['solve_time']:.2f}s"
+            )
+
+        schedule = result["schedule"]
         if not schedule:
             self.stdout.write(self.style.ERROR("Could not generate a complete roster."))
             return
@@ -27,12 +147,15 @@ class Command(BaseCommand):
                 f"\n📆 Duty Roster for {calendar.month_name[month]} {year}:"
             )
         )
+        members = Member.objects.in_bulk(
+            {m for entry in schedule for m in entry["slots"].values() if m}
+        )
         for entry in schedule:
             day = entry["date"]
             self.stdout.write(f"\n🗓 {day.strftime('%A, %B %d')}")
             for role, member_id in entry["slots"].items():
                 if member_id:
-                    m = Member.objects.get(pk=member_id)
+                    m = members[member_id]
                     self.stdout.write(f"  - {role.title()}: {m.full_display_name}")
                 else:
                     self.stdout.write(f"  - {role.title()}: ❌ None")
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from duty_roster.models import RosterGenerationJob
+from duty_roster.utils.roster_jobs import process_roster_generation_job
+from utils.management.commands.base_cronjob import BaseCronJobCommand
+
+MAX_ATTEMPTS = 3  # Maximum retries before a job is permanently abandoned.
+
+
+class Command(BaseCronJobCommand):
+    help = "Run queued roster proposal jobs (OR-Tools solves for propose-roster)"
+    job_name = "process_roster_generation_jobs"
+    max_execution_time = timedelta(minutes=15)
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="Max jobs to process per run (default: 10)",
+        )
+
+    def execute_job(self, *args, **options):
+        limit = options.get("limit", 10)
+        stale_cutoff = timezone.now() - self.max_execution_time
+
+        recovered_count = (
+            RosterGenerationJob.objects.filter(
+                status=RosterGenerationJob.STATUS_PROCESSING,
+            )
+            .filter(Q(started_at__isnull=True) | Q(started_at__lt=stale_cutoff))
+            .update(
+                status=RosterGenerationJob.STATUS_FAILED,
+                last_error=(
+                    "Marked failed for retry after stale processing timeout in "
+                    "process_roster_generation_jobs."
+                ),
+                completed_at=timezone.now(),
+            )
+        )
+        if recovered_count:
+            self.log_info(f"Recovered {recovered_count} stale roster job(s).")
+
+        job_ids = list(
+            RosterGenerationJob.objects.filter(
+                status__in=[
+                    RosterGenerationJob.STATUS_PENDING,
+                    RosterGenerationJob.STATUS_FAILED,
+                ],
+                attempt_count__lt=MAX_ATTEMPTS,
+            )
+            .order_by("queued_at")
+            .values_list("id", flat=True)[:limit]
+        )
+
+        if not job_ids:
+            self.log_info("No pending roster generation jobs.")
+            return
+
+        self.log_info(f"Processing {len(job_ids)} roster generation job(s).")
+
+        for job_id in job_ids:
+            process_roster_generation_job(job_id)
+
+        self.log_success("Finished processing roster generation jobs.")
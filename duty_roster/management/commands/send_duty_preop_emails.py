@@ -15,13 +15,17 @@ members with ops intent, and confirmed reservation participants) receive their o
 dedicated participant email with a generic Flying Day ICS.
 """
 
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import get_connection
 from django.core.management.base import BaseCommand
 from django.db.models import Q
-from django.template.loader import render_to_string
+from django.template.loader import get_template
 
 from duty_roster.models import (
     DutyAssignment,
@@ -34,9 +38,25 @@ from logsheet.models import MaintenanceDeadline, MaintenanceIssue
 from siteconfig.models import SiteConfiguration
 from siteconfig.timezone_utils import get_club_today
 from siteconfig.utils import get_role_title
-from utils.email import enforce_noreply_from_email, get_dev_mode_info
+from utils.email import (
+    DevModeEmailMultiAlternatives,
+    enforce_noreply_from_email,
+    get_dev_mode_info,
+)
 from utils.url_helpers import build_absolute_url, get_canonical_url
 
+logger = logging.getLogger(__name__)
+
+# (assignment field, role key) for every crew position, in email order.
+CREW_ROLES = (
+    ("instructor", "instructor"),
+    ("surge_instructor", "surge_instructor"),
+    ("tow_pilot", "towpilot"),
+    ("surge_tow_pilot", "surge_towpilot"),
+    ("duty_officer", "duty_officer"),
+    ("assistant_duty_officer", "assistant_duty_officer"),
+)
+
 
 class Command(BaseCommand):
     help = "Send pre-op duty email showing grounded aircraft, students, and upcoming maintenance"
@@ -45,6 +65,13 @@ class Command(BaseCommand):
         parser.add_argument(
             "--date", type=str, help="Target date for pre-op report (YYYY-MM-DD)"
         )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Parallel mail connections to send over (default: 1, a single "
+            "reused connection)",
+        )
 
     def handle(self, *args, **options):
         # Show dev mode status
@@ -80,69 +107,75 @@ class Command(BaseCommand):
             self.style.NOTICE(f"Generating pre-op report for {target_date}")
         )
 
-        # Get the duty assignment — send for both regular scheduled days and
-        # confirmed ad-hoc days (is_scheduled=False, is_confirmed=True).
-        # Unconfirmed ad-hoc days (is_confirmed=False) are excluded.
-        try:
-            assignment = DutyAssignment.objects.get(
-                Q(date=target_date)
-                & (Q(is_scheduled=True) | Q(is_scheduled=False, is_confirmed=True))
-            )
-        except DutyAssignment.DoesNotExist:
-            self.stdout.write(
-                "No ops for this date (no scheduled or confirmed ad-hoc assignment found)."
+        timings = {}
+
+        # Phase 1: load the assignment, its crew and everything the report
+        # shows. Querysets are evaluated here, once, and shared by both
+        # template variants and the participant list.
+        with self._timed(timings, "load"):
+            # Send for both regular scheduled days and confirmed ad-hoc days
+            # (is_scheduled=False, is_confirmed=True). Unconfirmed ad-hoc days
+            # (is_confirmed=False) are excluded.
+            assignment = (
+                DutyAssignment.objects.filter(
+                    Q(date=target_date)
+                    & (Q(is_scheduled=True) | Q(is_scheduled=False, is_confirmed=True))
+                )
+                .select_related(*(field for field, _ in CREW_ROLES))
+                .first()
             )
-            return
+            if assignment is None:
+                self.stdout.write(
+                    "No ops for this date (no scheduled or confirmed ad-hoc assignment found)."
+                )
+                return
 
-        # Build crew list with role information for personalized emails
-        crew_with_roles = self._get_crew_with_roles(assignment)
+            role_titles = {
+                role_key: get_role_title(role_key) for _, role_key in CREW_ROLES
+            }
 
-        if not crew_with_roles:
-            self.stdout.write(
-                self.style.WARNING(
-                    "No valid email addresses for duty crew. Email not sent."
+            # Build crew list with role information for personalized emails
+            crew_with_roles = self._get_crew_with_roles(assignment, role_titles)
+            if not crew_with_roles:
+                self.stdout.write(
+                    self.style.WARNING(
+                        "No valid email addresses for duty crew. Email not sent."
+                    )
                 )
-            )
-            return
-
-        # Get site configuration
-        config = SiteConfiguration.objects.first()
-        site_url = get_canonical_url()
+                return
 
-        # Build context for templates
-        context = self._build_context(assignment, target_date, config, site_url)
+            config = SiteConfiguration.objects.first()
+            site_url = get_canonical_url()
+            context = self._build_context(
+                assignment, target_date, config, site_url, role_titles
+            )
+            participant_emails = self._get_participant_emails(context, crew_with_roles)
 
-        # Collect participant recipient emails from students, ops intent members,
-        # and confirmed glider reservations.
-        crew_emails = [member.email for member, _ in crew_with_roles]
-        participant_emails = []
-        for slot in context.get("instruction_requests", []):
-            if slot.student and slot.student.email:
-                participant_emails.append(slot.student.email)
-        for intent in context.get("ops_intents", []):
-            if intent.member and intent.member.email:
-                participant_emails.append(intent.member.email)
-        for reservation in context.get("reservations", []):
-            if reservation.member and reservation.member.email:
-                participant_emails.append(reservation.member.email)
-        # Remove duplicates and any emails already in crew_emails
-        participant_emails = sorted(set(participant_emails) - set(crew_emails))
-
-        # Render templates — two variants: crew (default) and participant.
-        # Participant emails use the same template but with is_participant=True
-        # so the greeting and reminder wording is appropriate for non-crew members.
-        html_message = render_to_string("duty_roster/emails/preop_email.html", context)
-        text_message = render_to_string("duty_roster/emails/preop_email.txt", context)
-        participant_context = {**context, "is_participant": True}
-        participant_html_message = render_to_string(
-            "duty_roster/emails/preop_email.html", participant_context
-        )
-        participant_text_message = render_to_string(
-            "duty_roster/emails/preop_email.txt", participant_context
-        )
+        dev_mode, redirect_list = get_dev_mode_info()
+        if dev_mode and not redirect_list:
+            self.stderr.write(
+                self.style.ERROR(
+                    "DEV MODE is enabled but redirect_list is empty. "
+                    "Skipping all pre-op emails for safety."
+                )
+            )
+            return
 
-        # Normalize sender via shared helper so this direct EmailMultiAlternatives
-        # path stays consistent with utils.email.send_mail callers.
+        # Phase 2: render each template variant once from the compiled
+        # templates — crew (default) and participant. Participant emails use
+        # is_participant=True so the greeting and reminder wording is
+        # appropriate for non-crew members.
+        with self._timed(timings, "render"):
+            html_template = get_template("duty_roster/emails/preop_email.html")
+            text_template = get_template("duty_roster/emails/preop_email.txt")
+            html_message = html_template.render(context)
+            text_message = text_template.render(context)
+            participant_context = {**context, "is_participant": True}
+            participant_html_message = html_template.render(participant_context)
+            participant_text_message = text_template.render(participant_context)
+
+        # Normalize sender via shared helper so this direct email path stays
+        # consistent with utils.email.send_mail callers.
         default_from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "")
         from_email = enforce_noreply_from_email(
             default_from_email
@@ -151,115 +184,126 @@ class Command(BaseCommand):
                 f"noreply@{config.domain_name}" if config and config.domain_name else ""
             )
         )
-
         subject = f"Pre-Ops Report for {target_date}"
 
-        # Check dev mode
-        dev_mode, redirect_list = get_dev_mode_info()
-
-        try:
-            # Send individual emails to each crew member with personalized ICS attachment
+        # Phase 3: build every message with its ICS attachment. Crew members
+        # get a personalized ICS for their role; participants (students, ops
+        # intent members, reservation holders) share one generic Flying Day
+        # ICS rather than a crew-role ICS that would show someone else's name.
+        outgoing = []
+        with self._timed(timings, "build"):
             for member, role_title in crew_with_roles:
-                if not member.email:
-                    continue
-
-                # Generate ICS for this crew member's duty
                 ics_content = generate_preop_ics(assignment, member, role_title)
                 # Fallback to "crew" if role_title is None
                 role_slug = (role_title or "Crew").lower().replace(" ", "-")
-                ics_filename = f"duty-{target_date.isoformat()}-{role_slug}.ics"
-
-                # Create email with attachment — no CC here; participants
-                # receive their own dedicated email (see below).
-                email = EmailMultiAlternatives(
+                email = DevModeEmailMultiAlternatives(
                     subject=subject,
                     body=text_message,
                     from_email=from_email,
                     to=[member.email],
                 )
                 email.attach_alternative(html_message, "text/html")
-                email.attach(ics_filename, ics_content, "text/calendar")
-
-                # Apply dev mode if enabled
-                if dev_mode and redirect_list:
-                    email.subject = f"[DEV MODE] {subject} (TO: {member.email})"
-                    email.to = redirect_list
-                elif dev_mode and not redirect_list:
-                    self.stderr.write(
-                        self.style.ERROR(
-                            f"DEV MODE is enabled but redirect_list is empty. Skipping email to {member.email} ({role_title}) for safety."
-                        )
-                    )
-                    continue
-
-                email.send(fail_silently=False)
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"Email sent to {member.email} ({role_title}) with ICS attachment"
-                    )
+                email.attach(
+                    f"duty-{target_date.isoformat()}-{role_slug}.ics",
+                    ics_content,
+                    "text/calendar",
+                )
+                outgoing.append(
+                    (email, f"{member.email} ({role_title}) with ICS attachment")
                 )
 
-            # Send a dedicated email to each participant recipient (students, ops intent
-            # members) with a generic "Flying Day" ICS rather than a crew-role
-            # ICS that would show someone else's name.
-            ics_flying_day = generate_ops_day_ics(target_date)
-            ics_flying_filename = f"flying-day-{target_date.isoformat()}.ics"
+            if participant_emails:
+                ics_flying_day = generate_ops_day_ics(target_date)
+                ics_flying_filename = f"flying-day-{target_date.isoformat()}.ics"
             for participant_email in participant_emails:
-                participant_email_obj = EmailMultiAlternatives(
+                email = DevModeEmailMultiAlternatives(
                     subject=subject,
                     body=participant_text_message,
                     from_email=from_email,
                     to=[participant_email],
                 )
-                participant_email_obj.attach_alternative(
-                    participant_html_message, "text/html"
-                )
-                participant_email_obj.attach(
-                    ics_flying_filename, ics_flying_day, "text/calendar"
+                email.attach_alternative(participant_html_message, "text/html")
+                email.attach(ics_flying_filename, ics_flying_day, "text/calendar")
+                outgoing.append(
+                    (email, f"participant {participant_email} with flying day ICS")
                 )
 
-                if dev_mode and redirect_list:
-                    participant_email_obj.subject = (
-                        f"[DEV MODE] {subject} (TO: {participant_email})"
-                    )
-                    participant_email_obj.to = redirect_list
-                elif dev_mode and not redirect_list:
-                    self.stderr.write(
-                        self.style.ERROR(
-                            f"DEV MODE is enabled but redirect_list is empty. Skipping participant email to {participant_email} for safety."
-                        )
-                    )
-                    continue
-
-                participant_email_obj.send(fail_silently=False)
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"Email sent to participant {participant_email} with flying day ICS"
-                    )
+        # Phase 4: send over reused connections.
+        try:
+            with self._timed(timings, "send"):
+                self._send_messages(
+                    [email for email, _ in outgoing], options["concurrency"]
                 )
-
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"Failed to send email: {e}"))
             raise
+        finally:
+            logger.info(
+                "Pre-op emails for %s: %d messages; %s",
+                target_date,
+                len(outgoing),
+                ", ".join(
+                    f"{phase}={seconds:.3f}s" for phase, seconds in timings.items()
+                ),
+            )
 
-    def _get_crew_with_roles(self, assignment):
+        for _, description in outgoing:
+            self.stdout.write(self.style.SUCCESS(f"Email sent to {description}"))
+
+    @contextmanager
+    def _timed(self, timings, phase):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[phase] = time.perf_counter() - started
+
+    def _send_messages(self, messages, concurrency):
+        """
+        Send messages over at most ``concurrency`` connections, each opened
+        once and reused for its whole share of the batch.
+        """
+        concurrency = max(1, min(concurrency, len(messages)))
+        chunks = [messages[i::concurrency] for i in range(concurrency)]
+
+        def send_chunk(chunk):
+            with get_connection(fail_silently=False) as connection:
+                return connection.send_messages(chunk)
+
+        if len(chunks) == 1:
+            return send_chunk(chunks[0])
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            return sum(executor.map(send_chunk, chunks))
+
+    def _get_crew_with_roles(self, assignment, role_titles):
         """Get list of (member, role_title) tuples for crew members with emails."""
         crew_roles = [
-            (assignment.instructor, get_role_title("instructor")),
-            (assignment.surge_instructor, get_role_title("surge_instructor")),
-            (assignment.tow_pilot, get_role_title("towpilot")),
-            (assignment.surge_tow_pilot, get_role_title("surge_towpilot")),
-            (assignment.duty_officer, get_role_title("duty_officer")),
-            (
-                assignment.assistant_duty_officer,
-                get_role_title("assistant_duty_officer"),
-            ),
+            (getattr(assignment, field), role_titles[role_key])
+            for field, role_key in CREW_ROLES
         ]
         return [
             (member, role) for member, role in crew_roles if member and member.email
         ]
 
-    def _build_context(self, assignment, target_date, config, site_url):
+    def _get_participant_emails(self, context, crew_with_roles):
+        """
+        Emails of students, ops intent members and confirmed reservation
+        holders who are not already crew.
+        """
+        crew_emails = {member.email for member, _ in crew_with_roles}
+        participant_emails = set()
+        for slot in context["instruction_requests"]:
+            if slot.student and slot.student.email:
+                participant_emails.add(slot.student.email)
+        for intent in context["ops_intents"]:
+            if intent.member and intent.member.email:
+                participant_emails.add(intent.member.email)
+        for reservation in context["reservations"]:
+            if reservation.member and reservation.member.email:
+                participant_emails.add(reservation.member.email)
+        return sorted(participant_emails - crew_emails)
+
+    def _build_context(self, assignment, target_date, config, site_url, role_titles):
         """Build the template context with all required data."""
 
         # Get grounded aircraft
@@ -328,21 +372,16 @@ class Command(BaseCommand):
             "duty_officer": assignment.duty_officer,
             "assistant_duty_officer": assignment.assistant_duty_officer,
             # Role titles
-            "instructor_title": get_role_title("instructor"),
-            "surge_instructor_title": get_role_title("surge_instructor"),
-            "towpilot_title": get_role_title("towpilot"),
-            "surge_towpilot_title": get_role_title("surge_towpilot"),
-            "duty_officer_title": get_role_title("duty_officer"),
-            "assistant_duty_officer_title": get_role_title("assistant_duty_officer"),
+            **{f"{role_key}_title": title for role_key, title in role_titles.items()},
             # Students and members
-            "instruction_requests": instruction_requests,
-            "ops_intents": ops_intents,
-            "reservations": reservations,
+            "instruction_requests": list(instruction_requests),
+            "ops_intents": list(ops_intents),
+            "reservations": list(reservations),
             # Maintenance
-            "grounded_gliders": grounded_gliders,
-            "grounded_towplanes": grounded_towplanes,
-            "expired_deadlines": expired_deadlines,
-            "upcoming_deadlines": upcoming_deadlines,
+            "grounded_gliders": list(grounded_gliders),
+            "grounded_towplanes": list(grounded_towplanes),
+            "expired_deadlines": list(expired_deadlines),
+            "upcoming_deadlines": list(upcoming_deadlines),
         }
 
         return context
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.16 on 2026-10-16 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("duty_roster", "0017_roster_generation_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rostergenerationjob",
+            name="hint_schedule",
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name="rostergenerationjob",
+            name="locked_schedule",
+            field=models.JSONField(default=list),
+        ),
+    ]
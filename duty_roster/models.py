@@ -6,6 +6,7 @@ from bleach.css_sanitizer import CSSSanitizer
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models.functions import Now
 from django.utils import timezone
 from tinymce.models import HTMLField
 
@@ -1379,3 +1380,93 @@ class GliderReservation(models.Model):
         """Mark this reservation as no-show (member didn't show up)."""
         self.status = "no_show"
         self.save()
+
+
+class RosterGenerationJob(models.Model):
+    """
+    Durable queue record for an asynchronous roster proposal.
+
+    The propose-roster page enqueues a job instead of running the solver in
+    the request; ``process_roster_generation_jobs`` runs it, publishing solver
+    progress (best objective, solutions found, elapsed time) as it goes, and
+    stores the finished draft in ``result`` so reloading the page is instant.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_READY = "ready"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_PROCESSING, "Processing"),
+        (STATUS_READY, "Ready"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    requested_by = models.ForeignKey(
+        Member,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="roster_generation_jobs",
+    )
+    start_date = models.DateField()
+    end_date = models.DateField()
+    roles = models.JSONField(default=list)
+    # ISO date strings the rostermeister removed from the draft.
+    exclude_dates = models.JSONField(default=list)
+    # Warm start: previous proposal/accepted roster in the session draft format,
+    # and the hand-picked slots the solver must keep.
+    hint_schedule = models.JSONField(default=list)
+    locked_schedule = models.JSONField(default=list)
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        db_index=True,
+    )
+    attempt_count = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    best_objective = models.FloatField(null=True, blank=True)
+    solutions_found = models.PositiveIntegerField(default=0)
+    elapsed_seconds = models.FloatField(null=True, blank=True)
+    progress_updated_at = models.DateTimeField(null=True, blank=True)
+    # Draft entries in the session format: [{"date", "slots", "diagnostics"}].
+    result = models.JSONField(null=True, blank=True)
+    incomplete = models.BooleanField(default=False)
+    queued_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["queued_at"]
+
+    def __str__(self):
+        return (
+            f"RosterGenerationJob({self.start_date}..{self.end_date}, "
+            f"status={self.status})"
+        )
+
+    @property
+    def is_active(self):
+        return self.status in (self.STATUS_PENDING, self.STATUS_PROCESSING)
+
+
+class CalendarChange(models.Model):
+    """
+    One entry of the duty calendar change feed (``utils/calendar_cache.py``).
+
+    Open calendars poll for entries after the id they last saw and re-fetch
+    only those days. A null ``day`` means every month changed (role labels,
+    site configuration, member names) and clients reload in full. Entries are
+    pruned after ``CALENDAR_CHANGE_RETENTION``.
+    """
+
+    day = models.DateField(null=True, blank=True, db_index=True)
+    changed_at = models.DateTimeField(db_default=Now(), db_index=True)
+
+    class Meta:
+        ordering = ["pk"]
+
+    def __str__(self):
+        return f"CalendarChange({self.day or 'all'} @ {self.changed_at:%Y-%m-%d %H:%M})"
@@ -1,96 +1,482 @@
-"""Benchmark: OR-Tools vs Current Greedy Algorithm
+"""Benchmark: OR-Tools vs legacy roster generation on synthetic clubs.
 
-This script compares the performance and solution quality of the OR-Tools
-CP-SAT solver against the current greedy algorithm for duty roster generation.
+Builds a synthetic club (members, role mix, duty preferences, blackouts,
+pairings and avoidances) inside a transaction that is always rolled back,
+runs both schedulers over the requested range and records wall time, peak
+Python memory, slot fill rate and fairness metrics. Results are plain
+JSON-serialisable dicts so runs can be saved and compared across commits.
+
+The run deactivates every existing member and rewrites the site
+configuration inside that transaction, holding their row locks until the
+solves finish, so it refuses to run against a database that already has
+members unless ``allow_existing_data`` is passed.
 
 Usage:
+    python manage.py benchmark_roster_solvers --output bench.json
+    python manage.py benchmark_roster_solvers --compare bench.json
+
     python manage.py shell
     >>> from duty_roster.ortools_benchmark import run_benchmark
-    >>> run_benchmark()
+    >>> run_benchmark(profiles=["small"], month_counts=[1])
 """
 
+import calendar
+import platform
+import random
+import statistics
+import subprocess
 import time
-from datetime import date
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from duty_roster.models import (
+    DutyAvoidance,
+    DutyPairing,
+    DutyPreference,
+    MemberBlackout,
+)
+from duty_roster.ortools_scheduler import SolverSettings, generate_roster_ortools
+from duty_roster.roster_generator import (
+    _generate_roster_legacy,
+    clear_operational_season_cache,
+)
+from members.constants.membership import DEFAULT_ROLES
+from members.models import Member
+from siteconfig.models import SiteConfiguration
+
+SCHEDULERS = ("legacy", "ortools")
+
+
+class BenchmarkDatabaseInUse(Exception):
+    """The benchmark was pointed at a database that already holds members."""
+
+
+def check_benchmark_database(allow_existing_data: bool = False) -> None:
+    """Raise BenchmarkDatabaseInUse unless the database has no members."""
+    if not allow_existing_data and Member.objects.exists():
+        raise BenchmarkDatabaseInUse(
+            "The database already has members. The benchmark locks every "
+            "active member and the site configuration for the whole run, so "
+            "use an empty or test database."
+        )
+
+
+@dataclass
+class ClubProfile:
+    """Shape of a synthetic club used for benchmarking."""
+
+    name: str
+    members: int
+    # Fraction of members flagged for each role.
+    role_mix: dict[str, float]
+    # Chance that a member blacks out any given weekend day.
+    blackout_rate: float = 0.15
+    # Pairings and avoidances per member.
+    pairing_rate: float = 0.05
+    avoidance_rate: float = 0.03
+    # Share of members with "don't schedule" or suspended scheduling.
+    unavailable_rate: float = 0.05
+    max_assignments_choices: tuple[int, ...] = (1, 2, 2, 3, 4)
+
 
-from duty_roster.ortools_poc import ScheduleProblem, SimpleMember, create_sample_problem
+CLUB_PROFILES = {
+    "small": ClubProfile(
+        name="small",
+        members=50,
+        role_mix={
+            "instructor": 0.20,
+            "duty_officer": 0.30,
+            "assistant_duty_officer": 0.40,
+            "towpilot": 0.12,
+        },
+    ),
+    "medium": ClubProfile(
+        name="medium",
+        members=150,
+        role_mix={
+            "instructor": 0.12,
+            "duty_officer": 0.25,
+            "assistant_duty_officer": 0.35,
+            "towpilot": 0.10,
+        },
+        blackout_rate=0.20,
+    ),
+    "large": ClubProfile(
+        name="large",
+        members=400,
+        role_mix={
+            "instructor": 0.08,
+            "duty_officer": 0.15,
+            "assistant_duty_officer": 0.30,
+            "towpilot": 0.06,
+        },
+        blackout_rate=0.25,
+        pairing_rate=0.08,
+        avoidance_rate=0.05,
+    ),
+}
 
 
-def run_benchmark():
-    """Run benchmark comparing OR-Tools vs current algorithm."""
-    print("=" * 70)
-    print("Duty Roster Scheduling Benchmark")
-    print("=" * 70)
-    print()
+@dataclass
+class BenchmarkScenario:
+    profile: ClubProfile
+    start_date: date
+    end_date: date
+    months: int
+    roles: list[str] = field(default_factory=lambda: list(DEFAULT_ROLES))
 
-    # Test with sample problem from POC
-    members, dates, roles, blackouts = create_sample_problem()
+    @property
+    def key(self) -> str:
+        return f"{self.profile.name}-{self.months}m"
 
-    print("Benchmark 1: Simple Problem (4 dates, 3 roles, 5 members)")
-    print("-" * 70)
-    print()
 
-    # Test OR-Tools
-    print("Testing OR-Tools CP-SAT Solver...")
-    problem = ScheduleProblem(members, dates, roles, blackouts)
-    problem.add_constraints()
-    problem.set_objective()
+def month_range(start: date, months: int) -> tuple[date, date]:
+    """First and last day of a run of ``months`` calendar months."""
+    end_year, end_month = divmod(start.year * 12 + start.month - 1 + months - 1, 12)
+    end_month += 1
+    return (
+        start.replace(day=1),
+        date(end_year, end_month, calendar.monthrange(end_year, end_month)[1]),
+    )
+
+
+def build_synthetic_club(
+    profile: ClubProfile, start_date: date, end_date: date, rng: random.Random
+) -> list[Member]:
+    """
+    Create a synthetic club's members and scheduling constraints.
+
+    Existing members are deactivated so only the synthetic club is scheduled;
+    callers must run this inside a transaction that is rolled back.
+    """
+    Member.objects.filter(is_active=True).update(is_active=False)
 
-    start = time.time()
-    status, ortools_solution = problem.solve()
-    ortools_time = time.time() - start
+    members = []
+    for i in range(profile.members):
+        flags = {role: rng.random() < share for role, share in profile.role_mix.items()}
+        members.append(
+            Member(
+                username=f"bench_{profile.name}_{i}",
+                first_name="Bench",
+                last_name=f"Member{i:03d}",
+                email=f"bench_{profile.name}_{i}@example.invalid",
+                membership_status="Full Member",
+                is_active=True,
+                **flags,
+            )
+        )
+    members = Member.objects.bulk_create(members)
 
-    ortools_assigned = sum(
-        len(day_assignments)
-        for day_assignments in ortools_solution["assignments"].values()
+    preferences = []
+    for member in members:
+        unavailable = rng.random() < profile.unavailable_rate
+        preferences.append(
+            DutyPreference(
+                member=member,
+                dont_schedule=unavailable and rng.random() < 0.5,
+                scheduling_suspended=unavailable,
+                last_duty_date=start_date - timedelta(days=rng.randint(7, 180)),
+                instructor_percent=rng.choice((0, 25, 50, 100)),
+                duty_officer_percent=rng.choice((0, 50, 100)),
+                ado_percent=rng.choice((0, 50, 100)),
+                towpilot_percent=rng.choice((0, 50, 100)),
+                max_assignments_per_month=rng.choice(profile.max_assignments_choices),
+                allow_weekend_double=rng.random() < 0.2,
+            )
+        )
+    DutyPreference.objects.bulk_create(preferences)
+
+    weekend_days = [
+        start_date + timedelta(days=offset)
+        for offset in range((end_date - start_date).days + 1)
+        if (start_date + timedelta(days=offset)).weekday() >= 5
+    ]
+    MemberBlackout.objects.bulk_create(
+        MemberBlackout(member=member, date=day)
+        for member in members
+        for day in weekend_days
+        if rng.random() < profile.blackout_rate
     )
-    ortools_slots = len(dates) * len(roles)
-
-    print(f"  Status: {status}")
-    print(f"  Time: {ortools_time:.4f} seconds")
-    print(f"  Slots filled: {ortools_assigned}/{ortools_slots}")
-    print(f"  Fill rate: {100 * ortools_assigned / ortools_slots:.1f}%")
-    print()
-
-    # Note: Can't easily test current algorithm with SimpleMember mock data
-    # Would need to create actual Django Member objects in database
-    print("Testing Current Greedy Algorithm...")
-    print("  ⚠️  Skipped - requires real Member objects in database")
-    print("  (Current algorithm can be tested manually with real data)")
-    print()
-
-    print("-" * 70)
-    print()
-
-    # Summary
-    print("Summary:")
-    print()
-    print("OR-Tools Solver:")
-    print(f"  ✓ Solved in {ortools_time:.4f} seconds")
-    print(f"  ✓ Found {status.lower()} solution")
-    print(f"  ✓ {ortools_assigned}/{ortools_slots} slots filled")
-    print()
-    print("Key Observations:")
-    print("  • OR-Tools solver is very fast (<0.05 seconds)")
-    print("  • Guarantees optimality (or proves infeasibility)")
-    print("  • Declarative constraint formulation is clean")
-    print("  • Can handle complex constraints easily")
-    print()
-    print("Next Steps:")
-    print("  1. Test with real Django Member data")
-    print("  2. Add more complex constraints (avoidances, pairings)")
-    print("  3. Tune objective function for better distribution")
-    print("  4. Compare solution quality over multiple months")
-    print()
 
+    def random_pairs(rate):
+        pairs = set()
+        for _ in range(int(len(members) * rate)):
+            a, b = rng.sample(members, 2)
+            pairs.add((a, b))
+        return pairs
+
+    DutyPairing.objects.bulk_create(
+        DutyPairing(member=a, pair_with=b)
+        for a, b in random_pairs(profile.pairing_rate)
+    )
+    DutyAvoidance.objects.bulk_create(
+        DutyAvoidance(member=a, avoid_with=b)
+        for a, b in random_pairs(profile.avoidance_rate)
+    )
+    return members
+
+
+def schedule_metrics(schedule, roles, pool_ids) -> dict:
+    """
+    Fill rate and fairness of a generated schedule.
+
+    Fairness is measured over ``pool_ids`` (members who could be scheduled),
+    counting members who received no duty at all.
+    """
+    total_slots = len(schedule) * len(roles)
+    counts = dict.fromkeys(pool_ids, 0)
+    filled = 0
+    filled_by_role = dict.fromkeys(roles, 0)
+    for entry in schedule:
+        for role in roles:
+            member_id = entry["slots"].get(role)
+            if member_id is None:
+                continue
+            filled += 1
+            filled_by_role[role] += 1
+            counts[member_id] = counts.get(member_id, 0) + 1
+
+    values = sorted(counts.values())
+    mean = statistics.fmean(values) if values else 0.0
+    gini = 0.0
+    if values and sum(values):
+        weighted = sum((i + 1) * v for i, v in enumerate(values))
+        gini = (2 * weighted) / (len(values) * sum(values)) - (len(values) + 1) / len(
+            values
+        )
     return {
-        "ortools": {
-            "time": ortools_time,
-            "status": status,
-            "filled": ortools_assigned,
-            "total": ortools_slots,
-        }
+        "duty_days": len(schedule),
+        "total_slots": total_slots,
+        "filled_slots": filled,
+        "fill_rate": round(100 * filled / total_slots, 2) if total_slots else 0.0,
+        "fill_rate_by_role": {
+            role: round(100 * count / len(schedule), 2) if schedule else 0.0
+            for role, count in filled_by_role.items()
+        },
+        "members_assigned": sum(1 for v in values if v),
+        "assignments_mean": round(mean, 3),
+        "assignments_stdev": round(statistics.pstdev(values), 3) if values else 0.0,
+        "assignments_spread": (values[-1] - values[0]) if values else 0,
+        "assignments_gini": round(gini, 4),
     }
 
 
-if __name__ == "__main__":
-    run_benchmark()
+def _run_scheduler(name, scenario, timeout_seconds, solver_settings, seed):
+    if name == "legacy":
+        random.seed(seed)
+        return _generate_roster_legacy(
+            roles=scenario.roles,
+            start_date=scenario.start_date,
+            end_date=scenario.end_date,
+        )
+    return generate_roster_ortools(
+        roles=scenario.roles,
+        start_date=scenario.start_date,
+        end_date=scenario.end_date,
+        timeout_seconds=timeout_seconds,
+        solver_settings=solver_settings,
+    )
+
+
+def _measure(name, scenario, timeout_seconds, solver_settings, seed, measure_memory):
+    result = {"error": None, "peak_memory_kb": None}
+    started = time.perf_counter()
+    try:
+        schedule = _run_scheduler(
+            name, scenario, timeout_seconds, solver_settings, seed
+        )
+    except Exception as exc:  # Failures are part of the benchmark result.
+        result["error"] = str(exc)
+        schedule = []
+    result["wall_time"] = round(time.perf_counter() - started, 4)
+
+    # tracemalloc slows Python code down, so memory is measured on a
+    # separate run to keep wall times comparable.
+    if measure_memory and result["error"] is None:
+        tracemalloc.start()
+        try:
+            _run_scheduler(name, scenario, timeout_seconds, solver_settings, seed)
+            result["peak_memory_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+        except Exception:
+            pass
+        finally:
+            tracemalloc.stop()
+    return result, schedule
+
+
+def run_scenario(
+    scenario: BenchmarkScenario,
+    *,
+    schedulers=SCHEDULERS,
+    timeout_seconds: float = 10.0,
+    solver_settings: SolverSettings | None = None,
+    seed: int = 0,
+    measure_memory: bool = True,
+) -> dict:
+    """Build the scenario's club, run each scheduler and roll everything back."""
+    solver_settings = solver_settings or SolverSettings(random_seed=seed)
+    rng = random.Random(f"{seed}-{scenario.key}")
+    clear_operational_season_cache()
+    try:
+        with transaction.atomic():
+            # Synthetic clubs fly year-round with the legacy role set.
+            SiteConfiguration.objects.update(
+                operations_start_period="",
+                operations_end_period="",
+                enable_dynamic_duty_roles=False,
+            )
+            members = build_synthetic_club(
+                scenario.profile, scenario.start_date, scenario.end_date, rng
+            )
+            pool_ids = {
+                m.id
+                for m in members
+                if any(getattr(m, role, False) for role in scenario.roles)
+            }
+            pool_ids -= set(
+                DutyPreference.objects.filter(member_id__in=pool_ids)
+                .exclude(dont_schedule=False, scheduling_suspended=False)
+                .values_list("member_id", flat=True)
+            )
+
+            results = {}
+            for name in schedulers:
+                result, schedule = _measure(
+                    name,
+                    scenario,
+                    timeout_seconds,
+                    solver_settings,
+                    seed,
+                    measure_memory,
+                )
+                result.update(schedule_metrics(schedule, scenario.roles, pool_ids))
+                results[name] = result
+            transaction.set_rollback(True)
+    finally:
+        clear_operational_season_cache()
+
+    return {
+        "key": scenario.key,
+        "profile": asdict(scenario.profile),
+        "months": scenario.months,
+        "start_date": scenario.start_date.isoformat(),
+        "end_date": scenario.end_date.isoformat(),
+        "roles": list(scenario.roles),
+        "results": results,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmark(
+    profiles=("small", "medium", "large"),
+    month_counts=(1, 3),
+    *,
+    start_date: date | None = None,
+    schedulers=SCHEDULERS,
+    timeout_seconds: float = 10.0,
+    solver_settings: SolverSettings | None = None,
+    seed: int = 0,
+    measure_memory: bool = True,
+    on_scenario=None,
+    allow_existing_data: bool = False,
+) -> dict:
+    """
+    Run every profile x month-count scenario and return the JSON report.
+
+    ``profiles`` may mix CLUB_PROFILES names and ClubProfile instances.
+    ``on_scenario`` is called with each scenario's result as it finishes.
+    See check_benchmark_database() for ``allow_existing_data``.
+    """
+    from ortools import __version__ as ortools_version
+
+    check_benchmark_database(allow_existing_data)
+
+    if start_date is None:
+        today = timezone.localdate()
+        start_date = date(today.year + 1, 3, 1)
+    solver_settings = solver_settings or SolverSettings(random_seed=seed)
+
+    scenarios = []
+    for profile in profiles:
+        if isinstance(profile, str):
+            profile = CLUB_PROFILES[profile]
+        for months in month_counts:
+            range_start, range_end = month_range(start_date, months)
+            scenario = run_scenario(
+                BenchmarkScenario(profile, range_start, range_end, months),
+                schedulers=schedulers,
+                timeout_seconds=timeout_seconds,
+                solver_settings=solver_settings,
+                seed=seed,
+                measure_memory=measure_memory,
+            )
+            if on_scenario:
+                on_scenario(scenario)
+            scenarios.append(scenario)
+
+    return {
+        "meta": {
+            "generated_at": timezone.now().isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "ortools": ortools_version,
+            "seed": seed,
+            "timeout_seconds": timeout_seconds,
+            "solver_settings": asdict(solver_settings),
+        },
+        "scenarios": scenarios,
+    }
+
+
+COMPARED_METRICS = (
+    "wall_time",
+    "peak_memory_kb",
+    "fill_rate",
+    "assignments_stdev",
+    "assignments_gini",
+)
+
+
+def compare_benchmarks(baseline: dict, current: dict) -> list[dict]:
+    """
+    Pair scenarios by key and scheduler and report metric deltas.
+
+    Each row has ``scenario``, ``scheduler`` and, per metric, the baseline
+    and current values plus the relative change in percent (None when the
+    baseline is zero or missing).
+    """
+    baseline_by_key = {s["key"]: s for s in baseline.get("scenarios", [])}
+    rows = []
+    for scenario in current.get("scenarios", []):
+        before = baseline_by_key.get(scenario["key"])
+        if before is None:
+            continue
+        for name, after_result in scenario["results"].items():
+            before_result = before["results"].get(name)
+            if before_result is None:
+                continue
+            row = {"scenario": scenario["key"], "scheduler": name}
+            for metric in COMPARED_METRICS:
+                old, new = before_result.get(metric), after_result.get(metric)
+                change = None
+                if old and new is not None:
+                    change = round(100 * (new - old) / old, 1)
+                row[metric] = {"baseline": old, "current": new, "change_pct": change}
+            rows.append(row)
+    return rows
@@ -11,35 +11,86 @@ Phase 2 Implementation: Full production constraints matching legacy scheduler be
 """
 
 import logging
-from dataclasses import dataclass, field
+from collections import Counter
+from dataclasses import dataclass, field, replace
 from datetime import date, timedelta
 from typing import Any
 
 from ortools.sat.python import cp_model
 
-from duty_roster.models import (
-    DutyAvoidance,
-    DutyPairing,
-    DutyPreference,
-    DutyRoleDefinition,
-    MemberBlackout,
-)
+from duty_roster.models import DutyPreference
 from duty_roster.roster_generator import (
     calculate_assignment_cap,
     get_default_max_assignments_per_month,
 )
-from duty_roster.utils.role_resolution import RoleResolutionService
 from duty_roster.utils.roles import member_has_role
+from duty_roster.utils.scheduling_snapshot import load_scheduling_snapshot
 from members.models import Member
 from siteconfig.models import SiteConfiguration
 
 logger = logging.getLogger("duty_roster.ortools_scheduler")
 
 
+class SolverProgressCallback(cp_model.CpSolverSolutionCallback):
+    """
+    Forward every improving CP-SAT solution to ``on_progress``.
+
+    ``on_progress`` receives a dict with ``objective_value``, ``wall_time``
+    and ``solutions`` (solutions found so far in this solve). CP-SAT calls
+    this from its worker threads, so ``on_progress`` must be cheap and must
+    not touch the database.
+    """
+
+    def __init__(self, on_progress):
+        super().__init__()
+        self._on_progress = on_progress
+        self.solution_count = 0
+
+    def on_solution_callback(self):
+        self.solution_count += 1
+        try:
+            self._on_progress(
+                {
+                    "objective_value": self.ObjectiveValue(),
+                    "wall_time": self.WallTime(),
+                    "solutions": self.solution_count,
+                }
+            )
+        except Exception:
+            logger.exception("Solver progress callback failed")
+
+
 def _member_has_role(member: Member, role: str) -> bool:
     return member_has_role(member, role)
 
 
+def _schedule_slot_map(schedule) -> dict[tuple[date, str], int]:
+    """
+    Flatten schedule entries into a {(day, role): member_id} map.
+
+    Accepts generator output and session drafts alike: ``date`` may be a
+    ``date`` or an ISO string, and empty slots are skipped.
+    """
+    slot_map: dict[tuple[date, str], int] = {}
+    for entry in schedule or []:
+        day = entry.get("date")
+        if isinstance(day, str):
+            try:
+                day = date.fromisoformat(day)
+            except ValueError:
+                continue
+        if not isinstance(day, date):
+            continue
+        for role, member_id in (entry.get("slots") or {}).items():
+            if member_id in (None, ""):
+                continue
+            try:
+                slot_map[day, role] = int(member_id)
+            except (TypeError, ValueError):
+                continue
+    return slot_map
+
+
 # Constants
 PAIRING_MULTIPLIER = 3  # Weight multiplier for preferred pairings
 FAIRNESS_PENALTY_WEIGHT = (
@@ -63,6 +114,9 @@ MAX_WEEKEND_SPACING_PAIR_TERMS = 1200
 # Avoid adding spacing soft-terms on very large models where objective expansion
 # can dominate solve time.
 MAX_WEEKEND_SPACING_DECISION_VARS = 500
+# Ranges spanning at least this many calendar months are solved month by month
+# (rolling horizon) instead of as one model.
+ROLLING_HORIZON_MIN_MONTHS = 3
 
 ROLE_PERCENT_FIELD_MAP = {
     "instructor": "instructor_percent",
@@ -94,6 +148,42 @@ class SchedulingData:
     role_percent_basis: dict[str, str] = field(default_factory=dict)
     month_span: int = 1
     prior_assignments: dict[str, int | None] = field(default_factory=dict)
+    # Rolling-horizon carry-over from earlier windows (see solve_roster_rolling).
+    prior_assignment_counts: dict[int, int] = field(default_factory=dict)
+    prior_last_duty_dates: dict[int, date] = field(default_factory=dict)
+    # Slots of the previous window's last seven days, for adjacent-weekend
+    # spacing across the window boundary: {date: {role: member_id}}.
+    prior_week_assignments: dict[date, dict[str, int | None]] = field(
+        default_factory=dict
+    )
+    horizon_month_span: int | None = None
+    # Legacy percent roles flagged on each member (see load_scheduling_snapshot).
+    member_percent_roles: dict[int, tuple[str, ...]] = field(default_factory=dict)
+
+
+@dataclass
+class SolverSettings:
+    """
+    CP-SAT search configuration.
+
+    Several workers run CP-SAT's parallel portfolio search (fastest); a single
+    worker with a fixed ``random_seed`` reproduces a roster exactly.
+    """
+
+    num_search_workers: int = 4
+    random_seed: int | None = None
+    log_search_progress: bool = False
+
+    @classmethod
+    def from_site_configuration(cls, config) -> "SolverSettings":
+        """Read solver options from SiteConfiguration (defaults if missing)."""
+        if config is None:
+            return cls()
+        return cls(
+            num_search_workers=max(1, config.ortools_search_workers or 1),
+            random_seed=config.ortools_random_seed,
+            log_search_progress=config.ortools_log_search_progress,
+        )
 
 
 class DutyRosterScheduler:
@@ -115,25 +205,50 @@ class DutyRosterScheduler:
         *,
         enforce_anti_repeat: bool = True,
         enforce_adjacent_weekend_spacing: bool = True,
+        hint_schedule: list[dict[str, Any]] | None = None,
+        locked_schedule: list[dict[str, Any]] | None = None,
+        solver_settings: SolverSettings | None = None,
     ):
         """
         Initialize scheduler with preprocessed data.
 
         Args:
             data: SchedulingData object with all necessary scheduling information
+            hint_schedule: Optional previous proposal/accepted roster (schedule
+                entries) used as a CP-SAT warm start
+            locked_schedule: Optional schedule entries whose filled slots are
+                fixed assignments rather than decisions
+            solver_settings: CP-SAT workers/seed/logging (default: 4 workers,
+                no seed, no search log)
         """
         self.data = data
         self.enforce_anti_repeat = enforce_anti_repeat
         self.enforce_adjacent_weekend_spacing = enforce_adjacent_weekend_spacing
+        self.hints = _schedule_slot_map(hint_schedule)
+        self.locked = _schedule_slot_map(locked_schedule)
         self.model = cp_model.CpModel()
         self.x = {}  # Decision variables: x[member_id, role, day] = BoolVar
+        self._locked_slots_applied = 0
+        self._hinted_vars = 0
         self.solver = cp_model.CpSolver()
         self._adjacent_spacing_constraints_added = 0
+        self.solver_settings = solver_settings or SolverSettings()
+        self.search_log: list[str] = []
 
         # Configure solver parameters
         self.solver.parameters.max_time_in_seconds = 10.0
-        self.solver.parameters.num_search_workers = 4
-        self.solver.parameters.log_search_progress = False  # Set to True for debugging
+        self.solver.parameters.num_search_workers = (
+            self.solver_settings.num_search_workers
+        )
+        if self.solver_settings.random_seed is not None:
+            self.solver.parameters.random_seed = self.solver_settings.random_seed
+        if self.solver_settings.log_search_progress:
+            # Capture the search log instead of letting CP-SAT print it.
+            self.solver.parameters.log_search_progress = True
+            self.solver.parameters.log_to_stdout = False
+            self.solver.log_callback = self.search_log.append
+        else:
+            self.solver.parameters.log_search_progress = False
 
     def _create_decision_variables(self):
         """
@@ -177,6 +292,8 @@ class DutyRosterScheduler:
                     # Tuple is valid - create variable
                     valid_tuples.add((member.id, role, day))
 
+        valid_tuples = self._apply_locked_slots(valid_tuples)
+
         # Create BoolVars for all valid tuples in a deterministic order
         for member_id, role, day in sorted(
             valid_tuples, key=lambda t: (t[0], t[1], t[2])
@@ -184,10 +301,75 @@ class DutyRosterScheduler:
             var_name = f"x_{member_id}_{role}_{day}"
             self.x[member_id, role, day] = self.model.NewBoolVar(var_name)
 
+        # Locked slots keep a single, fixed variable so the existing
+        # constraints and objective terms still see the assignment.
+        for (day, role), member_id in self.locked.items():
+            var = self.x.get((member_id, role, day))
+            if var is not None:
+                self.model.Add(var == 1)
+
         logger.info(
             f"Created {len(self.x)} decision variables from {len(valid_tuples)} valid tuples"
         )
 
+    def _apply_locked_slots(self, valid_tuples):
+        """
+        Drop alternative candidates for locked (day, role) slots.
+
+        A lock whose member is no longer valid for the slot (new blackout,
+        lost qualification, 0% preference) cannot be honoured; it is demoted
+        to a hint so the solver still starts from it.
+        """
+        if not self.locked:
+            return valid_tuples
+
+        duty_days = set(self.data.duty_days)
+        applied = {}
+        for (day, role), member_id in self.locked.items():
+            if day not in duty_days or role not in self.data.roles:
+                continue
+            if (member_id, role, day) not in valid_tuples:
+                logger.warning(
+                    "Locked %s on %s for member %s is no longer valid; "
+                    "using it as a hint instead",
+                    role,
+                    day,
+                    member_id,
+                )
+                self.hints.setdefault((day, role), member_id)
+                continue
+            applied[day, role] = member_id
+
+        self.locked = applied
+        self._locked_slots_applied = len(applied)
+        return {
+            (member_id, role, day)
+            for member_id, role, day in valid_tuples
+            if applied.get((day, role), member_id) == member_id
+        }
+
+    def _add_solution_hints(self):
+        """
+        Warm-start CP-SAT from a previous proposal or accepted roster.
+
+        Every variable of a hinted slot gets a hint (1 for the hinted member,
+        0 for the others) so small edits re-solve from a nearly complete
+        assignment instead of from scratch.
+        """
+        if not self.hints:
+            return
+
+        for (member_id, role, day), var in self.x.items():
+            if (day, role) in self.locked:
+                continue
+            hinted_member = self.hints.get((day, role))
+            if hinted_member is None:
+                continue
+            self.model.AddHint(var, 1 if hinted_member == member_id else 0)
+            self._hinted_vars += 1
+
+        logger.info(f"Added {self._hinted_vars} solution hints")
+
     def _is_role_allowed(
         self, member: Member, role: str, pref: DutyPreference | None
     ) -> bool:
@@ -257,9 +439,14 @@ class DutyRosterScheduler:
         not only the current scheduled subset, so 0% override semantics remain
         consistent when scheduling a subset of roles.
         """
-        eligible_roles = [
-            role for role in ROLE_PERCENT_FIELD_MAP if _member_has_role(member, role)
-        ]
+        percent_roles = self.data.member_percent_roles.get(member.id)
+        if percent_roles is None:
+            percent_roles = [
+                role
+                for role in ROLE_PERCENT_FIELD_MAP
+                if _member_has_role(member, role)
+            ]
+        eligible_roles = list(percent_roles)
 
         for scheduled_role in self.data.roles:
             if not self._is_member_eligible_for_role(member, scheduled_role):
@@ -324,9 +511,11 @@ class DutyRosterScheduler:
         if self.enforce_anti_repeat:
             self._add_anti_repeat_constraints()
 
-        # Constraint 5: Adjacent-weekend spacing for members who opt out
+        # Constraint 5: Adjacent-weekend spacing for members who opt out,
+        # including against the previous rolling-horizon window
         if self.enforce_adjacent_weekend_spacing:
             self._add_adjacent_weekend_spacing_constraints()
+            self._add_carryover_weekend_spacing_constraints()
 
         # Constraint 6: Max assignments per month
         self._add_max_assignments_constraints()
@@ -517,6 +706,34 @@ class DutyRosterScheduler:
                         self.model.Add(self.x[key1] + self.x[key2] <= 1)
                         self._adjacent_spacing_constraints_added += 1
 
+    def _add_carryover_weekend_spacing_constraints(self):
+        """
+        Constraint: adjacent-weekend spacing against the previous window.
+
+        Rolling-horizon windows pass the slots of the previous window's last
+        seven days in ``prior_week_assignments``; a member who held a role on
+        one of those days cannot take the same role seven days later. The
+        same opt-in and two-candidate feasibility guard as the in-window
+        constraint apply.
+        """
+        duty_day_set = set(self.data.duty_days)
+        for prior_day, slots in self.data.prior_week_assignments.items():
+            day = prior_day + timedelta(days=7)
+            if day not in duty_day_set:
+                continue
+            for role, member_id in slots.items():
+                if not member_id or role not in self.data.roles:
+                    continue
+                if self._member_allows_weekend_double(member_id):
+                    continue
+                key = (member_id, role, day)
+                candidates = [
+                    m.id for m in self.data.members if (m.id, role, day) in self.x
+                ]
+                if key in self.x and len(candidates) >= 2:
+                    self.model.Add(self.x[key] == 0)
+                    self._adjacent_spacing_constraints_added += 1
+
     def _add_max_assignments_constraints(self):
         """
         Constraint: Members cannot exceed their max assignments per month.
@@ -543,6 +760,14 @@ class DutyRosterScheduler:
                 # (they have no valid decision variables anyway due to sparse creation)
                 continue
 
+            # Rolling-horizon windows also respect the cap for the whole range,
+            # less what earlier windows already assigned.
+            if self.data.horizon_month_span:
+                horizon_remaining = calculate_assignment_cap(
+                    monthly_limit, self.data.horizon_month_span
+                ) - self.data.prior_assignment_counts.get(member.id, 0)
+                max_assignments = max(0, min(max_assignments, horizon_remaining))
+
             # Sum all assignments for this member
             total_assignments = [
                 self.x[member.id, role, day]
@@ -656,6 +881,9 @@ class DutyRosterScheduler:
                 if (pref and pref.last_duty_date)
                 else date(1900, 1, 1)
             )
+            carried_last_duty = self.data.prior_last_duty_dates.get(member.id)
+            if carried_last_duty and carried_last_duty > last_duty:
+                last_duty = carried_last_duty
             days_since = (self.data.earliest_duty_day - last_duty).days
 
             # Cap staleness to prevent dominating objective (max 365 days = 1 year)
@@ -685,7 +913,16 @@ class DutyRosterScheduler:
         ]
 
         if qualified_members:
-            avg_assignments = total_slots / len(qualified_members)
+            # Assignments carried over from earlier rolling-horizon windows count
+            # towards fairness, so the season stays balanced window by window.
+            prior_counts = {
+                m.id: self.data.prior_assignment_counts.get(m.id, 0)
+                for m in qualified_members
+            }
+            load_bound = total_slots + max(prior_counts.values())
+            avg_assignments = (total_slots + sum(prior_counts.values())) / len(
+                qualified_members
+            )
             logger.debug(
                 f"Fairness constraint: {len(qualified_members)} qualified members, "
                 f"avg={avg_assignments:.2f} assignments/member"
@@ -706,14 +943,17 @@ class DutyRosterScheduler:
                 if member_assignments:
                     # Track total assignments for this member
                     total_assignments = self.model.NewIntVar(
-                        0, total_slots, f"total_assignments_{member.id}"
+                        0, load_bound, f"total_assignments_{member.id}"
+                    )
+                    self.model.Add(
+                        total_assignments
+                        == prior_counts[member.id] + sum(member_assignments)
                     )
-                    self.model.Add(total_assignments == sum(member_assignments))
                     member_total_assignment_vars.append(total_assignments)
 
                     # Calculate deviation from average
                     deviation = self.model.NewIntVar(
-                        -total_slots, total_slots, f"deviation_{member.id}"
+                        -load_bound, load_bound, f"deviation_{member.id}"
                     )
                     self.model.Add(
                         deviation == total_assignments - int(avg_assignments)
@@ -721,7 +961,7 @@ class DutyRosterScheduler:
 
                     # Get absolute deviation (CP-SAT requires auxiliary variable)
                     abs_deviation = self.model.NewIntVar(
-                        0, total_slots, f"abs_dev_{member.id}"
+                        0, load_bound, f"abs_dev_{member.id}"
                     )
                     self.model.AddAbsEquality(abs_deviation, deviation)
 
@@ -731,9 +971,7 @@ class DutyRosterScheduler:
 
             if member_total_assignment_vars:
                 # Soft cap concentration by penalizing the single busiest member's load.
-                max_member_load = self.model.NewIntVar(
-                    0, total_slots, "max_member_load"
-                )
+                max_member_load = self.model.NewIntVar(0, load_bound, "max_member_load")
                 self.model.AddMaxEquality(max_member_load, member_total_assignment_vars)
                 objective_terms.append(
                     -MAX_ASSIGNMENT_CONCENTRATION_WEIGHT * max_member_load
@@ -965,10 +1203,17 @@ class DutyRosterScheduler:
         # Return actual percent
         return percent
 
-    def solve(self, timeout_seconds: float = 10.0) -> dict[str, Any]:
+    def solve(
+        self, timeout_seconds: float = 10.0, progress_callback=None
+    ) -> dict[str, Any]:
         """
         Build constraint model and solve for optimal duty roster.
 
+        Args:
+            timeout_seconds: Solver time limit
+            progress_callback: Optional callable receiving a progress dict for
+                each improving solution (see ``SolverProgressCallback``)
+
         Returns:
             Dict with:
                 - 'status': Solver status (OPTIMAL, FEASIBLE, INFEASIBLE, UNKNOWN)
@@ -991,12 +1236,22 @@ class DutyRosterScheduler:
         # Step 3: Add objective function (soft constraints)
         self._add_objective_function()
 
+        # Step 3b: Warm start from the previous proposal, if any
+        self._add_solution_hints()
+
         # Step 4: Solve
         logger.info("Invoking CP-SAT solver...")
-        status = self.solver.Solve(self.model)
+        if progress_callback is not None:
+            status = self.solver.Solve(
+                self.model, SolverProgressCallback(progress_callback)
+            )
+        else:
+            status = self.solver.Solve(self.model)
 
         # Step 5: Extract results
         result = self._extract_results(status)
+        for line in self.search_log:
+            logger.info("CP-SAT: %s", line)
 
         logger.info(
             f"Solver finished: status={result['status']}, "
@@ -1031,13 +1286,29 @@ class DutyRosterScheduler:
             "diagnostics": {
                 "num_conflicts": self.solver.NumConflicts(),
                 "num_branches": self.solver.NumBranches(),
+                "wall_time": self.solver.WallTime(),
+                "best_objective_bound": None,
+                "objective_gap": None,
+                "num_search_workers": self.solver_settings.num_search_workers,
+                "random_seed": self.solver_settings.random_seed,
                 "infeasible_hints": [],
+                "hinted_vars": self._hinted_vars,
+                "locked_slots": self._locked_slots_applied,
             },
         }
+        if self.search_log:
+            result["diagnostics"]["search_log"] = "\n".join(self.search_log)
 
         # Only extract schedule if solution found
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-            result["objective_value"] = self.solver.ObjectiveValue()
+            objective = self.solver.ObjectiveValue()
+            bound = self.solver.BestObjectiveBound()
+            result["objective_value"] = objective
+            result["diagnostics"]["best_objective_bound"] = bound
+            # Relative gap between the solution and the proven bound (0 = optimal).
+            result["diagnostics"]["objective_gap"] = abs(objective - bound) / max(
+                1.0, abs(objective)
+            )
             result["schedule"] = self._build_schedule_from_solution()
         else:
             result["objective_value"] = None
@@ -1145,105 +1416,11 @@ def extract_scheduling_data(
         exclude_set = set(exclude_dates)
         duty_days = [d for d in duty_days if d not in exclude_set]
 
-    # Query Django ORM
-    active_members_qs = Member.objects.filter(is_active=True)
-    members = list(active_members_qs)
-    preferences = {
-        p.member_id: p for p in DutyPreference.objects.select_related("member").all()
-    }
-    blackouts = {
-        (b.member_id, b.date)
-        for b in MemberBlackout.objects.filter(
-            date__gte=range_start, date__lte=range_end
-        )
-    }
-    avoidances = {(a.member_id, a.avoid_with_id) for a in DutyAvoidance.objects.all()}
-    pairings_qs = DutyPairing.objects.all()
-    pairings = set()
-    for p in pairings_qs:
-        member_id = p.member_id
-        pair_with_id = p.pair_with_id
-        # Treat pairings as undirected: canonicalize each pair so (A,B) and (B,A)
-        # are represented once as (min_id, max_id), matching legacy behavior.
-        if member_id is None or pair_with_id is None:
-            continue
-        if member_id == pair_with_id:
-            continue
-        a, b = sorted((member_id, pair_with_id))
-        pairings.add((a, b))
-
-    # Dynamic-role compatibility mappings used by OR-Tools constraints.
     config = SiteConfiguration.objects.first()
-    role_service = RoleResolutionService(site_configuration=config)
-    dynamic_enabled = bool(config and config.enable_dynamic_duty_roles)
-
-    role_percent_basis: dict[str, str] = {role: role for role in roles}
-    role_eligible_member_ids: dict[str, set[int]] = {}
-
-    if dynamic_enabled:
-        role_defs_by_key = {
-            role_def.key: role_def
-            for role_def in DutyRoleDefinition.objects.filter(
-                site_configuration=config,
-                is_active=True,
-                key__in=roles,
-            )
-        }
-
-        for role in roles:
-            role_def = role_defs_by_key.get(role)
-            role_percent_basis[role] = (
-                role_def.legacy_role_key
-                if role_def and role_def.legacy_role_key
-                else role
-            )
-            role_eligible_member_ids[role] = role_service.get_eligible_member_ids(
-                role,
-                members_queryset=active_members_qs,
-            )
-
-    # Calculate role scarcity
-    from duty_roster.roster_generator import calculate_role_scarcity
-
-    role_scarcity = {}
-
-    def scarcity_role_eligibility(member, role):
-        eligible_ids = role_eligible_member_ids.get(role)
-        if eligible_ids is not None:
-            return member.id in eligible_ids
-        return _member_has_role(member, role)
-
-    def scarcity_eligible_percent_fields(member):
-        fields = []
-        for legacy_role, field_name in ROLE_PERCENT_FIELD_MAP.items():
-            if _member_has_role(member, legacy_role):
-                fields.append(field_name)
-        return sorted(set(fields))
-
-    def scarcity_role_percent_value(pref, role, all_zero):
-        if all_zero:
-            return 100
-        percent_basis_role = role_percent_basis.get(role) or role
-        mapped_field = ROLE_PERCENT_FIELD_MAP.get(percent_basis_role)
-        if mapped_field:
-            return getattr(pref, mapped_field, 0)
-        field_name = f"{percent_basis_role}_percent"
-        if hasattr(pref, field_name):
-            return getattr(pref, field_name, 0)
-        return 100
-
-    for role in roles:
-        scarcity_data = calculate_role_scarcity(
-            members,
-            preferences,
-            blackouts,
-            duty_days,
-            role,
-            role_eligibility_fn=scarcity_role_eligibility,
-            eligible_percent_fields_fn=scarcity_eligible_percent_fields,
-            role_percent_value_fn=scarcity_role_percent_value,
-        )
-        role_scarcity[role] = scarcity_data
+    snapshot = load_scheduling_snapshot(
+        roles, range_start, range_end, site_configuration=config
+    )
+    role_scarcity = {role: snapshot.role_scarcity(role, duty_days) for role in roles}
 
     # Determine earliest duty day for staleness calculation
     earliest_duty_day = min(duty_days) if duty_days else today
@@ -1258,21 +1435,238 @@ def extract_scheduling_data(
                     prior_assignments[role] = getattr(previous_assignment, field_name)
 
     return SchedulingData(
-        members=members,
+        members=snapshot.members,
         duty_days=duty_days,
         roles=roles,
-        preferences=preferences,
-        blackouts=blackouts,
-        avoidances=avoidances,
-        pairings=pairings,
+        preferences=snapshot.preferences,
+        blackouts=snapshot.blackouts,
+        avoidances=snapshot.avoidances,
+        pairings=snapshot.pairings,
         role_scarcity=role_scarcity,
         earliest_duty_day=earliest_duty_day,
-        role_eligible_member_ids=role_eligible_member_ids,
-        role_percent_basis=role_percent_basis,
+        role_eligible_member_ids=snapshot.role_eligible_member_ids,
+        role_percent_basis=snapshot.role_percent_basis,
         month_span=month_span,
         prior_assignments=prior_assignments,
+        member_percent_roles={
+            m.id: percent_roles
+            for m, percent_roles in zip(snapshot.members, snapshot.percent_roles)
+        },
+    )
+
+
+def solve_roster_ortools(
+    data: SchedulingData,
+    *,
+    timeout_seconds: float = 10.0,
+    progress_callback=None,
+    hint_schedule: list[dict[str, Any]] | None = None,
+    locked_schedule: list[dict[str, Any]] | None = None,
+    solver_settings: SolverSettings | None = None,
+) -> dict[str, Any]:
+    """
+    Solve the strict model, retrying with relaxed repeat constraints if needed.
+
+    Returns:
+        The ``DutyRosterScheduler.solve`` result of the last pass that ran
+        (schedule, status, objective and solver diagnostics)
+    """
+    scheduler_options = {
+        "hint_schedule": hint_schedule,
+        "locked_schedule": locked_schedule,
+        "solver_settings": solver_settings,
+    }
+
+    # First pass: strict model
+    scheduler = DutyRosterScheduler(data, **scheduler_options)
+    result = scheduler.solve(
+        timeout_seconds=timeout_seconds, progress_callback=progress_callback
     )
 
+    # Second pass fallback: if strict model is infeasible, retry with repeat
+    # hard constraints relaxed to salvage a feasible OR-Tools schedule.
+    if result["status"] == "INFEASIBLE":
+        logger.warning(
+            "OR-Tools strict model infeasible; retrying with relaxed repeat constraints "
+            "(anti-repeat and adjacent-weekend spacing disabled)."
+        )
+        relaxed_scheduler = DutyRosterScheduler(
+            data,
+            enforce_anti_repeat=False,
+            enforce_adjacent_weekend_spacing=False,
+            **scheduler_options,
+        )
+        relaxed_result = relaxed_scheduler.solve(
+            timeout_seconds=timeout_seconds, progress_callback=progress_callback
+        )
+        if relaxed_result["status"] in ("OPTIMAL", "FEASIBLE"):
+            logger.warning(
+                "OR-Tools recovered with relaxed repeat constraints; returning feasible schedule."
+            )
+
+        # Keep latest diagnostics for downstream error handling/logging.
+        result = relaxed_result
+
+    return result
+
+
+def _split_duty_days_by_month(duty_days: list[date]) -> list[list[date]]:
+    """Group sorted duty days into calendar-month windows."""
+    windows: list[list[date]] = []
+    for day in sorted(duty_days):
+        if windows and (windows[-1][0].year, windows[-1][0].month) == (
+            day.year,
+            day.month,
+        ):
+            windows[-1].append(day)
+        else:
+            windows.append([day])
+    return windows
+
+
+def solve_roster_rolling(
+    data: SchedulingData,
+    *,
+    timeout_seconds: float = 10.0,
+    polish_seconds: float = 0.0,
+    progress_callback=None,
+    hint_schedule: list[dict[str, Any]] | None = None,
+    locked_schedule: list[dict[str, Any]] | None = None,
+    solver_settings: SolverSettings | None = None,
+) -> dict[str, Any]:
+    """
+    Solve a long range month by month (rolling horizon).
+
+    Each calendar month is solved as its own model with ``solve_roster_ortools``
+    (``timeout_seconds`` per window). Per-member assignment counts, last duty
+    dates, the final day's slots (for carry-over anti-repeat) and the final
+    week's slots (for adjacent-weekend spacing) are carried into the next
+    window, so model size and solve time grow linearly with the range instead
+    of steeply.
+
+    With ``polish_seconds`` > 0, a global solve over the whole range is then
+    warm-started from the stitched schedule; its result is used only if it
+    finds a feasible schedule within that time.
+
+    Returns:
+        Result dict in the ``DutyRosterScheduler.solve`` format; diagnostics
+        include a ``windows`` list with per-month status and solve time
+    """
+    windows = _split_duty_days_by_month(data.duty_days)
+    counts = Counter(data.prior_assignment_counts)
+    last_duty_dates = dict(data.prior_last_duty_dates)
+    prior_assignments = dict(data.prior_assignments)
+    prior_week_assignments = dict(data.prior_week_assignments)
+    schedule: list[dict[str, Any]] = []
+    window_diagnostics = []
+    totals = Counter()
+    objective_value = 0.0
+    all_optimal = True
+
+    for days in windows:
+        window_data = replace(
+            data,
+            duty_days=days,
+            earliest_duty_day=days[0],
+            month_span=1,
+            horizon_month_span=data.month_span,
+            prior_assignments=prior_assignments,
+            prior_week_assignments=prior_week_assignments,
+            prior_assignment_counts=dict(counts),
+            prior_last_duty_dates=dict(last_duty_dates),
+        )
+        result = solve_roster_ortools(
+            window_data,
+            timeout_seconds=timeout_seconds,
+            progress_callback=progress_callback,
+            hint_schedule=hint_schedule,
+            locked_schedule=locked_schedule,
+            solver_settings=solver_settings,
+        )
+        diagnostics = result["diagnostics"]
+        window_diagnostics.append(
+            {
+                "start": days[0],
+                "end": days[-1],
+                "status": result["status"],
+                "solve_time": result["solve_time"],
+                "objective_value": result["objective_value"],
+            }
+        )
+        for key in ("num_conflicts", "num_branches", "hinted_vars", "locked_slots"):
+            totals[key] += diagnostics.get(key, 0)
+        totals["solve_time"] += result["solve_time"]
+
+        if result["status"] not in ("OPTIMAL", "FEASIBLE"):
+            logger.warning(
+                "Rolling-horizon window %s..%s failed with status %s",
+                days[0],
+                days[-1],
+                result["status"],
+            )
+            diagnostics["windows"] = window_diagnostics
+            return result
+
+        all_optimal = all_optimal and result["status"] == "OPTIMAL"
+        objective_value += result["objective_value"]
+        schedule.extend(result["schedule"])
+        for entry in result["schedule"]:
+            for member_id in entry["slots"].values():
+                if member_id:
+                    counts[member_id] += 1
+                    last_duty_dates[member_id] = entry["date"]
+        if result["schedule"]:
+            prior_assignments = dict(result["schedule"][-1]["slots"])
+        week_start = days[-1] - timedelta(days=6)
+        prior_week_assignments = {
+            entry["date"]: dict(entry["slots"])
+            for entry in result["schedule"]
+            if entry["date"] >= week_start
+        }
+
+    settings = solver_settings or SolverSettings()
+    combined = {
+        "status": "OPTIMAL" if all_optimal else "FEASIBLE",
+        "solve_time": totals["solve_time"],
+        "schedule": schedule,
+        "objective_value": objective_value,
+        "diagnostics": {
+            "num_conflicts": totals["num_conflicts"],
+            "num_branches": totals["num_branches"],
+            "wall_time": totals["solve_time"],
+            # Window objectives are not bounds on the global objective.
+            "best_objective_bound": None,
+            "objective_gap": None,
+            "num_search_workers": settings.num_search_workers,
+            "random_seed": settings.random_seed,
+            "infeasible_hints": [],
+            "hinted_vars": totals["hinted_vars"],
+            "locked_slots": totals["locked_slots"],
+            "windows": window_diagnostics,
+            "polished": False,
+        },
+    }
+
+    if polish_seconds > 0 and len(windows) > 1:
+        polished = DutyRosterScheduler(
+            data,
+            hint_schedule=schedule,
+            locked_schedule=locked_schedule,
+            solver_settings=solver_settings,
+        ).solve(timeout_seconds=polish_seconds, progress_callback=progress_callback)
+        if polished["status"] in ("OPTIMAL", "FEASIBLE"):
+            polished["diagnostics"]["windows"] = window_diagnostics
+            polished["diagnostics"]["polished"] = True
+            polished["solve_time"] += combined["solve_time"]
+            return polished
+        logger.info(
+            "Global polish pass found no schedule (status=%s); keeping the "
+            "rolling-horizon schedule",
+            polished["status"],
+        )
+
+    return combined
+
 
 def generate_roster_ortools(
     year: int | None = None,
@@ -1282,6 +1676,12 @@ def generate_roster_ortools(
     start_date: date | None = None,
     end_date: date | None = None,
     timeout_seconds: float = 10.0,
+    progress_callback=None,
+    hint_schedule: list[dict[str, Any]] | None = None,
+    locked_schedule: list[dict[str, Any]] | None = None,
+    solver_settings: SolverSettings | None = None,
+    rolling_horizon: bool | None = None,
+    polish_seconds: float = 0.0,
 ) -> list[dict[str, Any]]:
     """
     Generate duty roster using OR-Tools constraint programming solver.
@@ -1297,6 +1697,18 @@ def generate_roster_ortools(
         start_date: Optional explicit scheduling range start (inclusive)
         end_date: Optional explicit scheduling range end (inclusive)
         timeout_seconds: Solver timeout (default: 10 seconds)
+        progress_callback: Optional callable receiving solver progress for each
+            improving solution (see ``SolverProgressCallback``)
+        hint_schedule: Optional previous proposal or accepted roster used to
+            warm-start both the strict and the relaxed solve
+        locked_schedule: Optional schedule entries whose filled slots are kept
+            as fixed assignments
+        solver_settings: CP-SAT workers/seed/logging (default: read from
+            SiteConfiguration)
+        rolling_horizon: Solve month by month (see ``solve_roster_rolling``);
+            default: when the range spans ``ROLLING_HORIZON_MIN_MONTHS`` or more
+        polish_seconds: Time for the optional global polish pass after a
+            rolling-horizon solve (default: 0, disabled)
 
     Returns:
         List of dicts with:
@@ -1316,32 +1728,27 @@ def generate_roster_ortools(
         start_date=start_date,
         end_date=end_date,
     )
+    if solver_settings is None:
+        solver_settings = SolverSettings.from_site_configuration(
+            SiteConfiguration.objects.first()
+        )
 
-    # First pass: strict model
-    scheduler = DutyRosterScheduler(data)
-    result = scheduler.solve(timeout_seconds=timeout_seconds)
+    if rolling_horizon is None:
+        rolling_horizon = data.month_span >= ROLLING_HORIZON_MIN_MONTHS
 
-    # Second pass fallback: if strict model is infeasible, retry with repeat
-    # hard constraints relaxed to salvage a feasible OR-Tools schedule.
-    if result["status"] == "INFEASIBLE":
-        logger.warning(
-            "OR-Tools strict model infeasible; retrying with relaxed repeat constraints "
-            "(anti-repeat and adjacent-weekend spacing disabled)."
-        )
-        relaxed_scheduler = DutyRosterScheduler(
-            data,
-            enforce_anti_repeat=False,
-            enforce_adjacent_weekend_spacing=False,
+    solve_options = {
+        "timeout_seconds": timeout_seconds,
+        "progress_callback": progress_callback,
+        "hint_schedule": hint_schedule,
+        "locked_schedule": locked_schedule,
+        "solver_settings": solver_settings,
+    }
+    if rolling_horizon:
+        result = solve_roster_rolling(
+            data, polish_seconds=polish_seconds, **solve_options
         )
-        relaxed_result = relaxed_scheduler.solve(timeout_seconds=timeout_seconds)
-        if relaxed_result["status"] in ("OPTIMAL", "FEASIBLE"):
-            logger.warning(
-                "OR-Tools recovered with relaxed repeat constraints; returning feasible schedule."
-            )
-            return relaxed_result["schedule"]
-
-        # Keep latest diagnostics for downstream error handling/logging.
-        result = relaxed_result
+    else:
+        result = solve_roster_ortools(data, **solve_options)
 
     # Check solver status
     if result["status"] not in ("OPTIMAL", "FEASIBLE"):
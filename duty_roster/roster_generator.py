@@ -8,17 +8,10 @@ from decimal import ROUND_CEILING, Decimal
 
 from django.core.cache import cache
 
-from duty_roster.models import (
-    DutyAssignment,
-    DutyAvoidance,
-    DutyPairing,
-    DutyPreference,
-    DutyRoleDefinition,
-    MemberBlackout,
-)
+from duty_roster.models import DutyAssignment
 from duty_roster.operational_calendar import get_operational_weekend
-from duty_roster.utils.role_resolution import RoleResolutionService
 from duty_roster.utils.roles import member_has_role
+from duty_roster.utils.scheduling_snapshot import load_scheduling_snapshot
 from members.constants.membership import DEFAULT_ROLES, ROLE_FIELD_MAP
 from members.models import Member
 from siteconfig.models import SiteConfiguration
@@ -620,62 +613,23 @@ def _generate_roster_legacy(
     # Use provided roles or fall back to DEFAULT_ROLES
     roles_to_schedule = roles if roles is not None else DEFAULT_ROLES
 
-    site_config = SiteConfiguration.objects.first()
-    role_service = RoleResolutionService(site_configuration=site_config)
-    role_percent_basis = {role: role for role in roles_to_schedule}
-    role_eligible_member_ids = {}
-    active_members_qs = Member.objects.filter(is_active=True)
-
-    if site_config and site_config.enable_dynamic_duty_roles:
-        role_defs_by_key = {
-            role_def.key: role_def
-            for role_def in DutyRoleDefinition.objects.filter(
-                site_configuration=site_config,
-                is_active=True,
-                key__in=roles_to_schedule,
-            )
-        }
-        for role in roles_to_schedule:
-            role_def = role_defs_by_key.get(role)
-            role_percent_basis[role] = (
-                role_def.legacy_role_key
-                if role_def and role_def.legacy_role_key
-                else role
-            )
-            role_eligible_member_ids[role] = role_service.get_eligible_member_ids(
-                role,
-                members_queryset=active_members_qs,
-            )
+    snapshot = load_scheduling_snapshot(
+        roles_to_schedule,
+        start_date,
+        end_date,
+        site_configuration=SiteConfiguration.objects.first(),
+    )
 
     def _member_has_scheduled_role(member, role):
-        eligible_ids = role_eligible_member_ids.get(role)
-        if eligible_ids is not None:
-            return member.id in eligible_ids
-        return _member_has_role(member, role)
-
-    def _role_percent_field(role):
-        basis_role = role_percent_basis.get(role, role)
-        mapped_field = PERCENT_FIELDS.get(basis_role)
-        if mapped_field:
-            return mapped_field
-        field_name = f"{basis_role}_percent"
-        return field_name if hasattr(DutyPreference, field_name) else None
+        return snapshot.has_role(member.id, role)
 
     def _role_percent_value(pref, role, all_zero):
         if all_zero:
             return 100
-        field_name = _role_percent_field(role)
-        if not field_name:
-            return 100
-        return getattr(pref, field_name, 0)
+        return snapshot.role_percent(pref, role)
 
     def _eligible_percent_fields(member):
-        fields = []
-        for legacy_role, field_name in PERCENT_FIELDS.items():
-            if _member_has_role(member, legacy_role):
-                fields.append(field_name)
-        # Keep deterministic order for diagnostics/behavior.
-        return sorted(set(fields))
+        return snapshot.eligible_percent_fields(member.id)
 
     all_weekend_dates = get_weekend_dates_in_range(start_date, end_date)
 
@@ -700,18 +654,10 @@ def _generate_roster_legacy(
                 f"Excluded {excluded_count} user-removed dates from roster generation: "
                 f"{sorted(exclude_set)}"
             )
-    members = list(active_members_qs)
-    prefs = {
-        p.member_id: p for p in DutyPreference.objects.select_related("member").all()
-    }
-    avoidances = {(a.member_id, a.avoid_with_id) for a in DutyAvoidance.objects.all()}
-    pairings = defaultdict(set)
-    for p in DutyPairing.objects.all():
-        pairings[p.member_id].add(p.pair_with_id)
-    blackouts = {
-        (b.member_id, b.date)
-        for b in MemberBlackout.objects.filter(date__gte=start_date, date__lte=end_date)
-    }
+    members = snapshot.members
+    prefs = snapshot.preferences
+    avoidances = snapshot.avoidances
+    blackouts = snapshot.blackouts
     assignments = defaultdict(int)
     default_no_preference_cap = calculate_assignment_cap(8, month_span)
 
@@ -827,9 +773,7 @@ def _generate_roster_legacy(
                 base = _role_percent_value(p, role, all_zero)
             w = base
             for o in assigned:
-                if o.id in pairings.get(m.id, set()) or m.id in pairings.get(
-                    o.id, set()
-                ):
+                if tuple(sorted((m.id, o.id))) in snapshot.pairings:
                     w *= 3
                     break
             logger.debug(
@@ -847,17 +791,7 @@ def _generate_roster_legacy(
 
     # Calculate role scarcity and prioritize most constrained roles first.
     role_scarcity = {
-        role: calculate_role_scarcity(
-            members,
-            prefs,
-            blackouts,
-            weekend_dates,
-            role,
-            role_eligibility_fn=_member_has_scheduled_role,
-            eligible_percent_fields_fn=_eligible_percent_fields,
-            role_percent_value_fn=_role_percent_value,
-        )
-        for role in roles_to_schedule
+        role: snapshot.role_scarcity(role, weekend_dates) for role in roles_to_schedule
     }
 
     # Sort roles by scarcity score (lowest = most constrained = highest priority)
@@ -930,6 +864,9 @@ def generate_roster(
     exclude_dates=None,
     start_date=None,
     end_date=None,
+    progress_callback=None,
+    hint_schedule=None,
+    locked_schedule=None,
 ):
     """
     Generate duty roster using configured scheduler (OR-Tools or legacy).
@@ -950,6 +887,12 @@ def generate_roster(
             (e.g. dates the user has already removed from the proposed roster).
         start_date: Optional explicit scheduling range start (inclusive)
         end_date: Optional explicit scheduling range end (inclusive)
+        progress_callback: Optional callable receiving OR-Tools solver progress
+            (ignored by the legacy scheduler)
+        hint_schedule: Optional previous proposal/accepted roster used to
+            warm-start the OR-Tools solver (ignored by the legacy scheduler)
+        locked_schedule: Optional schedule entries whose filled slots OR-Tools
+            keeps as fixed assignments (ignored by the legacy scheduler)
 
     Returns:
         List of dicts, each with:
@@ -990,13 +933,20 @@ def generate_roster(
 
             from duty_roster.ortools_scheduler import generate_roster_ortools
 
+            ortools_kwargs = {"start_date": start_date, "end_date": end_date}
+            if progress_callback is not None:
+                ortools_kwargs["progress_callback"] = progress_callback
+            if hint_schedule:
+                ortools_kwargs["hint_schedule"] = hint_schedule
+            if locked_schedule:
+                ortools_kwargs["locked_schedule"] = locked_schedule
+
             schedule = generate_roster_ortools(
                 year,
                 month,
                 roles,
                 exclude_dates,
-                start_date=start_date,
-                end_date=end_date,
+                **ortools_kwargs,
             )
 
             elapsed_ms = (time.perf_counter() - start_time) * 1000
@@ -11,11 +11,20 @@ import sys
 
 from django.apps import apps
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.template.loader import render_to_string
 from django.urls import reverse
 
+from duty_roster.utils.calendar_cache import (
+    invalidate_all_calendar_months,
+    invalidate_calendar_date,
+)
+from duty_roster.utils.ics import (
+    invalidate_all_member_ics_feeds,
+    invalidate_member_ics_feeds,
+)
 from notifications.models import Notification
 from siteconfig.models import SiteConfiguration
 from utils.email import send_mail
@@ -544,3 +553,121 @@ def sync_assignment_role_rows_from_legacy(sender, instance, **kwargs):
         logger.exception(
             "Failed syncing normalized role rows for assignment %s", instance.pk
         )
+
+
+# Calendar month cache invalidation. Each bump writes CacheVersion and
+# CalendarChange rows, so like the other DB side effects here it is skipped
+# when is_safe_to_run_signals() is False (migrations, fixture loads); entries
+# cached before such a run expire on their own timeout.
+
+
+def _calendar_date_for(instance):
+    if hasattr(instance, "original_date"):
+        return instance.original_date
+    if hasattr(instance, "date"):
+        return instance.date
+    try:
+        return instance.assignment.date
+    except ObjectDoesNotExist:
+        return None
+
+
+@receiver(post_save, sender="duty_roster.DutyAssignment")
+@receiver(post_delete, sender="duty_roster.DutyAssignment")
+@receiver(post_save, sender="duty_roster.DutyAssignmentRole")
+@receiver(post_delete, sender="duty_roster.DutyAssignmentRole")
+@receiver(post_save, sender="duty_roster.DutySwapRequest")
+@receiver(post_delete, sender="duty_roster.DutySwapRequest")
+@receiver(post_save, sender="duty_roster.OpsIntent")
+@receiver(post_delete, sender="duty_roster.OpsIntent")
+@receiver(post_save, sender="duty_roster.InstructionSlot")
+@receiver(post_delete, sender="duty_roster.InstructionSlot")
+def invalidate_calendar_month_for_instance(sender, instance, **kwargs):
+    """Drop cached calendar months that show the changed row's date."""
+    if not is_safe_to_run_signals():
+        return
+    invalidate_calendar_date(_calendar_date_for(instance))
+
+
+@receiver(post_save, sender="duty_roster.DutyRoleDefinition")
+@receiver(post_delete, sender="duty_roster.DutyRoleDefinition")
+@receiver(post_save, sender=SiteConfiguration)
+def invalidate_all_calendar_months_on_config_change(sender, **kwargs):
+    """Role labels and titles are baked into every cached calendar month."""
+    if not is_safe_to_run_signals():
+        return
+    invalidate_all_calendar_months()
+    invalidate_all_member_ics_feeds()
+
+
+@receiver(post_save, sender="members.Member")
+def invalidate_all_calendar_months_on_member_change(
+    sender, instance, created=False, **kwargs
+):
+    """
+    Member names are baked into cached months. New members are on no
+    calendar yet, and sign-ins only touch last_login.
+    """
+    update_fields = kwargs.get("update_fields")
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    if not is_safe_to_run_signals():
+        return
+    invalidate_all_calendar_months()
+
+
+# Member ICS feed invalidation: bump the feed of every member who gains or
+# loses a duty. pre_save remembers who held the roles before the change.
+
+
+def _assignment_member_ids(assignment):
+    return {
+        getattr(assignment, f"{field_name}_id")
+        for field_name in assignment.LEGACY_ROLE_TO_FIELD.values()
+    }
+
+
+@receiver(pre_save, sender="duty_roster.DutyAssignment")
+def store_original_assignment_members(sender, instance, **kwargs):
+    instance._original_member_ids = set()
+    if not is_safe_to_run_signals():
+        return
+    if instance.pk:
+        id_fields = [
+            f"{field_name}_id" for field_name in instance.LEGACY_ROLE_TO_FIELD.values()
+        ]
+        original = sender.objects.filter(pk=instance.pk).values_list(*id_fields)
+        instance._original_member_ids = set(original.first() or ())
+
+
+@receiver(pre_save, sender="duty_roster.DutyAssignmentRole")
+def store_original_role_row_member(sender, instance, **kwargs):
+    instance._original_member_ids = set()
+    if not is_safe_to_run_signals():
+        return
+    if instance.pk:
+        instance._original_member_ids = set(
+            sender.objects.filter(pk=instance.pk).values_list("member_id", flat=True)
+        )
+
+
+@receiver(post_save, sender="duty_roster.DutyAssignment")
+@receiver(post_delete, sender="duty_roster.DutyAssignment")
+def invalidate_member_ics_feeds_for_assignment(sender, instance, **kwargs):
+    """Assigned and previously assigned members see the change in their feed."""
+    if not is_safe_to_run_signals():
+        return
+    invalidate_member_ics_feeds(
+        _assignment_member_ids(instance)
+        | getattr(instance, "_original_member_ids", set())
+    )
+
+
+@receiver(post_save, sender="duty_roster.DutyAssignmentRole")
+@receiver(post_delete, sender="duty_roster.DutyAssignmentRole")
+def invalidate_member_ics_feeds_for_role_row(sender, instance, **kwargs):
+    if not is_safe_to_run_signals():
+        return
+    invalidate_member_ics_feeds(
+        {instance.member_id} | getattr(instance, "_original_member_ids", set())
+    )
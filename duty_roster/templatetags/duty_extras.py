@@ -1,6 +1,7 @@
 from django import template
 
 from duty_roster.models import DutyRosterMessage
+from duty_roster.utils import ics
 
 register = template.Library()
 
@@ -26,3 +27,15 @@ def get_roster_message():
         {% endif %}
     """
     return DutyRosterMessage.get_message()
+
+
+@register.simple_tag
+def member_ics_feed_url(member):
+    """
+    Absolute URL of a member's subscribable duty calendar feed.
+
+    Usage in templates:
+        {% load duty_extras %}
+        {% member_ics_feed_url user as feed_url %}
+    """
+    return ics.member_ics_feed_url(member)
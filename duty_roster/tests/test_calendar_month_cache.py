@@ -0,0 +1,278 @@
+from datetime import date
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from duty_roster.models import CalendarChange, DutyAssignment, DutySwapRequest
+from duty_roster.utils.calendar_cache import (
+    CALENDAR_CHANGE_GRACE,
+    CALENDAR_CHANGE_RETENTION,
+    calendar_change_cursor,
+    calendar_month_cache_key,
+    get_calendar_changes,
+    months_showing_date,
+)
+from members.models import Member
+from siteconfig.models import SiteConfiguration
+
+DAY = date(2030, 6, 15)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _member(username, **flags):
+    return Member.objects.create_user(
+        username=username,
+        email=f"{username}@example.com",
+        password="password",
+        membership_status="Full Member",
+        **flags,
+    )
+
+
+def _calendar(client):
+    return client.get(
+        reverse(
+            "duty_roster:duty_calendar_month",
+            kwargs={"year": DAY.year, "month": DAY.month},
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_repeat_render_reuses_cached_month(client):
+    SiteConfiguration.objects.create(
+        club_name="Test Club", domain_name="example.org", club_abbreviation="TC"
+    )
+    instructor = _member("inst", instructor=True)
+    DutyAssignment.objects.create(date=DAY, instructor=instructor)
+    client.force_login(_member("viewer"))
+
+    with CaptureQueriesContext(connection) as first:
+        assert _calendar(client).status_code == 200
+    with CaptureQueriesContext(connection) as second:
+        response = _calendar(client)
+
+    assert len(second.captured_queries) < len(first.captured_queries)
+    assert response.context["assignments_by_date"][DAY].instructor == instructor
+
+
+@pytest.mark.django_db
+def test_assignment_change_invalidates_cached_month(client):
+    client.force_login(_member("viewer"))
+    _calendar(client)
+    key = calendar_month_cache_key(DAY.year, DAY.month)
+
+    DutyAssignment.objects.create(date=DAY, instructor=_member("inst"))
+
+    assert calendar_month_cache_key(DAY.year, DAY.month) != key
+    assert DAY in _calendar(client).context["assignments_by_date"]
+
+
+@pytest.mark.django_db
+def test_cached_swaps_are_filtered_per_viewer(client):
+    requester = _member("requester")
+    target = _member("target")
+    bystander = _member("bystander")
+    DutySwapRequest.objects.create(
+        requester=requester,
+        original_date=DAY,
+        role="TOW",
+        request_type="direct",
+        direct_request_to=target,
+        status="open",
+    )
+
+    client.force_login(target)
+    assert _calendar(client).context["open_swap_summary_by_date"][DAY]["count"] == 1
+
+    client.force_login(bystander)
+    assert DAY not in _calendar(client).context["open_swap_summary_by_date"]
+
+    client.logout()
+    assert DAY not in _calendar(client).context["open_swap_summary_by_date"]
+
+
+@pytest.mark.django_db
+def test_site_configuration_save_invalidates_every_month():
+    key = calendar_month_cache_key(DAY.year, DAY.month)
+
+    SiteConfiguration.objects.create(
+        club_name="Test Club", domain_name="example.org", club_abbreviation="TC"
+    )
+
+    assert calendar_month_cache_key(DAY.year, DAY.month) != key
+
+
+@pytest.mark.django_db
+def test_member_rename_invalidates_every_month(client):
+    instructor = _member("inst", first_name="Old", last_name="Name")
+    DutyAssignment.objects.create(date=DAY, instructor=instructor)
+    client.force_login(_member("viewer"))
+    _calendar(client)
+    key = calendar_month_cache_key(DAY.year, DAY.month)
+
+    instructor.last_login = None
+    instructor.save(update_fields=["last_login"])
+    assert calendar_month_cache_key(DAY.year, DAY.month) == key
+
+    instructor.first_name = "New"
+    instructor.save()
+    assert calendar_month_cache_key(DAY.year, DAY.month) != key
+    assert b"New" in _calendar(client).content
+
+
+@pytest.mark.django_db
+def test_month_versions_are_shared_between_workers(client):
+    key = calendar_month_cache_key(DAY.year, DAY.month)
+    DutyAssignment.objects.create(date=DAY, instructor=_member("inst"))
+    bumped = calendar_month_cache_key(DAY.year, DAY.month)
+
+    # A worker that did not handle the save starts from its own empty cache.
+    cache.clear()
+
+    assert bumped != key
+    assert calendar_month_cache_key(DAY.year, DAY.month) == bumped
+
+
+@pytest.mark.parametrize(
+    "day,expected",
+    [
+        (date(2030, 6, 15), {(2030, 6)}),
+        (date(2030, 6, 2), {(2030, 6), (2030, 5)}),
+        (date(2030, 12, 28), {(2030, 12), (2031, 1)}),
+    ],
+)
+def test_months_showing_date_includes_padded_neighbours(day, expected):
+    assert months_showing_date(day) == expected
+
+
+@pytest.mark.django_db
+def test_change_feed_lists_days_changed_since_cursor(client):
+    response = _calendar(client)
+    cursor = response.context["change_cursor"]
+    feed_url = reverse(
+        "duty_roster:calendar_month_changes",
+        kwargs={"year": DAY.year, "month": DAY.month},
+    )
+
+    assert client.get(feed_url, {"since": cursor}).json()["days"] == []
+
+    DutyAssignment.objects.create(date=DAY, instructor=_member("inst"))
+    DutyAssignment.objects.create(date=DAY.replace(day=20))
+    feed = client.get(feed_url, {"since": cursor}).json()
+
+    assert feed["full"] is False
+    assert feed["days"] == ["2030-06-15", "2030-06-20"]
+    assert client.get(feed_url, {"since": feed["cursor"]}).json()["days"] == []
+
+
+@pytest.mark.django_db
+def test_change_feed_requests_full_reload_for_unknown_cursor(client):
+    cursor = calendar_change_cursor(DAY.year, DAY.month)
+
+    SiteConfiguration.objects.create(
+        club_name="Test Club", domain_name="example.org", club_abbreviation="TC"
+    )
+
+    assert get_calendar_changes(DAY.year, DAY.month, cursor)[1] is None
+    assert get_calendar_changes(DAY.year, DAY.month, "garbage")[1] is None
+
+
+@pytest.mark.django_db
+def test_change_feed_answers_cursors_from_any_worker(client):
+    DutyAssignment.objects.create(date=DAY.replace(day=1))
+    cursor = calendar_change_cursor(DAY.year, DAY.month)
+
+    # The poll lands on a worker that never saw this cursor or the change.
+    cache.clear()
+    assert get_calendar_changes(DAY.year, DAY.month, cursor)[1] == []
+
+    DutyAssignment.objects.create(date=DAY)
+    cache.clear()
+    assert get_calendar_changes(DAY.year, DAY.month, cursor)[1] == [DAY]
+
+
+@pytest.mark.django_db
+def test_change_feed_ignores_days_outside_the_grid():
+    cursor = calendar_change_cursor(DAY.year, DAY.month)
+
+    DutyAssignment.objects.create(date=date(2030, 8, 15))
+
+    assert get_calendar_changes(DAY.year, DAY.month, cursor)[1] == []
+
+
+@pytest.mark.django_db
+def test_change_feed_returns_entries_committed_after_a_higher_id():
+    for day in (1, 10, 20):
+        DutyAssignment.objects.create(date=DAY.replace(day=day))
+    _first, middle, last = CalendarChange.objects.order_by("pk")
+    # The middle entry's transaction has not committed when the page renders.
+    late_pk = middle.pk
+    middle.delete()
+    cursor = calendar_change_cursor(DAY.year, DAY.month)
+    assert get_calendar_changes(DAY.year, DAY.month, cursor)[1] == []
+
+    CalendarChange.objects.create(pk=late_pk, day=DAY)
+
+    new_cursor, days = get_calendar_changes(DAY.year, DAY.month, cursor)
+    assert days == [DAY]
+    assert new_cursor == str(last.pk)
+    assert get_calendar_changes(DAY.year, DAY.month, new_cursor)[1] == []
+
+
+@pytest.mark.django_db
+def test_change_feed_forgets_missing_ids_after_the_grace_period():
+    for day in (1, 10, 20):
+        DutyAssignment.objects.create(date=DAY.replace(day=day))
+    _first, middle, last = CalendarChange.objects.order_by("pk")
+    middle.delete()
+    assert calendar_change_cursor(DAY.year, DAY.month) != str(last.pk)
+
+    CalendarChange.objects.filter(pk=last.pk).update(
+        changed_at=timezone.now() - CALENDAR_CHANGE_GRACE * 2
+    )
+
+    assert calendar_change_cursor(DAY.year, DAY.month) == str(last.pk)
+
+
+@pytest.mark.django_db
+def test_change_feed_prunes_old_entries_and_reloads_pruned_cursors():
+    stale = CalendarChange.objects.create(
+        day=DAY, changed_at=timezone.now() - CALENDAR_CHANGE_RETENTION * 2
+    )
+    cursor = str(stale.pk - 1)
+
+    DutyAssignment.objects.create(date=DAY)
+    DutyAssignment.objects.create(date=DAY.replace(day=20))
+
+    assert not CalendarChange.objects.filter(pk=stale.pk).exists()
+    assert get_calendar_changes(DAY.year, DAY.month, cursor)[1] is None
+
+
+@pytest.mark.django_db
+def test_cells_endpoint_renders_only_requested_visible_days(client):
+    DutyAssignment.objects.create(date=DAY, instructor=_member("inst", last_name="Zed"))
+
+    response = client.get(
+        reverse(
+            "duty_roster:calendar_month_cells",
+            kwargs={"year": DAY.year, "month": DAY.month},
+        ),
+        {"days": "2030-06-15,2030-09-01,bogus"},
+    )
+
+    content = response.content.decode()
+    assert response.status_code == 200
+    assert content.count('id="calendar-cell-') == 1
+    assert 'id="calendar-cell-2030-06-15"' in content
+    assert "Zed" in content
@@ -6,15 +6,21 @@ from datetime import date, timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from icalendar import Calendar
 
 from duty_roster.models import DutyAssignment, DutySwapOffer, DutySwapRequest
 from duty_roster.utils.ics import (
     _build_club_location,
     generate_duty_ics,
+    generate_member_duty_feed,
     generate_ops_day_ics,
     generate_preop_ics,
     generate_swap_ics,
+    member_ics_feed_token,
 )
 from siteconfig.models import SiteConfiguration
 
@@ -422,7 +428,7 @@ class TestIcsAttachmentInEmails:
 
         # Mock email sending
         with patch(
-            "duty_roster.management.commands.send_duty_preop_emails.EmailMultiAlternatives"
+            "duty_roster.management.commands.send_duty_preop_emails.DevModeEmailMultiAlternatives"
         ) as mock_email_class:
             mock_email = MagicMock()
             mock_email_class.return_value = mock_email
@@ -604,3 +610,111 @@ class TestBuildClubLocation:
         )
         result = _build_club_location(cfg, "My Club")
         assert result == "Warrenton VA 20186"
+
+
+@pytest.mark.django_db
+class TestMemberDutyFeed:
+    """Tests for the per-member subscribable duty feed."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    @pytest.fixture
+    def member(self, django_user_model):
+        return django_user_model.objects.create_user(
+            username="feedpilot",
+            email="feed@example.com",
+            password="password",
+            first_name="Feed",
+            last_name="Pilot",
+            membership_status="Full Member",
+        )
+
+    def _feed_url(self, member):
+        return reverse(
+            "duty_roster:member_ics_feed",
+            kwargs={"token": member_ics_feed_token(member)},
+        )
+
+    def test_feed_lists_upcoming_duties_with_stable_uids(self, site_config, member):
+        upcoming = date.today() + timedelta(days=3)
+        DutyAssignment.objects.create(
+            date=upcoming, duty_officer=member, tow_pilot=member
+        )
+        DutyAssignment.objects.create(
+            date=date.today() - timedelta(days=3), duty_officer=member
+        )
+
+        cal = _parse_ical(generate_member_duty_feed(member))
+        events = [c for c in cal.walk() if c.name == "VEVENT"]
+
+        assert len(events) == 2
+        assert {str(e["uid"]) for e in events} == {
+            f"{upcoming.isoformat()}-duty-officer-member-{member.pk}@testsoaring.org",
+            f"{upcoming.isoformat()}-towpilot-member-{member.pk}@testsoaring.org",
+        }
+
+    def test_unchanged_feed_is_served_as_not_modified(
+        self, client, site_config, member
+    ):
+        DutyAssignment.objects.create(
+            date=date.today() + timedelta(days=3), duty_officer=member
+        )
+        first = client.get(self._feed_url(member))
+        assert first.status_code == 200
+        assert first["Content-Type"].startswith("text/calendar")
+
+        with patch(
+            "duty_roster.utils.ics.generate_member_duty_feed"
+        ) as generate, CaptureQueriesContext(connection) as queries:
+            second = client.get(
+                self._feed_url(member), HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+
+        assert second.status_code == 304
+        generate.assert_not_called()
+        assert not [q for q in queries if "duty_roster_dutyassignment" in q["sql"]]
+
+    def test_reassignment_changes_etag_for_old_and_new_member(
+        self, client, site_config, member, django_user_model
+    ):
+        other = django_user_model.objects.create_user(
+            username="other", password="password", membership_status="Full Member"
+        )
+        assignment = DutyAssignment.objects.create(
+            date=date.today() + timedelta(days=3), duty_officer=member
+        )
+        member_etag = client.get(self._feed_url(member))["ETag"]
+        other_etag = client.get(self._feed_url(other))["ETag"]
+
+        assignment.duty_officer = other
+        assignment.save()
+
+        assert client.get(self._feed_url(member))["ETag"] != member_etag
+        other_feed = client.get(self._feed_url(other))
+        assert other_feed["ETag"] != other_etag
+        assert b"Duty Officer" in other_feed.content
+
+    def test_etag_is_shared_between_workers(self, client, site_config, member):
+        assignment = DutyAssignment.objects.create(
+            date=date.today() + timedelta(days=3), duty_officer=member
+        )
+        stale_etag = client.get(self._feed_url(member))["ETag"]
+
+        assignment.delete()
+        # A worker that did not handle the delete, with its own empty cache.
+        cache.clear()
+        fresh = client.get(self._feed_url(member), HTTP_IF_NONE_MATCH=stale_etag)
+
+        assert fresh.status_code == 200
+        assert b"VEVENT" not in fresh.content
+        cache.clear()
+        assert client.get(self._feed_url(member))["ETag"] == fresh["ETag"]
+
+    def test_tampered_token_is_not_found(self, client, member):
+        url = self._feed_url(member).replace(".ics", "x.ics")
+
+        assert client.get(url).status_code == 404
@@ -0,0 +1,151 @@
+import json
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from duty_roster.models import DutyPreference
+from duty_roster.ortools_benchmark import (
+    CLUB_PROFILES,
+    ClubProfile,
+    compare_benchmarks,
+    run_benchmark,
+    schedule_metrics,
+)
+from members.models import Member
+
+TINY = ClubProfile(
+    name="tiny",
+    members=16,
+    role_mix={
+        "instructor": 0.5,
+        "duty_officer": 0.5,
+        "assistant_duty_officer": 0.5,
+        "towpilot": 0.5,
+    },
+    max_assignments_choices=(4,),
+)
+
+
+@pytest.mark.django_db
+def test_run_benchmark_reports_both_schedulers_and_rolls_back():
+    existing = Member.objects.create(
+        username="real_member", membership_status="Full Member"
+    )
+
+    report = run_benchmark(
+        profiles=[TINY],
+        month_counts=[1],
+        start_date=date(2027, 3, 1),
+        timeout_seconds=2,
+        measure_memory=False,
+        allow_existing_data=True,
+    )
+
+    (scenario,) = report["scenarios"]
+    assert scenario["key"] == "tiny-1m"
+    assert set(scenario["results"]) == {"legacy", "ortools"}
+    for result in scenario["results"].values():
+        assert result["error"] is None
+        assert result["duty_days"] == 8
+        assert result["total_slots"] == 32
+        assert 0 <= result["fill_rate"] <= 100
+    assert report["meta"]["seed"] == 0
+    json.dumps(report)
+
+    assert list(Member.objects.values_list("username", flat=True)) == ["real_member"]
+    existing.refresh_from_db()
+    assert existing.is_active
+    assert not DutyPreference.objects.exists()
+
+
+@pytest.mark.django_db
+def test_command_refuses_a_database_with_members():
+    Member.objects.create(username="real_member", membership_status="Full Member")
+
+    with patch.dict(CLUB_PROFILES, {"tiny": TINY}):
+        with pytest.raises(CommandError, match="--allow-existing-data"):
+            call_command(
+                "benchmark_roster_solvers", "--profiles", "tiny", stdout=StringIO()
+            )
+
+    assert Member.objects.get(username="real_member").is_active
+
+
+def test_schedule_metrics_counts_idle_members_in_fairness():
+    schedule = [
+        {"date": date(2027, 3, 6), "slots": {"instructor": 1, "towpilot": None}},
+        {"date": date(2027, 3, 7), "slots": {"instructor": 1, "towpilot": 2}},
+    ]
+
+    metrics = schedule_metrics(schedule, ["instructor", "towpilot"], {1, 2, 3})
+
+    assert metrics["fill_rate"] == 75.0
+    assert metrics["fill_rate_by_role"] == {"instructor": 100.0, "towpilot": 50.0}
+    assert metrics["members_assigned"] == 2
+    assert metrics["assignments_spread"] == 2
+    assert metrics["assignments_gini"] > 0
+
+
+def test_compare_benchmarks_pairs_scenarios_by_key():
+    def report(wall_time):
+        return {
+            "scenarios": [
+                {
+                    "key": "small-1m",
+                    "results": {"ortools": {"wall_time": wall_time, "fill_rate": 90}},
+                }
+            ]
+        }
+
+    (row,) = compare_benchmarks(report(2.0), report(1.5))
+
+    assert row["scenario"] == "small-1m"
+    assert row["wall_time"]["change_pct"] == -25.0
+    assert row["fill_rate"]["change_pct"] == 0.0
+    assert row["peak_memory_kb"]["change_pct"] is None
+
+
+@pytest.mark.django_db
+def test_command_writes_json_and_compares_with_baseline(tmp_path):
+    output = tmp_path / "bench.json"
+    out = StringIO()
+
+    with patch.dict(CLUB_PROFILES, {"tiny": TINY}):
+        call_command(
+            "benchmark_roster_solvers",
+            "--profiles",
+            "tiny",
+            "--months",
+            "1",
+            "--start",
+            "2027-03-01",
+            "--schedulers",
+            "legacy",
+            "--no-memory",
+            "--output",
+            str(output),
+            stdout=out,
+        )
+        call_command(
+            "benchmark_roster_solvers",
+            "--profiles",
+            "tiny",
+            "--months",
+            "1",
+            "--start",
+            "2027-03-01",
+            "--schedulers",
+            "legacy",
+            "--no-memory",
+            "--compare",
+            str(output),
+            stdout=out,
+        )
+
+    report = json.loads(output.read_text())
+    assert [s["key"] for s in report["scenarios"]] == ["tiny-1m"]
+    assert "Change vs baseline:" in out.getvalue()
+    assert "tiny-1m legacy" in out.getvalue()
@@ -9,9 +9,12 @@ Tests cover:
 - Performance benchmarking
 """
 
+from collections import Counter
 from datetime import date, timedelta
+from io import StringIO
 from unittest.mock import MagicMock, patch
 
+from django.core.management import call_command
 from django.test import TestCase
 
 from duty_roster.models import (
@@ -28,8 +31,11 @@ from duty_roster.ortools_scheduler import (
     WEEKEND_SPACING_PENALTY_BY_LAG_WEEKS,
     DutyRosterScheduler,
     SchedulingData,
+    SolverSettings,
+    _split_duty_days_by_month,
     extract_scheduling_data,
     generate_roster_ortools,
+    solve_roster_rolling,
 )
 from duty_roster.roster_generator import (
     clear_operational_season_cache,
@@ -1555,6 +1561,359 @@ class ORToolsEdgeCasesTests(TestCase):
         self.assertFalse(relaxed_kwargs.get("enforce_adjacent_weekend_spacing", True))
 
 
+class ORToolsWarmStartTests(ORToolsSchedulerTestBase):
+    """Test solution hints and locked slots from a previous proposal."""
+
+    def setUp(self):
+        self.members = [
+            Member.objects.create(
+                username=f"inst{i}",
+                email=f"inst{i}@test.com",
+                first_name="Inst",
+                last_name=str(i),
+                membership_status="Full Member",
+                instructor=True,
+                is_active=True,
+            )
+            for i in range(3)
+        ]
+        self.days = [date(2026, 3, 7), date(2026, 3, 8), date(2026, 3, 14)]
+
+    def _data(self, blackouts=None):
+        return SchedulingData(
+            members=self.members,
+            duty_days=self.days,
+            roles=["instructor"],
+            preferences={},
+            blackouts=blackouts or set(),
+            avoidances=set(),
+            pairings=set(),
+            role_scarcity={"instructor": {"scarcity_score": 1.0}},
+            earliest_duty_day=self.days[0],
+        )
+
+    def test_locked_slot_is_a_fixed_assignment(self):
+        """Locked slots keep only the locked member's variable, pinned to 1."""
+        locked_id = self.members[2].id
+        scheduler = DutyRosterScheduler(
+            self._data(),
+            enforce_adjacent_weekend_spacing=False,
+            locked_schedule=[
+                {"date": "2026-03-08", "slots": {"instructor": locked_id}}
+            ],
+        )
+
+        result = scheduler.solve(timeout_seconds=5.0)
+
+        slot_vars = [key for key in scheduler.x if key[2] == self.days[1]]
+        self.assertEqual(slot_vars, [(locked_id, "instructor", self.days[1])])
+        self.assertIn(result["status"], ("OPTIMAL", "FEASIBLE"))
+        self.assertEqual(result["schedule"][1]["slots"]["instructor"], locked_id)
+        self.assertEqual(result["diagnostics"]["locked_slots"], 1)
+
+    def test_invalid_lock_is_demoted_to_hint(self):
+        """A lock on a now-blacked-out member becomes a hint, not a constraint."""
+        blocked = self.members[0]
+        scheduler = DutyRosterScheduler(
+            self._data(blackouts={(blocked.id, self.days[0])}),
+            enforce_adjacent_weekend_spacing=False,
+            locked_schedule=[
+                {"date": self.days[0], "slots": {"instructor": blocked.id}}
+            ],
+        )
+
+        result = scheduler.solve(timeout_seconds=5.0)
+
+        self.assertIn(result["status"], ("OPTIMAL", "FEASIBLE"))
+        self.assertEqual(result["diagnostics"]["locked_slots"], 0)
+        self.assertNotEqual(result["schedule"][0]["slots"]["instructor"], blocked.id)
+
+    def test_previous_schedule_is_added_as_hint(self):
+        """Every variable of a hinted slot receives a solution hint."""
+        first = DutyRosterScheduler(
+            self._data(), enforce_adjacent_weekend_spacing=False
+        ).solve(timeout_seconds=5.0)
+
+        scheduler = DutyRosterScheduler(
+            self._data(),
+            enforce_adjacent_weekend_spacing=False,
+            hint_schedule=first["schedule"],
+        )
+        result = scheduler.solve(timeout_seconds=5.0)
+
+        hint = scheduler.model.Proto().solution_hint
+        self.assertEqual(len(hint.vars), len(scheduler.x))
+        self.assertEqual(result["diagnostics"]["hinted_vars"], len(scheduler.x))
+        self.assertEqual(result["objective_value"], first["objective_value"])
+
+    @patch("duty_roster.ortools_scheduler.DutyRosterScheduler")
+    @patch("duty_roster.ortools_scheduler.extract_scheduling_data")
+    def test_relaxed_retry_reuses_warm_start(self, mock_extract, mock_scheduler_cls):
+        """The relaxed fallback solve receives the same hints and locks."""
+        mock_extract.return_value = self._data()
+        strict_scheduler = MagicMock()
+        relaxed_scheduler = MagicMock()
+        mock_scheduler_cls.side_effect = [strict_scheduler, relaxed_scheduler]
+        strict_scheduler.solve.return_value = {
+            "status": "INFEASIBLE",
+            "schedule": [],
+            "diagnostics": {"infeasible_hints": []},
+        }
+        relaxed_scheduler.solve.return_value = {
+            "status": "FEASIBLE",
+            "schedule": [],
+            "diagnostics": {"infeasible_hints": []},
+        }
+        hint = [{"date": "2026-03-07", "slots": {"instructor": 1}}]
+        locked = [{"date": "2026-03-08", "slots": {"instructor": 2}}]
+
+        generate_roster_ortools(
+            year=2026,
+            month=3,
+            roles=["instructor"],
+            hint_schedule=hint,
+            locked_schedule=locked,
+        )
+
+        for _, kwargs in mock_scheduler_cls.call_args_list:
+            self.assertEqual(kwargs["hint_schedule"], hint)
+            self.assertEqual(kwargs["locked_schedule"], locked)
+
+
+class ORToolsSolverSettingsTests(ORToolsSchedulerTestBase):
+    """Test configurable CP-SAT workers, seed, search log and solver stats."""
+
+    def setUp(self):
+        self.members = [
+            Member.objects.create(
+                username=f"seed{i}",
+                email=f"seed{i}@test.com",
+                first_name="Seed",
+                last_name=str(i),
+                membership_status="Full Member",
+                instructor=True,
+                is_active=True,
+            )
+            for i in range(4)
+        ]
+        self.days = [date(2026, 3, 7), date(2026, 3, 8), date(2026, 3, 14)]
+
+    def _data(self):
+        return SchedulingData(
+            members=self.members,
+            duty_days=self.days,
+            roles=["instructor"],
+            preferences={},
+            blackouts=set(),
+            avoidances=set(),
+            pairings=set(),
+            role_scarcity={"instructor": {"scarcity_score": 1.0}},
+            earliest_duty_day=self.days[0],
+        )
+
+    def test_settings_read_from_site_configuration(self):
+        config = SiteConfiguration.objects.create(
+            club_name="Test Club",
+            domain_name="test.org",
+            club_abbreviation="TC",
+            ortools_search_workers=1,
+            ortools_random_seed=42,
+            ortools_log_search_progress=True,
+        )
+
+        settings = SolverSettings.from_site_configuration(config)
+
+        self.assertEqual(settings, SolverSettings(1, 42, True))
+        self.assertEqual(SolverSettings.from_site_configuration(None), SolverSettings())
+
+    def test_solver_parameters_follow_settings(self):
+        scheduler = DutyRosterScheduler(
+            self._data(),
+            solver_settings=SolverSettings(num_search_workers=1, random_seed=7),
+        )
+
+        self.assertEqual(scheduler.solver.parameters.num_search_workers, 1)
+        self.assertEqual(scheduler.solver.parameters.random_seed, 7)
+        self.assertFalse(scheduler.solver.parameters.log_search_progress)
+
+    def test_diagnostics_include_solver_stats(self):
+        result = self._create_scheduler_without_adjacent_weekend_spacing(
+            self._data()
+        ).solve(timeout_seconds=5.0)
+
+        diagnostics = result["diagnostics"]
+        self.assertIn(result["status"], ("OPTIMAL", "FEASIBLE"))
+        for key in ("num_branches", "num_conflicts", "wall_time"):
+            self.assertGreaterEqual(diagnostics[key], 0)
+        self.assertIsNotNone(diagnostics["best_objective_bound"])
+        self.assertGreaterEqual(diagnostics["objective_gap"], 0.0)
+        self.assertEqual(diagnostics["num_search_workers"], 4)
+        self.assertNotIn("search_log", diagnostics)
+
+    def test_search_log_is_captured(self):
+        scheduler = DutyRosterScheduler(
+            self._data(),
+            enforce_adjacent_weekend_spacing=False,
+            solver_settings=SolverSettings(log_search_progress=True),
+        )
+
+        result = scheduler.solve(timeout_seconds=5.0)
+
+        self.assertIn("CP-SAT", result["diagnostics"]["search_log"])
+
+    def test_single_worker_seed_reproduces_roster(self):
+        settings = SolverSettings(num_search_workers=1, random_seed=11)
+        schedules = [
+            DutyRosterScheduler(
+                self._data(),
+                enforce_adjacent_weekend_spacing=False,
+                solver_settings=settings,
+            ).solve(timeout_seconds=5.0)["schedule"]
+            for _ in range(2)
+        ]
+
+        self.assertEqual(schedules[0], schedules[1])
+
+    def test_generate_duty_roster_command_prints_stats(self):
+        out = StringIO()
+        data = self._data()
+
+        with patch(
+            "duty_roster.management.commands.generate_duty_roster."
+            "extract_scheduling_data",
+            return_value=data,
+        ):
+            call_command(
+                "generate_duty_roster",
+                "2026",
+                "3",
+                "--deterministic",
+                "--seed",
+                "3",
+                stdout=out,
+            )
+
+        output = out.getvalue()
+        self.assertIn("workers=1", output)
+        self.assertIn("seed=3", output)
+        self.assertIn("Duty Roster for March 2026", output)
+
+
+class ORToolsRollingHorizonTests(ORToolsSchedulerTestBase):
+    """Test month-by-month (rolling horizon) solving of long ranges."""
+
+    def setUp(self):
+        self.members = [
+            Member.objects.create(
+                username=f"roll{i}",
+                email=f"roll{i}@test.com",
+                first_name="Roll",
+                last_name=str(i),
+                membership_status="Full Member",
+                instructor=True,
+                is_active=True,
+            )
+            for i in range(4)
+        ]
+        # Saturdays in March-May 2026.
+        self.days = [date(2026, 3, 7) + timedelta(weeks=week) for week in range(0, 13)]
+
+    def _data(self, **overrides):
+        data = SchedulingData(
+            members=self.members,
+            duty_days=self.days,
+            roles=["instructor"],
+            preferences={},
+            blackouts=set(),
+            avoidances=set(),
+            pairings=set(),
+            role_scarcity={"instructor": {"scarcity_score": 1.0}},
+            earliest_duty_day=self.days[0],
+            month_span=3,
+        )
+        for key, value in overrides.items():
+            setattr(data, key, value)
+        return data
+
+    def test_split_duty_days_by_month(self):
+        windows = _split_duty_days_by_month(list(reversed(self.days)))
+
+        self.assertEqual([len(w) for w in windows], [4, 4, 5])
+        self.assertEqual(windows[1][0], date(2026, 4, 4))
+
+    def test_rolling_solve_covers_range_and_carries_state(self):
+        result = solve_roster_rolling(self._data(), timeout_seconds=5.0)
+
+        self.assertIn(result["status"], ("OPTIMAL", "FEASIBLE"))
+        self.assertEqual([e["date"] for e in result["schedule"]], self.days)
+        self.assertEqual(len(result["diagnostics"]["windows"]), 3)
+        counts = Counter(e["slots"]["instructor"] for e in result["schedule"])
+        # Carried-over counts keep the season balanced across windows.
+        self.assertLessEqual(max(counts.values()) - min(counts.values()), 1)
+        # Carried-over anti-repeat holds across window boundaries.
+        for previous, current in zip(result["schedule"], result["schedule"][1:]):
+            self.assertNotEqual(
+                previous["slots"]["instructor"], current["slots"]["instructor"]
+            )
+
+    def test_adjacent_weekend_spacing_holds_across_window_boundaries(self):
+        members = self.members[:3]
+        saturdays = [date(2026, 3, 7) + timedelta(weeks=week) for week in range(13)]
+        days = sorted(saturdays + [d + timedelta(days=1) for d in saturdays])
+
+        result = solve_roster_rolling(
+            self._data(members=members, duty_days=days, earliest_duty_day=days[0]),
+            timeout_seconds=5.0,
+        )
+
+        self.assertIn(result["status"], ("OPTIMAL", "FEASIBLE"))
+        assigned = {e["date"]: e["slots"]["instructor"] for e in result["schedule"]}
+        for day, member_id in assigned.items():
+            next_week = day + timedelta(days=7)
+            if next_week in assigned:
+                self.assertNotEqual(member_id, assigned[next_week], day)
+
+    def test_prior_counts_shift_fairness(self):
+        busy = self.members[0]
+        data = self._data(
+            duty_days=self.days[:4],
+            month_span=1,
+            prior_assignment_counts={busy.id: 6},
+        )
+
+        result = self._create_scheduler_without_adjacent_weekend_spacing(data).solve(
+            timeout_seconds=5.0
+        )
+
+        assigned = [e["slots"]["instructor"] for e in result["schedule"]]
+        self.assertNotIn(busy.id, assigned)
+
+    def test_polish_pass_is_warm_started_from_windows(self):
+        result = solve_roster_rolling(
+            self._data(), timeout_seconds=5.0, polish_seconds=5.0
+        )
+
+        self.assertTrue(result["diagnostics"]["polished"])
+        self.assertEqual(len(result["diagnostics"]["windows"]), 3)
+        self.assertEqual(
+            result["diagnostics"]["hinted_vars"], len(self.days) * len(self.members)
+        )
+
+    @patch("duty_roster.ortools_scheduler.solve_roster_ortools")
+    @patch("duty_roster.ortools_scheduler.solve_roster_rolling")
+    @patch("duty_roster.ortools_scheduler.extract_scheduling_data")
+    def test_generate_roster_uses_rolling_for_long_ranges(
+        self, mock_extract, mock_rolling, mock_single
+    ):
+        mock_extract.return_value = self._data()
+        mock_rolling.return_value = {"status": "FEASIBLE", "schedule": []}
+
+        generate_roster_ortools(start_date=date(2026, 3, 1), end_date=date(2026, 5, 31))
+
+        mock_rolling.assert_called_once()
+        mock_single.assert_not_called()
+
+
 class ORToolsIntegrationTests(TestCase):
     """Integration tests with Django ORM and legacy scheduler comparison."""
 
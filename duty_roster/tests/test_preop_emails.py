@@ -16,6 +16,7 @@ from unittest.mock import patch
 
 import pytest
 from django.core import mail
+from django.core.mail import get_connection
 from django.core.management import call_command
 from django.test import override_settings
 
@@ -1053,3 +1054,48 @@ class TestSendDutyPreopEmails:
 
         assert len(mail.outbox) == 3
         assert f"Pre-Ops Report for {local_tomorrow}" in mail.outbox[0].subject
+
+    @override_settings(
+        EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+        EMAIL_DEV_MODE=False,
+        DEFAULT_FROM_EMAIL="noreply@test.com",
+        SITE_URL="https://test.manage2soar.com",
+    )
+    @pytest.mark.parametrize("concurrency,connections", [(1, 1), (2, 2), (8, 4)])
+    def test_sends_batch_over_limited_reused_connections(
+        self,
+        site_config,
+        duty_assignment,
+        members,
+        tomorrow,
+        caplog,
+        concurrency,
+        connections,
+    ):
+        """All messages go out over at most --concurrency connections."""
+        InstructionSlot.objects.create(
+            assignment=duty_assignment,
+            student=members["student"],
+            status="pending",
+        )
+        mail.outbox.clear()  # Drop the signup notification to the instructor
+        with patch(
+            "duty_roster.management.commands.send_duty_preop_emails.get_connection",
+            side_effect=get_connection,
+        ) as mock_get_connection, caplog.at_level("INFO"):
+            call_command(
+                "send_duty_preop_emails",
+                date=tomorrow.strftime("%Y-%m-%d"),
+                concurrency=concurrency,
+                stdout=StringIO(),
+            )
+
+        assert sorted(email.to[0] for email in mail.outbox) == [
+            "bob@example.com",
+            "jane@example.com",
+            "john@example.com",
+            "sally@example.com",
+        ]
+        assert mock_get_connection.call_count == connections
+        assert "4 messages; load=" in caplog.text
+        assert "send=" in caplog.text
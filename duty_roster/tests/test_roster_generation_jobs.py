@@ -0,0 +1,357 @@
+"""Tests for asynchronous OR-Tools roster generation jobs."""
+
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from ortools.sat.python import cp_model
+
+from duty_roster.models import DutyAssignment, RosterGenerationJob
+from duty_roster.ortools_scheduler import SolverProgressCallback
+from duty_roster.roster_generator import clear_operational_season_cache
+from duty_roster.utils.roster_jobs import process_roster_generation_job
+from members.models import Member
+from siteconfig.models import SiteConfiguration
+
+
+def _fake_generate_roster(**kwargs):
+    callback = kwargs["progress_callback"]
+    callback({"objective_value": 120.0, "wall_time": 0.1, "solutions": 1})
+    callback({"objective_value": 80.0, "wall_time": 0.2, "solutions": 2})
+    return [
+        {
+            "date": date(2026, 3, 7),
+            "slots": {"instructor": 42},
+            "diagnostics": {"instructor": None},
+        }
+    ]
+
+
+@pytest.mark.django_db
+class TestRosterGenerationJobs:
+    @pytest.fixture(autouse=True)
+    def ortools_config(self):
+        clear_operational_season_cache()
+        yield SiteConfiguration.objects.create(
+            club_name="Test Club",
+            domain_name="test.org",
+            club_abbreviation="TC",
+            schedule_instructors=True,
+            schedule_tow_pilots=False,
+            schedule_duty_officers=False,
+            schedule_assistant_duty_officers=False,
+            use_ortools_scheduler=True,
+        )
+        clear_operational_season_cache()
+
+    @pytest.fixture
+    def rostermeister(self, client):
+        user = Member.objects.create_user(
+            username="rostermeister",
+            password="testpass123",
+            is_active=True,
+            membership_status="Full Member",
+        )
+        user.rostermeister = True
+        user.save()
+        client.login(username="rostermeister", password="testpass123")
+        return user
+
+    def _get(self, client):
+        return client.get(
+            reverse("duty_roster:propose_roster"), {"year": 2026, "month": 3}
+        )
+
+    def test_get_queues_job_instead_of_solving(self, client, rostermeister):
+        with patch("duty_roster.views.generate_roster") as mock_generate:
+            response = self._get(client)
+
+        assert response.status_code == 200
+        mock_generate.assert_not_called()
+        job = RosterGenerationJob.objects.get()
+        assert job.status == RosterGenerationJob.STATUS_PENDING
+        assert job.requested_by == rostermeister
+        assert (job.start_date, job.end_date) == (date(2026, 3, 1), date(2026, 3, 31))
+        assert job.roles == ["instructor"]
+        assert client.session["proposed_roster_job"]["id"] == job.pk
+        assert response.context["roster_job"] == job
+        assert b"Generating roster" in response.content
+        assert b'value="publish"' not in response.content
+
+    def test_reload_reuses_the_session_job(self, client, rostermeister):
+        self._get(client)
+        self._get(client)
+
+        assert RosterGenerationJob.objects.count() == 1
+
+    def test_roll_reuses_in_flight_job_with_same_inputs(self, client, rostermeister):
+        self._get(client)
+        client.post(
+            reverse("duty_roster:propose_roster"),
+            {"year": 2026, "month": 3, "action": "roll"},
+        )
+
+        assert RosterGenerationJob.objects.count() == 1
+
+    def test_roll_warm_starts_from_session_draft(self, client, rostermeister):
+        session = client.session
+        session["proposed_roster"] = [
+            {"date": "2026-03-07", "slots": {"instructor": 7}, "locked": []},
+            {
+                "date": "2026-03-08",
+                "slots": {"instructor": 8},
+                "locked": ["instructor"],
+            },
+            {"date": "2026-03-14", "slots": {"instructor": None}},
+        ]
+        session["proposed_roster_range"] = {
+            "start_date": "2026-03-01",
+            "end_date": "2026-03-31",
+        }
+        session.save()
+
+        client.post(
+            reverse("duty_roster:propose_roster"),
+            {"year": 2026, "month": 3, "action": "roll"},
+        )
+
+        job = RosterGenerationJob.objects.get()
+        assert job.hint_schedule == [
+            {"date": "2026-03-07", "slots": {"instructor": 7}},
+            {"date": "2026-03-08", "slots": {"instructor": 8}},
+        ]
+        assert job.locked_schedule == [
+            {"date": "2026-03-08", "slots": {"instructor": 8}}
+        ]
+
+    def test_new_range_warm_starts_from_published_roster(self, client, rostermeister):
+        DutyAssignment.objects.create(date=date(2026, 3, 7), instructor=rostermeister)
+
+        self._get(client)
+
+        job = RosterGenerationJob.objects.get()
+        assert job.hint_schedule == [
+            {"date": "2026-03-07", "slots": {"instructor": rostermeister.pk}}
+        ]
+        assert job.locked_schedule == []
+
+    def test_hand_edited_slot_is_locked(self, client, rostermeister):
+        rostermeister.instructor = True
+        rostermeister.save()
+        session = client.session
+        session["proposed_roster"] = [
+            {"date": "2026-03-07", "slots": {"instructor": None}, "diagnostics": {}}
+        ]
+        session.save()
+        url = reverse("duty_roster:update_roster_slot")
+
+        client.post(
+            url,
+            {"date": "2026-03-07", "role": "instructor", "member_id": rostermeister.pk},
+        )
+        assert client.session["proposed_roster"][0]["locked"] == ["instructor"]
+
+        client.post(url, {"date": "2026-03-07", "role": "instructor", "member_id": ""})
+        assert "locked" not in client.session["proposed_roster"][0]
+
+    def test_process_job_passes_warm_start_and_keeps_locks(self):
+        locked = [{"date": "2026-03-07", "slots": {"instructor": 42}}]
+        job = RosterGenerationJob.objects.create(
+            start_date=date(2026, 3, 1),
+            end_date=date(2026, 3, 31),
+            roles=["instructor"],
+            hint_schedule=locked,
+            locked_schedule=locked,
+        )
+
+        with patch(
+            "duty_roster.utils.roster_jobs.generate_roster",
+            side_effect=_fake_generate_roster,
+        ) as mock_generate:
+            process_roster_generation_job(job.pk)
+
+        kwargs = mock_generate.call_args.kwargs
+        assert kwargs["hint_schedule"] == locked
+        assert kwargs["locked_schedule"] == locked
+        job.refresh_from_db()
+        assert job.result[0]["locked"] == ["instructor"]
+
+    def test_process_job_stores_draft_and_progress(self, rostermeister):
+        job = RosterGenerationJob.objects.create(
+            requested_by=rostermeister,
+            start_date=date(2026, 3, 1),
+            end_date=date(2026, 3, 31),
+            roles=["instructor"],
+            exclude_dates=["2026-03-14"],
+        )
+
+        with patch(
+            "duty_roster.utils.roster_jobs.generate_roster",
+            side_effect=_fake_generate_roster,
+        ) as mock_generate:
+            process_roster_generation_job(job.pk)
+
+        kwargs = mock_generate.call_args.kwargs
+        assert kwargs["exclude_dates"] == [date(2026, 3, 14)]
+        assert kwargs["start_date"] == date(2026, 3, 1)
+        job.refresh_from_db()
+        assert job.status == RosterGenerationJob.STATUS_READY
+        assert job.attempt_count == 1
+        assert job.best_objective == 80.0
+        assert job.solutions_found == 2
+        assert job.elapsed_seconds is not None
+        assert job.incomplete is False
+        assert job.result == [
+            {
+                "date": "2026-03-07",
+                "slots": {"instructor": 42},
+                "diagnostics": {"instructor": None},
+            }
+        ]
+
+    def test_ready_job_draft_is_loaded_once(self, client, rostermeister):
+        self._get(client)
+        job = RosterGenerationJob.objects.get()
+        with patch(
+            "duty_roster.utils.roster_jobs.generate_roster",
+            side_effect=_fake_generate_roster,
+        ):
+            process_roster_generation_job(job.pk)
+
+        response = self._get(client)
+        assert [e["date"] for e in response.context["draft"]] == [date(2026, 3, 7)]
+        assert client.session["proposed_roster_job"] == {"id": job.pk, "loaded": True}
+
+        # Slot edits made after loading survive a reload.
+        session = client.session
+        session["proposed_roster"][0]["slots"]["instructor"] = None
+        session.save()
+        response = self._get(client)
+        assert response.context["draft"][0]["slots"] == {"instructor": None}
+        assert RosterGenerationJob.objects.count() == 1
+
+    def test_failed_job_falls_back_to_blank_draft(self, client, rostermeister):
+        self._get(client)
+        job = RosterGenerationJob.objects.get()
+        with patch(
+            "duty_roster.utils.roster_jobs.generate_roster",
+            side_effect=RuntimeError("boom"),
+        ):
+            process_roster_generation_job(job.pk)
+
+        job.refresh_from_db()
+        assert job.status == RosterGenerationJob.STATUS_FAILED
+        assert job.last_error == "boom"
+
+        response = self._get(client)
+        assert response.context["incomplete"] is True
+        assert all(
+            entry["slots"] == {"instructor": None}
+            for entry in response.context["draft"]
+        )
+
+    def test_successful_retry_replaces_fallback_draft(self, client, rostermeister):
+        self._get(client)
+        job = RosterGenerationJob.objects.get()
+        with patch(
+            "duty_roster.utils.roster_jobs.generate_roster",
+            side_effect=RuntimeError("boom"),
+        ):
+            process_roster_generation_job(job.pk)
+        self._get(client)
+        assert client.session["proposed_roster_job"]["loaded"] is False
+
+        with patch(
+            "duty_roster.utils.roster_jobs.generate_roster",
+            side_effect=_fake_generate_roster,
+        ):
+            process_roster_generation_job(job.pk)
+
+        response = self._get(client)
+        assert [e["date"] for e in response.context["draft"]] == [date(2026, 3, 7)]
+        assert client.session["proposed_roster_job"] == {"id": job.pk, "loaded": True}
+
+    @override_settings(ROSTER_GENERATION_INLINE=True)
+    def test_inline_setting_solves_within_request(self, client, rostermeister):
+        with patch(
+            "duty_roster.utils.roster_jobs.generate_roster",
+            side_effect=_fake_generate_roster,
+        ):
+            response = self._get(client)
+
+        assert RosterGenerationJob.objects.get().status == "ready"
+        assert response.context["roster_job"].status == "ready"
+        assert [e["date"] for e in response.context["draft"]] == [date(2026, 3, 7)]
+
+    def test_status_endpoint_reports_progress(self, client, rostermeister):
+        job = RosterGenerationJob.objects.create(
+            start_date=date(2026, 3, 1),
+            end_date=date(2026, 3, 31),
+            status=RosterGenerationJob.STATUS_PROCESSING,
+            best_objective=12.5,
+            solutions_found=3,
+            elapsed_seconds=4.2,
+        )
+
+        response = client.get(
+            reverse("duty_roster:roster_generation_job_status", args=[job.pk])
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "processing"
+        assert data["best_objective"] == 12.5
+        assert data["solutions_found"] == 3
+        assert data["elapsed_seconds"] == 4.2
+
+    def test_status_endpoint_requires_rostermeister(self, client):
+        Member.objects.create_user(
+            username="regular", password="testpass123", membership_status="Full Member"
+        )
+        client.login(username="regular", password="testpass123")
+        job = RosterGenerationJob.objects.create(
+            start_date=date(2026, 3, 1), end_date=date(2026, 3, 31)
+        )
+
+        response = client.get(
+            reverse("duty_roster:roster_generation_job_status", args=[job.pk])
+        )
+
+        assert response.status_code == 302
+
+    def test_command_processes_pending_jobs(self):
+        job = RosterGenerationJob.objects.create(
+            start_date=date(2026, 3, 1),
+            end_date=date(2026, 3, 31),
+            roles=["instructor"],
+        )
+
+        with patch(
+            "duty_roster.utils.roster_jobs.generate_roster",
+            side_effect=_fake_generate_roster,
+        ):
+            call_command("process_roster_generation_jobs")
+
+        job.refresh_from_db()
+        assert job.status == RosterGenerationJob.STATUS_READY
+
+
+def test_solver_progress_callback_reports_improving_solutions():
+    model = cp_model.CpModel()
+    x = model.NewIntVar(0, 10, "x")
+    y = model.NewIntVar(0, 10, "y")
+    model.Add(x + y <= 12)
+    model.Maximize(3 * x + 2 * y)
+    solver = cp_model.CpSolver()
+    solver.parameters.num_search_workers = 1
+    progress = []
+
+    status = solver.Solve(model, SolverProgressCallback(progress.append))
+
+    assert status == cp_model.OPTIMAL
+    assert progress
+    assert progress[-1]["objective_value"] == solver.ObjectiveValue()
+    assert progress[-1]["solutions"] == len(progress)
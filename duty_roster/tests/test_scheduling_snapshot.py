@@ -0,0 +1,153 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from duty_roster.models import (
+    DutyPairing,
+    DutyPreference,
+    DutyQualificationRequirement,
+    DutyRoleDefinition,
+    MemberBlackout,
+    MemberDutyQualification,
+)
+from duty_roster.roster_generator import calculate_role_scarcity
+from duty_roster.utils.role_resolution import RoleResolutionService
+from duty_roster.utils.scheduling_snapshot import load_scheduling_snapshot
+from members.models import Member
+from siteconfig.models import SiteConfiguration
+
+DAYS = [date(2026, 3, 7), date(2026, 3, 8)]
+ROLES = ["instructor", "towpilot", "pm_check_pilot", "invalid_flag_role"]
+
+
+@pytest.fixture
+def site_config():
+    config = SiteConfiguration.objects.create(
+        club_name="Test Club",
+        domain_name="example.org",
+        club_abbreviation="TC",
+        enable_dynamic_duty_roles=True,
+    )
+    check_pilot = DutyRoleDefinition.objects.create(
+        site_configuration=config,
+        key="pm_check_pilot",
+        display_name="PM Check Pilot",
+        is_active=True,
+    )
+    DutyQualificationRequirement.objects.create(
+        role_definition=check_pilot,
+        requirement_type=DutyQualificationRequirement.TYPE_LEGACY_ROLE_FLAG,
+        requirement_value="instructor",
+    )
+    DutyQualificationRequirement.objects.create(
+        role_definition=check_pilot,
+        requirement_type=DutyQualificationRequirement.TYPE_MEMBER_DUTY_QUAL,
+        requirement_value="check_pilot_pm",
+    )
+    invalid = DutyRoleDefinition.objects.create(
+        site_configuration=config,
+        key="invalid_flag_role",
+        display_name="Invalid",
+        is_active=True,
+    )
+    DutyQualificationRequirement.objects.create(
+        role_definition=invalid,
+        requirement_type=DutyQualificationRequirement.TYPE_LEGACY_ROLE_FLAG,
+        requirement_value="not_a_real_member_field",
+    )
+    return config
+
+
+def _make_members(count, offset=0):
+    members = []
+    for i in range(offset, offset + count):
+        member = Member.objects.create(
+            username=f"snapshot_{i}",
+            membership_status="Full Member",
+            instructor=i % 2 == 0,
+            towpilot=i % 3 == 0,
+        )
+        DutyPreference.objects.create(
+            member=member,
+            instructor_percent=0 if i % 4 == 0 else 50,
+            towpilot_percent=50,
+            dont_schedule=i % 7 == 6,
+        )
+        MemberBlackout.objects.create(member=member, date=DAYS[i % 2])
+        if i % 4 == 2:
+            MemberDutyQualification.objects.create(
+                member=member, qualification_code="check_pilot_pm", is_qualified=True
+            )
+        members.append(member)
+    for a, b in zip(members, members[1:]):
+        DutyPairing.objects.create(member=a, pair_with=b)
+    return members
+
+
+def _count_snapshot_queries(site_config):
+    with CaptureQueriesContext(connection) as ctx:
+        load_scheduling_snapshot(
+            ROLES, DAYS[0], DAYS[-1], site_configuration=site_config
+        )
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_snapshot_query_count_does_not_grow_with_members(site_config):
+    _make_members(3)
+    small = _count_snapshot_queries(site_config)
+
+    _make_members(30, offset=3)
+    assert _count_snapshot_queries(site_config) == small
+
+
+@pytest.mark.django_db
+def test_bulk_eligibility_matches_per_role_resolution(site_config):
+    members = _make_members(12)
+    service = RoleResolutionService(site_configuration=site_config)
+
+    bulk = service.get_eligible_member_ids_by_role(ROLES, members)
+
+    for role in ROLES:
+        assert bulk[role] == service.get_eligible_member_ids(
+            role, members_queryset=Member.objects.filter(is_active=True)
+        )
+    assert bulk["invalid_flag_role"] == set()
+    assert bulk["pm_check_pilot"] == {m.id for m in members[2::4]}
+
+
+@pytest.mark.django_db
+def test_snapshot_scarcity_matches_calculate_role_scarcity(site_config):
+    _make_members(12)
+    snapshot = load_scheduling_snapshot(
+        ROLES, DAYS[0], DAYS[-1], site_configuration=site_config
+    )
+
+    for role in ROLES:
+        expected = calculate_role_scarcity(
+            snapshot.members,
+            snapshot.preferences,
+            snapshot.blackouts,
+            DAYS,
+            role,
+            role_eligibility_fn=lambda m, r: snapshot.has_role(m.id, r),
+            eligible_percent_fields_fn=lambda m: snapshot.eligible_percent_fields(m.id),
+            role_percent_value_fn=lambda p, r, all_zero: (
+                100 if all_zero else snapshot.role_percent(p, r)
+            ),
+        )
+        assert snapshot.role_scarcity(role, DAYS) == expected
+
+
+@pytest.mark.django_db
+def test_snapshot_canonicalizes_pairings(site_config):
+    a, b = _make_members(2)
+    DutyPairing.objects.create(member=b, pair_with=a)
+
+    snapshot = load_scheduling_snapshot(
+        ROLES, DAYS[0], DAYS[-1], site_configuration=site_config
+    )
+
+    assert snapshot.pairings == {tuple(sorted((a.id, b.id)))}
@@ -13,6 +13,21 @@ urlpatterns = [
         views.duty_calendar_view,
         name="duty_calendar_month",
     ),
+    path(
+        "calendar/<int:year>/<int:month>/changes/",
+        views.calendar_month_changes,
+        name="calendar_month_changes",
+    ),
+    path(
+        "calendar/<int:year>/<int:month>/cells/",
+        views.calendar_month_cells,
+        name="calendar_month_cells",
+    ),
+    path(
+        "calendar/feed/<str:token>.ics",
+        views.member_ics_feed,
+        name="member_ics_feed",
+    ),
     path(
         "calendar/day/<int:year>/<int:month>/<int:day>/",
         views.calendar_day_detail,
@@ -151,6 +166,11 @@ urlpatterns = [
         views.update_roster_slot,
         name="update_roster_slot",
     ),
+    path(
+        "propose-roster/jobs/<int:pk>/status/",
+        views.roster_generation_job_status,
+        name="roster_generation_job_status",
+    ),
     path(
         "duty-delinquents/detail/",
         views.duty_delinquents_detail,
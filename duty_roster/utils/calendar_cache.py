@@ -0,0 +1,189 @@
+"""
+Month-level cache for the member-independent part of the duty calendar.
+
+Each calendar month is cached under a key that embeds a per-month version and
+a global version (shared tokens from ``utils/cache.py``, so every worker sees
+a bump). ``duty_roster/signals.py`` bumps the month version whenever an
+assignment, role row, swap request, ops intent or instruction slot on a date
+shown in that month changes, and bumps the global version when role
+definitions, site configuration or member names change. A bumped version
+simply makes the old entry unreachable; it expires on its own.
+
+The same bumps append to a change feed stored in the database
+(``CalendarChange``), so every worker answers a cursor the same way. The
+cursor holds the id of the newest entry when the page was rendered, and
+clients ask ``get_calendar_changes`` which of the days they show changed
+since then instead of reloading the whole month. Ids are handed out before
+their transaction commits, so an entry with a lower id can appear after a
+higher one was read: the cursor also lists the missing ids below the newest
+one, and those are asked for again until they are older than
+``CALENDAR_CHANGE_GRACE``. A cursor the feed can no longer answer (global
+change, pruned entries, too far behind) asks for a full reload.
+"""
+
+import calendar
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db.models import Max, Min, Q
+from django.db.models.functions import Now
+
+from duty_roster.models import CalendarChange
+from utils.cache import (
+    bump_cache_version,
+    bump_cache_versions,
+    get_cache_versions,
+)
+
+# Backstop for changes that bypass signals (queryset updates, raw SQL); every
+# signalled change reaches all workers through the shared versions.
+CALENDAR_MONTH_CACHE_TIMEOUT = 120
+
+_GLOBAL_VERSION = "duty_calendar"
+
+# Clients further behind than this reload the whole month.
+CALENDAR_CHANGE_FEED_LIMIT = 60
+# Open calendars poll every 30 seconds; older entries are pruned.
+CALENDAR_CHANGE_RETENTION = timedelta(hours=1)
+# How long a missing id below the newest entry may still be committed.
+CALENDAR_CHANGE_GRACE = timedelta(minutes=5)
+CALENDAR_CHANGE_MAX_GAPS = 100
+
+
+def _month_version(year, month):
+    return f"duty_calendar:{year}-{month:02d}"
+
+
+def calendar_month_cache_key(year, month):
+    """Current cache key for a month's calendar grid."""
+    month_version = _month_version(year, month)
+    versions = get_cache_versions([_GLOBAL_VERSION, month_version])
+    return (
+        f"duty_calendar:grid:{year}-{month:02d}:"
+        f"{versions[_GLOBAL_VERSION]}:{versions[month_version]}"
+    )
+
+
+def get_cached_calendar_month(year, month, build):
+    """Return the cached grid for a month, calling ``build()`` on a miss."""
+    key = calendar_month_cache_key(year, month)
+    grid = cache.get(key)
+    if grid is None:
+        grid = build()
+        cache.set(key, grid, CALENDAR_MONTH_CACHE_TIMEOUT)
+    return grid
+
+
+def months_showing_date(day):
+    """(year, month) pairs whose calendar grid includes ``day``."""
+    months = {(day.year, day.month)}
+    first = day.replace(day=1)
+    last = day.replace(day=calendar.monthrange(day.year, day.month)[1])
+    # Sunday-first grids pad with up to six days of the adjacent months.
+    if (day - first).days < 7:
+        before = first - timedelta(days=1)
+        months.add((before.year, before.month))
+    if (last - day).days < 7:
+        after = last + timedelta(days=1)
+        months.add((after.year, after.month))
+    return months
+
+
+def _visible_range(year, month):
+    """First and last day of a month's Sunday-first calendar grid."""
+    weeks = calendar.Calendar(firstweekday=6).monthdatescalendar(year, month)
+    return weeks[0][0], weeks[-1][-1]
+
+
+def _publish_change(day=None):
+    change = CalendarChange.objects.create(day=day)
+    # Always keep the newest entry so that the oldest answerable cursor is
+    # known even after a quiet spell.
+    CalendarChange.objects.filter(
+        changed_at__lt=Now() - CALENDAR_CHANGE_RETENTION, pk__lt=change.pk
+    ).delete()
+
+
+def _feed_position():
+    """
+    ``(oldest, latest, gaps)``: the id range kept in the feed and the ids
+    below ``latest`` that are missing but may still be committed.
+    """
+    bounds = CalendarChange.objects.aggregate(
+        oldest=Min("pk"),
+        latest=Max("pk"),
+        settled=Max("pk", filter=Q(changed_at__lt=Now() - CALENDAR_CHANGE_GRACE)),
+    )
+    latest = bounds["latest"] or 0
+    # Below the newest entry older than the grace period (or the pruned
+    # range), a missing id belongs to a rolled-back transaction.
+    settled = max(bounds["settled"] or 0, (bounds["oldest"] or 1) - 1)
+    present = set(
+        CalendarChange.objects.filter(pk__gt=settled).values_list("pk", flat=True)
+    )
+    gaps = sorted(set(range(settled + 1, latest + 1)) - present)
+    return bounds["oldest"], latest, gaps[-CALENDAR_CHANGE_MAX_GAPS:]
+
+
+def _format_cursor(latest, gaps):
+    if not gaps:
+        return str(latest)
+    return f"{latest}-{'.'.join(map(str, gaps))}"
+
+
+def _parse_cursor(cursor):
+    """``(latest, gaps)`` from a cursor; raises ValueError when malformed."""
+    latest, _, gaps = (cursor or "").partition("-")
+    return int(latest), [int(gap) for gap in gaps.split(".") if gap]
+
+
+def calendar_change_cursor(year, month):
+    """Opaque cursor for the current state of the change feed."""
+    _oldest, latest, gaps = _feed_position()
+    return _format_cursor(latest, gaps)
+
+
+def get_calendar_changes(year, month, cursor):
+    """
+    Days shown in a month's grid that changed since ``cursor``.
+
+    Returns ``(new_cursor, days)`` where ``days`` is a sorted list of dates,
+    or ``None`` when the caller has to reload the whole month.
+    """
+    oldest, latest, gaps = _feed_position()
+    current = _format_cursor(latest, gaps)
+    try:
+        seen, seen_gaps = _parse_cursor(cursor)
+    except ValueError:
+        return current, None
+    if seen > latest or (oldest and seen < oldest - 1):
+        return current, None
+
+    first_day, last_day = _visible_range(year, month)
+    days = set()
+    for day in CalendarChange.objects.filter(
+        Q(day__isnull=True) | Q(day__range=(first_day, last_day)),
+        Q(pk__gt=seen, pk__lte=latest) | Q(pk__in=seen_gaps),
+    ).values_list("day", flat=True):
+        if day is None:
+            return current, None
+        days.add(day)
+        if len(days) > CALENDAR_CHANGE_FEED_LIMIT:
+            return current, None
+    return current, sorted(days)
+
+
+def invalidate_calendar_date(day):
+    """Drop cached calendar grids that display ``day`` and publish the change."""
+    if not isinstance(day, date):
+        return
+    bump_cache_versions(
+        _month_version(year, month) for year, month in months_showing_date(day)
+    )
+    _publish_change(day)
+
+
+def invalidate_all_calendar_months():
+    """Drop every cached calendar grid (labels, role setup or names changed)."""
+    bump_cache_version(_GLOBAL_VERSION)
+    _publish_change()
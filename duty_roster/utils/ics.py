@@ -4,17 +4,40 @@ ICS calendar file generation utilities for duty roster assignments.
 This module provides functions to generate ICS (iCalendar) files for duty
 assignments, which can be attached to notification emails to allow members
 to easily add their duty assignments to their personal calendars.
+
+It also renders each member's subscribable feed of upcoming duties. The
+feed's ETag is built from a per-member version that ``duty_roster/signals.py``
+bumps whenever one of the member's assignments changes. The versions are
+stored in the database (``utils/cache.py``), so every worker computes the
+same ETag and sees a bump at once. A calendar client polling an unchanged
+feed is answered with one small query and without touching
+``DutyAssignment``; the rendered body is cached under its ETag.
 """
 
-from datetime import timedelta
+import time
+from datetime import date, timedelta
 
 from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import Prefetch, Q
+from django.urls import reverse
 from django.utils import timezone
 from icalendar import Calendar, Event
 
+from duty_roster.models import DutyAssignment, DutyAssignmentRole
 from siteconfig.models import SiteConfiguration
+from siteconfig.utils import get_role_title
+from utils.cache import bump_cache_version, bump_cache_versions, get_cache_versions
 from utils.url_helpers import build_absolute_url
 
+# The ETag also rotates this often, as a backstop for assignment changes that
+# send no signals (queryset updates); rendered feeds are cached as long.
+MEMBER_ICS_FEED_TIMEOUT = 60 * 60 * 6
+
+_ICS_FEED_SALT = "duty_roster.ics_feed"
+_ICS_FEED_GLOBAL_VERSION = "duty_ics"
+
 
 def _build_club_location(config, fallback):
     """Return a formatted location string from SiteConfiguration address fields.
@@ -356,3 +379,160 @@ def generate_roster_ics(duty_date, role_title, member_name):
             component["uid"] = uid_suffix
 
     return calendar.to_ical()
+
+
+def member_ics_feed_token(member):
+    """Signed, URL-safe token identifying a member's duty feed."""
+    return signing.Signer(salt=_ICS_FEED_SALT).sign(str(member.pk))
+
+
+def member_id_from_ics_feed_token(token):
+    """Member pk for a feed token, or None when the signature is invalid."""
+    try:
+        return int(signing.Signer(salt=_ICS_FEED_SALT).unsign(token))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def member_ics_feed_url(member):
+    """Absolute URL calendar clients can subscribe to."""
+    return build_absolute_url(
+        reverse(
+            "duty_roster:member_ics_feed",
+            kwargs={"token": member_ics_feed_token(member)},
+        )
+    )
+
+
+def _member_feed_version(member_id):
+    return f"duty_ics:{member_id}"
+
+
+def member_ics_feed_etag(member_id):
+    """
+    ETag for a member's feed, read from the shared feed versions.
+
+    Includes today's date so that past duties drop out of the feed daily.
+    """
+    member_version = _member_feed_version(member_id)
+    versions = get_cache_versions([_ICS_FEED_GLOBAL_VERSION, member_version])
+    period = int(time.time() // MEMBER_ICS_FEED_TIMEOUT)
+    return (
+        f"{versions[_ICS_FEED_GLOBAL_VERSION][:12]}-{versions[member_version][:12]}-"
+        f"{date.today():%Y%m%d}-{period}"
+    )
+
+
+def invalidate_member_ics_feeds(member_ids):
+    """Bump the feed version of every member in ``member_ids``."""
+    bump_cache_versions(
+        _member_feed_version(member_id) for member_id in member_ids if member_id
+    )
+
+
+def invalidate_all_member_ics_feeds():
+    """Bump every member feed (club name, address or role titles changed)."""
+    bump_cache_version(_ICS_FEED_GLOBAL_VERSION)
+
+
+def _member_upcoming_duties(member_id):
+    """(date, role_key, role_title) for a member's duties from today on."""
+    legacy_fields = DutyAssignment.LEGACY_ROLE_TO_FIELD
+    member_filter = Q(role_rows__member_id=member_id)
+    for field_name in legacy_fields.values():
+        member_filter |= Q(**{f"{field_name}_id": member_id})
+    assignments = (
+        DutyAssignment.objects.filter(member_filter, date__gte=date.today())
+        .distinct()
+        .prefetch_related(
+            Prefetch(
+                "role_rows",
+                queryset=DutyAssignmentRole.objects.filter(
+                    member_id=member_id
+                ).select_related("role_definition"),
+            )
+        )
+        .order_by("date")
+    )
+
+    legacy_titles = {}
+    duties = []
+    for assignment in assignments:
+        for role_key, field_name in legacy_fields.items():
+            if getattr(assignment, f"{field_name}_id") == member_id:
+                if role_key not in legacy_titles:
+                    legacy_titles[role_key] = get_role_title(role_key)
+                duties.append((assignment.date, role_key, legacy_titles[role_key]))
+        for row in assignment.role_rows.all():
+            if row.role_key in legacy_fields:
+                continue
+            title = (
+                row.role_definition.display_name
+                if row.role_definition
+                else row.role_key.replace("_", " ").title()
+            )
+            duties.append((assignment.date, row.role_key, title))
+    return duties
+
+
+def generate_member_duty_feed(member):
+    """
+    Generate a subscribable ICS calendar of a member's upcoming duties.
+
+    Event UIDs are stable per date, role and member so that calendar clients
+    update entries in place when the feed is refreshed.
+
+    Returns:
+        bytes: ICS file content as bytes
+    """
+    config = SiteConfiguration.objects.first()
+    club_name = config.club_name if config else "Soaring Club"
+    domain_name = (config.domain_name if config else None) or "manage2soar.com"
+    location = _build_club_location(config, club_name)
+    roster_url = build_absolute_url("/duty_roster/calendar/")
+    default_from = getattr(settings, "DEFAULT_FROM_EMAIL", "")
+    now = timezone.now()
+
+    cal = Calendar()
+    cal.add("prodid", f"-//Manage2Soar//{club_name}//EN")
+    cal.add("version", "2.0")
+    cal.add("method", "PUBLISH")
+    cal.add("x-wr-calname", f"{club_name} duties - {member.full_display_name}")
+
+    for duty_date, role_key, role_title in _member_upcoming_duties(member.pk):
+        event = Event()
+        event.add("summary", f"{role_title} - {club_name}")
+        event.add(
+            "description",
+            f"You are assigned as {role_title} for {club_name}.\n"
+            f"\nView duty roster: {roster_url}",
+        )
+        event.add("dtstart", duty_date)
+        event.add("dtend", duty_date + timedelta(days=1))
+        event.add("location", location)
+        role_slug = role_key.replace("_", "-")
+        event.add(
+            "uid",
+            f"{duty_date.isoformat()}-{role_slug}-member-{member.pk}@{domain_name}",
+        )
+        event.add("dtstamp", now)
+        if default_from:
+            event.add("organizer", f"MAILTO:{default_from}")
+        event.add("status", "CONFIRMED")
+        cal.add_component(event)
+
+    return cal.to_ical()
+
+
+def get_member_duty_feed(member, etag=None):
+    """
+    Return ``(etag, ics_bytes)`` for a member's feed, rendering it at most
+    once per ETag in each worker.
+    """
+    etag = etag or member_ics_feed_etag(member.pk)
+    key = f"duty_ics:feed:{member.pk}:{etag}"
+    content = cache.get(key)
+    if content is None:
+        content = generate_member_duty_feed(member)
+        cache.set(key, content, MEMBER_ICS_FEED_TIMEOUT)
+    return etag, content
@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 from typing import Optional
 
-from django.core.exceptions import FieldError
+from django.core.exceptions import FieldDoesNotExist, FieldError
 from django.db.models import Q
 from django.utils import timezone
 
@@ -202,6 +202,120 @@ class RoleResolutionService:
 
         return eligible_ids
 
+    def get_eligible_member_ids_by_role(
+        self, role_keys, members
+    ) -> dict[str, set[int]]:
+        """Resolve eligibility for several roles over already-loaded members.
+
+        Same rules as ``get_eligible_member_ids``, but requirements are
+        evaluated in memory: role definitions and duty qualifications are
+        fetched once for all roles, so the query count does not depend on the
+        number of roles or members.
+        """
+        members = [m for m in members if m.id]
+        role_keys = list(role_keys)
+
+        role_definitions = {}
+        if self._is_dynamic_enabled():
+            role_definitions = {
+                role_definition.key: role_definition
+                for role_definition in self._role_queryset()
+                .filter(key__in=role_keys, is_active=True)
+                .prefetch_related("qualification_requirements")
+            }
+
+        requirements_by_role = {}
+        qualification_codes = set()
+        for role_key, role_definition in role_definitions.items():
+            requirements = []
+            for req in role_definition.qualification_requirements.all():
+                if not req.is_required:
+                    continue
+                if (
+                    req.requirement_type
+                    == DutyQualificationRequirement.TYPE_LEGACY_ROLE_FLAG
+                    and not self._is_member_field(req.requirement_value)
+                ):
+                    logger.warning(
+                        "Invalid legacy role flag '%s' for dynamic role '%s'; "
+                        "treating requirement as non-matching",
+                        req.requirement_value,
+                        role_key,
+                    )
+                elif (
+                    req.requirement_type
+                    == DutyQualificationRequirement.TYPE_MEMBER_DUTY_QUAL
+                ):
+                    qualification_codes.add(req.requirement_value)
+                requirements.append(req)
+            requirements_by_role[role_key] = requirements
+
+        qualified = set()
+        if qualification_codes and members:
+            qualified = set(
+                MemberDutyQualification.objects.filter(
+                    member_id__in=[m.id for m in members],
+                    qualification_code__in=qualification_codes,
+                    is_qualified=True,
+                )
+                .filter(
+                    Q(expires_on__isnull=True) | Q(expires_on__gte=timezone.localdate())
+                )
+                .values_list("member_id", "qualification_code")
+            )
+
+        eligible_by_role = {}
+        for role_key in role_keys:
+            role_definition = role_definitions.get(role_key)
+            requirements = requirements_by_role.get(role_key)
+            if not requirements:
+                fallback_role = (
+                    role_definition.legacy_role_key
+                    if role_definition and role_definition.legacy_role_key
+                    else role_key
+                )
+                eligible_by_role[role_key] = {
+                    m.id for m in members if member_has_role(m, fallback_role)
+                }
+                continue
+
+            eligible_by_role[role_key] = {
+                m.id
+                for m in members
+                if all(
+                    self._meets_loaded_requirement(m, req, qualified)
+                    for req in requirements
+                )
+            }
+        return eligible_by_role
+
+    @staticmethod
+    def _is_member_field(field_name: str) -> bool:
+        try:
+            Member._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return False
+        return True
+
+    def _meets_loaded_requirement(
+        self,
+        member: Member,
+        requirement: DutyQualificationRequirement,
+        qualified: set[tuple[int, str]],
+    ) -> bool:
+        requirement_type = requirement.requirement_type
+        requirement_value = requirement.requirement_value
+
+        if requirement_type == DutyQualificationRequirement.TYPE_LEGACY_ROLE_FLAG:
+            if not self._is_member_field(requirement_value):
+                return False
+            return getattr(member, requirement_value) is True
+
+        if requirement_type == DutyQualificationRequirement.TYPE_MEMBER_DUTY_QUAL:
+            return (member.id, requirement_value) in qualified
+
+        return self._meets_requirement(member, requirement)
+
     def _meets_requirement(
         self,
         member: Member,
@@ -0,0 +1,275 @@
+"""
+Asynchronous roster proposal jobs.
+
+Solving a multi-month OR-Tools roster can take longer than a web request
+should. The propose-roster page enqueues a ``RosterGenerationJob`` and polls
+it; the ``process_roster_generation_jobs`` cron command runs the solver,
+publishing progress while CP-SAT searches, and stores the finished draft on
+the job.
+"""
+
+import logging
+import threading
+import time
+from datetime import date
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from duty_roster.models import RosterGenerationJob
+from duty_roster.roster_generator import (
+    generate_roster,
+    get_weekend_dates_in_range,
+    is_within_operational_season,
+)
+
+MAX_LAST_ERROR_LENGTH = 2000
+PROGRESS_INTERVAL_SECONDS = 1.0
+logger = logging.getLogger(__name__)
+
+
+def build_roster_draft(
+    raw, roles, start_date, end_date, exclude_dates, locked_schedule=None
+):
+    """
+    Convert generator output into session draft entries.
+
+    When the generator returns nothing, the draft falls back to empty slots on
+    every in-season weekend date so the rostermeister can still fill it by hand.
+    Slots from ``locked_schedule`` that the generator kept are listed under the
+    entry's ``locked`` key so the next regeneration keeps them too.
+
+    Returns:
+        Tuple of (draft entries, incomplete flag)
+    """
+    incomplete = False
+    if not raw:
+        exclude_set = set(exclude_dates)
+        weekend = [
+            d
+            for d in get_weekend_dates_in_range(start_date, end_date)
+            if is_within_operational_season(d) and d not in exclude_set
+        ]
+        raw = [{"date": d, "slots": {r: None for r in roles}} for d in weekend]
+        incomplete = True
+
+    draft = [
+        {
+            "date": e["date"].isoformat(),
+            "slots": {r: e["slots"].get(r) for r in roles},
+            "diagnostics": e.get("diagnostics", {}),
+        }
+        for e in raw
+    ]
+
+    locked_by_date = {
+        entry["date"]: entry.get("slots", {}) for entry in locked_schedule or []
+    }
+    for entry in draft:
+        locked_slots = locked_by_date.get(entry["date"])
+        if not locked_slots:
+            continue
+        locked = [
+            r
+            for r in roles
+            if entry["slots"].get(r) is not None
+            and entry["slots"].get(r) == locked_slots.get(r)
+        ]
+        if locked:
+            entry["locked"] = locked
+    return draft, incomplete
+
+
+def _schedule_for_storage(entries, only_locked=False):
+    """Reduce draft entries to ``{"date", "slots"}`` with filled slots only."""
+    stored = []
+    for entry in entries or []:
+        slots = entry.get("slots") or {}
+        if only_locked:
+            slots = {r: slots.get(r) for r in entry.get("locked", [])}
+        slots = {r: m for r, m in slots.items() if m not in (None, "")}
+        if slots:
+            stored.append({"date": entry["date"], "slots": slots})
+    return stored
+
+
+def enqueue_roster_generation(
+    requested_by, start_date, end_date, roles, exclude_dates, warm_start=None
+):
+    """
+    Queue a roster proposal, reusing an in-flight job with identical inputs.
+
+    Reusing pending/processing jobs keeps double submits from stacking up
+    solver runs for the same range.
+
+    ``warm_start`` is an optional list of session draft entries (previous
+    proposal or accepted roster). Its filled slots become solver hints and
+    the slots listed under each entry's ``locked`` key stay fixed.
+    """
+    exclude = sorted({d.isoformat() for d in exclude_dates})
+    roles = list(roles)
+    hint_schedule = _schedule_for_storage(warm_start)
+    locked_schedule = _schedule_for_storage(warm_start, only_locked=True)
+    existing = (
+        RosterGenerationJob.objects.filter(
+            status__in=[
+                RosterGenerationJob.STATUS_PENDING,
+                RosterGenerationJob.STATUS_PROCESSING,
+            ],
+            start_date=start_date,
+            end_date=end_date,
+            roles=roles,
+            exclude_dates=exclude,
+            hint_schedule=hint_schedule,
+            locked_schedule=locked_schedule,
+        )
+        .order_by("-queued_at")
+        .first()
+    )
+    if existing:
+        return existing
+
+    return RosterGenerationJob.objects.create(
+        requested_by=requested_by,
+        start_date=start_date,
+        end_date=end_date,
+        roles=roles,
+        exclude_dates=exclude,
+        hint_schedule=hint_schedule,
+        locked_schedule=locked_schedule,
+    )
+
+
+class _ProgressReporter:
+    """
+    Collect solver progress and write it to the job from a background thread.
+
+    CP-SAT invokes solution callbacks on its own worker threads, so the
+    callback only records the latest solution; a single reporter thread
+    publishes it (with the elapsed time) every ``interval`` seconds.
+    """
+
+    def __init__(self, job_id, interval=PROGRESS_INTERVAL_SECONDS):
+        self.job_id = job_id
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._best_objective = None
+        self._solutions = 0
+        self._started = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"roster-job-{job_id}-progress", daemon=True
+        )
+
+    def __call__(self, progress):
+        with self._lock:
+            self._best_objective = progress["objective_value"]
+            self._solutions += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def fields(self):
+        """Progress columns for ``RosterGenerationJob``."""
+        with self._lock:
+            best_objective, solutions = self._best_objective, self._solutions
+        return {
+            "best_objective": best_objective,
+            "solutions_found": solutions,
+            "elapsed_seconds": round(time.monotonic() - self._started, 3),
+            "progress_updated_at": timezone.now(),
+        }
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    RosterGenerationJob.objects.filter(
+                        pk=self.job_id,
+                        status=RosterGenerationJob.STATUS_PROCESSING,
+                    ).update(**self.fields())
+                except Exception:
+                    logger.warning(
+                        "Could not publish progress for roster job %s", self.job_id
+                    )
+        finally:
+            connection.close()
+
+
+def process_roster_generation_job(job_id):
+    """Run one queued roster proposal and store the resulting draft."""
+    with transaction.atomic():
+        job = RosterGenerationJob.objects.select_for_update().get(pk=job_id)
+        if job.status in [
+            RosterGenerationJob.STATUS_PROCESSING,
+            RosterGenerationJob.STATUS_READY,
+        ]:
+            return
+
+        job.status = RosterGenerationJob.STATUS_PROCESSING
+        job.attempt_count += 1
+        job.started_at = timezone.now()
+        job.completed_at = None
+        job.last_error = ""
+        job.best_objective = None
+        job.solutions_found = 0
+        job.elapsed_seconds = 0
+        job.progress_updated_at = job.started_at
+        job.save(
+            update_fields=[
+                "status",
+                "attempt_count",
+                "started_at",
+                "completed_at",
+                "last_error",
+                "best_objective",
+                "solutions_found",
+                "elapsed_seconds",
+                "progress_updated_at",
+            ]
+        )
+
+    exclude_dates = [date.fromisoformat(d) for d in job.exclude_dates]
+    reporter = _ProgressReporter(job.pk)
+    try:
+        with reporter:
+            raw = generate_roster(
+                roles=job.roles,
+                exclude_dates=exclude_dates,
+                start_date=job.start_date,
+                end_date=job.end_date,
+                progress_callback=reporter,
+                hint_schedule=job.hint_schedule,
+                locked_schedule=job.locked_schedule,
+            )
+        draft, incomplete = build_roster_draft(
+            raw,
+            job.roles,
+            job.start_date,
+            job.end_date,
+            exclude_dates,
+            locked_schedule=job.locked_schedule,
+        )
+    except Exception as exc:
+        logger.exception("Roster generation job failed for job_id=%s", job_id)
+        RosterGenerationJob.objects.filter(pk=job_id).update(
+            status=RosterGenerationJob.STATUS_FAILED,
+            last_error=str(exc)[:MAX_LAST_ERROR_LENGTH],
+            completed_at=timezone.now(),
+            **reporter.fields(),
+        )
+        return
+
+    RosterGenerationJob.objects.filter(pk=job_id).update(
+        status=RosterGenerationJob.STATUS_READY,
+        result=draft,
+        incomplete=incomplete,
+        completed_at=timezone.now(),
+        last_error="",
+        **reporter.fields(),
+    )
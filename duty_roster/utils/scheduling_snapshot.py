@@ -0,0 +1,220 @@
+"""
+Bulk-loaded scheduling inputs shared by the legacy and OR-Tools schedulers.
+
+``load_scheduling_snapshot`` reads members, duty preferences, blackouts,
+pairings, avoidances and role eligibility in a fixed number of queries and
+indexes them by member position. Per-role eligibility and per-day
+availability are kept as bitsets (Python ints, bit ``i`` = ``members[i]``),
+so scarcity and eligibility checks never go back to the ORM or walk
+member attributes again.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+
+from duty_roster.models import (
+    DutyAvoidance,
+    DutyPairing,
+    DutyPreference,
+    DutyRoleDefinition,
+    MemberBlackout,
+)
+from duty_roster.utils.role_resolution import RoleResolutionService
+from duty_roster.utils.roles import member_has_role
+from members.models import Member
+
+# Legacy roles that carry a percentage on DutyPreference, in model order.
+PERCENT_ROLE_FIELDS = {
+    "instructor": "instructor_percent",
+    "towpilot": "towpilot_percent",
+    "duty_officer": "duty_officer_percent",
+    "assistant_duty_officer": "ado_percent",
+    "commercial_pilot": "commercial_pilot_percent",
+}
+
+
+def _bits(indexes) -> int:
+    mask = 0
+    for i in indexes:
+        mask |= 1 << i
+    return mask
+
+
+@dataclass
+class SchedulingSnapshot:
+    """
+    Scheduling inputs for one date range, indexed by member position.
+
+    ``role_eligible_member_ids`` is only populated for roles resolved through
+    dynamic role definitions; ``role_masks`` covers every scheduled role.
+    """
+
+    members: list[Member]
+    roles: list[str]
+    preferences: dict[int, DutyPreference]
+    blackouts: set[tuple[int, date]]
+    avoidances: set[tuple[int, int]]
+    # Undirected, canonical (min_id, max_id) pairs.
+    pairings: set[tuple[int, int]]
+    role_percent_basis: dict[str, str]
+    role_eligible_member_ids: dict[str, set[int]]
+    member_index: dict[int, int] = field(default_factory=dict)
+    role_masks: dict[str, int] = field(default_factory=dict)
+    # Legacy percent roles each member is flagged for, by member index.
+    percent_roles: list[tuple[str, ...]] = field(default_factory=list)
+    # Members with "don't schedule" or suspended scheduling.
+    unavailable_mask: int = 0
+    blackout_masks: dict[date, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.member_index = {m.id: i for i, m in enumerate(self.members)}
+        self.percent_roles = [
+            tuple(r for r in PERCENT_ROLE_FIELDS if member_has_role(m, r))
+            for m in self.members
+        ]
+        self.role_masks = {}
+        for role in self.roles:
+            eligible_ids = self.role_eligible_member_ids.get(role)
+            self.role_masks[role] = _bits(
+                i
+                for i, m in enumerate(self.members)
+                if (
+                    m.id in eligible_ids
+                    if eligible_ids is not None
+                    else member_has_role(m, role)
+                )
+            )
+        self.unavailable_mask = _bits(
+            self.member_index[member_id]
+            for member_id, pref in self.preferences.items()
+            if member_id in self.member_index
+            and (pref.dont_schedule or pref.scheduling_suspended)
+        )
+        blackout_masks: dict[date, int] = {}
+        for member_id, day in self.blackouts:
+            i = self.member_index.get(member_id)
+            if i is not None:
+                blackout_masks[day] = blackout_masks.get(day, 0) | (1 << i)
+        self.blackout_masks = blackout_masks
+
+    def has_role(self, member_id: int, role: str) -> bool:
+        """Scheduled-role eligibility (dynamic requirements or legacy flag)."""
+        i = self.member_index.get(member_id)
+        if i is None:
+            return False
+        return bool(self.role_masks.get(role, 0) >> i & 1)
+
+    def eligible_percent_fields(self, member_id: int) -> list[str]:
+        """DutyPreference percent fields for the member's legacy role flags."""
+        i = self.member_index.get(member_id)
+        if i is None:
+            return []
+        return sorted(PERCENT_ROLE_FIELDS[r] for r in self.percent_roles[i])
+
+    def role_percent(self, pref: DutyPreference, role: str) -> int:
+        """Preference percentage for a scheduled role (100 if it has none)."""
+        basis_role = self.role_percent_basis.get(role) or role
+        field_name = PERCENT_ROLE_FIELDS.get(basis_role, f"{basis_role}_percent")
+        if not hasattr(DutyPreference, field_name):
+            return 100
+        return getattr(pref, field_name, 0)
+
+    def _zero_percent_mask(self, role: str) -> int:
+        """Members whose preference rules them out of ``role`` (explicit 0%)."""
+        mask = 0
+        for member_id, pref in self.preferences.items():
+            i = self.member_index.get(member_id)
+            if i is None:
+                continue
+            fields = self.eligible_percent_fields(member_id)
+            if len(fields) == 1:
+                continue
+            if all(getattr(pref, f, 0) == 0 for f in fields):
+                continue
+            if self.role_percent(pref, role) == 0:
+                mask |= 1 << i
+        return mask
+
+    def role_scarcity(self, role: str, days: list[date]) -> dict:
+        """
+        Availability-based scarcity for ``role`` over ``days``.
+
+        Same result as ``roster_generator.calculate_role_scarcity`` for the
+        snapshot's members, computed with bitset intersections.
+        """
+        if not days:
+            return {
+                "total_members": 0,
+                "avg_available_per_day": 0,
+                "scarcity_score": float("inf"),
+                "availability_by_day": [],
+            }
+        role_mask = self.role_masks.get(role, 0)
+        available = role_mask & ~self.unavailable_mask & ~self._zero_percent_mask(role)
+        availability_by_day = [
+            (available & ~self.blackout_masks.get(day, 0)).bit_count() for day in days
+        ]
+        avg_available = sum(availability_by_day) / len(availability_by_day)
+        return {
+            "total_members": role_mask.bit_count(),
+            "avg_available_per_day": avg_available,
+            "scarcity_score": avg_available,
+            "availability_by_day": availability_by_day,
+        }
+
+
+def load_scheduling_snapshot(
+    roles: list[str],
+    start_date: date,
+    end_date: date,
+    site_configuration=None,
+) -> SchedulingSnapshot:
+    """
+    Load everything the schedulers need for ``roles`` between two dates.
+
+    Runs a fixed number of queries regardless of how many members, roles or
+    preferences exist: one per table, plus role definitions, their
+    requirements and matching duty qualifications when dynamic roles are on.
+    """
+    roles = list(roles)
+    members = list(Member.objects.filter(is_active=True))
+    preferences = {p.member_id: p for p in DutyPreference.objects.all()}
+    blackouts = set(
+        MemberBlackout.objects.filter(
+            date__gte=start_date, date__lte=end_date
+        ).values_list("member_id", "date")
+    )
+    avoidances = set(DutyAvoidance.objects.values_list("member_id", "avoid_with_id"))
+    pairings = set()
+    for member_id, pair_with_id in DutyPairing.objects.values_list(
+        "member_id", "pair_with_id"
+    ):
+        if member_id is None or pair_with_id is None or member_id == pair_with_id:
+            continue
+        pairings.add(tuple(sorted((member_id, pair_with_id))))
+
+    role_percent_basis = {role: role for role in roles}
+    role_eligible_member_ids: dict[str, set[int]] = {}
+    if site_configuration and site_configuration.enable_dynamic_duty_roles:
+        for role_def in DutyRoleDefinition.objects.filter(
+            site_configuration=site_configuration,
+            is_active=True,
+            key__in=roles,
+        ):
+            if role_def.legacy_role_key:
+                role_percent_basis[role_def.key] = role_def.legacy_role_key
+        role_service = RoleResolutionService(site_configuration=site_configuration)
+        role_eligible_member_ids = role_service.get_eligible_member_ids_by_role(
+            roles, members
+        )
+
+    return SchedulingSnapshot(
+        members=members,
+        roles=roles,
+        preferences=preferences,
+        blackouts=blackouts,
+        avoidances=avoidances,
+        pairings=pairings,
+        role_percent_basis=role_percent_basis,
+        role_eligible_member_ids=role_eligible_member_ids,
+    )
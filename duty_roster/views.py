@@ -13,6 +13,7 @@ from django.contrib.auth.decorators import user_passes_test
 from django.core.cache import cache
 from django.db import models, transaction
 from django.http import (
+    Http404,
     HttpResponse,
     HttpResponseBadRequest,
     HttpResponseForbidden,
@@ -22,10 +23,11 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from django.utils.html import format_html
 from django.utils.timezone import now
 from django.views.decorators.cache import never_cache
-from django.views.decorators.http import require_GET, require_POST
+from django.views.decorators.http import condition, require_GET, require_POST
 
 from duty_roster.utils.delinquents import apply_duty_delinquent_exemptions
 from duty_roster.utils.email import (
@@ -61,8 +63,10 @@ from .models import (
     GliderReservation,
     MemberBlackout,
     OpsIntent,
+    RosterGenerationJob,
 )
 from .roster_generator import (
+    DUTY_ROLE_TO_ASSIGNMENT_FIELD,
     calculate_assignment_cap,
     count_calendar_months_inclusive,
     generate_roster,
@@ -72,8 +76,25 @@ from .roster_generator import (
     is_within_operational_season,
     resolve_roster_date_range,
 )
+from .utils.calendar_cache import (
+    CALENDAR_CHANGE_FEED_LIMIT,
+    calendar_change_cursor,
+    get_cached_calendar_month,
+    get_calendar_changes,
+)
+from .utils.ics import (
+    get_member_duty_feed,
+    invalidate_member_ics_feeds,
+    member_ics_feed_etag,
+    member_id_from_ics_feed_token,
+)
 from .utils.role_resolution import RoleResolutionService
 from .utils.roles import member_is_commercial_pilot
+from .utils.roster_jobs import (
+    build_roster_draft,
+    enqueue_roster_generation,
+    process_roster_generation_job,
+)
 
 logger = logging.getLogger("duty_roster.views")
 
@@ -113,7 +134,12 @@ def _is_commercial_pilot_qualified(member):
 
 
 def calendar_refresh_response(year, month):
-    """Helper function to create HTMX response that refreshes calendar with month context"""
+    """
+    HTMX response asking the calendar to refresh a month.
+
+    When that month is on screen the client only replays the month's change
+    feed and swaps in the changed day cells; otherwise it loads the month.
+    """
     trigger_data = {"refreshCalendar": {"year": int(year), "month": int(month)}}
     return HttpResponse(headers={"HX-Trigger": json.dumps(trigger_data)})
 
@@ -973,28 +999,21 @@ def _agenda_reservation_period(reservation):
     )
 
 
-def duty_calendar_view(request, year=None, month=None):
-    today = date.today()
-    year = int(year) if year else today.year
-    month = int(month) if month else today.month
-
-    # Get site config for surge thresholds
-    tow_surge_threshold, instruction_surge_threshold = get_surge_thresholds()
-    instruction_max_students_per_instructor = (
-        get_instruction_max_students_per_instructor()
-    )
-
-    site_config = cache.get("siteconfig_instance", _SITECONFIG_CACHE_SENTINEL)
-    if site_config is _SITECONFIG_CACHE_SENTINEL:
-        site_config = SiteConfiguration.objects.first()
-        cache.set("siteconfig_instance", site_config, timeout=60)
+def _build_calendar_month_grid(weeks, site_config):
+    """
+    Build the member-independent part of a calendar month.
 
-    cal = calendar.Calendar(firstweekday=6)
-    weeks = cal.monthdatescalendar(year, month)
+    The result is cached per month (see ``utils.calendar_cache``): assignments
+    with their duty members and role rows, dynamic role labels, every open
+    swap request with its resolved role title, and surge counts. Filtering
+    swaps by who may see them happens per request.
+    """
     first_visible_day = weeks[0][0]
     last_visible_day = weeks[-1][-1]
-    assignments = (
+    visible_dates = [day for week in weeks for day in week]
+    assignments = list(
         DutyAssignment.objects.filter(date__range=(first_visible_day, last_visible_day))
+        .select_related(*DutyAssignment.LEGACY_ROLE_TO_FIELD.values())
         .prefetch_related(
             models.Prefetch(
                 "role_rows",
@@ -1005,9 +1024,7 @@ def duty_calendar_view(request, year=None, month=None):
         )
         .order_by("date")
     )
-    visible_dates = [day for week in weeks for day in week]
 
-    assignments_by_date = {a.date: a for a in assignments}
     role_service = RoleResolutionService(site_configuration=site_config)
     enabled_role_keys = (
         role_service.get_enabled_roles()
@@ -1044,8 +1061,6 @@ def duty_calendar_view(request, year=None, month=None):
         for assignment in assignments
     }
 
-    active_statuses = set(get_active_membership_statuses())
-    open_swap_summary_by_date = {}
     static_swap_role_titles = {
         "DO": (site_config.duty_officer_title if site_config else "Duty Officer"),
         "ADO": (
@@ -1057,32 +1072,11 @@ def duty_calendar_view(request, year=None, month=None):
         "INSTRUCTOR": (site_config.instructor_title if site_config else "Instructor"),
     }
     role_title_cache = {}
-
-    open_swap_queryset = DutySwapRequest.objects.filter(
+    open_swaps = []
+    for open_swap in DutySwapRequest.objects.filter(
         status="open",
         original_date__in=visible_dates,
-    )
-    if request.user.is_authenticated:
-        if not (request.user.is_staff or getattr(request.user, "rostermeister", False)):
-            open_swap_queryset = open_swap_queryset.filter(
-                models.Q(request_type="general")
-                | (
-                    models.Q(request_type="direct")
-                    & (
-                        models.Q(requester=request.user)
-                        | models.Q(direct_request_to=request.user)
-                    )
-                )
-            )
-    else:
-        open_swap_queryset = open_swap_queryset.filter(request_type="general")
-
-    for open_swap in open_swap_queryset.order_by("original_date", "pk"):
-        day_summary = open_swap_summary_by_date.setdefault(
-            open_swap.original_date,
-            {"count": 0, "roles": []},
-        )
-        day_summary["count"] += 1
+    ).order_by("original_date", "pk"):
         cache_key = (
             open_swap.role,
             open_swap.dynamic_role_key,
@@ -1100,9 +1094,116 @@ def duty_calendar_view(request, year=None, month=None):
                     open_swap.role,
                     open_swap.role.replace("_", " ").title(),
                 )
-        role_title = role_title_cache[cache_key]
-        if role_title not in day_summary["roles"]:
-            day_summary["roles"].append(role_title)
+        open_swaps.append(
+            {
+                "date": open_swap.original_date,
+                "role": open_swap.role,
+                "role_title": role_title_cache[cache_key],
+                "request_type": open_swap.request_type,
+                "requester_id": open_swap.requester_id,
+                "direct_request_to_id": open_swap.direct_request_to_id,
+            }
+        )
+
+    # Instruction surge: count non-cancelled InstructionSlots per date.
+    # (The 'instruction' OpsIntent checkbox was removed in Issue #679 as ambiguous;
+    # actual InstructionSlot records are the authoritative signal.)
+    from .models import InstructionSlot as _IS
+
+    instruction_count = defaultdict(int)
+    for row in (
+        _IS.objects.filter(assignment__date__in=visible_dates)
+        .exclude(status="cancelled")
+        .values("assignment__date")
+        .annotate(_count=models.Count("id"))
+    ):
+        instruction_count[row["assignment__date"]] += row["_count"]
+
+    # Tow surge: driven by tow-relevant OpsIntent activity flags (Issue #803).
+    tow_count = defaultdict(int)
+    for intent_date, available_as in OpsIntent.objects.filter(
+        date__in=visible_dates
+    ).values_list("date", "available_as"):
+        if any(key in TOW_INTENT_KEYS for key in available_as or []):
+            tow_count[intent_date] += 1
+
+    return {
+        "assignments_by_date": {a.date: a for a in assignments},
+        "dynamic_role_assignments_by_date": dynamic_role_assignments_by_date,
+        "open_swaps": open_swaps,
+        "instruction_count": dict(instruction_count),
+        "tow_count": dict(tow_count),
+    }
+
+
+def _get_calendar_site_config():
+    site_config = cache.get("siteconfig_instance", _SITECONFIG_CACHE_SENTINEL)
+    if site_config is _SITECONFIG_CACHE_SENTINEL:
+        site_config = SiteConfiguration.objects.first()
+        cache.set("siteconfig_instance", site_config, timeout=60)
+    return site_config
+
+
+def _get_calendar_month_grid(year, month):
+    """Sunday-first weeks of a month and its cached, member-independent grid."""
+    weeks = calendar.Calendar(firstweekday=6).monthdatescalendar(year, month)
+    grid = get_cached_calendar_month(
+        year,
+        month,
+        lambda: _build_calendar_month_grid(weeks, _get_calendar_site_config()),
+    )
+    return weeks, grid
+
+
+def _open_swap_summary_for_viewer(user, open_swaps):
+    """Per-day open swap badges the viewer may see from the cached swap list."""
+    sees_all_swaps = user.is_authenticated and (
+        user.is_staff or getattr(user, "rostermeister", False)
+    )
+    open_swap_summary_by_date = {}
+    for open_swap in open_swaps:
+        if not sees_all_swaps and open_swap["request_type"] != "general":
+            if not user.is_authenticated or open_swap["request_type"] != "direct":
+                continue
+            if user.pk not in (
+                open_swap["requester_id"],
+                open_swap["direct_request_to_id"],
+            ):
+                continue
+        day_summary = open_swap_summary_by_date.setdefault(
+            open_swap["date"],
+            {"count": 0, "roles": []},
+        )
+        day_summary["count"] += 1
+        if open_swap["role_title"] not in day_summary["roles"]:
+            day_summary["roles"].append(open_swap["role_title"])
+    return open_swap_summary_by_date
+
+
+def duty_calendar_view(request, year=None, month=None):
+    today = date.today()
+    year = int(year) if year else today.year
+    month = int(month) if month else today.month
+
+    # Get site config for surge thresholds
+    tow_surge_threshold, instruction_surge_threshold = get_surge_thresholds()
+    instruction_max_students_per_instructor = (
+        get_instruction_max_students_per_instructor()
+    )
+
+    # Taken before the grid so that changes racing this render are replayed
+    # by the client's next change-feed poll.
+    change_cursor = calendar_change_cursor(year, month)
+    weeks, grid = _get_calendar_month_grid(year, month)
+    visible_dates = [day for week in weeks for day in week]
+    site_config = _get_calendar_site_config()
+    assignments_by_date = grid["assignments_by_date"]
+    dynamic_role_assignments_by_date = grid["dynamic_role_assignments_by_date"]
+
+    active_statuses = set(get_active_membership_statuses())
+    open_swap_summary_by_date = _open_swap_summary_for_viewer(
+        request.user, grid["open_swaps"]
+    )
 
     intent_dates = set()
     instruction_dates = set()
@@ -1126,15 +1227,11 @@ def duty_calendar_view(request, year=None, month=None):
             .iterator()
         )
 
-        open_swap_keys = set(
-            DutySwapRequest.objects.filter(
-                requester=request.user,
-                original_date__in=visible_dates,
-                status="open",
-            )
-            .values_list("original_date", "role")
-            .iterator()
-        )
+        open_swap_keys = {
+            (open_swap["date"], open_swap["role"])
+            for open_swap in grid["open_swaps"]
+            if open_swap["requester_id"] == request.user.pk
+        }
 
     agenda_quick_actions_by_date = {}
     for day, assignment in assignments_by_date.items():
@@ -1190,37 +1287,17 @@ def duty_calendar_view(request, year=None, month=None):
 
     prev_year, prev_month, next_year, next_month = get_adjacent_months(year, month)
 
-    # Then safely run these:
-    instruction_count = defaultdict(int)
-    tow_count = defaultdict(int)
-
-    # Instruction surge: count non-cancelled InstructionSlots per date.
-    # (The 'instruction' OpsIntent checkbox was removed in Issue #679 as ambiguous;
-    # actual InstructionSlot records are the authoritative signal.)
-    from .models import InstructionSlot as _IS
-
-    for row in (
-        _IS.objects.filter(assignment__date__in=visible_dates)
-        .exclude(status="cancelled")
-        .values("assignment__date")
-        .annotate(_count=models.Count("id"))
-    ):
-        instruction_count[row["assignment__date"]] += row["_count"]
-
-    # Tow surge: driven by tow-relevant OpsIntent activity flags (Issue #803).
-    intents = OpsIntent.objects.filter(date__in=visible_dates)
-    for intent in intents:
-        roles = intent.available_as or []
-        if any(key in TOW_INTENT_KEYS for key in roles):
-            tow_count[intent.date] += 1
+    instruction_count = grid["instruction_count"]
+    tow_count = grid["tow_count"]
 
     surge_needed_by_date = {}
 
     for day in visible_dates:
         day_date = day if isinstance(day, date) else day.date()
         surge_needed_by_date[day_date] = {
-            "instructor": instruction_count[day_date] >= instruction_surge_threshold,
-            "towpilot": tow_count[day_date] >= tow_surge_threshold,
+            "instructor": instruction_count.get(day_date, 0)
+            >= instruction_surge_threshold,
+            "towpilot": tow_count.get(day_date, 0) >= tow_surge_threshold,
         }
 
     # Add formatted month and date context
@@ -1253,6 +1330,7 @@ def duty_calendar_view(request, year=None, month=None):
         "next_year": next_year,
         "next_month": next_month,
         "today": today,
+        "change_cursor": change_cursor,
         "agenda_quick_actions_by_date": agenda_quick_actions_by_date,
         "agenda_reservation_schedule_by_date": agenda_reservation_schedule_by_date,
         "can_view_agenda_reservations": can_view_agenda_reservations,
@@ -1267,6 +1345,81 @@ def duty_calendar_view(request, year=None, month=None):
     return render(request, "duty_roster/calendar.html", context)
 
 
+@never_cache
+@require_GET
+def calendar_month_changes(request, year, month):
+    """Change feed for an open calendar month: a new cursor and changed days."""
+    cursor, days = get_calendar_changes(year, month, request.GET.get("since"))
+    return JsonResponse(
+        {
+            "cursor": cursor,
+            "full": days is None,
+            "days": [day.isoformat() for day in days or []],
+        }
+    )
+
+
+@never_cache
+@require_GET
+def calendar_month_cells(request, year, month):
+    """Re-render only the requested day cells of a calendar month."""
+    if not 1 <= month <= 12:
+        raise Http404("Invalid month")
+    weeks, grid = _get_calendar_month_grid(year, month)
+    visible_dates = {day for week in weeks for day in week}
+    days = set()
+    for value in request.GET.get("days", "").split(",")[:CALENDAR_CHANGE_FEED_LIMIT]:
+        try:
+            day = date.fromisoformat(value)
+        except ValueError:
+            continue
+        if day in visible_dates:
+            days.add(day)
+
+    context = {
+        "year": year,
+        "month": month,
+        "today": date.today(),
+        "days": sorted(days),
+        "assignments_by_date": grid["assignments_by_date"],
+        "dynamic_role_assignments_by_date": grid["dynamic_role_assignments_by_date"],
+        "open_swap_summary_by_date": _open_swap_summary_for_viewer(
+            request.user, grid["open_swaps"]
+        ),
+    }
+    return render(request, "duty_roster/_calendar_day_cells.html", context)
+
+
+def _member_ics_feed_etag(request, token):
+    member_id = member_id_from_ics_feed_token(token)
+    return member_ics_feed_etag(member_id) if member_id else None
+
+
+@require_GET
+@condition(etag_func=_member_ics_feed_etag)
+def member_ics_feed(request, token):
+    """
+    Subscribable iCalendar feed of a member's upcoming duties.
+
+    Calendar clients cannot log in, so the URL carries a signed member token.
+    Unchanged feeds are answered with 304 from the ETag alone.
+    """
+    member_id = member_id_from_ics_feed_token(token)
+    member = (
+        Member.objects.filter(pk=member_id, is_active=True).first()
+        if member_id
+        else None
+    )
+    if member is None:
+        raise Http404("Unknown calendar feed")
+
+    _etag, content = get_member_duty_feed(member, _member_ics_feed_etag(request, token))
+    response = HttpResponse(content, content_type="text/calendar; charset=utf-8")
+    response["Content-Disposition"] = 'inline; filename="duties.ics"'
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
 def calendar_day_detail(request, year, month, day):
     day_date = date(year, month, day)
     assignment = (
@@ -2910,6 +3063,15 @@ def update_roster_slot(request):
 
             entry["slots"][role] = member_id
 
+            # Hand-picked slots stay fixed when the roster is regenerated.
+            locked = [r for r in entry.get("locked", []) if r != role]
+            if member_id:
+                locked.append(role)
+            if locked:
+                entry["locked"] = locked
+            else:
+                entry.pop("locked", None)
+
             # Clear any stale diagnostics for this role only when the slot is now filled.
             # If the slot is cleared (member_id is empty/None), retain diagnostics so the
             # UI can still explain why the slot is empty.
@@ -3088,6 +3250,111 @@ def _get_removed_dates_from_session(request, start_date, end_date, clean_invalid
     return exclude_dates
 
 
+def _roster_warm_start(request, start_date, end_date, roles):
+    """
+    Return draft entries to warm-start an OR-Tools solve for this range.
+
+    Prefers the session's proposal for the same range (including its
+    hand-picked ``locked`` slots); otherwise falls back to the roster already
+    published for the range.
+    """
+    draft = request.session.get("proposed_roster") or []
+    if draft and _get_proposed_roster_range(request) == (start_date, end_date):
+        return draft
+
+    assignments = DutyAssignment.objects.filter(
+        date__gte=start_date, date__lte=end_date
+    ).prefetch_related("role_rows")
+    warm_start = []
+    for assignment in assignments:
+        role_rows = {row.role_key: row.member_id for row in assignment.role_rows.all()}
+        slots = {}
+        for role in roles:
+            field_name = DUTY_ROLE_TO_ASSIGNMENT_FIELD.get(role)
+            member_id = (
+                getattr(assignment, field_name) if field_name else role_rows.get(role)
+            )
+            if member_id:
+                slots[role] = member_id
+        if slots:
+            warm_start.append({"date": assignment.date.isoformat(), "slots": slots})
+    return warm_start
+
+
+def _start_roster_job(request, start_date, end_date, roles, exclude_dates):
+    """Queue an OR-Tools roster proposal and point the session draft at it."""
+    job = enqueue_roster_generation(
+        request.user,
+        start_date,
+        end_date,
+        roles,
+        exclude_dates,
+        warm_start=_roster_warm_start(request, start_date, end_date, roles),
+    )
+    if getattr(settings, "ROSTER_GENERATION_INLINE", False):
+        process_roster_generation_job(job.pk)
+        job.refresh_from_db()
+
+    request.session["proposed_roster"] = []
+    request.session["proposed_roster_job"] = {"id": job.pk, "loaded": False}
+    _set_proposed_roster_range(request, start_date, end_date)
+    return job
+
+
+def _get_session_roster_job(request, start_date, end_date, roles):
+    """
+    Return the session's roster job if it was generated for this range/roles.
+
+    Removed dates are deliberately not compared: the session draft already
+    reflects removals made after the job finished.
+    """
+    stored = request.session.get("proposed_roster_job")
+    if not isinstance(stored, dict):
+        return None
+
+    job = RosterGenerationJob.objects.filter(pk=stored.get("id")).first()
+    if job is None:
+        return None
+    if (job.start_date, job.end_date, job.roles) != (start_date, end_date, roles):
+        return None
+    return job
+
+
+def _load_roster_job_draft(request, job):
+    """
+    Copy a finished job's draft into the session the first time it is seen.
+
+    A failed job gets a blank fallback draft, but it is not marked loaded:
+    failed jobs are retried by ``process_roster_generation_jobs``, and the
+    result of a successful retry must still replace the fallback.
+    """
+    stored = request.session.get("proposed_roster_job") or {}
+    if stored.get("loaded") or job.is_active:
+        return
+
+    if job.status == RosterGenerationJob.STATUS_READY:
+        request.session["proposed_roster"] = job.result or []
+        request.session["proposed_roster_job"] = {"id": job.pk, "loaded": True}
+        return
+
+    # Keep edits made to an earlier fallback for the same failed job.
+    if stored.get("fallback"):
+        return
+    draft, _ = build_roster_draft(
+        [],
+        job.roles,
+        job.start_date,
+        job.end_date,
+        [dt_date.fromisoformat(d) for d in job.exclude_dates],
+    )
+    request.session["proposed_roster"] = draft
+    request.session["proposed_roster_job"] = {
+        "id": job.pk,
+        "loaded": False,
+        "fallback": True,
+    }
+
+
 @active_member_required
 @user_passes_test(is_rostermeister)
 def propose_roster(request):
@@ -3113,6 +3380,7 @@ def propose_roster(request):
     year, month = range_start.year, range_start.month
     month_span = count_calendar_months_inclusive(range_start, range_end)
     incomplete = False
+    roster_job = None
 
     # Get site config and determine which roles to schedule
     siteconfig = SiteConfiguration.objects.first()
@@ -3231,36 +3499,24 @@ def propose_roster(request):
                 request, range_start, range_end, clean_invalid=True
             )
 
-            raw = generate_roster(
-                year,
-                month,
-                roles=enabled_roles,
-                exclude_dates=exclude_dates,
-                start_date=range_start,
-                end_date=range_end,
-            )
-            if not raw:
-                exclude_set = set(exclude_dates)
-                weekend = [
-                    d
-                    for d in get_weekend_dates_in_range(range_start, range_end)
-                    if is_within_operational_season(d) and d not in exclude_set
-                ]
-                raw = [
-                    {"date": d, "slots": {r: None for r in enabled_roles}}
-                    for d in weekend
-                ]
-                incomplete = True
-            draft = [
-                {
-                    "date": e["date"].isoformat(),
-                    "slots": {r: e["slots"].get(r) for r in enabled_roles},
-                    "diagnostics": e.get("diagnostics", {}),
-                }
-                for e in raw
-            ]
-            request.session["proposed_roster"] = draft
-            _set_proposed_roster_range(request, range_start, range_end)
+            if use_ortools_scheduler:
+                roster_job = _start_roster_job(
+                    request, range_start, range_end, enabled_roles, exclude_dates
+                )
+            else:
+                raw = generate_roster(
+                    year,
+                    month,
+                    roles=enabled_roles,
+                    exclude_dates=exclude_dates,
+                    start_date=range_start,
+                    end_date=range_end,
+                )
+                draft, incomplete = build_roster_draft(
+                    raw, enabled_roles, range_start, range_end, exclude_dates
+                )
+                request.session["proposed_roster"] = draft
+                _set_proposed_roster_range(request, range_start, range_end)
 
         elif action == "publish":
             from .utils.email import send_roster_published_notifications
@@ -3376,6 +3632,11 @@ def propose_roster(request):
                             for row in normalized_role_rows:
                                 row.assignment = assignment
                             DutyAssignmentRole.objects.bulk_create(normalized_role_rows)
+                            # bulk_create skips the signals that refresh
+                            # members' duty feeds.
+                            invalidate_member_ics_feeds(
+                                row.member_id for row in normalized_role_rows
+                            )
 
                 if unsupported_assigned_roles:
                     unsupported_list = ", ".join(sorted(unsupported_assigned_roles))
@@ -3396,6 +3657,7 @@ def propose_roster(request):
 
             request.session.pop("proposed_roster", None)
             request.session.pop("proposed_roster_range", None)
+            request.session.pop("proposed_roster_job", None)
             # Clear removed dates for the current range
             session_key = _removed_dates_session_key(active_start, active_end)
             request.session.pop(session_key, None)
@@ -3481,6 +3743,7 @@ def propose_roster(request):
         elif action == "cancel":
             request.session.pop("proposed_roster", None)
             request.session.pop("proposed_roster_range", None)
+            request.session.pop("proposed_roster_job", None)
             # Clear removed dates for the current range
             session_key = _removed_dates_session_key(active_start, active_end)
             request.session.pop(session_key, None)
@@ -3489,35 +3752,40 @@ def propose_roster(request):
         # Retrieve any previously removed dates for this range
         exclude_dates = _get_removed_dates_from_session(request, range_start, range_end)
 
-        raw = generate_roster(
-            year,
-            month,
-            roles=enabled_roles,
-            exclude_dates=exclude_dates,
-            start_date=range_start,
-            end_date=range_end,
-        )
-        if not raw:
-            exclude_set = set(exclude_dates)
-            weekend = [
-                d
-                for d in get_weekend_dates_in_range(range_start, range_end)
-                if is_within_operational_season(d) and d not in exclude_set
-            ]
-            raw = [
-                {"date": d, "slots": {r: None for r in enabled_roles}} for d in weekend
-            ]
+        if use_ortools_scheduler:
+            # OR-Tools solves run in the background; reuse this range's job so
+            # a reload shows the stored proposal instead of re-solving.
+            roster_job = _get_session_roster_job(
+                request, range_start, range_end, enabled_roles
+            ) or _start_roster_job(
+                request, range_start, range_end, enabled_roles, exclude_dates
+            )
+        else:
+            raw = generate_roster(
+                year,
+                month,
+                roles=enabled_roles,
+                exclude_dates=exclude_dates,
+                start_date=range_start,
+                end_date=range_end,
+            )
+            draft, incomplete = build_roster_draft(
+                raw, enabled_roles, range_start, range_end, exclude_dates
+            )
+            request.session["proposed_roster"] = draft
+            _set_proposed_roster_range(request, range_start, range_end)
+
+    if roster_job is not None:
+        _load_roster_job_draft(request, roster_job)
+        if roster_job.status == RosterGenerationJob.STATUS_READY:
+            incomplete = roster_job.incomplete
+        elif roster_job.status == RosterGenerationJob.STATUS_FAILED:
             incomplete = True
-        draft = [
-            {
-                "date": e["date"].isoformat(),
-                "slots": {r: e["slots"].get(r) for r in enabled_roles},
-                "diagnostics": e.get("diagnostics", {}),
-            }
-            for e in raw
-        ]
-        request.session["proposed_roster"] = draft
-        _set_proposed_roster_range(request, range_start, range_end)
+            messages.error(
+                request,
+                "Roster generation failed. Adjust the range and use "
+                "Generate For Range to try again.",
+            )
     display = [
         {
             "date": dt_date.fromisoformat(e["date"]),
@@ -3552,10 +3820,34 @@ def propose_roster(request):
             "siteconfig": siteconfig,
             "use_ortools_scheduler": use_ortools_scheduler,
             "removed_dates": removed_dates,
+            "roster_job": roster_job,
         },
     )
 
 
+@active_member_required
+@user_passes_test(is_rostermeister)
+@require_GET
+@never_cache
+def roster_generation_job_status(request, pk):
+    """Return progress for an asynchronous roster generation job as JSON."""
+    job = get_object_or_404(RosterGenerationJob, pk=pk)
+    return JsonResponse(
+        {
+            "id": job.pk,
+            "status": job.status,
+            "best_objective": job.best_objective,
+            "solutions_found": job.solutions_found,
+            "elapsed_seconds": job.elapsed_seconds,
+            "queued_at": job.queued_at.isoformat(),
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "completed_at": (
+                job.completed_at.isoformat() if job.completed_at else None
+            ),
+        }
+    )
+
+
 @user_passes_test(
     lambda u: u.is_authenticated
     and (u.rostermeister or u.member_manager or u.director or u.is_superuser)
@@ -6,12 +6,17 @@ legacy and OR-Tools schedulers, and that the feature flag seamlessly
 switches between them without breaking the UI.
 """
 
+from django.test import override_settings
+
 from duty_roster.models import DutyPreference
 from siteconfig.models import SiteConfiguration
 
 from .conftest import DjangoPlaywrightTestCase
 
 
+# OR-Tools proposals are normally solved by a cron worker; solve them inline
+# so the page renders the finished roster.
+@override_settings(ROSTER_GENERATION_INLINE=True)
 class TestORToolsSchedulerIntegration(DjangoPlaywrightTestCase):
     """Test roster generation UI with OR-Tools and legacy schedulers."""
 
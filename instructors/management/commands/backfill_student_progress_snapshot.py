@@ -2,7 +2,7 @@
 
 from django.core.management.base import BaseCommand
 
-from instructors.utils import update_student_progress_snapshot
+from instructors.utils import rebuild_student_progress_snapshots
 from members.models import Member
 from members.utils.membership import get_active_membership_statuses
 
@@ -11,26 +11,29 @@ class Command(BaseCommand):
     help = """
     Backfill StudentProgressSnapshot for all active members.
 
-    This command iterates through every member whose membership_status
-    is in the active statuses configured in siteconfig.MembershipStatus
-    and rebuilds their progress snapshot.
+    This command rebuilds the progress snapshot of every member whose
+    membership_status is in the active statuses configured in
+    siteconfig.MembershipStatus, in one set-based pass over all of them.
     """
 
     def handle(self, *args, **options):
         # Fetch active members
         active_statuses = get_active_membership_statuses()
-        members = Member.objects.filter(membership_status__in=active_statuses)
-        total = members.count()
+        member_ids = list(
+            Member.objects.filter(membership_status__in=active_statuses).values_list(
+                "pk", flat=True
+            )
+        )
+        total = len(member_ids)
         self.stdout.write(
             self.style.NOTICE(f"Starting backfill for {total} active members...")
         )
 
-        # Iterate and update
-        for idx, member in enumerate(members, start=1):
-            update_student_progress_snapshot(member)
-            self.stdout.write(
-                f"[{idx}/{total}] Updated snapshot for {member.full_display_name}"
-            )
+        snapshots = rebuild_student_progress_snapshots(member_ids)
+        with_sessions = sum(1 for snapshot in snapshots.values() if snapshot.sessions)
+        self.stdout.write(
+            f"Rebuilt {len(snapshots)} snapshots ({with_sessions} with instruction)"
+        )
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("instructors", "0004_add_sort_key_to_traininglesson"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="studentprogresssnapshot",
+            name="completed_lessons",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
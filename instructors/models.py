@@ -404,6 +404,12 @@ class MemberQualification(models.Model):
 # - solo_progress: Float [0.0–1.0] percent complete for solo.
 # - checkride_progress: Float [0.0–1.0] percent complete for rating.
 # - sessions: Integer total of ground + flight instruction sessions.
+# - completed_lessons: Per-session lessons at solo / checkride standard,
+#   keyed "report:<pk>" or "ground:<pk>"; lets a single saved session be
+#   applied without re-reading the student's history. Null until the
+#   snapshot is first rebuilt.
+# - training_grid: Compact lesson x session score matrix rendered by the
+#   training grid page (see instructors.utils). Null until first rebuilt.
 # - last_updated: Timestamp auto-updated on save.
 ####################################################
 
@@ -414,6 +420,10 @@ class StudentProgressSnapshot(models.Model):
     checkride_progress = models.FloatField(default=0.0)  # 0.0 to 1.0
     # total instructor sessions
     sessions = models.IntegerField(default=0)
+    # {"report:12": {"solo": [lesson ids], "rating": [lesson ids]}, ...}
+    completed_lessons = models.JSONField(null=True, blank=True)
+    # {"lessons": [lesson ids], "sessions": {"report:12": [date, instructor, "4 3!"]}}
+    training_grid = models.JSONField(null=True, blank=True)
     last_updated = models.DateTimeField(auto_now=True)
 
     def __str__(self):
@@ -2,18 +2,29 @@ import logging
 import sys
 
 from django.apps import apps
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.urls import NoReverseMatch, reverse
 from django.utils import timezone
 
 from notifications.models import Notification
 
-from .models import GroundInstruction, InstructionReport, MemberQualification
+from .models import (
+    GroundInstruction,
+    GroundLessonScore,
+    InstructionReport,
+    LessonScore,
+    MemberQualification,
+    TrainingLesson,
+)
 from .utils import (
     OVERDUE_SPR_NOTIFICATION_FRAGMENT,
     get_instructor_has_overdue_sprs,
-    update_student_progress_snapshot,
+    invalidate_all_overdue_sprs,
+    invalidate_instructor_overdue_sprs,
+    invalidate_lesson_requirement_index,
+    schedule_session_progress_update,
+    schedule_student_progress_rebuild,
 )
 
 logger = logging.getLogger(__name__)
@@ -84,6 +95,25 @@ def notify_student_on_instruction_report(sender, instance, created, **kwargs):
         return
 
 
+# Cached overdue SPR results (instructors.utils) must be dropped before the
+# reminder cleanup below re-checks them, so these receivers come first.
+@receiver(post_save, sender=InstructionReport)
+@receiver(post_delete, sender=InstructionReport)
+def instruction_report_changed_overdue_sprs(sender, instance, **kwargs):
+    # A report moved to another instructor changes both instructors' results.
+    invalidate_instructor_overdue_sprs(
+        getattr(instance, "_previous_instructor_id", None), instance.instructor_id
+    )
+
+
+@receiver(post_save, sender="logsheet.Flight")
+@receiver(post_delete, sender="logsheet.Flight")
+@receiver(post_save, sender="logsheet.Logsheet")
+@receiver(post_delete, sender="logsheet.Logsheet")
+def flights_changed_overdue_sprs(sender, instance, **kwargs):
+    invalidate_all_overdue_sprs()
+
+
 @receiver(post_save, sender=InstructionReport)
 def dismiss_stale_overdue_spr_notifications(sender, instance, **kwargs):
     """Dismiss overdue SPR reminders once an instructor has no overdue SPRs left."""
@@ -232,24 +262,55 @@ def is_safe_to_run_signals():
 ####################################################
 # Signal handlers for updating StudentProgressSnapshot
 #
-# These receivers listen for post-save events on InstructionReport
-# and GroundInstruction models, and trigger a refresh of the
-# StudentProgressSnapshot for the affected student.
+# These receivers listen for saves and deletes of InstructionReport,
+# GroundInstruction and their lesson scores, and queue the affected
+# session for an incremental snapshot update once the transaction commits
+# (see schedule_session_progress_update). TrainingLesson changes invalidate the
+# cached lesson-requirement index.
 ####################################################
 
 
+@receiver(pre_save, sender=InstructionReport)
+@receiver(pre_save, sender=GroundInstruction)
+def remember_stored_session(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Remember the stored student and instructor, so a session moved to
+    another one also updates what was derived for the previous one.
+    """
+    instance._previous_student_id = instance._previous_instructor_id = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not {"student", "instructor"} & set(update_fields):
+        return
+    stored = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list("student_id", "instructor_id")
+        .first()
+    )
+    if stored is not None:
+        instance._previous_student_id, instance._previous_instructor_id = stored
+
+
+def _schedule_previous_student(instance):
+    previous = getattr(instance, "_previous_student_id", None)
+    if previous is not None and previous != instance.student_id:
+        schedule_student_progress_rebuild(previous)
+
+
 @receiver(post_save, sender=InstructionReport)
 def instruction_report_saved(sender, instance, **kwargs):
     """
     Handler for InstructionReport saves.
 
-    Whenever an InstructionReport is created or updated, this
-    signal fires and calls update_student_progress_snapshot()
-    for the report's student to keep the snapshot in sync.
+    Whenever an InstructionReport is created or updated, this signal
+    queues the report so its lesson scores are applied to the student's
+    StudentProgressSnapshot. A report moved to another student also
+    rebuilds the previous student's snapshot.
     """
     if not is_safe_to_run_signals():
         return
-    update_student_progress_snapshot(instance.student)
+    schedule_session_progress_update("report", instance.pk, instance.student_id)
+    _schedule_previous_student(instance)
 
 
 @receiver(post_save, sender=GroundInstruction)
@@ -257,10 +318,49 @@ def ground_instruction_saved(sender, instance, **kwargs):
     """
     Handler for GroundInstruction saves.
 
-    Whenever a GroundInstruction session is created or updated,
-    this signal fires and calls update_student_progress_snapshot()
-    for the session's student to update the snapshot accordingly.
+    Whenever a GroundInstruction session is created or updated, this
+    signal queues the session so its lesson scores are applied to the
+    student's StudentProgressSnapshot (and the previous student's, when
+    the session was moved).
     """
     if not is_safe_to_run_signals():
         return
-    update_student_progress_snapshot(instance.student)
+    schedule_session_progress_update("ground", instance.pk, instance.student_id)
+    _schedule_previous_student(instance)
+
+
+@receiver(post_delete, sender=InstructionReport)
+def instruction_report_deleted(sender, instance, **kwargs):
+    if not is_safe_to_run_signals():
+        return
+    schedule_session_progress_update("report", instance.pk, instance.student_id)
+
+
+@receiver(post_delete, sender=GroundInstruction)
+def ground_instruction_deleted(sender, instance, **kwargs):
+    if not is_safe_to_run_signals():
+        return
+    schedule_session_progress_update("ground", instance.pk, instance.student_id)
+
+
+@receiver(post_save, sender=LessonScore)
+@receiver(post_delete, sender=LessonScore)
+def lesson_score_changed(sender, instance, **kwargs):
+    """Lesson scores are saved after their report; apply them too."""
+    if not is_safe_to_run_signals():
+        return
+    schedule_session_progress_update("report", instance.report_id)
+
+
+@receiver(post_save, sender=GroundLessonScore)
+@receiver(post_delete, sender=GroundLessonScore)
+def ground_lesson_score_changed(sender, instance, **kwargs):
+    if not is_safe_to_run_signals():
+        return
+    schedule_session_progress_update("ground", instance.session_id)
+
+
+@receiver(post_save, sender=TrainingLesson)
+@receiver(post_delete, sender=TrainingLesson)
+def training_lesson_changed(sender, instance, **kwargs):
+    invalidate_lesson_requirement_index()
@@ -1,20 +1,38 @@
 from datetime import date, timedelta
+from unittest.mock import patch
 
 import pytest
+from django.core.cache import cache
+from django.db import connection
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
+from instructors import utils as instructors_utils
 from instructors.models import (
     ClubQualificationType,
     GroundInstruction,
     InstructionReport,
     MemberQualification,
 )
-from instructors.utils import OVERDUE_SPR_NOTIFICATION_FRAGMENT
+from instructors.utils import (
+    OVERDUE_SPR_NOTIFICATION_FRAGMENT,
+    get_instructor_has_overdue_sprs,
+    get_overdue_spr_tuples,
+    invalidate_instructor_overdue_sprs,
+)
 from logsheet.models import Airfield, Flight, Glider, Logsheet
 from members.models import Badge, MemberBadge
 from notifications.context_processors import notifications as notifications_context
 from notifications.models import Notification
+from utils.models import CacheVersion
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
 
 
 def _create_finalized_instructional_flight(
@@ -277,3 +295,130 @@ def test_context_processor_hides_stale_overdue_notification(django_user_model):
 
     assert stale not in rendered_notifications
     assert keep in rendered_notifications
+
+
+@pytest.mark.django_db
+def test_overdue_spr_tuples_cover_all_instructors_in_one_query(django_user_model):
+    instructor_one = django_user_model.objects.create_user(username="inst_t1")
+    instructor_two = django_user_model.objects.create_user(username="inst_t2")
+    student_one = django_user_model.objects.create_user(username="stud_t1")
+    student_two = django_user_model.objects.create_user(username="stud_t2")
+    first_date = timezone.localdate() - timedelta(days=8)
+    second_date = timezone.localdate() - timedelta(days=10)
+
+    for suffix in ("201", "202"):
+        _create_finalized_instructional_flight(
+            instructor=instructor_one,
+            student=student_one,
+            flight_date=first_date,
+            suffix=suffix,
+        )
+    _create_finalized_instructional_flight(
+        instructor=instructor_one,
+        student=student_two,
+        flight_date=second_date,
+        suffix="203",
+    )
+    _create_finalized_instructional_flight(
+        instructor=instructor_two,
+        student=student_two,
+        flight_date=second_date,
+        suffix="204",
+    )
+    InstructionReport.objects.create(
+        student=student_two, instructor=instructor_one, report_date=second_date
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        overdue = get_overdue_spr_tuples()
+
+    # The anti-join, plus one lookup of every instructor's cache version.
+    assert len(queries) == 2
+    assert overdue == {
+        instructor_one.pk: [(student_one.pk, first_date)],
+        instructor_two.pk: [(student_two.pk, second_date)],
+    }
+
+
+@pytest.mark.django_db
+def test_instructor_overdue_check_is_cached_until_report_saved(django_user_model):
+    instructor = django_user_model.objects.create_user(username="inst_c1")
+    student = django_user_model.objects.create_user(username="stud_c1")
+    flight_date = timezone.localdate() - timedelta(days=8)
+    _create_finalized_instructional_flight(
+        instructor=instructor, student=student, flight_date=flight_date, suffix="301"
+    )
+
+    assert get_instructor_has_overdue_sprs(instructor) is True
+    with CaptureQueriesContext(connection) as queries:
+        assert get_instructor_has_overdue_sprs(instructor) is True
+    # Only the shared version lookup; the anti-join is not repeated.
+    assert len(queries) == 1
+
+    InstructionReport.objects.create(
+        student=student, instructor=instructor, report_date=flight_date
+    )
+    # The bump is stored in the database, where every worker reads it.
+    assert CacheVersion.objects.filter(
+        name=f"instructors:overdue_sprs:{instructor.pk}"
+    ).exists()
+
+    assert get_instructor_has_overdue_sprs(instructor) is False
+
+
+@pytest.mark.django_db
+def test_overdue_results_are_cached_under_versions_read_before_the_query(
+    django_user_model,
+):
+    instructor = django_user_model.objects.create_user(username="inst_v1")
+    student = django_user_model.objects.create_user(username="stud_v1")
+    _create_finalized_instructional_flight(
+        instructor=instructor,
+        student=student,
+        flight_date=timezone.localdate() - timedelta(days=8),
+        suffix="401",
+    )
+    flights_missing_reports = instructors_utils._flights_missing_reports
+
+    def report_saved_meanwhile(*args):
+        # Committed after the anti-join's snapshot, so it sees no report.
+        invalidate_instructor_overdue_sprs(instructor.pk)
+        return flights_missing_reports(*args)
+
+    with patch.object(
+        instructors_utils,
+        "_flights_missing_reports",
+        side_effect=report_saved_meanwhile,
+    ):
+        get_overdue_spr_tuples()
+    with CaptureQueriesContext(connection) as queries:
+        get_instructor_has_overdue_sprs(instructor)
+
+    # The stored result predates the bump, so it is not served.
+    assert len(queries) > 1
+
+
+@pytest.mark.django_db
+def test_moving_a_report_to_another_instructor_refreshes_both(django_user_model):
+    first = django_user_model.objects.create_user(username="inst_m1")
+    second = django_user_model.objects.create_user(username="inst_m2")
+    student = django_user_model.objects.create_user(username="stud_m1")
+    flight_date = timezone.localdate() - timedelta(days=8)
+    for instructor, suffix in ((first, "501"), (second, "502")):
+        _create_finalized_instructional_flight(
+            instructor=instructor,
+            student=student,
+            flight_date=flight_date,
+            suffix=suffix,
+        )
+    report = InstructionReport.objects.create(
+        student=student, instructor=first, report_date=flight_date
+    )
+    assert get_instructor_has_overdue_sprs(first) is False
+    assert get_instructor_has_overdue_sprs(second) is True
+
+    report.instructor = second
+    report.save()
+
+    assert get_instructor_has_overdue_sprs(first) is True
+    assert get_instructor_has_overdue_sprs(second) is False
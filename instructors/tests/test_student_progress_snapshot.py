@@ -0,0 +1,238 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models.query import QuerySet
+from django.test.utils import CaptureQueriesContext
+
+from instructors.models import (
+    GroundInstruction,
+    GroundLessonScore,
+    InstructionReport,
+    LessonScore,
+    StudentProgressSnapshot,
+    TrainingLesson,
+)
+from instructors.utils import (
+    schedule_session_progress_update,
+    update_session_progress,
+    update_student_progress_snapshot,
+)
+from members.models import Member
+from siteconfig.models import MembershipStatus
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _member(username, **extra):
+    return Member.objects.create(
+        username=username,
+        email=f"{username}@example.com",
+        membership_status="Full Member",
+        **extra,
+    )
+
+
+@pytest.fixture
+def lessons(db):
+    """a: solo + rating, b: solo only, c: rating only, d: neither."""
+    return {
+        "a": TrainingLesson.objects.create(
+            code="1a", title="A", far_requirement="61.87", pts_reference="I.A"
+        ),
+        "b": TrainingLesson.objects.create(
+            code="1b", title="B", far_requirement="61.87"
+        ),
+        "c": TrainingLesson.objects.create(code="1c", title="C", pts_reference="I.C"),
+        "d": TrainingLesson.objects.create(code="1d", title="D"),
+    }
+
+
+@pytest.fixture
+def history(lessons):
+    student = _member("student")
+    instructor = _member("instructor", instructor=True)
+    report = InstructionReport.objects.create(
+        student=student, instructor=instructor, report_date=date(2026, 5, 1)
+    )
+    LessonScore.objects.create(report=report, lesson=lessons["a"], score="4")
+    LessonScore.objects.create(report=report, lesson=lessons["b"], score="2")
+    ground = GroundInstruction.objects.create(
+        student=student, instructor=instructor, date=date(2026, 5, 2)
+    )
+    GroundLessonScore.objects.create(session=ground, lesson=lessons["b"], score="3")
+    GroundLessonScore.objects.create(session=ground, lesson=lessons["c"], score="!")
+    return student, instructor, report, ground
+
+
+@pytest.mark.django_db
+def test_rebuild_computes_progress_from_both_score_tables(history):
+    student, *_ = history
+
+    snapshot = update_student_progress_snapshot(student)
+
+    snapshot.refresh_from_db()
+    assert snapshot.sessions == 2
+    assert snapshot.solo_progress == 1.0
+    assert snapshot.checkride_progress == 0.5
+
+
+@pytest.mark.django_db
+def test_session_update_matches_full_rebuild(history, lessons):
+    student, instructor, report, ground = history
+    update_student_progress_snapshot(student)
+    for offset in range(10):
+        InstructionReport.objects.create(
+            student=student,
+            instructor=instructor,
+            report_date=date(2026, 1, 1) + timedelta(days=offset),
+        )
+    update_session_progress(
+        ("report", pk, None)
+        for pk in InstructionReport.objects.filter(student=student).values_list(
+            "pk", flat=True
+        )
+    )
+
+    new_report = InstructionReport.objects.create(
+        student=student, instructor=instructor, report_date=date(2026, 6, 1)
+    )
+    LessonScore.objects.create(report=new_report, lesson=lessons["c"], score="4")
+    ground_pk = ground.pk
+    ground.delete()
+    with CaptureQueriesContext(connection) as queries:
+        update_session_progress(
+            [("report", new_report.pk, None), ("ground", ground_pk, student.pk)]
+        )
+
+    incremental = StudentProgressSnapshot.objects.get(student=student)
+    rebuilt = update_student_progress_snapshot(student)
+    assert len(queries) <= 9
+    assert incremental.sessions == rebuilt.sessions == 12
+    assert incremental.solo_progress == rebuilt.solo_progress == 0.5
+    assert incremental.checkride_progress == rebuilt.checkride_progress == 1.0
+    assert incremental.completed_lessons == rebuilt.completed_lessons
+
+
+@pytest.mark.django_db
+def test_session_update_rebuilds_snapshots_without_completed_lessons(history):
+    student, _, report, _ = history
+    StudentProgressSnapshot.objects.create(student=student, sessions=99)
+
+    update_session_progress([("report", report.pk, None)])
+
+    snapshot = StudentProgressSnapshot.objects.get(student=student)
+    assert snapshot.sessions == 2
+    assert snapshot.solo_progress == 1.0
+
+
+@pytest.mark.django_db
+def test_session_update_locks_the_snapshot_rows(history):
+    student, _, report, _ = history
+    update_student_progress_snapshot(student)
+
+    original = QuerySet.select_for_update
+    with patch.object(
+        QuerySet, "select_for_update", autospec=True, side_effect=original
+    ) as select_for_update:
+        update_session_progress([("report", report.pk, None)])
+
+    locked = select_for_update.call_args.args[0]
+    assert locked.model is StudentProgressSnapshot
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("kind", ["report", "ground"])
+def test_session_moved_to_another_student_leaves_the_old_snapshot(
+    history, kind, django_capture_on_commit_callbacks
+):
+    student, _, report, ground = history
+    session = report if kind == "report" else ground
+    other = _member("other")
+    update_student_progress_snapshot(student)
+    update_student_progress_snapshot(other)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        session.student = other
+        session.save()
+
+    old = StudentProgressSnapshot.objects.get(student=student)
+    new = StudentProgressSnapshot.objects.get(student=other)
+    key = f"{kind}:{session.pk}"
+    assert key not in old.completed_lessons
+    assert key not in old.training_grid["sessions"]
+    assert old.sessions == 1
+    assert key in new.completed_lessons
+    assert key in new.training_grid["sessions"]
+    assert new.sessions == 1
+
+
+@pytest.mark.django_db
+def test_scheduled_sessions_are_applied_after_commit(
+    history, django_capture_on_commit_callbacks
+):
+    student, _, report, _ = history
+    update_student_progress_snapshot(student)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        LessonScore.objects.filter(report=report).delete()
+        for _ in range(3):
+            schedule_session_progress_update("report", report.pk)
+        snapshot = StudentProgressSnapshot.objects.get(student=student)
+        assert snapshot.checkride_progress == 0.5
+
+    snapshot.refresh_from_db()
+    assert snapshot.solo_progress == 0.5
+    assert snapshot.checkride_progress == 0.0
+
+
+@pytest.mark.django_db
+def test_sessions_scheduled_in_a_rolled_back_block_are_dropped(
+    history, django_capture_on_commit_callbacks
+):
+    student, instructor, report, _ = history
+    update_student_progress_snapshot(student)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                other = _member("other")
+                lost = InstructionReport.objects.create(
+                    student=other, instructor=instructor, report_date=date(2026, 5, 3)
+                )
+                schedule_session_progress_update("report", lost.pk, other.pk)
+                raise RuntimeError
+        LessonScore.objects.filter(report=report).delete()
+        schedule_session_progress_update("report", report.pk)
+
+    assert list(StudentProgressSnapshot.objects.values_list("student", flat=True)) == [
+        student.pk
+    ]
+    snapshot = StudentProgressSnapshot.objects.get(student=student)
+    assert snapshot.checkride_progress == 0.0
+
+
+@pytest.mark.django_db
+def test_backfill_query_count_does_not_grow_with_members(history):
+    MembershipStatus.objects.get_or_create(
+        name="Full Member", defaults={"is_active": True}
+    )
+    call_command("backfill_student_progress_snapshot")
+    with CaptureQueriesContext(connection) as few:
+        call_command("backfill_student_progress_snapshot")
+    for index in range(15):
+        _member(f"extra{index}")
+    call_command("backfill_student_progress_snapshot")
+    with CaptureQueriesContext(connection) as many:
+        call_command("backfill_student_progress_snapshot")
+
+    assert len(many) == len(few)
+    assert StudentProgressSnapshot.objects.count() == 17
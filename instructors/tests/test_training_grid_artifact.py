@@ -0,0 +1,174 @@
+from datetime import date, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from instructors.models import (
+    GroundInstruction,
+    GroundLessonScore,
+    InstructionReport,
+    LessonScore,
+    StudentProgressSnapshot,
+    TrainingLesson,
+)
+from instructors.utils import (
+    get_student_training_grid,
+    iter_training_grid_sessions,
+    update_session_progress,
+    update_student_progress_snapshot,
+)
+from members.models import Member
+
+START = date(2026, 1, 5)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _member(username, **extra):
+    return Member.objects.create(
+        username=username,
+        email=f"{username}@example.com",
+        membership_status="Full Member",
+        **extra,
+    )
+
+
+@pytest.fixture
+def student(db):
+    return _member("student")
+
+
+@pytest.fixture
+def instructor(db):
+    return _member("instructor", first_name="Ida", last_name="Lane", instructor=True)
+
+
+@pytest.fixture
+def lessons(db):
+    return [
+        TrainingLesson.objects.create(code=f"1.{n}", title=f"Lesson {n}")
+        for n in range(1, 6)
+    ]
+
+
+def _report(student, instructor, offset, scores):
+    report = InstructionReport.objects.create(
+        student=student,
+        instructor=instructor,
+        report_date=START + timedelta(days=offset),
+    )
+    for lesson, score in scores:
+        LessonScore.objects.create(report=report, lesson=lesson, score=score)
+    return report
+
+
+def _sessions(grid):
+    return {
+        kind: iter_training_grid_sessions(grid, kind) for kind in ("report", "ground")
+    }
+
+
+@pytest.mark.django_db
+def test_grid_artifact_holds_each_session_column(student, instructor, lessons):
+    report = _report(student, instructor, 0, [(lessons[0], "2"), (lessons[3], "!")])
+    ground = GroundInstruction.objects.create(
+        student=student, instructor=instructor, date=START
+    )
+    GroundLessonScore.objects.create(session=ground, lesson=lessons[1], score="4")
+
+    grid = get_student_training_grid(student)
+
+    assert _sessions(grid) == {
+        "report": [
+            (report.pk, START, instructor.pk, {lessons[0].pk: "2", lessons[3].pk: "!"})
+        ],
+        "ground": [(ground.pk, START, instructor.pk, {lessons[1].pk: "4"})],
+    }
+
+
+@pytest.mark.django_db
+def test_session_update_matches_rebuilt_grid(student, instructor, lessons):
+    first = _report(student, instructor, 0, [(lessons[0], "1")])
+    second = _report(student, instructor, 1, [(lessons[1], "3")])
+    update_student_progress_snapshot(student)
+
+    LessonScore.objects.filter(report=first).update(score="3")
+    LessonScore.objects.create(report=first, lesson=lessons[4], score="2")
+    second_pk = second.pk
+    second.delete()
+    third = _report(student, instructor, 2, [(lessons[2], "4")])
+    update_session_progress(
+        [
+            ("report", first.pk, None),
+            ("report", second_pk, student.pk),
+            ("report", third.pk, None),
+        ]
+    )
+
+    incremental = StudentProgressSnapshot.objects.get(student=student).training_grid
+    rebuilt = update_student_progress_snapshot(student).training_grid
+    assert _sessions(incremental) == _sessions(rebuilt)
+    assert [pk for pk, *_ in _sessions(incremental)["report"]] == [first.pk, third.pk]
+
+
+@pytest.mark.django_db
+def test_grid_page_query_count_does_not_grow_with_history(
+    client, student, instructor, lessons
+):
+    client.force_login(student)
+    url = reverse("instructors:member_training_grid", args=[student.pk])
+
+    def render_queries():
+        update_student_progress_snapshot(student)
+        client.get(url)  # warm per-request caches
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.status_code == 200
+        return len(queries), response
+
+    for offset in range(2):
+        _report(student, instructor, offset, [(lessons[0], "2")])
+    few, _ = render_queries()
+    for offset in range(2, 20):
+        _report(student, instructor, offset, [(lessons[offset % 5], "3")])
+    many, response = render_queries()
+
+    assert many == few
+    assert len(response.context["column_metadata"]) == 20
+    assert response.context["lesson_data"][0]["max_score"] == "3"
+
+
+@pytest.mark.django_db
+def test_grid_page_renders_sessions_of_missing_instructors(
+    client, student, instructor, lessons
+):
+    report = _report(student, instructor, 0, [(lessons[0], "2")])
+    ground = GroundInstruction.objects.create(
+        student=student, instructor=instructor, date=START + timedelta(days=1)
+    )
+    snapshot = update_student_progress_snapshot(student)
+    missing_id = Member.objects.order_by("-pk").values_list("pk", flat=True)[0] + 1
+    for key in (f"report:{report.pk}", f"ground:{ground.pk}"):
+        snapshot.training_grid["sessions"][key][1] = missing_id
+    snapshot.save(update_fields=["training_grid"])
+    client.force_login(student)
+
+    response = client.get(
+        reverse("instructors:member_training_grid", args=[student.pk])
+    )
+
+    assert response.status_code == 200
+    columns = response.context["column_metadata"]
+    assert [(column["initials"], column["instructor_name"]) for column in columns] == [
+        ("", ""),
+        ("", ""),
+    ]
+    assert response.context["lesson_data"][0]["scores"][0]["score"] == "2"
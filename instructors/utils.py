@@ -1,9 +1,13 @@
 # instructors/utils.py
 
 import logging
-from datetime import timedelta
+import threading
+from datetime import date, timedelta
+from functools import partial
 
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Count, Exists, F, Max, OuterRef, Q, Sum, Value
 from django.db.models.fields import DurationField
 from django.db.models.functions import Coalesce
@@ -12,6 +16,15 @@ from django.utils import timezone
 
 from logsheet.models import Flight
 from siteconfig.models import SiteConfiguration
+from utils.cache import (
+    UNVERSIONED,
+    bump_cache_version,
+    bump_cache_versions,
+    bump_cache_versions_on_commit,
+    get_cache_version,
+    get_cache_versions,
+    get_cache_versions_with_prefix,
+)
 from utils.email import send_mail
 from utils.email_helpers import get_absolute_club_logo_url
 from utils.url_helpers import build_absolute_url, get_canonical_url
@@ -31,6 +44,29 @@ OVERDUE_SPR_NOTIFICATION_FRAGMENT = "overdue Student Progress Report"
 PENDING_SPR_NOTIFICATION_FRAGMENT = "pending Student Progress Report"
 
 
+####################################################
+# Overdue / pending SPR engine
+#
+# A flight needs an SPR when its logsheet is finalized, it has a pilot and an
+# instructor, and no InstructionReport exists for the same instructor,
+# student and flight date. _flights_missing_reports() expresses that as one
+# SQL anti-join (NOT EXISTS) across all instructors, so callers never
+# compare flights against reports in Python.
+#
+# Request-time checks (the notifications context processor, reminder
+# cleanup) read per-instructor results from the cache. Entries are keyed by
+# versions stored in the database (utils.cache), so every worker sees a bump:
+# saving or deleting an InstructionReport bumps its instructor's version, and
+# flight or logsheet changes bump the global one (see instructors/signals.py).
+####################################################
+
+OVERDUE_SPR_MIN_DAYS = 7
+# Only bounds how long a bulk update, which sends no signals, goes unseen.
+OVERDUE_SPR_CACHE_TIMEOUT = 60 * 10
+
+_OVERDUE_SPR_VERSION = "instructors:overdue_sprs"
+
+
 def get_spr_escalation_level(days_overdue):
     """Determine escalation level for an overdue SPR based on age in days."""
     if days_overdue >= 30:
@@ -44,64 +80,154 @@ def get_spr_escalation_level(days_overdue):
     return "NOTICE"
 
 
-def get_overdue_sprs(max_days=30, as_of_date=None, instructor=None):
-    """Return overdue SPR data grouped by instructor.
-
-    A flight is considered overdue when it is at least 7 days old and no
-    InstructionReport exists for the same instructor, student and flight date.
-    """
+def _overdue_window(max_days, as_of_date):
+    """(as_of, first flight date, last flight date) or None when empty."""
     as_of = as_of_date or timezone.localdate()
     cutoff_date = as_of - timedelta(days=max_days)
-    overdue_cutoff = as_of - timedelta(days=7)
-
+    overdue_cutoff = as_of - timedelta(days=OVERDUE_SPR_MIN_DAYS)
     if overdue_cutoff < cutoff_date:
-        return {}
+        return None
+    return as_of, cutoff_date, overdue_cutoff
+
 
-    flights_qs = Flight.objects.filter(
+def _flights_missing_reports(date_from, date_to, instructor=None):
+    """Finalized instructional flights in a date range that have no SPR."""
+    report_exists = InstructionReport.objects.filter(
+        instructor_id=OuterRef("instructor_id"),
+        student_id=OuterRef("pilot_id"),
+        report_date=OuterRef("logsheet__log_date"),
+    )
+    flights = Flight.objects.filter(
+        ~Exists(report_exists),
         instructor__isnull=False,
         pilot__isnull=False,
         logsheet__finalized=True,
-        logsheet__log_date__gte=cutoff_date,
-        logsheet__log_date__lte=overdue_cutoff,
+        logsheet__log_date__gte=date_from,
+        logsheet__log_date__lte=date_to,
     )
-
     if instructor is not None:
-        flights_qs = flights_qs.filter(instructor=instructor)
+        flights = flights.filter(instructor=instructor)
+    return flights
 
-    flights = list(
-        flights_qs.select_related("instructor", "pilot", "logsheet").order_by(
-            "logsheet__log_date", "instructor", "pilot"
-        )
+
+def _instructor_overdue_spr_version(instructor_id):
+    return f"{_OVERDUE_SPR_VERSION}:{instructor_id}"
+
+
+def _overdue_spr_versions(instructor_ids=None):
+    """
+    The global and per-instructor version tokens (every instructor's when
+    ``instructor_ids`` is None), in one query. Read them before computing
+    the results they will key, so a bump made meanwhile is not hidden.
+    """
+    if instructor_ids is None:
+        return get_cache_versions_with_prefix(_OVERDUE_SPR_VERSION)
+    return get_cache_versions(
+        [
+            _OVERDUE_SPR_VERSION,
+            *map(_instructor_overdue_spr_version, instructor_ids),
+        ]
     )
 
-    if not flights:
-        return {}
 
-    report_qs = InstructionReport.objects.filter(
-        report_date__gte=cutoff_date,
-        report_date__lt=as_of,
+def _overdue_spr_cache_key(versions, instructor_id, as_of, max_days):
+    global_version = versions.get(_OVERDUE_SPR_VERSION, UNVERSIONED)
+    version = versions.get(_instructor_overdue_spr_version(instructor_id), UNVERSIONED)
+    return (
+        f"instructors:overdue_sprs:{global_version}:"
+        f"{version}:{instructor_id}:{as_of.isoformat()}:{max_days}"
+    )
+
+
+def invalidate_instructor_overdue_sprs(*instructor_ids):
+    """
+    Drop cached overdue SPRs for the given instructors (a report was saved,
+    possibly moving it from one instructor to another).
+    """
+    bump_cache_versions(
+        _instructor_overdue_spr_version(instructor_id)
+        for instructor_id in instructor_ids
+        if instructor_id is not None
     )
 
+
+def invalidate_all_overdue_sprs():
+    """
+    Drop every cached overdue SPR result (flights or logsheets changed) once
+    the transaction commits; a bulk flight sync bumps the version once.
+    """
+    bump_cache_versions_on_commit([_OVERDUE_SPR_VERSION])
+
+
+def get_overdue_spr_tuples(max_days=30, as_of_date=None, instructor=None):
+    """
+    Overdue SPRs as ``{instructor_id: [(student_id, flight_date), ...]}``
+    for all instructors (or one), from a single anti-join query.
+
+    The per-instructor results are cached for request-time checks.
+    """
+    window = _overdue_window(max_days, as_of_date)
+    if window is None:
+        return {}
+    as_of, cutoff_date, overdue_cutoff = window
+
+    versions = _overdue_spr_versions(None if instructor is None else [instructor.pk])
+    overdue = {}
+    for instructor_id, student_id, flight_date in (
+        _flights_missing_reports(cutoff_date, overdue_cutoff, instructor)
+        .values_list("instructor_id", "pilot_id", "logsheet__log_date")
+        .distinct()
+        .order_by("instructor_id", "logsheet__log_date", "pilot_id")
+    ):
+        overdue.setdefault(instructor_id, []).append((student_id, flight_date))
+
     if instructor is not None:
-        report_qs = report_qs.filter(instructor=instructor)
-    else:
-        report_qs = report_qs.filter(
-            instructor_id__in={flight.instructor_id for flight in flights}
-        )
+        overdue.setdefault(instructor.pk, [])
+    cache.set_many(
+        {
+            _overdue_spr_cache_key(versions, instructor_id, as_of, max_days): tuples
+            for instructor_id, tuples in overdue.items()
+        },
+        OVERDUE_SPR_CACHE_TIMEOUT,
+    )
+    return overdue
+
+
+def get_instructor_overdue_spr_tuples(instructor, max_days=30, as_of_date=None):
+    """Cached ``[(student_id, flight_date), ...]`` overdue for one instructor."""
+    window = _overdue_window(max_days, as_of_date)
+    if window is None:
+        return []
+    versions = _overdue_spr_versions([instructor.pk])
+    tuples = cache.get(
+        _overdue_spr_cache_key(versions, instructor.pk, window[0], max_days)
+    )
+    if tuples is None:
+        tuples = get_overdue_spr_tuples(max_days, window[0], instructor)[instructor.pk]
+    return tuples
+
+
+def get_overdue_sprs(max_days=30, as_of_date=None, instructor=None):
+    """Return overdue SPR data grouped by instructor.
 
-    existing_reports = set(
-        report_qs.values_list("instructor_id", "student_id", "report_date")
+    A flight is considered overdue when it is at least 7 days old and no
+    InstructionReport exists for the same instructor, student and flight date.
+    """
+    window = _overdue_window(max_days, as_of_date)
+    if window is None:
+        return {}
+    as_of, cutoff_date, overdue_cutoff = window
+
+    flights = (
+        _flights_missing_reports(cutoff_date, overdue_cutoff, instructor)
+        .select_related("instructor", "pilot", "logsheet")
+        .order_by("logsheet__log_date", "instructor", "pilot")
     )
 
     overdue_by_instructor = {}
     for flight in flights:
         flight_date = flight.logsheet.log_date
         days_since_flight = (as_of - flight_date).days
-
-        report_key = (flight.instructor_id, flight.pilot_id, flight_date)
-        if report_key in existing_reports:
-            continue
-
         overdue_by_instructor.setdefault(flight.instructor, []).append(
             {
                 "flight": flight,
@@ -123,48 +249,20 @@ def get_pending_sprs_for_date(flight_date, instructor=None):
     instructor, student, and flight date. Multiple flights for the same
     instructor/student/date are consolidated into a single reminder entry.
     """
-    flights_qs = Flight.objects.filter(
-        instructor__isnull=False,
-        pilot__isnull=False,
-        logsheet__finalized=True,
-        logsheet__log_date=flight_date,
-    )
-
-    if instructor is not None:
-        flights_qs = flights_qs.filter(instructor=instructor)
-
-    flights = list(
-        flights_qs.select_related("instructor", "pilot", "logsheet").order_by(
-            "instructor", "pilot"
-        )
-    )
-
-    if not flights:
-        return {}
-
-    report_qs = InstructionReport.objects.filter(report_date=flight_date)
-    if instructor is not None:
-        report_qs = report_qs.filter(instructor=instructor)
-    else:
-        report_qs = report_qs.filter(
-            instructor_id__in={flight.instructor_id for flight in flights}
-        )
-
-    existing_reports = set(
-        report_qs.values_list("instructor_id", "student_id", "report_date")
+    flights = (
+        _flights_missing_reports(flight_date, flight_date, instructor)
+        .select_related("instructor", "pilot", "logsheet")
+        .order_by("instructor", "pilot")
     )
 
     pending_by_instructor = {}
     seen = set()
     for flight in flights:
-        report_key = (flight.instructor_id, flight.pilot_id, flight_date)
+        report_key = (flight.instructor_id, flight.pilot_id)
         if report_key in seen:
             continue
         seen.add(report_key)
 
-        if report_key in existing_reports:
-            continue
-
         pending_by_instructor.setdefault(flight.instructor, []).append(
             {
                 "flight": flight,
@@ -189,37 +287,12 @@ def get_instructor_overdue_spr_count(instructor, max_days=30, as_of_date=None):
 def get_instructor_has_overdue_sprs(instructor, max_days=30, as_of_date=None):
     """Return True when instructor has at least one overdue SPR.
 
-    This uses a DB-side EXISTS check and avoids materializing full overdue
-    flight/report datasets in Python for request-time checks.
+    Reads the instructor's cached overdue (student, date) tuples, computing
+    them with one anti-join query on a miss.
     """
     if not instructor:
         return False
-
-    as_of = as_of_date or timezone.localdate()
-    cutoff_date = as_of - timedelta(days=max_days)
-    overdue_cutoff = as_of - timedelta(days=7)
-
-    if overdue_cutoff < cutoff_date:
-        return False
-
-    report_exists = InstructionReport.objects.filter(
-        instructor_id=OuterRef("instructor_id"),
-        student_id=OuterRef("pilot_id"),
-        report_date=OuterRef("logsheet__log_date"),
-    )
-
-    return (
-        Flight.objects.filter(
-            instructor=instructor,
-            pilot__isnull=False,
-            logsheet__finalized=True,
-            logsheet__log_date__gte=cutoff_date,
-            logsheet__log_date__lte=overdue_cutoff,
-        )
-        .annotate(has_report=Exists(report_exists))
-        .filter(has_report=False)
-        .exists()
-    )
+    return bool(get_instructor_overdue_spr_tuples(instructor, max_days, as_of_date))
 
 
 def is_overdue_spr_notification_message(message):
@@ -551,67 +624,362 @@ def get_logbook_glider_time_summary(member):
 
 
 ####################################################
-# update_student_progress_snapshot
+# Student progress snapshots
+#
+# StudentProgressSnapshot keeps two per-session artifacts for each student,
+# both keyed "report:<pk>" / "ground:<pk>":
 #
-# Recomputes (or creates) a StudentProgressSnapshot for the given student.
-# - sessions: total number of InstructionReport + GroundInstruction entries
-# - solo_progress: fraction of solo-required lessons with score ≥3
-# - checkride_progress: fraction of rating-required lessons with score ==4
+# - completed_lessons: lessons scored at solo standard (3 or 4) and at
+#   checkride standard (4). Progress is the share of required lessons found
+#   in their union, using a cached lesson-requirement index.
+# - training_grid: the lesson x session score matrix behind the training
+#   grid page. "lessons" lists the lesson ids that index each session's
+#   score string, one character per lesson (scores are single characters,
+#   GRID_NO_SCORE for none); "sessions" maps each session to
+#   [date, instructor id, score string].
 #
-# Automatically updates last_updated timestamp.
+# - update_session_progress() applies saved or deleted sessions by reading
+#   only their own rows (a fixed handful of queries, however long the
+#   student's history);
+# - rebuild_student_progress_snapshots() recomputes any number of students
+#   in one set-based pass (used by the backfill command and for snapshots
+#   that predate these fields);
+# - update_student_progress_snapshot() rebuilds a single student.
+#
+# Signals call schedule_session_progress_update(), which applies each
+# session touched in a transaction once, after commit.
 ####################################################
-def update_student_progress_snapshot(student):
-    snapshot, _ = StudentProgressSnapshot.objects.get_or_create(student=student)
-
-    # 1. Session counting
-    report_sessions = InstructionReport.objects.filter(student=student).count()
-    ground_sessions = GroundInstruction.objects.filter(student=student).count()
-    snapshot.sessions = report_sessions + ground_sessions
-
-    # 2. Identify required lesson IDs
-    lessons = list(TrainingLesson.objects.all())
-    solo_ids = [l.id for l in lessons if l.far_requirement]
-    rating_ids = [l.id for l in lessons if l.is_required_for_private()]
-
-    solo_total = len(solo_ids)
-    rating_total = len(rating_ids)
-
-    # 3. Collect completed lesson IDs from both scoring tables
-    ls_solo = set(
-        LessonScore.objects.filter(
-            report__student=student, lesson_id__in=solo_ids, score__gte="3"
-        ).values_list("lesson_id", flat=True)
+
+LESSON_REQUIREMENTS_CACHE_KEY = "instructors:lesson_requirements"
+LESSON_REQUIREMENTS_CACHE_TIMEOUT = 60 * 15
+
+SOLO_STANDARD_SCORES = ("3", "4")
+CHECKRIDE_STANDARD_SCORES = ("4",)
+GRID_NO_SCORE = " "
+
+_SESSION_SOURCES = {
+    "report": (InstructionReport, LessonScore, "report", "report_date"),
+    "ground": (GroundInstruction, GroundLessonScore, "session", "date"),
+}
+
+_progress_commits = threading.local()
+
+
+def get_lesson_requirement_index():
+    """
+    Cached ``{"solo": frozenset, "rating": frozenset}`` of TrainingLesson ids
+    required for solo (``far_requirement``) and for the rating
+    (``pts_reference``). Saving or deleting a TrainingLesson bumps the
+    shared version in the key (see invalidate_lesson_requirement_index).
+    """
+    key = (
+        f"{LESSON_REQUIREMENTS_CACHE_KEY}:"
+        f"{get_cache_version(LESSON_REQUIREMENTS_CACHE_KEY)}"
     )
-    gs_solo = set(
-        GroundLessonScore.objects.filter(
-            session__student=student, lesson_id__in=solo_ids, score__gte="3"
-        ).values_list("lesson_id", flat=True)
+    index = cache.get(key)
+    if index is None:
+        solo, rating = set(), set()
+        for pk, far_requirement, pts_reference in TrainingLesson.objects.values_list(
+            "pk", "far_requirement", "pts_reference"
+        ):
+            if far_requirement:
+                solo.add(pk)
+            if pts_reference:
+                rating.add(pk)
+        index = {"solo": frozenset(solo), "rating": frozenset(rating)}
+        cache.set(key, index, LESSON_REQUIREMENTS_CACHE_TIMEOUT)
+    return index
+
+
+def invalidate_lesson_requirement_index():
+    bump_cache_version(LESSON_REQUIREMENTS_CACHE_KEY)
+
+
+def _session_key(kind, pk):
+    return f"{kind}:{pk}"
+
+
+def _load_sessions(kind, **filters):
+    """
+    ``{pk: (student_id, date, instructor_id, [(lesson_id, score), ...])}``
+    for the sessions of one kind matching ``filters``, in two queries.
+    """
+    session_model, score_model, session_field, date_field = _SESSION_SOURCES[kind]
+    sessions = {
+        pk: (student_id, day, instructor_id, [])
+        for pk, student_id, day, instructor_id in session_model.objects.filter(
+            **filters
+        ).values_list("pk", "student_id", date_field, "instructor_id")
+    }
+    score_filters = {
+        f"{session_field}__{lookup}": value for lookup, value in filters.items()
+    }
+    for session_id, lesson_id, score in score_model.objects.filter(
+        **score_filters
+    ).values_list(session_field, "lesson_id", "score"):
+        if session_id in sessions:
+            sessions[session_id][3].append((lesson_id, score))
+    return sessions
+
+
+def _completed_entry(scores):
+    """{"solo": [...], "rating": [...]} from one session's (lesson_id, score)s."""
+    solo = sorted({lid for lid, score in scores if score in SOLO_STANDARD_SCORES})
+    rating = sorted(
+        {lid for lid, score in scores if score in CHECKRIDE_STANDARD_SCORES}
     )
+    return {"solo": solo, "rating": rating}
+
+
+def _set_grid_session(grid, key, day, instructor_id, scores):
+    """Store one session's column in the grid, adding lesson rows as needed."""
+    lessons = grid["lessons"]
+    positions = {lesson_id: index for index, lesson_id in enumerate(lessons)}
+    cells = []
+    for lesson_id, score in scores:
+        if lesson_id not in positions:
+            positions[lesson_id] = len(lessons)
+            lessons.append(lesson_id)
+        index = positions[lesson_id]
+        cells.extend(GRID_NO_SCORE * (index + 1 - len(cells)))
+        cells[index] = score
+    grid["sessions"][key] = [day.isoformat(), instructor_id, "".join(cells)]
+
+
+def iter_training_grid_sessions(grid, kind):
+    """
+    ``(pk, date, instructor_id, {lesson_id: score})`` for the grid's
+    sessions of one kind, ordered by date then pk.
+    """
+    lessons = grid["lessons"]
+    prefix = f"{kind}:"
+    rows = []
+    for key, (day, instructor_id, cells) in grid["sessions"].items():
+        if not key.startswith(prefix):
+            continue
+        scores = {
+            lessons[index]: score
+            for index, score in enumerate(cells)
+            if score != GRID_NO_SCORE
+        }
+        rows.append(
+            (int(key[len(prefix) :]), date.fromisoformat(day), instructor_id, scores)
+        )
+    rows.sort(key=lambda row: (row[1], row[0]))
+    return rows
 
-    ls_rating = set(
-        LessonScore.objects.filter(
-            report__student=student, lesson_id__in=rating_ids, score="4"
-        ).values_list("lesson_id", flat=True)
+
+def _apply_completed_lessons(snapshot, completed, index):
+    """Set snapshot counters from its per-session completed lessons."""
+    solo_done, rating_done = set(), set()
+    for entry in completed.values():
+        solo_done.update(entry["solo"])
+        rating_done.update(entry["rating"])
+    solo_ids, rating_ids = index["solo"], index["rating"]
+
+    snapshot.completed_lessons = completed
+    snapshot.sessions = len(completed)
+    snapshot.solo_progress = (
+        len(solo_done & solo_ids) / len(solo_ids) if solo_ids else 0.0
     )
-    gs_rating = set(
-        GroundLessonScore.objects.filter(
-            session__student=student, lesson_id__in=rating_ids, score="4"
-        ).values_list("lesson_id", flat=True)
+    snapshot.checkride_progress = (
+        len(rating_done & rating_ids) / len(rating_ids) if rating_ids else 0.0
     )
+    snapshot.last_updated = timezone.now()
 
-    # 4. Compute progress ratios
-    solo_done = ls_solo.union(gs_solo)
-    rating_done = ls_rating.union(gs_rating)
 
-    snapshot.solo_progress = (len(solo_done) / solo_total) if solo_total else 0.0
-    snapshot.checkride_progress = (
-        (len(rating_done) / rating_total) if rating_total else 0.0
+_SNAPSHOT_FIELDS = [
+    "completed_lessons",
+    "training_grid",
+    "sessions",
+    "solo_progress",
+    "checkride_progress",
+    "last_updated",
+]
+
+
+def rebuild_student_progress_snapshots(students):
+    """
+    Recompute (or create) snapshots for ``students`` (Members or pks) with a
+    fixed number of queries, whatever the number of students.
+
+    Returns the snapshots keyed by student pk.
+    """
+    student_ids = {getattr(student, "pk", student) for student in students}
+    if not student_ids:
+        return {}
+
+    with transaction.atomic():
+        # Lock the rows before reading sessions so an incremental update
+        # committed meanwhile is not overwritten by an older full rebuild.
+        snapshots = _lock_snapshots(student_ids)
+        completed = {student_id: {} for student_id in student_ids}
+        grids = {
+            student_id: {"lessons": [], "sessions": {}} for student_id in student_ids
+        }
+        for kind in _SESSION_SOURCES:
+            sessions = _load_sessions(kind, student_id__in=student_ids)
+            for pk, (student_id, day, instructor_id, scores) in sorted(
+                sessions.items()
+            ):
+                key = _session_key(kind, pk)
+                completed[student_id][key] = _completed_entry(scores)
+                _set_grid_session(grids[student_id], key, day, instructor_id, scores)
+        _save_rebuilt_snapshots(snapshots, student_ids, completed, grids)
+    return snapshots
+
+
+def _lock_snapshots(student_ids):
+    """The students' existing snapshots keyed by student pk, row-locked."""
+    return {
+        snapshot.student_id: snapshot
+        for snapshot in StudentProgressSnapshot.objects.select_for_update()
+        .filter(student_id__in=student_ids)
+        .order_by("student_id")
+    }
+
+
+def _save_rebuilt_snapshots(snapshots, student_ids, completed, grids):
+    index = get_lesson_requirement_index()
+    missing = []
+    for student_id in student_ids:
+        snapshot = snapshots.get(student_id)
+        if snapshot is None:
+            snapshot = snapshots[student_id] = StudentProgressSnapshot(
+                student_id=student_id
+            )
+            missing.append(snapshot)
+        snapshot.training_grid = grids[student_id]
+        _apply_completed_lessons(snapshot, completed[student_id], index)
+
+    existing = [snapshot for snapshot in snapshots.values() if snapshot.pk]
+    StudentProgressSnapshot.objects.bulk_update(existing, _SNAPSHOT_FIELDS)
+    StudentProgressSnapshot.objects.bulk_create(missing)
+
+
+def update_student_progress_snapshot(student):
+    """Recompute (or create) the StudentProgressSnapshot for one student."""
+    return rebuild_student_progress_snapshots([student])[student.pk]
+
+
+def get_student_training_grid(student):
+    """
+    The student's training grid artifact (see above), read from the
+    snapshot; built on first use.
+    """
+    snapshot = (
+        StudentProgressSnapshot.objects.filter(student=student)
+        .only("training_grid")
+        .first()
     )
+    if snapshot is None or snapshot.training_grid is None:
+        snapshot = update_student_progress_snapshot(student)
+    return snapshot.training_grid
 
-    # 5. Save and timestamp
-    snapshot.last_updated = timezone.now()
-    snapshot.save()
-    return snapshot
+
+def update_session_progress(sessions):
+    """
+    Apply saved or deleted sessions to their students' snapshots.
+
+    ``sessions`` is an iterable of ``(kind, pk, student_id)`` with kind
+    ``"report"`` (InstructionReport) or ``"ground"`` (GroundInstruction).
+    ``student_id`` is only needed for sessions that no longer exist. Reads
+    just these sessions' rows; students whose snapshot is missing or
+    predates the per-session fields are rebuilt in full instead.
+    """
+    by_kind = {}
+    for kind, pk, student_id in sessions:
+        by_kind.setdefault(kind, {})[pk] = student_id
+
+    # key -> (student_id, (date, instructor_id, scores) or None when gone)
+    changes = {}
+    for kind, pks in by_kind.items():
+        loaded = _load_sessions(kind, pk__in=list(pks))
+        for pk, hint in pks.items():
+            if pk in loaded:
+                student_id, *session = loaded[pk]
+                changes[_session_key(kind, pk)] = (student_id, session)
+            elif hint is not None:
+                changes[_session_key(kind, pk)] = (hint, None)
+
+    student_ids = {student_id for student_id, _ in changes.values()}
+    if not student_ids:
+        return
+    with transaction.atomic():
+        # The JSON fields are read-modify-write: hold the rows until commit so
+        # concurrent updates for the same student apply one after the other.
+        _apply_session_changes(_lock_snapshots(student_ids), student_ids, changes)
+
+
+def _apply_session_changes(snapshots, student_ids, changes):
+    rebuild = {
+        student_id
+        for student_id in student_ids
+        if student_id not in snapshots
+        or snapshots[student_id].completed_lessons is None
+        or snapshots[student_id].training_grid is None
+    }
+
+    index = get_lesson_requirement_index()
+    updated = []
+    for student_id, snapshot in snapshots.items():
+        if student_id in rebuild:
+            continue
+        completed = dict(snapshot.completed_lessons)
+        grid = snapshot.training_grid
+        for key, (owner, session) in changes.items():
+            if owner != student_id:
+                continue
+            if session is None:
+                completed.pop(key, None)
+                grid["sessions"].pop(key, None)
+            else:
+                day, instructor_id, scores = session
+                completed[key] = _completed_entry(scores)
+                _set_grid_session(grid, key, day, instructor_id, scores)
+        snapshot.training_grid = grid
+        _apply_completed_lessons(snapshot, completed, index)
+        updated.append(snapshot)
+    StudentProgressSnapshot.objects.bulk_update(updated, _SNAPSHOT_FIELDS)
+
+    if rebuild:
+        rebuild_student_progress_snapshots(rebuild)
+
+
+def _apply_scheduled_session(applied, kind, pk, student_id):
+    # ``applied`` is shared by the callbacks of one commit; a session already
+    # applied is skipped unless this call knows a student the first did not.
+    known = applied.get((kind, pk))
+    if known or (known is not None and student_id is None):
+        return
+    applied[(kind, pk)] = student_id is not None
+    update_session_progress([(kind, pk, student_id)])
+
+
+def schedule_session_progress_update(kind, pk, student_id=None):
+    """
+    Queue a session for ``update_session_progress`` once the current
+    transaction commits. Sessions touched several times in one transaction
+    (a report and each of its scores) are applied once. Each call registers
+    its own callback, so sessions queued in a transaction or savepoint that
+    rolls back are dropped with it.
+    """
+    applied = getattr(_progress_commits, "applied", None)
+    if applied is None or applied:
+        # A non-empty dict belongs to a commit whose callbacks already ran.
+        applied = _progress_commits.applied = {}
+    transaction.on_commit(
+        partial(_apply_scheduled_session, applied, kind, pk, student_id)
+    )
+
+
+def schedule_student_progress_rebuild(student_id):
+    """
+    Rebuild ``student_id``'s snapshot once the current transaction commits;
+    used when a session moves to another student, which the incremental
+    update only applies to the new one.
+    """
+    transaction.on_commit(partial(rebuild_student_progress_snapshots, [student_id]))
 
 
 ####################################################
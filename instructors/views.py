@@ -56,7 +56,9 @@ from instructors.utils import (
     classify_logbook_flight_minutes,
     get_flight_summary_for_member,
     get_logbook_glider_time_summary,
+    get_student_training_grid,
     has_logbook_instructor_context,
+    iter_training_grid_sessions,
     send_instruction_report_email,
 )
 from knowledgetest.forms import TestBuilderForm
@@ -293,18 +295,21 @@ def fill_instruction_report(request, student_id, report_date):
         formset = LessonScoreSimpleFormSet(request.POST)
 
         if report_form.is_valid() and formset.is_valid():
-            # save the InstructionReport (new or existing)
-            report = report_form.save()
-
-            # clear & recreate the LessonScores
-            LessonScore.objects.filter(report=report).delete()
-            for form in formset.cleaned_data:
-                lesson = form.get("lesson")
-                score = form.get("score")
-                if lesson and score:
-                    LessonScore.objects.create(
-                        report=report, lesson=lesson, score=score
-                    )
+            # One transaction so the report and its scores reach the
+            # progress snapshot as a single update.
+            with transaction.atomic():
+                # save the InstructionReport (new or existing)
+                report = report_form.save()
+
+                # clear & recreate the LessonScores
+                LessonScore.objects.filter(report=report).delete()
+                for form in formset.cleaned_data:
+                    lesson = form.get("lesson")
+                    score = form.get("score")
+                    if lesson and score:
+                        LessonScore.objects.create(
+                            report=report, lesson=lesson, score=score
+                        )
 
             # Check if qualification data was included and process it
             qual_qualification_id = request.POST.get("qual_qualification")
@@ -568,20 +573,19 @@ def get_instructor_initials(member):
 @active_member_required
 def member_training_grid(request, member_id):
     member = get_object_or_404(Member, pk=member_id)
-    # Fetch all reports and prefetch lesson scores and instructors
-    reports = (
-        InstructionReport.objects.filter(student=member)
-        .order_by("report_date", "id")
-        .select_related("instructor")
-        .prefetch_related("lesson_scores__lesson")
-    )
     if request.user != member and not request.user.instructor:
         raise PermissionDenied
 
+    # Reports, ground sessions and their scores come from the student's
+    # precomputed grid artifact (one read; kept current as they are saved).
+    # Each entry is (pk, date, instructor_id, {lesson_id: score}).
+    grid = get_student_training_grid(member)
+    report_entries = iter_training_grid_sessions(grid, "report")
+    ground_sessions = iter_training_grid_sessions(grid, "ground")
+
     # Keep one grid column per saved report and add a pending column for
     # any flight instructor/date pair that does not yet have a report.
-    report_entries = list(reports)
-    lessons = TrainingLesson.objects.all().order_by("sort_key")
+    lessons = TrainingLesson.objects.select_related("phase").order_by("sort_key")
 
     def score_rank(score):
         if score and score.isdigit():
@@ -597,25 +601,19 @@ def member_training_grid(request, member_id):
 
     # Build lookup for report scores by (lesson_id, report_id)
     scores_lookup = {
-        (sc.lesson_id, rep.id): sc.score
-        for rep in report_entries
-        for sc in rep.lesson_scores.all()
+        (lesson_id, report_id): score
+        for report_id, _, _, scores in report_entries
+        for lesson_id, score in scores.items()
     }
 
     # Build lookup for ground scores by (lesson_id, date, instructor_id),
     # keeping best score when multiple ground sessions exist on the same day.
     ground_scores_lookup = defaultdict(str)
-    ground_sessions = (
-        GroundInstruction.objects.filter(student=member)
-        .select_related("instructor")
-        .prefetch_related("lesson_scores")
-        .order_by("date", "id")
-    )
-    for session in ground_sessions:
-        for score in session.lesson_scores.all():
-            key = (score.lesson_id, session.date, session.instructor_id)
+    for _, session_date, instructor_id, scores in ground_sessions:
+        for lesson_id, score in scores.items():
+            key = (lesson_id, session_date, instructor_id)
             ground_scores_lookup[key] = pick_best_score(
-                ground_scores_lookup[key], score.score
+                ground_scores_lookup[key], score
             )
 
     today = now().date()
@@ -624,8 +622,9 @@ def member_training_grid(request, member_id):
     report_entries_by_date = defaultdict(list)
     existing_report_keys = set()
     for report in report_entries:
-        report_entries_by_date[report.report_date].append(report)
-        existing_report_keys.add((report.report_date, report.instructor_id))
+        _, report_date, instructor_id, _ = report
+        report_entries_by_date[report_date].append(report)
+        existing_report_keys.add((report_date, instructor_id))
 
     # Build pending columns from distinct instructor/date flight pairs, bounded to
     # a recent window to avoid scanning/loading a student's full flight history.
@@ -655,13 +654,17 @@ def member_training_grid(request, member_id):
             }
         )
 
-    pending_instructors_by_id = Member.objects.filter(
+    # The artifact may name an instructor that no longer exists; such columns
+    # are kept with a blank heading rather than failing the page.
+    instructors_by_id = Member.objects.filter(
         id__in=pending_instructor_ids
+        | {instructor_id for _, _, instructor_id, _ in report_entries}
+        | {instructor_id for _, _, instructor_id, _ in ground_sessions}
     ).in_bulk()
     for report_date, pending_entries in pending_entries_by_date.items():
         resolved_entries = []
         for entry in pending_entries:
-            instructor = pending_instructors_by_id.get(entry["instructor_id"])
+            instructor = instructors_by_id.get(entry["instructor_id"])
             if not instructor:
                 continue
             resolved_entries.append(
@@ -687,8 +690,8 @@ def member_training_grid(request, member_id):
 
     ground_entries_by_date = defaultdict(list)
     ground_column_keys = set()
-    for session in ground_sessions:
-        column_key = (session.date, session.instructor_id)
+    for _, session_date, instructor_id, _ in ground_sessions:
+        column_key = (session_date, instructor_id)
         if column_key in existing_report_keys:
             continue
         if column_key in pending_key_set:
@@ -696,11 +699,11 @@ def member_training_grid(request, member_id):
         if column_key in ground_column_keys:
             continue
 
-        ground_entries_by_date[session.date].append(
+        ground_entries_by_date[session_date].append(
             {
-                "date": session.date,
-                "instructor": session.instructor,
-                "instructor_id": session.instructor_id,
+                "date": session_date,
+                "instructor": instructors_by_id.get(instructor_id),
+                "instructor_id": instructor_id,
                 "is_pending": False,
                 "report_id": None,
                 "is_ground_only": True,
@@ -715,14 +718,16 @@ def member_training_grid(request, member_id):
         | set(ground_entries_by_date)
     )
     for report_date in all_column_dates:
-        for report in report_entries_by_date.get(report_date, []):
+        for report_id, _, instructor_id, _ in report_entries_by_date.get(
+            report_date, []
+        ):
             column_entries.append(
                 {
-                    "date": report.report_date,
-                    "instructor": report.instructor,
-                    "instructor_id": report.instructor_id,
+                    "date": report_date,
+                    "instructor": instructors_by_id.get(instructor_id),
+                    "instructor_id": instructor_id,
                     "is_pending": False,
-                    "report_id": report.id,
+                    "report_id": report_id,
                 }
             )
 
@@ -738,7 +743,7 @@ def member_training_grid(request, member_id):
         ground_columns = sorted(
             ground_entries_by_date.get(report_date, []),
             key=lambda entry: (
-                str(entry["instructor"].full_display_name or ""),
+                str(getattr(entry["instructor"], "full_display_name", "") or ""),
                 entry["instructor_id"],
             ),
         )
@@ -766,10 +771,15 @@ def member_training_grid(request, member_id):
     def get_column_meta(column_entry):
         d = column_entry["date"]
         instructor = column_entry["instructor"]
+        if instructor is None:
+            initials = full_name = ""
+        else:
+            initials = get_instructor_initials(instructor)
+            full_name = str(instructor.full_display_name or "")
 
         return {
-            "initials": get_instructor_initials(instructor),
-            "full_name": str(instructor.full_display_name or ""),
+            "initials": initials,
+            "full_name": full_name,
             "days_ago": (today - d).days,
             "instructor_id": column_entry["instructor_id"],
             "is_pending": column_entry["is_pending"],
@@ -936,16 +946,17 @@ def log_ground_instruction(request):
                 session = form.save(commit=False)
                 session.instructor = request.user
                 session.student = student
-                session.save()
-                # Create scores for each submitted lesson
-                for entry in formset.cleaned_data:
-                    lid = entry.get("lesson")
-                    sc = entry.get("score")
-                    if lid and sc:
-                        lesson = TrainingLesson.objects.get(pk=lid)
-                        GroundLessonScore.objects.create(
-                            session=session, lesson=lesson, score=sc
-                        )
+                with transaction.atomic():
+                    session.save()
+                    # Create scores for each submitted lesson
+                    for entry in formset.cleaned_data:
+                        lid = entry.get("lesson")
+                        sc = entry.get("score")
+                        if lid and sc:
+                            lesson = TrainingLesson.objects.get(pk=lid)
+                            GroundLessonScore.objects.create(
+                                session=session, lesson=lesson, score=sc
+                            )
 
                 # Check if qualification data was included and process it
                 qual_qualification_id = request.POST.get("qual_qualification")
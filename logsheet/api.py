@@ -9,25 +9,285 @@ Provides API endpoints for:
 Part of Issue #315: PWA Fully-offline Logsheet data entry
 """
 
+import hashlib
 import json
 import logging
+from datetime import timedelta
 
-from django.db import transaction
-from django.http import JsonResponse
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models.signals import post_save
+from django.http import HttpResponseNotModified, JsonResponse
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from django.views.decorators.http import require_GET, require_POST
 
+from analytics.rollups import deferred_rollup_refresh
 from members.decorators import active_member_required
 from members.models import Member
 
-from .models import Airfield, Flight, Glider, Logsheet, Towplane
+from .models import (
+    Airfield,
+    Flight,
+    Glider,
+    Logsheet,
+    OfflineSyncIdempotencyKey,
+    Towplane,
+)
 
 logger = logging.getLogger(__name__)
 
 
-# Cache for tracking idempotency keys to prevent duplicate flight creation
-# In production, this should be stored in Redis or database
-_idempotency_cache = {}
+# How long a replayed offline queue is answered from the idempotency ledger.
+# Tablets normally flush their queue within a day; a week leaves ample margin.
+IDEMPOTENCY_KEY_TTL = timedelta(days=7)
+
+# Foreign keys accepted in offline flight payloads:
+# (payload key, Flight attribute, reference table, label used in errors)
+OFFLINE_FK_FIELDS = (
+    ("pilot_id", "pilot", "members", "Pilot"),
+    ("instructor_id", "instructor", "members", "Instructor"),
+    ("glider_id", "glider", "gliders", "Glider"),
+    ("towplane_id", "towplane", "towplanes", "Towplane"),
+    ("tow_pilot_id", "tow_pilot", "members", "Tow pilot"),
+    ("passenger_id", "passenger", "members", "Passenger"),
+    ("airfield_id", "airfield", "airfields", "Airfield"),
+)
+
+# Plain fields that offline updates may change; creates also accept a
+# free-text passenger name.
+OFFLINE_UPDATE_FIELDS = (
+    "launch_time",
+    "landing_time",
+    "release_altitude",
+    "flight_type",
+    "launch_method",
+    "notes",
+)
+OFFLINE_CREATE_FIELDS = OFFLINE_UPDATE_FIELDS + ("passenger_name",)
+
+
+def _load_idempotency_ledger(keys):
+    """
+    Return {key: flight_id} for every unexpired ledger entry in ``keys``.
+
+    Expired entries are purged first so the ledger stays bounded. The lookup
+    is a single query for the whole sync payload.
+    """
+    now = timezone.now()
+    OfflineSyncIdempotencyKey.objects.filter(expires_at__lte=now).delete()
+    if not keys:
+        return {}
+    return dict(
+        OfflineSyncIdempotencyKey.objects.filter(
+            key__in=keys, expires_at__gt=now
+        ).values_list("key", "flight_id")
+    )
+
+
+# Choice lists shipped with the reference data; these match the form choices.
+FLIGHT_TYPE_CHOICES = [
+    {"value": "solo", "label": "Solo"},
+    {"value": "dual", "label": "Dual Instruction"},
+    {"value": "intro", "label": "Intro Ride"},
+    {"value": "demo", "label": "Demo Flight"},
+    {"value": "checkout", "label": "Checkout"},
+    {"value": "proficiency", "label": "Proficiency"},
+    {"value": "passenger", "label": "Passenger Flight"},
+    {"value": "other", "label": "Other"},
+]
+RELEASE_ALTITUDE_CHOICES = [
+    {"value": i, "label": f"{i} ft"} for i in range(0, 7100, 100)
+]
+LAUNCH_METHOD_CHOICES = [
+    {"value": "tow", "label": "Towplane"},
+    {"value": "winch", "label": "Winch"},
+    {"value": "self", "label": "Self-Launch"},
+    {"value": "other", "label": "Other"},
+]
+
+# The built reference data is cached until a member, glider, towplane or
+# airfield changes (see logsheet/signals.py). Each version's rows are kept
+# longer so ``since=<version>`` requests can be answered with a delta.
+#
+# The default cache is per process, so a save only drops the copy held by the
+# worker that handled it. Other workers keep serving their copy until it
+# expires, which is why the timeout is short: reference data is at most
+# REFERENCE_DATA_CACHE_TIMEOUT seconds stale anywhere. The ETag is a hash of
+# the content, so workers holding the same data agree on it.
+REFERENCE_DATA_CACHE_KEY = "offline_reference_data"
+REFERENCE_DATA_CACHE_TIMEOUT = 30
+REFERENCE_DATA_VERSION_TIMEOUT = 7 * 24 * 3600
+REFERENCE_DATA_TABLES = ("members", "gliders", "towplanes", "airfields")
+
+
+def _build_reference_rows():
+    """Return {table: [row, ...]} for the active rows offline entry needs."""
+    # Get active members who can appear on flights
+    # Include pilots, instructors, tow pilots
+    members = Member.objects.filter(is_active=True).values(
+        "id",
+        "first_name",
+        "last_name",
+        "nickname",
+    )
+    member_list = [
+        {
+            "id": m["id"],
+            "name": f"{m['first_name']} {m['last_name']}".strip(),
+            "nickname": m["nickname"] or "",
+            "display_name": (
+                m["nickname"]
+                if m["nickname"]
+                else f"{m['first_name']} {m['last_name']}".strip()
+            ),
+        }
+        for m in members
+    ]
+
+    # Get active gliders
+    gliders = Glider.objects.filter(is_active=True).values(
+        "id",
+        "model",
+        "n_number",
+        "competition_number",
+        "seats",
+        "rental_rate",
+        "club_owned",
+    )
+    glider_list = []
+    for g in gliders:
+        display_parts = []
+        if g["competition_number"]:
+            display_parts.append(g["competition_number"].upper())
+        if g["n_number"]:
+            display_parts.append(g["n_number"].upper())
+        if g["model"]:
+            display_parts.append(g["model"])
+
+        glider_list.append(
+            {
+                "id": g["id"],
+                "display_name": " / ".join(display_parts),
+                "n_number": g["n_number"],
+                "competition_number": g["competition_number"] or "",
+                "model": g["model"],
+                "seats": g["seats"],
+                "rental_rate": str(g["rental_rate"]) if g["rental_rate"] else None,
+                "club_owned": g["club_owned"],
+            }
+        )
+
+    # Get active towplanes
+    towplanes = Towplane.objects.filter(is_active=True).values(
+        "id",
+        "name",
+        "n_number",
+    )
+    towplane_list = [
+        {
+            "id": t["id"],
+            "name": t["name"],
+            "n_number": t["n_number"],
+            "display_name": f"{t['name']} ({t['n_number']})",
+        }
+        for t in towplanes
+    ]
+
+    # Get active airfields
+    airfields = Airfield.objects.filter(is_active=True).values(
+        "id",
+        "identifier",
+        "name",
+    )
+    airfield_list = [
+        {
+            "id": a["id"],
+            "identifier": a["identifier"],
+            "name": a["name"],
+            "display_name": f"{a['identifier']} – {a['name']}",
+        }
+        for a in airfields
+    ]
+
+    return {
+        "members": member_list,
+        "gliders": glider_list,
+        "towplanes": towplane_list,
+        "airfields": airfield_list,
+    }
+
+
+def get_reference_data_snapshot():
+    """
+    Return the current reference data with its content hash.
+
+    The snapshot is {"version": int, "etag": str, "rows": {table: [...]}}.
+    ``version`` and ``etag`` are both derived from a SHA-256 of the rows and
+    choice lists, so every worker computes the same stamp for the same data.
+    """
+    snapshot = cache.get(REFERENCE_DATA_CACHE_KEY)
+    if snapshot is not None:
+        return snapshot
+
+    rows = _build_reference_rows()
+    content = json.dumps(
+        [
+            rows,
+            FLIGHT_TYPE_CHOICES,
+            RELEASE_ALTITUDE_CHOICES,
+            LAUNCH_METHOD_CHOICES,
+        ],
+        sort_keys=True,
+    )
+    digest = hashlib.sha256(content.encode()).hexdigest()
+    snapshot = {
+        # 52 bits keeps the version exactly representable as a JS number.
+        "version": int(digest[:13], 16),
+        "etag": f'"{digest[:32]}"',
+        "rows": rows,
+    }
+    cache.set(REFERENCE_DATA_CACHE_KEY, snapshot, REFERENCE_DATA_CACHE_TIMEOUT)
+    cache.set(
+        f"{REFERENCE_DATA_CACHE_KEY}:v{snapshot['version']}",
+        rows,
+        REFERENCE_DATA_VERSION_TIMEOUT,
+    )
+    return snapshot
+
+
+def invalidate_reference_data_cache():
+    """Drop the cached reference data so the next request rebuilds it."""
+    cache.delete(REFERENCE_DATA_CACHE_KEY)
+
+
+def _reference_data_delta(previous_rows, current_rows):
+    """
+    Diff two {table: [row, ...]} mappings.
+
+    Returns ({table: [added or changed rows]}, {table: [removed ids]}); rows
+    are removed when they were deactivated or deleted since ``previous_rows``.
+    """
+    changed = {}
+    removed = {}
+    for table in REFERENCE_DATA_TABLES:
+        previous = {row["id"]: row for row in previous_rows.get(table, [])}
+        current_ids = set()
+        changed[table] = []
+        for row in current_rows[table]:
+            current_ids.add(row["id"])
+            if previous.get(row["id"]) != row:
+                changed[table].append(row)
+        removed[table] = sorted(set(previous) - current_ids)
+    return changed, removed
+
+
+def _etag_matches(request, etag):
+    """Return True if the request's If-None-Match covers ``etag``."""
+    candidates = parse_etags(request.headers.get("If-None-Match", ""))
+    return "*" in candidates or etag in (c.removeprefix("W/") for c in candidates)
 
 
 @require_GET
@@ -43,144 +303,46 @@ def reference_data(request):
     - airfields: id, identifier, name, is_active
     - flight_types: list of valid flight type choices
     - release_altitudes: list of valid release altitude choices
+
+    Conditional requests:
+    - ``If-None-Match`` with the current ETag returns 304 Not Modified.
+    - ``?since=<version>`` returns only the rows added or changed since that
+      version plus ``removed`` ids per table, with ``"delta": true``. If the
+      old version is no longer known the full payload is returned instead.
     """
     try:
-        # Get active members who can appear on flights
-        # Include pilots, instructors, tow pilots
-        members = Member.objects.filter(is_active=True).values(
-            "id",
-            "first_name",
-            "last_name",
-            "nickname",
-            "is_staff",
-        )
-
-        # Determine member capabilities from related permissions
-        member_list = []
-        for m in members:
-            member_list.append(
-                {
-                    "id": m["id"],
-                    "name": f"{m['first_name']} {m['last_name']}".strip(),
-                    "nickname": m["nickname"] or "",
-                    "display_name": (
-                        m["nickname"]
-                        if m["nickname"]
-                        else f"{m['first_name']} {m['last_name']}".strip()
-                    ),
-                }
+        snapshot = get_reference_data_snapshot()
+        etag = snapshot["etag"]
+
+        if _etag_matches(request, etag):
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+        rows = snapshot["rows"]
+        payload = {"success": True, "version": snapshot["version"]}
+
+        previous_rows = None
+        since = request.GET.get("since", "")
+        if since.isdigit():
+            previous_rows = cache.get(f"{REFERENCE_DATA_CACHE_KEY}:v{since}")
+
+        if previous_rows is not None:
+            changed, removed = _reference_data_delta(previous_rows, rows)
+            payload.update(delta=True, since=int(since), removed=removed, **changed)
+        else:
+            payload.update(
+                delta=False,
+                flight_types=FLIGHT_TYPE_CHOICES,
+                release_altitudes=RELEASE_ALTITUDE_CHOICES,
+                launch_methods=LAUNCH_METHOD_CHOICES,
+                **rows,
             )
 
-        # Get active gliders
-        gliders = Glider.objects.filter(is_active=True).values(
-            "id",
-            "make",
-            "model",
-            "n_number",
-            "competition_number",
-            "seats",
-            "rental_rate",
-            "club_owned",
-        )
-        glider_list = []
-        for g in gliders:
-            display_parts = []
-            if g["competition_number"]:
-                display_parts.append(g["competition_number"].upper())
-            if g["n_number"]:
-                display_parts.append(g["n_number"].upper())
-            if g["model"]:
-                display_parts.append(g["model"])
-
-            glider_list.append(
-                {
-                    "id": g["id"],
-                    "display_name": " / ".join(display_parts),
-                    "n_number": g["n_number"],
-                    "competition_number": g["competition_number"] or "",
-                    "model": g["model"],
-                    "seats": g["seats"],
-                    "rental_rate": str(g["rental_rate"]) if g["rental_rate"] else None,
-                    "club_owned": g["club_owned"],
-                }
-            )
-
-        # Get active towplanes
-        towplanes = Towplane.objects.filter(is_active=True).values(
-            "id",
-            "name",
-            "n_number",
-            "make",
-            "model",
-        )
-        towplane_list = [
-            {
-                "id": t["id"],
-                "name": t["name"],
-                "n_number": t["n_number"],
-                "display_name": f"{t['name']} ({t['n_number']})",
-            }
-            for t in towplanes
-        ]
-
-        # Get active airfields
-        airfields = Airfield.objects.filter(is_active=True).values(
-            "id",
-            "identifier",
-            "name",
-        )
-        airfield_list = [
-            {
-                "id": a["id"],
-                "identifier": a["identifier"],
-                "name": a["name"],
-                "display_name": f"{a['identifier']} – {a['name']}",
-            }
-            for a in airfields
-        ]
-
-        # Flight types - these match the choices used in forms
-        flight_types = [
-            {"value": "solo", "label": "Solo"},
-            {"value": "dual", "label": "Dual Instruction"},
-            {"value": "intro", "label": "Intro Ride"},
-            {"value": "demo", "label": "Demo Flight"},
-            {"value": "checkout", "label": "Checkout"},
-            {"value": "proficiency", "label": "Proficiency"},
-            {"value": "passenger", "label": "Passenger Flight"},
-            {"value": "other", "label": "Other"},
-        ]
-
-        # Release altitude choices (from Flight model)
-        release_altitudes = [
-            {"value": i, "label": f"{i} ft"} for i in range(0, 7100, 100)
-        ]
-
-        # Launch methods
-        launch_methods = [
-            {"value": "tow", "label": "Towplane"},
-            {"value": "winch", "label": "Winch"},
-            {"value": "self", "label": "Self-Launch"},
-            {"value": "other", "label": "Other"},
-        ]
-
-        # Version for cache invalidation
-        # Use a combination of data modification timestamps
-        version = int(timezone.now().timestamp())
-
-        return JsonResponse(
-            {
-                "success": True,
-                "version": version,
-                "members": member_list,
-                "gliders": glider_list,
-                "towplanes": towplane_list,
-                "airfields": airfield_list,
-                "flight_types": flight_types,
-                "release_altitudes": release_altitudes,
-                "launch_methods": launch_methods,
-            }
-        )
+        response = JsonResponse(payload)
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
 
     except Exception as e:
         logger.exception("Error fetching reference data")
@@ -236,91 +398,399 @@ def flights_sync(request):
                 status=400,
             )
 
-        results = []
+        results = None
+        if data.get("mode") == "bulk":
+            results = _sync_flights_bulk(flights, request.user)
+        if results is None:
+            results = _sync_flights_individually(flights, request.user)
+
+        return JsonResponse(
+            {
+                "success": True,
+                "results": results,
+            }
+        )
+
+    except json.JSONDecodeError:
+        return JsonResponse(
+            {"success": False, "error": "Invalid JSON"},
+            status=400,
+        )
+    except Exception as e:
+        logger.exception("Error in flights sync")
+        return JsonResponse(
+            {"success": False, "error": "An error occurred syncing flights."},
+            status=500,
+        )
+
 
-        for flight_item in flights:
-            idempotency_key = flight_item.get("idempotencyKey")
-            action = flight_item.get("action", "create")
-            flight_data = flight_item.get("data", {})
+def _sync_flights_individually(flights, user):
+    """Process a sync payload one flight at a time; return per-item results."""
+    results = []
+    ledger = _load_idempotency_ledger(
+        {item.get("idempotencyKey") for item in flights} - {None, ""}
+    )
 
-            result = {"idempotencyKey": idempotency_key}
+    for flight_item in flights:
+        idempotency_key = flight_item.get("idempotencyKey")
+        action = flight_item.get("action", "create")
+        flight_data = flight_item.get("data", {})
+
+        result = {"idempotencyKey": idempotency_key}
+
+        try:
+            # Replays are answered from the shared ledger without
+            # re-running flight creation.
+            if idempotency_key in ledger:
+                result["status"] = "duplicate"
+                result["serverId"] = ledger[idempotency_key]
+                results.append(result)
+                continue
+
+            if action == "create":
+                flight_result = _create_flight_with_idempotency_key(
+                    flight_data, user, idempotency_key
+                )
 
-            try:
-                # Check for duplicate using idempotency key
-                if idempotency_key in _idempotency_cache:
-                    cached = _idempotency_cache[idempotency_key]
+                if flight_result.get("duplicate"):
+                    result["status"] = "duplicate"
+                    result["serverId"] = flight_result["flight_id"]
+                elif flight_result["success"]:
+                    result["status"] = "success"
+                    result["serverId"] = flight_result["flight_id"]
+                else:
+                    result["status"] = "error"
+                    result["error"] = flight_result.get("error", "Unknown error")
+
+                if result["status"] in ("success", "duplicate") and idempotency_key:
+                    ledger[idempotency_key] = result["serverId"]
+
+            elif action == "update":
+                # Handle update with conflict detection
+                flight_result = _update_flight_from_offline(flight_data, user)
+
+                if flight_result["success"]:
+                    result["status"] = "success"
+                    result["serverId"] = flight_result["flight_id"]
+                elif flight_result.get("conflict"):
+                    result["status"] = "conflict"
+                    result["reason"] = flight_result.get("reason")
+                    result["serverData"] = flight_result.get("serverData")
+                else:
+                    result["status"] = "error"
+                    result["error"] = flight_result.get("error", "Unknown error")
+
+            else:
+                result["status"] = "error"
+                result["error"] = f"Unknown action: {action}"
+
+        except Exception as e:
+            logger.exception(f"Error processing flight sync: {idempotency_key}")
+            result["status"] = "error"
+            result["error"] = "An internal error occurred while processing this flight."
+
+        results.append(result)
+
+    return results
+
+
+def _sync_flights_bulk(flights, user):
+    """
+    Bulk ingest path for ``flights_sync`` (``"mode": "bulk"``).
+
+    Resolves every referenced row with one ``in_bulk`` query per table,
+    validates the whole payload in memory, then writes all creates and
+    updates with ``bulk_create``/``bulk_update`` in a single transaction.
+    Results keep the per-item shape of the one-by-one path.
+
+    Returns None if a concurrent replay claimed one of the payload's
+    idempotency keys mid-flight; the caller then falls back to the per-item
+    path, which resolves each race individually.
+    """
+    results = [{"idempotencyKey": item.get("idempotencyKey")} for item in flights]
+    ledger = _load_idempotency_ledger(
+        {result["idempotencyKey"] for result in results} - {None, ""}
+    )
+    key_max_length = OfflineSyncIdempotencyKey._meta.get_field("key").max_length
+
+    try:
+        with transaction.atomic():
+            refs = _resolve_offline_references(flights)
+            to_create = []  # (result, flight, idempotency key)
+            first_create_by_key = {}  # key -> flight created earlier in payload
+            repeated_creates = []  # (result, flight)
+            to_update = {}  # flight pk -> (flight, status before this sync)
+            update_results = []  # (result, flight)
+            update_fields = {"duration"}
+
+            for item, result in zip(flights, results):
+                idempotency_key = result["idempotencyKey"]
+                action = item.get("action", "create")
+                flight_data = item.get("data", {})
+
+                if idempotency_key in ledger:
                     result["status"] = "duplicate"
-                    result["serverId"] = cached.get("flight_id")
-                    results.append(result)
+                    result["serverId"] = ledger[idempotency_key]
                     continue
 
                 if action == "create":
-                    # Validate and create flight
-                    flight_result = _create_flight_from_offline(
-                        flight_data, request.user
-                    )
-
-                    if flight_result["success"]:
-                        result["status"] = "success"
-                        result["serverId"] = flight_result["flight_id"]
+                    if idempotency_key in first_create_by_key:
+                        repeated_creates.append(
+                            (result, first_create_by_key[idempotency_key])
+                        )
+                        continue
+                    if idempotency_key and len(str(idempotency_key)) > key_max_length:
+                        result["status"] = "error"
+                        result["error"] = "idempotencyKey is too long"
+                        continue
 
-                        # Cache idempotency key
-                        _idempotency_cache[idempotency_key] = {
-                            "flight_id": flight_result["flight_id"],
-                            "created_at": timezone.now().isoformat(),
-                        }
-                    else:
+                    flight, error = _build_offline_flight(flight_data, refs)
+                    if error:
                         result["status"] = "error"
-                        result["error"] = flight_result.get("error", "Unknown error")
+                        result["error"] = error
+                        continue
+
+                    to_create.append((result, flight, idempotency_key))
+                    if idempotency_key:
+                        first_create_by_key[idempotency_key] = flight
 
                 elif action == "update":
-                    # Handle update with conflict detection
-                    flight_result = _update_flight_from_offline(
-                        flight_data, request.user
-                    )
+                    flight = refs["flights"].get(_coerce_id(flight_data.get("id")))
+                    if not flight_data.get("id"):
+                        error = "Flight id is required for updates"
+                    elif flight is None:
+                        error = "Flight not found"
+                    elif flight.logsheet.finalized:
+                        error = "Logsheet is finalized"
+                    else:
+                        error = None
 
-                    if flight_result["success"]:
-                        result["status"] = "success"
-                        result["serverId"] = flight_result["flight_id"]
-                    elif flight_result.get("conflict"):
+                    if error:
+                        result["status"] = "error"
+                        result["error"] = error
+                        continue
+
+                    client_version = flight_data.get("version")
+                    if (
+                        client_version
+                        and client_version != flight.created_at.isoformat()
+                    ):
                         result["status"] = "conflict"
-                        result["reason"] = flight_result.get("reason")
-                        result["serverData"] = flight_result.get("serverData")
-                    else:
+                        result["reason"] = "Flight was modified on server"
+                        result["serverData"] = _flight_to_dict(flight)
+                        continue
+
+                    changes, error = _collect_offline_changes(
+                        flight_data, refs, OFFLINE_UPDATE_FIELDS
+                    )
+                    if error:
                         result["status"] = "error"
-                        result["error"] = flight_result.get("error", "Unknown error")
+                        result["error"] = error
+                        continue
+
+                    to_update.setdefault(flight.pk, (flight, flight.status))
+                    for attr, value in changes.items():
+                        setattr(flight, attr, value)
+                    flight.refresh_duration()
+                    update_fields.update(changes)
+                    update_results.append((result, flight))
 
                 else:
                     result["status"] = "error"
                     result["error"] = f"Unknown action: {action}"
 
-            except Exception as e:
-                logger.exception(f"Error processing flight sync: {idempotency_key}")
-                result["status"] = "error"
-                result["error"] = (
-                    "An internal error occurred while processing this flight."
+            created_flights = [flight for _, flight, _ in to_create]
+            if created_flights:
+                Flight.objects.bulk_create(created_flights)
+                expires_at = timezone.now() + IDEMPOTENCY_KEY_TTL
+                OfflineSyncIdempotencyKey.objects.bulk_create(
+                    [
+                        OfflineSyncIdempotencyKey(
+                            key=key, flight=flight, expires_at=expires_at
+                        )
+                        for _, flight, key in to_create
+                        if key
+                    ]
                 )
+            if to_update:
+                # bulk_update does not apply auto_now; stamp updated_at so
+                # incremental stats dumps see these edits.
+                updated_at = timezone.now()
+                for flight, _ in to_update.values():
+                    flight.updated_at = updated_at
+                Flight.objects.bulk_update(
+                    [flight for flight, _ in to_update.values()],
+                    sorted(update_fields | {"updated_at"}),
+                )
+
+            # bulk_create/bulk_update bypass save(); send post_save so
+            # receivers (instructor notifications etc.) still see each write.
+            # The analytics rollup is refreshed once per logsheet, not per flight.
+            with deferred_rollup_refresh():
+                for flight in created_flights:
+                    post_save.send(
+                        sender=Flight,
+                        instance=flight,
+                        created=True,
+                        update_fields=None,
+                        raw=False,
+                        using=flight._state.db,
+                    )
+                for flight, previous_status in to_update.values():
+                    flight._previous_status = previous_status
+                    post_save.send(
+                        sender=Flight,
+                        instance=flight,
+                        created=False,
+                        update_fields=frozenset(update_fields),
+                        raw=False,
+                        using=flight._state.db,
+                    )
+    except IntegrityError:
+        logger.info("Bulk flight sync lost an idempotency race; retrying per item")
+        return None
 
-            results.append(result)
+    for result, flight, _ in to_create:
+        result["status"] = "success"
+        result["serverId"] = flight.pk
+    for result, flight in repeated_creates:
+        result["status"] = "duplicate"
+        result["serverId"] = flight.pk
+    for result, flight in update_results:
+        result["status"] = "success"
+        result["serverId"] = flight.pk
 
-        return JsonResponse(
-            {
-                "success": True,
-                "results": results,
-            }
-        )
+    return results
 
-    except json.JSONDecodeError:
-        return JsonResponse(
-            {"success": False, "error": "Invalid JSON"},
-            status=400,
-        )
-    except Exception as e:
-        logger.exception("Error in flights sync")
-        return JsonResponse(
-            {"success": False, "error": "An error occurred syncing flights."},
-            status=500,
-        )
+
+def _coerce_id(value):
+    """Return ``value`` as an int primary key, or None if it is not one."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _resolve_offline_references(flights):
+    """
+    Load every logsheet, member, aircraft, airfield and flight referenced by
+    a sync payload with one ``in_bulk`` query per table.
+
+    Must run inside a transaction: flights targeted by updates are locked.
+    """
+    ids = {
+        table: set()
+        for table in ("logsheets", "members", "gliders", "towplanes", "airfields")
+    }
+    ids["flights"] = set()
+    for item in flights:
+        flight_data = item.get("data", {})
+        ids["logsheets"].add(_coerce_id(flight_data.get("logsheet_id")))
+        if item.get("action") == "update":
+            ids["flights"].add(_coerce_id(flight_data.get("id")))
+        for payload_key, _attr, table, _label in OFFLINE_FK_FIELDS:
+            ids[table].add(_coerce_id(flight_data.get(payload_key)))
+    for id_set in ids.values():
+        id_set.discard(None)
+
+    return {
+        "logsheets": Logsheet.objects.in_bulk(ids["logsheets"]),
+        "members": Member.objects.in_bulk(ids["members"]),
+        "gliders": Glider.objects.in_bulk(ids["gliders"]),
+        "towplanes": Towplane.objects.in_bulk(ids["towplanes"]),
+        "airfields": Airfield.objects.in_bulk(ids["airfields"]),
+        "flights": Flight.objects.select_related("logsheet")
+        .select_for_update(of=("self",))
+        .in_bulk(ids["flights"]),
+    }
+
+
+def _collect_offline_changes(flight_data, refs, fields):
+    """
+    Validate the payload fields present in ``flight_data`` against the
+    preloaded ``refs``.
+
+    Returns (changes, None) where ``changes`` maps Flight attributes to
+    values, or (None, error message) on the first invalid field.
+    """
+    changes = {}
+    for payload_key, attr, table, label in OFFLINE_FK_FIELDS:
+        if payload_key not in flight_data:
+            continue
+        if not flight_data[payload_key]:
+            changes[attr] = None
+            continue
+        obj = refs[table].get(_coerce_id(flight_data[payload_key]))
+        if obj is None:
+            return None, f"{label} not found"
+        changes[attr] = obj
+
+    for field_name in fields:
+        if field_name not in flight_data:
+            continue
+        field = Flight._meta.get_field(field_name)
+        try:
+            value = field.to_python(flight_data[field_name])
+            field.run_validators(value)
+        except ValidationError:
+            return None, f"Invalid {field_name}"
+        if value is None and not field.null:
+            value = field.get_default()
+        changes[field_name] = value
+
+    return changes, None
+
+
+def _build_offline_flight(flight_data, refs):
+    """Return (unsaved Flight, None) for an offline create, or (None, error)."""
+    if not flight_data.get("logsheet_id"):
+        return None, "logsheet_id is required"
+    logsheet = refs["logsheets"].get(_coerce_id(flight_data["logsheet_id"]))
+    if logsheet is None:
+        return None, "Logsheet not found"
+    if logsheet.finalized:
+        return None, "Logsheet is finalized"
+
+    changes, error = _collect_offline_changes(flight_data, refs, OFFLINE_CREATE_FIELDS)
+    if error:
+        return None, error
+
+    fields = {"flight_type": "solo", "launch_method": "tow"}
+    fields.update(changes)
+    flight = Flight(logsheet=logsheet, **fields)
+    flight.refresh_duration()
+    return flight, None
+
+
+def _create_flight_with_idempotency_key(flight_data, user, idempotency_key):
+    """
+    Create a flight and record its idempotency key in the same transaction.
+
+    If another worker records the same key first, the unique constraint on
+    the ledger rolls back our flight and the winner's flight id is returned
+    with ``duplicate`` set, so concurrent replays never create two flights.
+    """
+    if not idempotency_key:
+        return _create_flight_from_offline(flight_data, user)
+    key_max_length = OfflineSyncIdempotencyKey._meta.get_field("key").max_length
+    if len(str(idempotency_key)) > key_max_length:
+        return {"success": False, "error": "idempotencyKey is too long"}
+
+    try:
+        with transaction.atomic():
+            flight_result = _create_flight_from_offline(flight_data, user)
+            if flight_result["success"]:
+                OfflineSyncIdempotencyKey.objects.create(
+                    key=idempotency_key,
+                    flight_id=flight_result["flight_id"],
+                    expires_at=timezone.now() + IDEMPOTENCY_KEY_TTL,
+                )
+            return flight_result
+    except IntegrityError:
+        existing = OfflineSyncIdempotencyKey.objects.filter(key=idempotency_key).first()
+        if existing is None:
+            raise
+        return {"success": True, "duplicate": True, "flight_id": existing.flight_id}
 
 
 def _create_flight_from_offline(flight_data, user):
@@ -8,6 +8,9 @@ from logsheet.utils.stats_dump import process_stats_dump_outbox_job
 from utils.management.commands.base_cronjob import BaseCronJobCommand
 
 MAX_ATTEMPTS = 5  # Maximum retries before a job is permanently abandoned.
+# A processing job whose heartbeat (progress_updated_at, bumped with every
+# saved part) is older than this is treated as dead and retried.
+STALE_HEARTBEAT = timedelta(minutes=20)
 
 
 class Command(BaseCronJobCommand):
@@ -26,13 +29,16 @@ class Command(BaseCronJobCommand):
 
     def execute_job(self, *args, **options):
         limit = options.get("limit", 20)
-        stale_cutoff = timezone.now() - self.max_execution_time
+        stale_cutoff = timezone.now() - STALE_HEARTBEAT
 
         recovered_count = (
             StatsDumpOutbox.objects.filter(
                 status=StatsDumpOutbox.STATUS_PROCESSING,
             )
-            .filter(Q(started_at__isnull=True) | Q(started_at__lt=stale_cutoff))
+            .filter(
+                Q(progress_updated_at__isnull=True)
+                | Q(progress_updated_at__lt=stale_cutoff)
+            )
             .update(
                 status=StatsDumpOutbox.STATUS_FAILED,
                 last_error=(
@@ -4,7 +4,7 @@ from django.db.models import Q
 from django.utils.dateparse import parse_date
 
 from logsheet.models import Flight, Logsheet
-from siteconfig.models import SiteConfiguration
+from logsheet.utils.pricing import PRICING_SELECT_RELATED, PricingContext
 
 
 class Command(BaseCommand):
@@ -33,9 +33,9 @@ class Command(BaseCommand):
         if not logsheets.exists():
             raise CommandError(f"No finalized logsheets found after {after_str}.")
 
-        # Cache site configuration once for this run; cost properties read
-        # retrieve-waiver flags from this model.
-        site_config = SiteConfiguration.objects.first()
+        # Load site configuration, membership rules and tow tiers once for
+        # the whole run instead of once per flight.
+        pricing = PricingContext()
         from billing.models import LedgerEntry
 
         total_updated = 0
@@ -50,12 +50,10 @@ class Command(BaseCommand):
                     | Q(rental_cost_actual=0)
                 )
                 .distinct()
-                .select_related("glider", "towplane__charge_scheme")
-                .prefetch_related("towplane__charge_scheme__charge_tiers")
+                .select_related(*PRICING_SELECT_RELATED)
             )
             updated = 0
-            for flight in flights:
-                flight._site_config_cache = site_config
+            for flight in pricing.prime(flights):
                 tow_actual = getattr(flight, "tow_cost_actual", None)
                 rental_actual = getattr(flight, "rental_cost_actual", None)
                 should_update_tow = tow_actual is None or tow_actual == 0
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.16 on 2026-10-16 19:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "logsheet",
+            "0030_rename_logsheet_fl_logshee_25df4a_idx_logsheet_fl_logshee_3a0b41_idx",
+        ),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OfflineSyncIdempotencyKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=128, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("expires_at", models.DateTimeField(db_index=True)),
+                (
+                    "flight",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="offline_sync_keys",
+                        to="logsheet.flight",
+                    ),
+                ),
+            ],
+        ),
+    ]
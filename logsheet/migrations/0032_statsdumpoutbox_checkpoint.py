@@ -0,0 +1,48 @@
+# Generated by Django 5.2.16 on 2026-10-16 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logsheet", "0031_offlinesyncidempotencykey"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="statsdumpoutbox",
+            name="cursor_flight_id",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="statsdumpoutbox",
+            name="cursor_log_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="statsdumpoutbox",
+            name="cursor_logsheet_id",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="statsdumpoutbox",
+            name="parts_written",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="statsdumpoutbox",
+            name="progress_updated_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="statsdumpoutbox",
+            name="rows_at_start",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="statsdumpoutbox",
+            name="rows_written",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.16 on 2026-10-16 20:19
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Existing rows have not changed since they were created; without this
+    # the first incremental stats dump would export every flight.
+    for model_name in ("Flight", "Logsheet"):
+        model = apps.get_model("logsheet", model_name)
+        model.objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("logsheet", "0032_statsdumpoutbox_checkpoint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FlightTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("flight_id", models.PositiveIntegerField(db_index=True)),
+                ("logsheet_id", models.PositiveIntegerField(blank=True, null=True)),
+                ("log_date", models.DateField(blank=True, null=True)),
+                ("deleted_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "ordering": ["deleted_at", "flight_id"],
+            },
+        ),
+        migrations.AddField(
+            model_name="flight",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name="logsheet",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name="statsdumpoutbox",
+            name="changed_since",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="statsdumpoutbox",
+            name="mode",
+            field=models.CharField(
+                choices=[("full", "Full"), ("incremental", "Incremental")],
+                default="full",
+                max_length=16,
+            ),
+        ),
+        migrations.AddField(
+            model_name="statsdumpoutbox",
+            name="snapshot_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
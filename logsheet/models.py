@@ -160,6 +160,7 @@ class Flight(models.Model):
     client_token = models.CharField(max_length=64, blank=True, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     RELEASE_ALTITUDE_CHOICES = [(i, f"{i} ft") for i in range(0, 7100, 100)]
 
     release_altitude = models.IntegerField(
@@ -414,7 +415,11 @@ class Flight(models.Model):
                 return delta
         return None
 
-    def save(self, *args, **kwargs):
+    def refresh_duration(self):
+        """Set ``duration`` from launch/landing times.
+
+        Called by save(); bulk writers (which bypass save) call it directly.
+        """
         if self.launch_time and self.landing_time:
             launch_dt = datetime.combine(date.today(), self.launch_time)
             land_dt = datetime.combine(date.today(), self.landing_time)
@@ -428,13 +433,19 @@ class Flight(models.Model):
                 else:
                     # probably a bad duration, so throw it away
                     self.duration = None
-                    super().save(*args, **kwargs)
                     return
 
             self.duration = land_dt - launch_dt
         else:
             self.duration = None
 
+    def save(self, *args, **kwargs):
+        self.refresh_duration()
+        update_fields = kwargs.get("update_fields")
+        if update_fields:
+            # auto_now only writes updated_at when it is listed, and
+            # incremental stats dumps select flights by it.
+            kwargs["update_fields"] = {*update_fields, "updated_at"}
         super().save(*args, **kwargs)
 
     split_with = models.ForeignKey(
@@ -1036,6 +1047,13 @@ class FinalizationEmailOutbox(models.Model):
 class StatsDumpOutbox(models.Model):
     """Durable queue record for asynchronous stats dump CSV generation."""
 
+    MODE_FULL = "full"
+    MODE_INCREMENTAL = "incremental"
+    MODE_CHOICES = [
+        (MODE_FULL, "Full"),
+        (MODE_INCREMENTAL, "Incremental"),
+    ]
+
     STATUS_PENDING = "pending"
     STATUS_PROCESSING = "processing"
     STATUS_READY = "ready"
@@ -1060,6 +1078,11 @@ class StatsDumpOutbox(models.Model):
         default=STATUS_PENDING,
         db_index=True,
     )
+    mode = models.CharField(max_length=16, choices=MODE_CHOICES, default=MODE_FULL)
+    # Incremental exports include flights changed after ``changed_since`` (the
+    # requester's previous successful dump's ``snapshot_at``); None = all.
+    changed_since = models.DateTimeField(null=True, blank=True)
+    snapshot_at = models.DateTimeField(null=True, blank=True)
     result_file = models.FileField(upload_to="exports/stats_dumps/", blank=True)
     result_filename = models.CharField(max_length=255, blank=True)
     attempt_count = models.PositiveIntegerField(default=0)
@@ -1068,12 +1091,80 @@ class StatsDumpOutbox(models.Model):
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    # Checkpoint: sort key (log_date, logsheet_id, flight pk) of the last row
+    # in the last gzip part saved to storage. A retry resumes after it.
+    cursor_log_date = models.DateField(null=True, blank=True)
+    cursor_logsheet_id = models.PositiveIntegerField(null=True, blank=True)
+    cursor_flight_id = models.PositiveIntegerField(null=True, blank=True)
+    rows_written = models.PositiveIntegerField(default=0)
+    parts_written = models.PositiveIntegerField(default=0)
+    # rows_written when the current attempt started (for the rows/s rate)
+    rows_at_start = models.PositiveIntegerField(default=0)
+    progress_updated_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         ordering = ["-queued_at"]
 
     def __str__(self):
         return f"StatsDumpOutbox(id={self.pk}, status={self.status})"
 
+    @property
+    def cursor(self):
+        """Resume point as ``(log_date, logsheet_id, flight_id)``, or None."""
+        if self.cursor_flight_id is None:
+            return None
+        return (self.cursor_log_date, self.cursor_logsheet_id, self.cursor_flight_id)
+
+    @property
+    def rows_per_second(self):
+        """Export throughput of the current (or last) attempt, or None."""
+        end = self.completed_at or self.progress_updated_at
+        if not self.started_at or not end:
+            return None
+        elapsed = (end - self.started_at).total_seconds()
+        rows = self.rows_written - self.rows_at_start
+        if elapsed <= 0 or rows <= 0:
+            return None
+        return rows / elapsed
+
+
+class FlightTombstone(models.Model):
+    """Record of a deleted flight, emitted by incremental stats dumps."""
+
+    flight_id = models.PositiveIntegerField(db_index=True)
+    logsheet_id = models.PositiveIntegerField(null=True, blank=True)
+    log_date = models.DateField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["deleted_at", "flight_id"]
+
+    def __str__(self):
+        return f"FlightTombstone(flight={self.flight_id}, deleted_at={self.deleted_at})"
+
+
+class OfflineSyncIdempotencyKey(models.Model):
+    """Shared ledger of offline sync idempotency keys.
+
+    Lives in the database (not process memory) so every gunicorn worker and
+    pod sees the same replay history. Rows expire after ``expires_at`` and are
+    purged opportunistically by the sync endpoint.
+    """
+
+    key = models.CharField(max_length=128, unique=True)
+    flight = models.ForeignKey(
+        Flight,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="offline_sync_keys",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"OfflineSyncIdempotencyKey(key={self.key}, flight={self.flight_id})"
+
 
 ####################################################
 # Towplane model
@@ -1350,6 +1441,7 @@ class Logsheet(models.Model):
     airfield = models.ForeignKey(Airfield, on_delete=models.PROTECT)
     created_by = models.ForeignKey(Member, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     finalized = models.BooleanField(default=False)
 
     duty_officer = models.ForeignKey(
@@ -1422,6 +1514,8 @@ class Logsheet(models.Model):
             was_finalized = old.finalized
         else:
             was_finalized = False
+        # Lets post_save receivers detect finalize/unfinalize transitions.
+        self._was_finalized = was_finalized
         super().save(*args, **kwargs)
         # Only run automation if just finalized
         if not was_finalized and self.finalized:
@@ -6,6 +6,7 @@ from siteconfig.models import SiteConfiguration
 from .models import Flight, Logsheet, RevisionLog
 from .utils.finalization_email import enqueue_finalization_summary_email_job
 from .utils.flight_charges import get_billing_allocations
+from .utils.pricing import PRICING_SELECT_RELATED, PricingContext
 
 
 @transaction.atomic
@@ -17,13 +18,17 @@ def finalize_logsheet_financials(
     if locked_logsheet.finalized:
         return False
 
-    billing_enabled = SiteConfiguration.objects.filter(
-        billing_app_enabled=True
-    ).exists()
+    site_config = SiteConfiguration.objects.first()
+    billing_enabled = bool(site_config and site_config.billing_app_enabled)
 
-    # Keep nullable relationships out of the locking query. PostgreSQL rejects
-    # FOR UPDATE queries that lock the nullable side of an outer join.
-    locked_flights = Flight.objects.select_for_update().filter(logsheet=locked_logsheet)
+    # Lock only the flight rows: PostgreSQL rejects FOR UPDATE queries that
+    # lock the nullable side of an outer join, and the pricing relations are
+    # nullable. All flights are priced from one PricingContext.
+    locked_flights = PricingContext(site_config=site_config).prime(
+        Flight.objects.select_for_update(of=("self",))
+        .select_related(*PRICING_SELECT_RELATED, "split_with")
+        .filter(logsheet=locked_logsheet)
+    )
     for flight in locked_flights:
         # Track which cost fields actually changed to avoid no-op saves
         costs_to_save = []
@@ -1,17 +1,25 @@
 import logging
 
 from django.conf import settings
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.template.loader import render_to_string
 from django.urls import reverse
 
+from members.models import Member
 from notifications.models import Notification
 from utils.email import send_mail
 from utils.email_helpers import get_absolute_club_logo_url
 from utils.url_helpers import build_absolute_url, get_canonical_url
 
-from .models import Flight, MaintenanceIssue
+from .models import (
+    Airfield,
+    Flight,
+    FlightTombstone,
+    Glider,
+    MaintenanceIssue,
+    Towplane,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -321,3 +329,36 @@ def notify_instructor_on_flight_created(sender, instance, created, **kwargs):
         # Don't raise in signals
         logger.exception("notify_instructor_on_flight_created: unexpected exception")
         return
+
+
+# Offline reference data (logsheet/api.py) is cached until one of its source
+# tables changes. Member saves that only touch last_login (every sign-in)
+# cannot change the payload, so they are ignored.
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+@receiver(post_save, sender=Glider)
+@receiver(post_delete, sender=Glider)
+@receiver(post_save, sender=Towplane)
+@receiver(post_delete, sender=Towplane)
+@receiver(post_save, sender=Airfield)
+@receiver(post_delete, sender=Airfield)
+def invalidate_offline_reference_data(sender, instance, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+
+    from .api import invalidate_reference_data_cache
+
+    invalidate_reference_data_cache()
+
+
+# Incremental stats dumps (logsheet/utils/stats_dump.py) report deleted
+# flights as tombstones, so keep a record of each deletion.
+@receiver(post_delete, sender=Flight)
+def record_flight_tombstone(sender, instance, **kwargs):
+    logsheet = getattr(instance, "logsheet", None)
+    FlightTombstone.objects.create(
+        flight_id=instance.pk,
+        logsheet_id=instance.logsheet_id,
+        log_date=logsheet.log_date if logsheet else None,
+    )
@@ -5,14 +5,22 @@ Part of Issue #315: PWA Fully-offline Logsheet data entry
 """
 
 import json
-from datetime import date
+from datetime import date, timedelta
 from unittest.mock import patch
 
 import pytest
 from django.test import Client
 from django.urls import reverse
-
-from logsheet.models import Airfield, Flight, Glider, Logsheet, Towplane
+from django.utils import timezone
+
+from logsheet.models import (
+    Airfield,
+    Flight,
+    Glider,
+    Logsheet,
+    OfflineSyncIdempotencyKey,
+    Towplane,
+)
 from members.models import Member
 
 
@@ -235,6 +243,73 @@ class TestReferenceDataEndpoint:
         assert inactive.id not in glider_ids
 
 
+class TestReferenceDataConditionalRequests:
+    """ETag / If-None-Match and ``since=`` delta support for reference data."""
+
+    def test_response_carries_etag(self, db, authenticated_client):
+        url = reverse("logsheet:api_offline_reference_data")
+        response = authenticated_client.get(url)
+        assert response["ETag"].startswith('"')
+        assert response.json()["delta"] is False
+
+    def test_matching_if_none_match_returns_304(self, db, authenticated_client):
+        url = reverse("logsheet:api_offline_reference_data")
+        etag = authenticated_client.get(url)["ETag"]
+
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+    def test_version_is_stable_until_data_changes(
+        self, db, authenticated_client, glider
+    ):
+        url = reverse("logsheet:api_offline_reference_data")
+        first = authenticated_client.get(url)
+        second = authenticated_client.get(url)
+        assert first.json()["version"] == second.json()["version"]
+
+        glider.model = "Discus 2"
+        glider.save()
+
+        third = authenticated_client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        assert third.status_code == 200
+        assert third.json()["version"] != first.json()["version"]
+        assert third["ETag"] != first["ETag"]
+
+    def test_since_returns_only_changed_and_removed_rows(
+        self, db, authenticated_client, glider, towplane, airfield
+    ):
+        url = reverse("logsheet:api_offline_reference_data")
+        version = authenticated_client.get(url).json()["version"]
+
+        new_glider = Glider.objects.create(
+            make="Schleicher", model="ASK-21", n_number="N21AK", is_active=True
+        )
+        towplane.is_active = False
+        towplane.save()
+
+        data = authenticated_client.get(url, {"since": version}).json()
+
+        assert data["delta"] is True
+        assert data["since"] == version
+        assert [g["id"] for g in data["gliders"]] == [new_glider.id]
+        assert data["members"] == []
+        assert data["airfields"] == []
+        assert data["removed"]["towplanes"] == [towplane.id]
+        assert data["removed"]["gliders"] == []
+
+    def test_unknown_since_falls_back_to_full_payload(
+        self, db, authenticated_client, glider
+    ):
+        url = reverse("logsheet:api_offline_reference_data")
+        data = authenticated_client.get(url, {"since": "12345"}).json()
+
+        assert data["delta"] is False
+        assert glider.id in [g["id"] for g in data["gliders"]]
+        assert "flight_types" in data
+
+
 class TestFlightsSyncEndpoint:
     """Tests for the POST /api/offline/flights/sync/ endpoint."""
 
@@ -483,6 +558,310 @@ class TestFlightsSyncEndpoint:
         assert "SECRET_STACK_TRACE_DETAIL" not in response.content.decode("utf-8")
 
 
+class TestIdempotencyLedger:
+    """Tests for the shared, database-backed idempotency ledger."""
+
+    def _payload(self, key, logsheet, member, glider, airfield):
+        return {
+            "flights": [
+                {
+                    "idempotencyKey": key,
+                    "action": "create",
+                    "data": {
+                        "logsheet_id": logsheet.id,
+                        "pilot_id": member.id,
+                        "glider_id": glider.id,
+                        "airfield_id": airfield.id,
+                        "flight_type": "solo",
+                    },
+                }
+            ]
+        }
+
+    def test_successful_create_records_ledger_entry(
+        self, db, authenticated_client, logsheet, active_member, glider, airfield
+    ):
+        url = reverse("logsheet:api_offline_flights_sync")
+        payload = self._payload(
+            "ledger-key-001", logsheet, active_member, glider, airfield
+        )
+
+        response = authenticated_client.post(
+            url, data=json.dumps(payload), content_type="application/json"
+        )
+        server_id = response.json()["results"][0]["serverId"]
+
+        entry = OfflineSyncIdempotencyKey.objects.get(key="ledger-key-001")
+        assert entry.flight_id == server_id
+        assert entry.expires_at > timezone.now()
+
+    def test_replay_is_answered_without_recreating_flight(
+        self, db, authenticated_client, logsheet, active_member, glider, airfield
+    ):
+        """A key recorded by any worker short-circuits creation entirely."""
+        flight = Flight.objects.create(
+            logsheet=logsheet, pilot=active_member, glider=glider, flight_type="solo"
+        )
+        OfflineSyncIdempotencyKey.objects.create(
+            key="ledger-key-replay",
+            flight=flight,
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+        url = reverse("logsheet:api_offline_flights_sync")
+        payload = self._payload(
+            "ledger-key-replay", logsheet, active_member, glider, airfield
+        )
+
+        with patch("logsheet.api._create_flight_from_offline") as create:
+            response = authenticated_client.post(
+                url, data=json.dumps(payload), content_type="application/json"
+            )
+
+        create.assert_not_called()
+        result = response.json()["results"][0]
+        assert result["status"] == "duplicate"
+        assert result["serverId"] == flight.id
+
+    def test_repeated_key_within_one_payload_creates_single_flight(
+        self, db, authenticated_client, logsheet, active_member, glider, airfield
+    ):
+        url = reverse("logsheet:api_offline_flights_sync")
+        payload = self._payload(
+            "ledger-key-twice", logsheet, active_member, glider, airfield
+        )
+        payload["flights"] = payload["flights"] * 2
+
+        response = authenticated_client.post(
+            url, data=json.dumps(payload), content_type="application/json"
+        )
+
+        statuses = [r["status"] for r in response.json()["results"]]
+        assert statuses == ["success", "duplicate"]
+        assert Flight.objects.filter(logsheet=logsheet).count() == 1
+
+    def test_expired_entries_are_purged_and_not_replayed(
+        self, db, authenticated_client, logsheet, active_member, glider, airfield
+    ):
+        OfflineSyncIdempotencyKey.objects.create(
+            key="ledger-key-expired",
+            flight=None,
+            expires_at=timezone.now() - timedelta(seconds=1),
+        )
+        url = reverse("logsheet:api_offline_flights_sync")
+        payload = self._payload(
+            "ledger-key-expired", logsheet, active_member, glider, airfield
+        )
+
+        response = authenticated_client.post(
+            url, data=json.dumps(payload), content_type="application/json"
+        )
+
+        assert response.json()["results"][0]["status"] == "success"
+        entry = OfflineSyncIdempotencyKey.objects.get(key="ledger-key-expired")
+        assert entry.expires_at > timezone.now()
+
+    def test_overlong_key_is_rejected_without_creating_flight(
+        self, db, authenticated_client, logsheet, active_member, glider, airfield
+    ):
+        url = reverse("logsheet:api_offline_flights_sync")
+        payload = self._payload("k" * 129, logsheet, active_member, glider, airfield)
+
+        response = authenticated_client.post(
+            url, data=json.dumps(payload), content_type="application/json"
+        )
+
+        result = response.json()["results"][0]
+        assert result["status"] == "error"
+        assert result["error"] == "idempotencyKey is too long"
+        assert not Flight.objects.filter(logsheet=logsheet).exists()
+        assert not OfflineSyncIdempotencyKey.objects.exists()
+
+
+class TestBulkFlightsSync:
+    """Tests for the single-transaction ``"mode": "bulk"`` sync path."""
+
+    def _create_item(self, key, logsheet, member, glider, airfield, **extra):
+        data = {
+            "logsheet_id": logsheet.id,
+            "pilot_id": member.id,
+            "glider_id": glider.id,
+            "airfield_id": airfield.id,
+            "flight_type": "solo",
+        }
+        data.update(extra)
+        return {"idempotencyKey": key, "action": "create", "data": data}
+
+    def _post(self, client, flights):
+        url = reverse("logsheet:api_offline_flights_sync")
+        return client.post(
+            url,
+            data=json.dumps({"mode": "bulk", "flights": flights}),
+            content_type="application/json",
+        )
+
+    def test_bulk_create_returns_per_item_results(
+        self, db, authenticated_client, logsheet, active_member, glider, airfield
+    ):
+        flights = [
+            self._create_item(
+                "bulk-001",
+                logsheet,
+                active_member,
+                glider,
+                airfield,
+                launch_time="10:00",
+                landing_time="10:45",
+            ),
+            self._create_item(
+                "bulk-002", logsheet, active_member, glider, airfield, pilot_id=99999
+            ),
+            self._create_item("bulk-003", logsheet, active_member, glider, airfield),
+        ]
+
+        response = self._post(authenticated_client, flights)
+        results = response.json()["results"]
+
+        assert [r["status"] for r in results] == ["success", "error", "success"]
+        assert results[1]["error"] == "Pilot not found"
+        flight = Flight.objects.get(id=results[0]["serverId"])
+        assert flight.duration == timedelta(minutes=45)
+        assert flight.launch_method == "tow"
+        assert (
+            OfflineSyncIdempotencyKey.objects.filter(
+                key__in=["bulk-001", "bulk-003"]
+            ).count()
+            == 2
+        )
+
+    def test_bulk_query_count_does_not_grow_with_payload(
+        self,
+        db,
+        authenticated_client,
+        logsheet,
+        active_member,
+        glider,
+        airfield,
+        django_assert_max_num_queries,
+    ):
+        flights = [
+            self._create_item(
+                f"bulk-many-{i}", logsheet, active_member, glider, airfield
+            )
+            for i in range(40)
+        ]
+
+        with django_assert_max_num_queries(20):
+            response = self._post(authenticated_client, flights)
+
+        assert all(r["status"] == "success" for r in response.json()["results"])
+        assert Flight.objects.filter(logsheet=logsheet).count() == 40
+
+    def test_bulk_replay_and_repeated_keys_are_duplicates(
+        self, db, authenticated_client, logsheet, active_member, glider, airfield
+    ):
+        item = self._create_item("bulk-dup", logsheet, active_member, glider, airfield)
+        first = self._post(authenticated_client, [item, item]).json()["results"]
+        second = self._post(authenticated_client, [item]).json()["results"]
+
+        assert [r["status"] for r in first] == ["success", "duplicate"]
+        assert first[1]["serverId"] == first[0]["serverId"]
+        assert second[0]["status"] == "duplicate"
+        assert second[0]["serverId"] == first[0]["serverId"]
+        assert Flight.objects.filter(logsheet=logsheet).count() == 1
+
+    def test_bulk_update_applies_changes_and_detects_conflicts(
+        self, db, authenticated_client, logsheet, active_member, glider, towplane
+    ):
+        flight = Flight.objects.create(
+            logsheet=logsheet, pilot=active_member, glider=glider, flight_type="solo"
+        )
+        stale = Flight.objects.create(
+            logsheet=logsheet, pilot=active_member, glider=glider, flight_type="solo"
+        )
+        flights = [
+            {
+                "idempotencyKey": "bulk-update-1",
+                "action": "update",
+                "data": {
+                    "id": flight.id,
+                    "towplane_id": towplane.id,
+                    "launch_time": "11:00",
+                    "landing_time": "11:30",
+                    "release_altitude": 2000,
+                },
+            },
+            {
+                "idempotencyKey": "bulk-update-2",
+                "action": "update",
+                "data": {"id": stale.id, "version": "1999-01-01T00:00:00"},
+            },
+        ]
+
+        results = self._post(authenticated_client, flights).json()["results"]
+
+        assert results[0]["status"] == "success"
+        assert results[1]["status"] == "conflict"
+        assert results[1]["serverData"]["id"] == stale.id
+        flight.refresh_from_db()
+        assert flight.towplane == towplane
+        assert flight.release_altitude == 2000
+        assert flight.duration == timedelta(minutes=30)
+
+    def test_bulk_rejects_invalid_values_without_sinking_batch(
+        self, db, authenticated_client, logsheet, active_member, glider, airfield
+    ):
+        flights = [
+            self._create_item(
+                "bulk-bad-time",
+                logsheet,
+                active_member,
+                glider,
+                airfield,
+                launch_time="not-a-time",
+            ),
+            self._create_item("bulk-good", logsheet, active_member, glider, airfield),
+        ]
+
+        results = self._post(authenticated_client, flights).json()["results"]
+
+        assert results[0] == {
+            "idempotencyKey": "bulk-bad-time",
+            "status": "error",
+            "error": "Invalid launch_time",
+        }
+        assert results[1]["status"] == "success"
+
+    def test_bulk_create_notifies_instructor(
+        self,
+        db,
+        authenticated_client,
+        logsheet,
+        active_member,
+        instructor_member,
+        glider,
+        airfield,
+    ):
+        from notifications.models import Notification
+
+        flights = [
+            self._create_item(
+                "bulk-dual",
+                logsheet,
+                active_member,
+                glider,
+                airfield,
+                instructor_id=instructor_member.id,
+                flight_type="dual",
+                launch_time="09:00",
+                landing_time="09:20",
+            )
+        ]
+
+        self._post(authenticated_client, flights)
+
+        assert Notification.objects.filter(user=instructor_member).exists()
+
+
 class TestSyncStatusEndpoint:
     """Tests for the GET /api/offline/sync-status/ endpoint."""
 
@@ -0,0 +1,166 @@
+from datetime import time
+from decimal import Decimal
+
+from django.test import TestCase
+
+from logsheet.models import (
+    Airfield,
+    Flight,
+    Glider,
+    Logsheet,
+    Towplane,
+    TowplaneChargeScheme,
+    TowplaneChargeTier,
+)
+from logsheet.utils.pricing import PRICING_SELECT_RELATED, PricingContext
+from members.models import Member
+from siteconfig.models import (
+    MembershipBillingRule,
+    MembershipGliderRentalRule,
+    MembershipStatus,
+    SiteConfiguration,
+)
+
+
+def _costs(flight):
+    return (
+        flight.tow_cost_calculated,
+        flight.rental_cost,
+        flight.instruction_fee_calculated,
+    )
+
+
+class PricingContextTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        SiteConfiguration.objects.create(
+            club_name="Test Club",
+            domain_name="example.org",
+            club_abbreviation="TC",
+            billing_rules_enabled=True,
+            billing_pricing_mode="matrix",
+            instructor_time_charges_enabled=True,
+            waive_tow_fee_on_retrieve=True,
+        )
+        student_status, _ = MembershipStatus.objects.get_or_create(
+            name="Student Member", defaults={"is_active": True}
+        )
+        MembershipStatus.objects.get_or_create(
+            name="Full Member", defaults={"is_active": True}
+        )
+        cls.member = Member.objects.create(
+            username="pricing_full", membership_status="Full Member"
+        )
+        cls.student = Member.objects.create(
+            username="pricing_student", membership_status="Student Member"
+        )
+        cls.instructor = Member.objects.create(
+            username="pricing_cfi", membership_status="Full Member", instructor=True
+        )
+        cls.glider = Glider.objects.create(
+            n_number="N100PC", model="ASK-21", club_owned=True, rental_rate=12
+        )
+        cls.discount_glider = Glider.objects.create(
+            n_number="N200PC", model="1-26", club_owned=True, rental_rate=20
+        )
+        MembershipBillingRule.objects.create(
+            membership_status=student_status,
+            tow_rate_per_1000ft_override=Decimal("7.50"),
+            instruction_flat_fee_per_flight=Decimal("18.00"),
+            charge_instruction_per_instructed_flight=True,
+        )
+        MembershipGliderRentalRule.objects.create(
+            membership_status=student_status,
+            glider=cls.discount_glider,
+            hourly_rate_override=Decimal("5.00"),
+        )
+        cls.towplanes = []
+        for n, hookup in enumerate(("7.50", "10.00")):
+            towplane = Towplane.objects.create(name=f"Tow {n}", n_number=f"N{n}00TP")
+            scheme = TowplaneChargeScheme.objects.create(
+                towplane=towplane, name=f"Rates {n}", hookup_fee=Decimal(hookup)
+            )
+            TowplaneChargeTier.objects.create(
+                charge_scheme=scheme,
+                altitude_start=0,
+                altitude_end=1000,
+                rate_type="flat",
+                rate_amount=Decimal("10.00"),
+            )
+            TowplaneChargeTier.objects.create(
+                charge_scheme=scheme,
+                altitude_start=1000,
+                rate_type="per_1000ft",
+                rate_amount=Decimal("5.00"),
+            )
+            cls.towplanes.append(towplane)
+        cls.unpriced_towplane = Towplane.objects.create(name="No Scheme", n_number="N9")
+
+        airfield = Airfield.objects.create(identifier="KPRC", name="Pricing Field")
+        cls.logsheet = Logsheet.objects.create(
+            log_date="2025-06-01", airfield=airfield, created_by=cls.member
+        )
+
+    def _flight(self, **kwargs):
+        fields = {
+            "logsheet": self.logsheet,
+            "pilot": self.member,
+            "glider": self.glider,
+            "towplane": self.towplanes[0],
+            "release_altitude": 3000,
+            "launch_time": time(10, 0),
+            "landing_time": time(11, 0),
+        }
+        fields.update(kwargs)
+        return Flight.objects.create(**fields)
+
+    def _make_flights(self):
+        self._flight()
+        self._flight(pilot=self.student, instructor=self.instructor)
+        self._flight(pilot=self.student, glider=self.discount_glider)
+        self._flight(towplane=self.towplanes[1], release_altitude=1500)
+        self._flight(towplane=self.unpriced_towplane)
+        self._flight(is_retrieve=True)
+        self._flight(pilot=None, guest_pilot_name="Guest")
+
+    def _fresh(self):
+        return Flight.objects.select_related(*PRICING_SELECT_RELATED).order_by("pk")
+
+    def test_primed_costs_match_unprimed_properties(self):
+        self._make_flights()
+        expected = [_costs(f) for f in Flight.objects.order_by("pk")]
+
+        primed = PricingContext().prime(self._fresh())
+
+        self.assertEqual([_costs(f) for f in primed], expected)
+        self.assertEqual(expected[1][2], Decimal("18.00"))
+        self.assertEqual(expected[2][1], Decimal("5.00"))
+        self.assertEqual(expected[5][0], Decimal("0.00"))
+
+    def test_pricing_a_batch_costs_constant_queries(self):
+        self._make_flights()
+        # Flight list, site config, tow tiers, billing rules, glider rules.
+        with self.assertNumQueries(5):
+            flights = PricingContext().prime(self._fresh())
+        with self.assertNumQueries(0):
+            for flight in flights:
+                _costs(flight)
+
+        for _ in range(10):
+            self._flight(pilot=self.student, instructor=self.instructor)
+        with self.assertNumQueries(5):
+            flights = PricingContext().prime(self._fresh())
+        with self.assertNumQueries(0):
+            for flight in flights:
+                _costs(flight)
+
+    def test_rules_not_loaded_when_billing_rules_disabled(self):
+        SiteConfiguration.objects.update(billing_rules_enabled=False)
+        self._flight(pilot=self.student, instructor=self.instructor)
+
+        with self.assertNumQueries(3):
+            flights = PricingContext().prime(self._fresh())
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                _costs(flights[0]), (Decimal("27.50"), Decimal("12.00"), Decimal(0))
+            )
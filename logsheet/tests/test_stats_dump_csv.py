@@ -1,3 +1,6 @@
+import gzip
+from datetime import timedelta
+
 import pytest
 from django.core.files.base import ContentFile
 from django.urls import reverse
@@ -55,6 +58,27 @@ def test_stats_dump_csv_queues_job_and_redirects_to_status(client):
     assert outbox.requested_by == requester
     assert outbox.status == StatsDumpOutbox.STATUS_PENDING
     assert resp.url == reverse("logsheet:stats_dump_export_status", args=[outbox.pk])
+    assert outbox.mode == StatsDumpOutbox.MODE_FULL
+
+
+@pytest.mark.django_db
+def test_stats_dump_csv_queues_incremental_job(client):
+    requester = Member.objects.create_user(
+        username="stats_owner_incremental",
+        password="pass",
+        membership_status="Full Member",
+        stats_monger=True,
+    )
+
+    client.force_login(requester)
+    client.post(
+        reverse("logsheet:stats_dump_export_queue"),
+        {"mode": StatsDumpOutbox.MODE_INCREMENTAL},
+    )
+    client.post(reverse("logsheet:stats_dump_export_queue"), {"mode": "bogus"})
+
+    modes = list(StatsDumpOutbox.objects.order_by("pk").values_list("mode", flat=True))
+    assert modes == [StatsDumpOutbox.MODE_INCREMENTAL, StatsDumpOutbox.MODE_FULL]
 
 
 @pytest.mark.django_db
@@ -213,3 +237,60 @@ def test_stats_dump_status_shows_last_error_for_superuser(client):
     content = resp.content.decode("utf-8")
     assert "Export failed." in content
     assert "internal traceback details" in content
+
+
+@pytest.mark.django_db
+def test_stats_dump_download_serves_gzip_export(client, tmp_path, settings):
+    settings.MEDIA_ROOT = str(tmp_path)
+    requester = Member.objects.create_user(
+        username="stats_owner_download_gz",
+        password="pass",
+        membership_status="Full Member",
+        stats_monger=True,
+    )
+    outbox = StatsDumpOutbox.objects.create(
+        requested_by=requester,
+        status=StatsDumpOutbox.STATUS_READY,
+        completed_at=timezone.now(),
+        result_filename="stats_dump_test.csv.gz",
+    )
+    outbox.result_file.save(
+        "stats_dump_test.csv.gz",
+        ContentFile(gzip.compress(b"flight_tracking_id\n1\n")),
+        save=True,
+    )
+
+    client.force_login(requester)
+    resp = client.get(reverse("logsheet:stats_dump_export_download", args=[outbox.pk]))
+
+    assert resp.status_code == 200
+    assert resp["Content-Type"].startswith("application/gzip")
+    assert 'filename="stats_dump_test.csv.gz"' in resp["Content-Disposition"]
+
+
+@pytest.mark.django_db
+def test_stats_dump_status_shows_rows_per_second(client):
+    requester = Member.objects.create_user(
+        username="stats_owner_progress",
+        password="pass",
+        membership_status="Full Member",
+        stats_monger=True,
+    )
+    started = timezone.now() - timedelta(seconds=10)
+    outbox = StatsDumpOutbox.objects.create(
+        requested_by=requester,
+        status=StatsDumpOutbox.STATUS_PROCESSING,
+        started_at=started,
+        progress_updated_at=started + timedelta(seconds=4),
+        rows_at_start=1000,
+        rows_written=3000,
+    )
+
+    client.force_login(requester)
+    resp = client.get(reverse("logsheet:stats_dump_export_status", args=[outbox.pk]))
+
+    assert resp.status_code == 200
+    content = resp.content.decode("utf-8")
+    assert "3000" in content
+    assert "500 rows/s" in content
+    assert "resumed after 1000 rows" in content
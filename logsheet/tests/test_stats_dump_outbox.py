@@ -1,15 +1,27 @@
+import gzip
 from datetime import date, time, timedelta
 from decimal import Decimal
-from unittest.mock import patch
+from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
 from django.core.management import call_command
 from django.utils import timezone
+from storages.backends.gcloud import GoogleCloudStorage
 
 from logsheet.management.commands.process_stats_dump_outbox import MAX_ATTEMPTS
-from logsheet.models import Airfield, Flight, Glider, Logsheet, StatsDumpOutbox
+from logsheet.models import (
+    Airfield,
+    Flight,
+    FlightTombstone,
+    Glider,
+    Logsheet,
+    StatsDumpOutbox,
+)
 from logsheet.utils.stats_dump import (
     MAX_LAST_ERROR_LENGTH,
+    STATS_DUMP_PARTS_DIR,
+    _assemble_stats_dump,
+    iter_stats_dump_records,
     iter_stats_dump_rows,
     process_stats_dump_outbox_job,
 )
@@ -75,13 +87,15 @@ class TestStatsDumpOutboxCommand:
         assert outbox.completed_at is not None
         assert outbox.attempt_count == 1
 
-        content = outbox.result_file.read().decode("utf-8")
+        assert outbox.result_filename.endswith(".csv.gz")
+        content = gzip.decompress(outbox.result_file.read()).decode("utf-8")
         assert "flight_tracking_id" in content
         assert "Pilot One" in content
         assert "KTS1" in content
 
     @patch(
-        "logsheet.utils.stats_dump.iter_stats_dump_rows", side_effect=Exception("boom")
+        "logsheet.utils.stats_dump.iter_stats_dump_records",
+        side_effect=Exception("boom"),
     )
     def test_command_marks_failed_when_generation_errors(self, _mock_rows):
         outbox = StatsDumpOutbox.objects.create(
@@ -156,7 +170,7 @@ class TestStatsDumpOutboxCommand:
         assert outbox.attempt_count == 1
 
     @patch(
-        "logsheet.utils.stats_dump.iter_stats_dump_rows",
+        "logsheet.utils.stats_dump.iter_stats_dump_records",
         side_effect=Exception("x" * 5000),
     )
     def test_process_job_truncates_last_error(self, _mock_rows):
@@ -173,7 +187,7 @@ class TestStatsDumpOutboxCommand:
 
     @patch("logsheet.utils.stats_dump.logger.exception")
     @patch(
-        "logsheet.utils.stats_dump.iter_stats_dump_rows",
+        "logsheet.utils.stats_dump.iter_stats_dump_records",
         side_effect=Exception("boom"),
     )
     def test_process_job_logs_exception_when_generation_fails(
@@ -228,3 +242,289 @@ class TestStatsDumpOutboxCommand:
         assert len(data_rows) >= 2
         flight_dates = [row[1] for row in data_rows]
         assert flight_dates == sorted(flight_dates)
+
+    def _add_flights(self, count):
+        for offset in range(count):
+            logsheet = Logsheet.objects.create(
+                log_date=self.logsheet.log_date - timedelta(days=offset + 1),
+                airfield=self.airfield,
+                created_by=self.requester,
+                finalized=False,
+            )
+            Flight.objects.create(
+                logsheet=logsheet,
+                pilot=self.pilot,
+                glider=self.glider,
+                flight_type="Dual",
+                launch_time=time(11, 0, 0),
+                landing_time=time(11, 30, 0),
+                release_altitude=3000,
+            )
+
+    def _data_rows(self, outbox):
+        with outbox.result_file.open("rb") as f:
+            content = gzip.decompress(f.read()).decode("utf-8")
+        lines = content.strip().splitlines()
+        assert lines[0].startswith("flight_tracking_id,")
+        return lines[1:]
+
+    def test_process_job_writes_gzip_parts_and_checkpoints(self, tmp_path):
+        self._add_flights(2)
+        outbox = StatsDumpOutbox.objects.create(
+            requested_by=self.requester,
+            status=StatsDumpOutbox.STATUS_PENDING,
+        )
+
+        process_stats_dump_outbox_job(outbox.pk, part_rows=1)
+
+        outbox.refresh_from_db()
+        assert outbox.status == StatsDumpOutbox.STATUS_READY
+        assert outbox.rows_written == 3
+        assert outbox.parts_written == 3
+        assert outbox.cursor is None
+        assert [row.split(",")[0] for row in self._data_rows(outbox)] == [
+            row[0] for row in list(iter_stats_dump_rows())[1:]
+        ]
+        # Parts are removed once assembled into the result file.
+        parts_dir = tmp_path / STATS_DUMP_PARTS_DIR / str(outbox.pk)
+        assert not parts_dir.exists() or not any(parts_dir.iterdir())
+
+    def test_process_job_resumes_from_checkpoint_after_failure(self):
+        self._add_flights(3)
+        expected_ids = [row[0] for row in list(iter_stats_dump_rows())[1:]]
+        outbox = StatsDumpOutbox.objects.create(
+            requested_by=self.requester,
+            status=StatsDumpOutbox.STATUS_PENDING,
+        )
+
+        def dies_after_two_rows(**kwargs):
+            for n, record in enumerate(iter_stats_dump_records(**kwargs)):
+                if n == 2:
+                    raise RuntimeError("worker died")
+                yield record
+
+        with patch(
+            "logsheet.utils.stats_dump.iter_stats_dump_records",
+            side_effect=dies_after_two_rows,
+        ):
+            process_stats_dump_outbox_job(outbox.pk, part_rows=1)
+
+        outbox.refresh_from_db()
+        assert outbox.status == StatsDumpOutbox.STATUS_FAILED
+        assert outbox.rows_written == 2
+        assert outbox.cursor_flight_id == int(expected_ids[1])
+
+        resumed_from = []
+
+        def records_spy(**kwargs):
+            resumed_from.append(kwargs["after"])
+            return iter_stats_dump_records(**kwargs)
+
+        with patch(
+            "logsheet.utils.stats_dump.iter_stats_dump_records",
+            side_effect=records_spy,
+        ):
+            process_stats_dump_outbox_job(outbox.pk, part_rows=1)
+
+        outbox.refresh_from_db()
+        assert outbox.status == StatsDumpOutbox.STATUS_READY
+        assert resumed_from[0][2] == int(expected_ids[1])
+        assert outbox.rows_at_start == 2
+        assert outbox.rows_written == 4
+        assert [row.split(",")[0] for row in self._data_rows(outbox)] == expected_ids
+
+    def test_command_leaves_long_running_job_with_fresh_heartbeat(self):
+        outbox = StatsDumpOutbox.objects.create(
+            requested_by=self.requester,
+            status=StatsDumpOutbox.STATUS_PROCESSING,
+            started_at=timezone.now() - timedelta(hours=1),
+            progress_updated_at=timezone.now() - timedelta(minutes=1),
+            attempt_count=1,
+        )
+
+        call_command("process_stats_dump_outbox", limit=10, verbosity=0)
+
+        outbox.refresh_from_db()
+        assert outbox.status == StatsDumpOutbox.STATUS_PROCESSING
+        assert outbox.attempt_count == 1
+
+    def test_taken_over_attempt_stops_writing_parts(self):
+        self._add_flights(3)
+        outbox = StatsDumpOutbox.objects.create(
+            requested_by=self.requester,
+            status=StatsDumpOutbox.STATUS_PENDING,
+        )
+
+        def taken_over_after_one_row(**kwargs):
+            for n, record in enumerate(iter_stats_dump_records(**kwargs)):
+                if n == 1:
+                    # Recovered as stale and claimed by a newer attempt.
+                    StatsDumpOutbox.objects.filter(pk=outbox.pk).update(attempt_count=2)
+                yield record
+
+        with patch(
+            "logsheet.utils.stats_dump.iter_stats_dump_records",
+            side_effect=taken_over_after_one_row,
+        ):
+            process_stats_dump_outbox_job(outbox.pk, part_rows=1)
+
+        outbox.refresh_from_db()
+        assert outbox.status == StatsDumpOutbox.STATUS_PROCESSING
+        assert outbox.parts_written == 1
+        assert not outbox.result_file
+
+    def test_gcs_parts_are_composed_inside_the_bucket(self):
+        storage = GoogleCloudStorage(bucket_name="bucket", file_overwrite=True)
+        parts = [f"parts/part-{i:06d}.csv.gz" for i in range(40)]
+
+        with patch.object(
+            GoogleCloudStorage, "bucket", new_callable=PropertyMock
+        ) as bucket:
+            blobs = {}
+            bucket.return_value.blob.side_effect = lambda name: blobs.setdefault(
+                name, MagicMock(name=name)
+            )
+            name = _assemble_stats_dump(storage, parts, "exports/dump.csv.gz")
+
+        target = blobs["exports/dump.csv.gz"]
+        first, second = target.compose.call_args_list
+        assert first.args[0] == [blobs[part] for part in parts[:32]]
+        assert second.args[0] == [target, *(blobs[part] for part in parts[32:])]
+        assert name == "exports/dump.csv.gz"
+
+    def test_iter_stats_dump_records_continues_after_cursor(self):
+        self._add_flights(2)
+        records = list(iter_stats_dump_records())
+
+        remaining = list(iter_stats_dump_records(after=records[0][0]))
+
+        assert [row for _cursor, row in remaining] == [
+            row for _cursor, row in records[1:]
+        ]
+
+
+@pytest.mark.django_db
+class TestIncrementalStatsDump:
+    @pytest.fixture(autouse=True)
+    def setup(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        self.requester = Member.objects.create_user(
+            username="incremental_requester",
+            password="testpass",
+            membership_status="Full Member",
+            stats_monger=True,
+        )
+        self.pilot = Member.objects.create_user(
+            username="incremental_pilot",
+            password="testpass",
+            membership_status="Full Member",
+            first_name="Inc",
+            last_name="Pilot",
+        )
+        self.airfield = Airfield.objects.create(identifier="KTS2", name="Inc Field")
+        self.glider = Glider.objects.create(
+            make="Schweizer",
+            model="SGS 2-33",
+            n_number="N233AA",
+            rental_rate=Decimal("30.00"),
+            club_owned=True,
+            is_active=True,
+        )
+        self.old_logsheet = self._logsheet(days_ago=10)
+        self.kept = self._flight(self.old_logsheet)
+        self.edited = self._flight(self.old_logsheet)
+        self.deleted = self._flight(self.old_logsheet)
+
+    def _logsheet(self, days_ago):
+        return Logsheet.objects.create(
+            log_date=date.today() - timedelta(days=days_ago),
+            airfield=self.airfield,
+            created_by=self.requester,
+        )
+
+    def _flight(self, logsheet):
+        return Flight.objects.create(
+            logsheet=logsheet,
+            pilot=self.pilot,
+            glider=self.glider,
+            flight_type="Solo",
+            launch_time=time(12, 0, 0),
+            landing_time=time(12, 45, 0),
+            release_altitude=2000,
+        )
+
+    def _run(self, mode):
+        outbox = StatsDumpOutbox.objects.create(
+            requested_by=self.requester,
+            status=StatsDumpOutbox.STATUS_PENDING,
+            mode=mode,
+        )
+        process_stats_dump_outbox_job(outbox.pk)
+        outbox.refresh_from_db()
+        assert outbox.status == StatsDumpOutbox.STATUS_READY
+        with outbox.result_file.open("rb") as f:
+            lines = gzip.decompress(f.read()).decode("utf-8").strip().splitlines()
+        return outbox, [line.split(",") for line in lines]
+
+    def test_flight_delete_records_tombstone(self):
+        flight_id = self.deleted.pk
+
+        self.deleted.delete()
+
+        tombstone = FlightTombstone.objects.get(flight_id=flight_id)
+        assert tombstone.logsheet_id == self.old_logsheet.pk
+        assert tombstone.log_date == self.old_logsheet.log_date
+
+    def test_incremental_without_previous_dump_exports_everything(self):
+        outbox, rows = self._run(StatsDumpOutbox.MODE_INCREMENTAL)
+
+        assert outbox.changed_since is None
+        assert rows[0][-1] == "change"
+        assert len(rows) == 4
+        assert {row[-1] for row in rows[1:]} == {"upsert"}
+        assert outbox.result_filename.startswith("stats_dump_incremental_")
+
+    def test_incremental_exports_only_changes_since_previous_dump(self):
+        first, _rows = self._run(StatsDumpOutbox.MODE_FULL)
+
+        self.edited.release_altitude = 3000
+        self.edited.save()
+        deleted_id = self.deleted.pk
+        self.deleted.delete()
+        new_logsheet = self._logsheet(days_ago=1)
+        added = self._flight(new_logsheet)
+
+        outbox, rows = self._run(StatsDumpOutbox.MODE_INCREMENTAL)
+
+        assert outbox.changed_since == first.snapshot_at
+        changes = {row[0]: row[-1] for row in rows[1:]}
+        assert changes == {
+            str(deleted_id): "deleted",
+            str(self.edited.pk): "upsert",
+            str(added.pk): "upsert",
+        }
+        # Tombstones lead the file.
+        assert rows[1][0] == str(deleted_id)
+        assert len(rows[1]) == len(rows[0])
+
+    def test_incremental_includes_flights_saved_with_update_fields(self):
+        self._run(StatsDumpOutbox.MODE_FULL)
+
+        self.edited.split_type = "even"
+        self.edited.save(update_fields=["split_type"])
+
+        _outbox, rows = self._run(StatsDumpOutbox.MODE_INCREMENTAL)
+
+        assert [row[0] for row in rows[1:]] == [str(self.edited.pk)]
+
+    def test_incremental_includes_flights_on_finalized_logsheet(self):
+        self._run(StatsDumpOutbox.MODE_FULL)
+
+        self.old_logsheet.finalized = True
+        self.old_logsheet.save()
+
+        _outbox, rows = self._run(StatsDumpOutbox.MODE_INCREMENTAL)
+
+        assert sorted(row[0] for row in rows[1:]) == sorted(
+            str(f.pk) for f in (self.kept, self.edited, self.deleted)
+        )
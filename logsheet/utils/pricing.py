@@ -0,0 +1,119 @@
+"""
+Shared pricing lookups for computing costs over many flights.
+
+``Flight.tow_cost_calculated``, ``rental_cost_calculated`` and
+``instruction_fee_calculated`` read the site configuration, the pilot's
+membership billing rule, the status+glider rental rule and the towplane's
+charge tiers. Each lookup is cached on the instance, but every flight starts
+cold, so pricing N flights costs O(N) queries. ``PricingContext`` loads those
+tables once and fills the per-instance caches, so a batch of flights is
+priced with a fixed number of queries.
+
+Flights passed to ``PricingContext.prime`` should be loaded with
+``select_related(*PRICING_SELECT_RELATED)`` so the pilot, glider and
+towplane charge scheme come with each row.
+"""
+
+from logsheet.models import TowplaneChargeScheme, TowplaneChargeTier
+from siteconfig.models import (
+    MembershipBillingRule,
+    MembershipGliderRentalRule,
+    SiteConfiguration,
+)
+
+PRICING_SELECT_RELATED = ("pilot", "instructor", "glider", "towplane__charge_scheme")
+
+_UNSET = object()
+
+
+class PricingContext:
+    """Pricing tables loaded once and shared by every flight in a batch."""
+
+    def __init__(self, site_config=_UNSET):
+        if site_config is _UNSET:
+            site_config = SiteConfiguration.objects.first()
+        self.site_config = site_config
+        self._tiers_by_scheme = None
+        self._billing_rules_by_status = None
+        self._glider_rules_by_status_glider = None
+
+    @property
+    def billing_rules_enabled(self):
+        return bool(self.site_config and self.site_config.billing_rules_enabled)
+
+    def _active_tiers_by_scheme(self):
+        if self._tiers_by_scheme is None:
+            tiers_by_scheme = {}
+            for tier in TowplaneChargeTier.objects.filter(is_active=True).order_by(
+                "charge_scheme_id", "altitude_start"
+            ):
+                tiers_by_scheme.setdefault(tier.charge_scheme_id, []).append(tier)
+            self._tiers_by_scheme = tiers_by_scheme
+        return self._tiers_by_scheme
+
+    def _load_membership_rules(self):
+        if self._billing_rules_by_status is not None:
+            return
+        if not self.billing_rules_enabled:
+            # Cost properties never consult the rules when billing rules are
+            # off, so there is nothing to load.
+            self._billing_rules_by_status = {}
+            self._glider_rules_by_status_glider = {}
+            return
+
+        self._billing_rules_by_status = {
+            rule.membership_status.name: rule
+            for rule in MembershipBillingRule.objects.select_related(
+                "membership_status"
+            ).filter(is_active=True)
+        }
+        self._glider_rules_by_status_glider = {
+            (rule.membership_status.name, rule.glider_id): rule
+            for rule in MembershipGliderRentalRule.objects.select_related(
+                "membership_status", "glider"
+            ).filter(is_active=True)
+        }
+
+    def billing_rule_for(self, membership_status):
+        """Active ``MembershipBillingRule`` for a status name, or None."""
+        if not membership_status:
+            return None
+        self._load_membership_rules()
+        return self._billing_rules_by_status.get(membership_status)
+
+    def glider_rule_for(self, membership_status, glider_id):
+        """Active ``MembershipGliderRentalRule`` for a status and glider, or None."""
+        if not membership_status or not glider_id:
+            return None
+        self._load_membership_rules()
+        return self._glider_rules_by_status_glider.get((membership_status, glider_id))
+
+    def prime(self, flights):
+        """
+        Fill the pricing caches on ``flights`` and return them as a list.
+
+        After priming, the calculated cost properties of every flight run
+        without further queries (given ``PRICING_SELECT_RELATED``).
+        """
+        flights = list(flights)
+        for flight in flights:
+            flight._site_config_cache = self.site_config
+
+            pilot = flight.pilot if flight.pilot_id else None
+            status = pilot.membership_status if pilot else None
+            flight._membership_billing_rule_cache = (
+                self.billing_rule_for(status) or False
+            )
+            flight._membership_glider_rental_rule_cache = (
+                self.glider_rule_for(status, flight.glider_id) or False
+            )
+
+            if flight.towplane_id:
+                try:
+                    scheme = flight.towplane.charge_scheme
+                except TowplaneChargeScheme.DoesNotExist:
+                    continue
+                scheme._active_charge_tiers = self._active_tiers_by_scheme().get(
+                    scheme.pk, []
+                )
+        return flights
@@ -1,30 +1,32 @@
 import csv
+import gzip
+import io
 import logging
-import os
-import tempfile
 from decimal import ROUND_HALF_UP, Decimal
+from itertools import islice
 
 from django.core.files import File
+from django.core.files.base import ContentFile
 from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
+from storages.backends.gcloud import GoogleCloudStorage
+from storages.utils import clean_name
 
-from logsheet.models import (
-    Flight,
-    StatsDumpOutbox,
-    TowplaneChargeScheme,
-    TowplaneChargeTier,
-)
+from logsheet.models import Flight, FlightTombstone, StatsDumpOutbox
 from logsheet.utils.flight_charges import (
     effective_rental_cost as _effective_rental_cost,
 )
-from siteconfig.models import (
-    MembershipBillingRule,
-    MembershipGliderRentalRule,
-    SiteConfiguration,
-)
+from logsheet.utils.pricing import PricingContext
 from utils.csv import sanitize_csv_cell as _sanitize_csv_cell
 
 MAX_LAST_ERROR_LENGTH = 2000
+STATS_DUMP_FETCH_SIZE = 2000
+STATS_DUMP_PART_ROWS = 5000  # rows per gzip part / checkpoint
+STATS_DUMP_PARTS_DIR = "exports/stats_dumps/parts"
+GCS_COMPOSE_MAX_SOURCES = 32  # objects per Cloud Storage compose request
+CHANGE_UPSERT = "upsert"
+CHANGE_DELETED = "deleted"
 logger = logging.getLogger(__name__)
 
 
@@ -62,29 +64,71 @@ def _stats_dump_duration_text(duration):
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
+STATS_DUMP_HEADER = [
+    "flight_tracking_id",
+    "flight_date",
+    "pilot",
+    "passenger",
+    "glider",
+    "instructor",
+    "towpilot",
+    "flight_type",
+    "takeoff_time",
+    "landing_time",
+    "flight_time",
+    "release_altitude",
+    "flight_cost",
+    "tow_cost",
+    "total_cost",
+    "field",
+]
+
+
+def _after_cursor_q(after):
+    """Keyset filter for rows sorting after ``(log_date, logsheet_id, pk)``."""
+    log_date, logsheet_id, flight_id = after
+    return (
+        Q(logsheet__log_date__gt=log_date)
+        | Q(logsheet__log_date=log_date, logsheet_id__gt=logsheet_id)
+        | Q(logsheet__log_date=log_date, logsheet_id=logsheet_id, pk__gt=flight_id)
+    )
+
+
+def _primed_batches(flights, pricing):
+    """Yield ``flights`` with pricing caches primed one fetch batch at a time."""
+    flights = iter(flights)
+    while True:
+        batch = pricing.prime(islice(flights, STATS_DUMP_FETCH_SIZE))
+        if not batch:
+            return
+        yield from batch
+
+
 def iter_stats_dump_rows():
     """Yield stats dump rows as a sequence of CSV-compatible values."""
-    yield [
-        "flight_tracking_id",
-        "flight_date",
-        "pilot",
-        "passenger",
-        "glider",
-        "instructor",
-        "towpilot",
-        "flight_type",
-        "takeoff_time",
-        "landing_time",
-        "flight_time",
-        "release_altitude",
-        "flight_cost",
-        "tow_cost",
-        "total_cost",
-        "field",
-    ]
-
+    yield list(STATS_DUMP_HEADER)
+    for _cursor, row in iter_stats_dump_records():
+        yield row
+
+
+def iter_stats_dump_records(after=None, changed_since=None):
+    """
+    Yield ``(cursor, row)`` for every flight in stats dump order.
+
+    ``cursor`` is the flight's sort key ``(log_date, logsheet_id, pk)``; pass
+    the last one seen as ``after`` to continue from that point. With
+    ``changed_since``, only flights edited after it, or on a logsheet
+    created, edited or finalized after it, are included.
+    """
+    flights = Flight.objects.all()
+    if changed_since is not None:
+        flights = flights.filter(
+            Q(updated_at__gt=changed_since) | Q(logsheet__updated_at__gt=changed_since)
+        )
+    if after is not None:
+        flights = flights.filter(_after_cursor_q(after))
     flights = (
-        Flight.objects.select_related(
+        flights.select_related(
             "logsheet",
             "logsheet__airfield",
             "airfield",
@@ -97,83 +141,12 @@ def iter_stats_dump_rows():
             "tow_pilot",
         )
         .order_by("logsheet__log_date", "logsheet_id", "pk")
-        .iterator(chunk_size=2000)
+        .iterator(chunk_size=STATS_DUMP_FETCH_SIZE)
     )
 
-    pricing_caches_loaded = False
-    active_tiers_by_scheme = {}
-    billing_rules_by_status = {}
-    glider_rules_by_status_glider = {}
-    site_config = SiteConfiguration.objects.first()
-
-    for flight in flights:
-        flight._site_config_cache = site_config
-
-        needs_calculated_pricing = (not flight.logsheet.finalized) or (
-            flight.logsheet.finalized
-            and (flight.tow_cost_actual is None or flight.rental_cost_actual is None)
-        )
-
-        if needs_calculated_pricing:
-            if not pricing_caches_loaded:
-                for tier in (
-                    TowplaneChargeTier.objects.filter(
-                        is_active=True,
-                        charge_scheme__is_active=True,
-                    )
-                    .select_related("charge_scheme")
-                    .order_by("charge_scheme_id", "altitude_start")
-                ):
-                    active_tiers_by_scheme.setdefault(tier.charge_scheme_id, []).append(
-                        tier
-                    )
-
-                billing_rules_by_status = {
-                    rule.membership_status.name: rule
-                    for rule in MembershipBillingRule.objects.select_related(
-                        "membership_status"
-                    ).filter(is_active=True)
-                }
-                glider_rules_by_status_glider = {
-                    (rule.membership_status.name, rule.glider_id): rule
-                    for rule in MembershipGliderRentalRule.objects.select_related(
-                        "membership_status", "glider"
-                    ).filter(is_active=True)
-                }
-                pricing_caches_loaded = True
-
-            pilot_status = (
-                flight.pilot.membership_status
-                if flight.pilot and flight.pilot.membership_status
-                else None
-            )
-            if pilot_status:
-                flight._membership_billing_rule_cache = (
-                    billing_rules_by_status.get(pilot_status) or False
-                )
-                if flight.glider and flight.glider.pk:
-                    flight._membership_glider_rental_rule_cache = (
-                        glider_rules_by_status_glider.get(
-                            (pilot_status, flight.glider.pk)
-                        )
-                        or False
-                    )
-                else:
-                    flight._membership_glider_rental_rule_cache = False
-            else:
-                flight._membership_billing_rule_cache = False
-                flight._membership_glider_rental_rule_cache = False
-        else:
-            flight._membership_billing_rule_cache = False
-            flight._membership_glider_rental_rule_cache = False
-
-        if needs_calculated_pricing and flight.towplane_id:
-            try:
-                scheme = flight.towplane.charge_scheme
-                scheme._active_charge_tiers = active_tiers_by_scheme.get(scheme.pk, [])
-            except TowplaneChargeScheme.DoesNotExist:
-                pass
+    pricing = PricingContext()
 
+    for flight in _primed_batches(flights, pricing):
         if flight.logsheet.finalized:
             tow_cost = flight.tow_cost_actual
             if tow_cost is None:
@@ -213,7 +186,8 @@ def iter_stats_dump_rows():
         if field_airfield:
             airfield_label = field_airfield.identifier or field_airfield.name or ""
 
-        yield [
+        cursor = (flight.logsheet.log_date, flight.logsheet_id, flight.pk)
+        yield cursor, [
             str(flight.pk),
             flight.logsheet.log_date.isoformat() if flight.logsheet else "",
             _sanitize_csv_cell(
@@ -257,24 +231,203 @@ def iter_stats_dump_rows():
         ]
 
 
-def _build_stats_dump_filename(outbox_id):
+def iter_stats_dump_tombstone_rows(deleted_since):
+    """Yield incremental-dump rows for flights deleted after ``deleted_since``."""
+    blanks = [""] * (len(STATS_DUMP_HEADER) - 2)
+    for tombstone in FlightTombstone.objects.filter(
+        deleted_at__gt=deleted_since
+    ).iterator(chunk_size=2000):
+        log_date = tombstone.log_date.isoformat() if tombstone.log_date else ""
+        yield [str(tombstone.flight_id), log_date, *blanks, CHANGE_DELETED]
+
+
+def _previous_dump_snapshot(outbox):
+    """``snapshot_at`` of the requester's last successful dump, or None."""
+    return (
+        StatsDumpOutbox.objects.filter(
+            requested_by_id=outbox.requested_by_id,
+            status=StatsDumpOutbox.STATUS_READY,
+            snapshot_at__isnull=False,
+        )
+        .exclude(pk=outbox.pk)
+        .order_by("-snapshot_at")
+        .values_list("snapshot_at", flat=True)
+        .first()
+    )
+
+
+def _build_stats_dump_filename(outbox):
     timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
-    return f"stats_dump_{timestamp}_{outbox_id}.csv"
+    if outbox.mode == StatsDumpOutbox.MODE_INCREMENTAL:
+        return f"stats_dump_incremental_{timestamp}_{outbox.pk}.csv.gz"
+    return f"stats_dump_{timestamp}_{outbox.pk}.csv.gz"
+
+
+def _stats_dump_part_name(outbox_id, index):
+    return f"{STATS_DUMP_PARTS_DIR}/{outbox_id}/part-{index:06d}.csv.gz"
+
+
+class _StatsDumpJobTakenOver(Exception):
+    """The outbox job was recovered as stale and handed to another attempt."""
+
+
+def _owned_attempt(outbox_id, attempt):
+    """The outbox row, filtered to this attempt while it is still processing."""
+    return StatsDumpOutbox.objects.filter(
+        pk=outbox_id,
+        status=StatsDumpOutbox.STATUS_PROCESSING,
+        attempt_count=attempt,
+    )
 
 
-def process_stats_dump_outbox_job(outbox_id):
-    """Process one durable outbox entry and generate stats dump CSV."""
+def _save_stats_dump_part(
+    storage, outbox_id, attempt, index, rows, cursor, rows_written
+):
+    """
+    Save one gzip member to storage and checkpoint the outbox past it.
+
+    Part names are deterministic, so a part left behind by a worker that died
+    before checkpointing is overwritten by the retry. Each save first bumps
+    ``progress_updated_at`` (the heartbeat used for stale recovery) and stops
+    if another attempt has taken the job over.
+    """
+    if not _owned_attempt(outbox_id, attempt).update(
+        progress_updated_at=timezone.now()
+    ):
+        raise _StatsDumpJobTakenOver
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    payload = gzip.compress(buffer.getvalue().encode("utf-8"), mtime=0)
+
+    name = _stats_dump_part_name(outbox_id, index)
+    if storage.exists(name):
+        storage.delete(name)
+    storage.save(name, ContentFile(payload))
+
+    checkpoint = {
+        "rows_written": rows_written,
+        "parts_written": index + 1,
+        "progress_updated_at": timezone.now(),
+    }
+    if cursor is not None:
+        checkpoint.update(
+            cursor_log_date=cursor[0],
+            cursor_logsheet_id=cursor[1],
+            cursor_flight_id=cursor[2],
+        )
+    if not _owned_attempt(outbox_id, attempt).update(**checkpoint):
+        raise _StatsDumpJobTakenOver
+
+
+class _StoredPartsReader(io.RawIOBase):
+    """Read stored parts back to back, opening one part at a time."""
+
+    def __init__(self, storage, names):
+        super().__init__()
+        self._storage = storage
+        self._names = list(names)
+        self._part = None
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while True:
+            if self._part is None:
+                if not self._names:
+                    return 0
+                self._part = self._storage.open(self._names.pop(0), "rb")
+            data = self._part.read(len(buffer))
+            if data:
+                buffer[: len(data)] = data
+                return len(data)
+            self._part.close()
+            self._part = None
+
+    def close(self):
+        if self._part is not None:
+            self._part.close()
+            self._part = None
+        super().close()
+
+
+def _assemble_stats_dump(storage, part_names, name):
+    """
+    Concatenate the gzip parts into one stored file; return its name.
+
+    On Google Cloud Storage the parts are composed inside the bucket, so the
+    dump never passes through the worker. Other storages receive the parts as
+    one stream, read a part at a time, with no local copy of the whole file.
+    """
+    name = storage.get_available_name(name)
+    if isinstance(storage, GoogleCloudStorage):
+        bucket = storage.bucket
+        target = bucket.blob(storage._normalize_name(clean_name(name)))
+        target.content_type = "application/gzip"
+        sources = [
+            bucket.blob(storage._normalize_name(clean_name(part)))
+            for part in part_names
+        ]
+        target.compose(sources[:GCS_COMPOSE_MAX_SOURCES])
+        # The target counts as one source of each following request.
+        rest = sources[GCS_COMPOSE_MAX_SOURCES:]
+        step = GCS_COMPOSE_MAX_SOURCES - 1
+        for start in range(0, len(rest), step):
+            target.compose([target, *rest[start : start + step]])
+        return name
+
+    with io.BufferedReader(_StoredPartsReader(storage, part_names)) as stream:
+        return storage.save(name, File(stream, name=name))
+
+
+def process_stats_dump_outbox_job(outbox_id, part_rows=STATS_DUMP_PART_ROWS):
+    """
+    Process one durable outbox entry and generate the stats dump.
+
+    Rows are streamed in ``part_rows`` batches, each saved to storage as its
+    own gzip member, with the outbox checkpointed after every part. A retry
+    resumes after the checkpointed cursor instead of starting over. Once all
+    rows are written the parts are concatenated (gzip members concatenate
+    into one valid ``.csv.gz``) into ``result_file`` by
+    ``_assemble_stats_dump``.
+
+    Incremental jobs export only flights changed since the requester's
+    previous successful dump, with a trailing ``change`` column
+    (``upsert``/``deleted``); flights deleted since then are emitted as
+    ``deleted`` tombstone rows at the top of the file.
+    """
     with transaction.atomic():
-        outbox = StatsDumpOutbox.objects.select_for_update().get(pk=outbox_id)
-        if outbox.status in [
-            StatsDumpOutbox.STATUS_PROCESSING,
-            StatsDumpOutbox.STATUS_READY,
-        ]:
+        # Claim the row: a job another worker holds or has finished is skipped.
+        outbox = (
+            StatsDumpOutbox.objects.select_for_update(skip_locked=True)
+            .filter(pk=outbox_id)
+            .exclude(
+                status__in=[
+                    StatsDumpOutbox.STATUS_PROCESSING,
+                    StatsDumpOutbox.STATUS_READY,
+                ]
+            )
+            .first()
+        )
+        if outbox is None:
             return
 
+        if outbox.cursor is None:
+            # Nothing checkpointed yet: (re)start from the first row.
+            outbox.rows_written = 0
+            outbox.parts_written = 0
+            outbox.snapshot_at = timezone.now()
+            outbox.changed_since = (
+                _previous_dump_snapshot(outbox)
+                if outbox.mode == StatsDumpOutbox.MODE_INCREMENTAL
+                else None
+            )
+
         outbox.status = StatsDumpOutbox.STATUS_PROCESSING
         outbox.attempt_count += 1
         outbox.started_at = timezone.now()
+        outbox.progress_updated_at = outbox.started_at
+        outbox.rows_at_start = outbox.rows_written
         outbox.completed_at = None
         outbox.last_error = ""
         outbox.save(
@@ -282,37 +435,90 @@ def process_stats_dump_outbox_job(outbox_id):
                 "status",
                 "attempt_count",
                 "started_at",
+                "progress_updated_at",
+                "rows_written",
+                "parts_written",
+                "rows_at_start",
+                "snapshot_at",
+                "changed_since",
                 "completed_at",
                 "last_error",
             ]
         )
 
-    filename = _build_stats_dump_filename(outbox_id)
+    attempt = outbox.attempt_count
+    filename = _build_stats_dump_filename(outbox)
+    storage = outbox.result_file.storage
+    incremental = outbox.mode == StatsDumpOutbox.MODE_INCREMENTAL
 
     try:
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            newline="",
-            encoding="utf-8",
-            suffix=".csv",
-            delete=False,
-        ) as tmp_file:
-            writer = csv.writer(tmp_file)
-            for row in iter_stats_dump_rows():
-                writer.writerow(row)
-            temp_path = tmp_file.name
-
-        outbox = StatsDumpOutbox.objects.get(pk=outbox_id)
+        part_index = outbox.parts_written
+        rows_written = outbox.rows_written
+        pending = []
+        pending_rows = 0
+        cursor = None
+
+        if outbox.cursor is None:
+            header = list(STATS_DUMP_HEADER)
+            if incremental:
+                header.append("change")
+            pending.append(header)
+            # Tombstones go in the first part so a resumed job never repeats them.
+            if incremental and outbox.changed_since is not None:
+                for row in iter_stats_dump_tombstone_rows(outbox.changed_since):
+                    pending.append(row)
+                    pending_rows += 1
+
+        for cursor, row in iter_stats_dump_records(
+            after=outbox.cursor, changed_since=outbox.changed_since
+        ):
+            if incremental:
+                row.append(CHANGE_UPSERT)
+            pending.append(row)
+            pending_rows += 1
+            if pending_rows >= part_rows:
+                rows_written += pending_rows
+                _save_stats_dump_part(
+                    storage,
+                    outbox_id,
+                    attempt,
+                    part_index,
+                    pending,
+                    cursor,
+                    rows_written,
+                )
+                part_index += 1
+                pending = []
+                pending_rows = 0
+
+        if pending:
+            rows_written += pending_rows
+            _save_stats_dump_part(
+                storage, outbox_id, attempt, part_index, pending, cursor, rows_written
+            )
+            part_index += 1
+
+        part_names = [_stats_dump_part_name(outbox_id, i) for i in range(part_index)]
+
+        outbox = _owned_attempt(outbox_id, attempt).first()
+        if outbox is None:
+            raise _StatsDumpJobTakenOver
         if outbox.result_file:
             outbox.result_file.delete(save=False)
 
-        with open(temp_path, "rb") as generated_file:
-            outbox.result_file.save(filename, File(generated_file), save=False)
+        outbox.result_file.name = _assemble_stats_dump(
+            storage,
+            part_names,
+            outbox.result_file.field.generate_filename(outbox, filename),
+        )
 
         outbox.status = StatsDumpOutbox.STATUS_READY
         outbox.result_filename = filename
         outbox.completed_at = timezone.now()
         outbox.last_error = ""
+        outbox.cursor_log_date = None
+        outbox.cursor_logsheet_id = None
+        outbox.cursor_flight_id = None
         outbox.save(
             update_fields=[
                 "result_file",
@@ -320,18 +526,32 @@ def process_stats_dump_outbox_job(outbox_id):
                 "result_filename",
                 "completed_at",
                 "last_error",
+                "cursor_log_date",
+                "cursor_logsheet_id",
+                "cursor_flight_id",
             ]
         )
+    except _StatsDumpJobTakenOver:
+        # The newer attempt owns the parts now; leave them alone.
+        logger.warning(
+            "Stats dump outbox job %s was taken over by another attempt",
+            outbox_id,
+        )
+        return
     except Exception as exc:
         logger.exception(
             "Stats dump outbox job failed for outbox_id=%s",
             outbox_id,
         )
-        StatsDumpOutbox.objects.filter(pk=outbox_id).update(
+        _owned_attempt(outbox_id, attempt).update(
             status=StatsDumpOutbox.STATUS_FAILED,
             last_error=str(exc)[:MAX_LAST_ERROR_LENGTH],
             completed_at=timezone.now(),
         )
-    finally:
-        if "temp_path" in locals() and os.path.exists(temp_path):
-            os.remove(temp_path)
+        return
+
+    for name in part_names:
+        try:
+            storage.delete(name)
+        except Exception:
+            logger.warning("Could not delete stats dump part %s", name)
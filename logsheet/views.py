@@ -67,7 +67,6 @@ from .models import (
     RevisionLog,
     StatsDumpOutbox,
     Towplane,
-    TowplaneChargeScheme,
     TowplaneChargeTier,
     TowplaneCloseout,
 )
@@ -79,6 +78,7 @@ from .utils.flight_charges import (
     quantize_currency,
     split_flight_costs,
 )
+from .utils.pricing import PRICING_SELECT_RELATED, PricingContext
 from .utils.tow_logbook import (
     TOW_LOGBOOK_ESTIMATED_HOBBS_PER_TOW,
     TOW_LOGBOOK_ESTIMATED_TACH_PER_TOW,
@@ -479,41 +479,14 @@ def _get_personal_charge_data(member, start_date):
         Flight.objects.filter(logsheet__log_date__gte=start_date)
         .exclude(commercial_ride=True)
         .filter(Q(pilot=member) | Q(split_with=member))
-        .select_related(
-            "logsheet",
-            "glider",
-            "pilot",
-            "split_with",
-            "towplane",
-            "towplane__charge_scheme",
-        )
-        .prefetch_related("towplane__charge_scheme__charge_tiers")
+        .select_related("logsheet", "split_with", *PRICING_SELECT_RELATED)
         .order_by("-logsheet__log_date", "-launch_time", "-pk")
     )
 
-    # Avoid per-flight SiteConfiguration lookups when non-finalized flights
-    # use tow_cost_calculated / rental_cost and retrieve-waiver rules.
-    site_config = SiteConfiguration.objects.first()
-
+    # Non-finalized flights use tow_cost_calculated / rental_cost; load the
+    # pricing tables once rather than per flight.
     flight_rows = []
-    for flight in flights:
-        flight._site_config_cache = site_config
-        if flight.towplane_id:
-            try:
-                charge_scheme = flight.towplane.charge_scheme
-            except TowplaneChargeScheme.DoesNotExist:
-                charge_scheme = None
-
-            if charge_scheme and not hasattr(charge_scheme, "_active_charge_tiers"):
-                charge_scheme._active_charge_tiers = sorted(
-                    [
-                        tier
-                        for tier in charge_scheme.charge_tiers.all()
-                        if tier.is_active
-                    ],
-                    key=lambda tier: tier.altitude_start,
-                )
-
+    for flight in PricingContext().prime(flights):
         tow_cost, rental_cost, instruction_cost, total_cost = (
             _member_flight_charge_breakdown(flight, member)
         )
@@ -666,9 +639,14 @@ def stats_dump_export_queue(request):
     if request.method != "POST":
         return HttpResponseNotAllowed(["GET", "POST"])
 
+    mode = request.POST.get("mode", StatsDumpOutbox.MODE_FULL)
+    if mode not in dict(StatsDumpOutbox.MODE_CHOICES):
+        mode = StatsDumpOutbox.MODE_FULL
+
     outbox = StatsDumpOutbox.objects.create(
         requested_by=request.user,
         status=StatsDumpOutbox.STATUS_PENDING,
+        mode=mode,
     )
     messages.info(
         request,
@@ -720,7 +698,7 @@ def stats_dump_export_download(request, pk):
         export_job.result_file.open("rb"),
         as_attachment=True,
         filename=filename,
-        content_type="text/csv",
+        content_type="application/gzip" if filename.endswith(".gz") else "text/csv",
     )
 
 
@@ -877,23 +855,14 @@ def export_logsheet_finances_csv(request, pk):
         )
         return redirect("logsheet:manage_logsheet_finances", pk=logsheet.pk)
 
-    flights = list(
-        logsheet.flights.select_related(
-            "pilot",
-            "split_with",
-            "glider",
-            "towplane",
-        )
+    # Legacy finalized flights without locked-in costs fall back to the
+    # calculated properties; price them from one shared PricingContext.
+    flights = PricingContext().prime(
+        logsheet.flights.select_related(*PRICING_SELECT_RELATED, "split_with")
         .exclude(commercial_ride=True)
         .order_by("launch_time", "pk")
     )
 
-    # Avoid per-flight SiteConfiguration lookups when legacy finalized flights
-    # rely on calculated properties (retrieve waiver checks).
-    site_config = SiteConfiguration.objects.first()
-    for flight in flights:
-        flight._site_config_cache = site_config
-
     response = HttpResponse(content_type="text/csv")
     response["Content-Disposition"] = (
         f'attachment; filename="Flights_{logsheet.log_date.isoformat()}.csv"'
@@ -2683,7 +2652,7 @@ def manage_logsheet_finances(request, pk):
 
     # OPTIMIZATION: Use select_related to avoid N+1 queries for pilot, glider, towplane
     flights = logsheet.flights.select_related(
-        "pilot", "instructor", "glider", "towplane", "split_with"
+        *PRICING_SELECT_RELATED, "split_with"
     ).exclude(commercial_ride=True)
 
     # Get towplane rental costs for this logsheet
@@ -2692,15 +2661,11 @@ def manage_logsheet_finances(request, pk):
         "towplane", "rental_charged_to"
     ).all()
 
-    # OPTIMIZATION: Cache SiteConfiguration to avoid N+1 queries when processing retrieve flights
-    # (Issue #66 - retrieve flights may query SiteConfiguration to check waiver settings)
-    from siteconfig.models import SiteConfiguration
-
-    site_config = SiteConfiguration.objects.first()
-
-    # Pre-cache config on all Flight instances to avoid repeated DB lookups
-    for flight in flights:
-        flight._site_config_cache = site_config
+    # OPTIMIZATION: Load site config, membership rules and tow tiers once for
+    # all flights instead of per flight (Issue #66 retrieve waivers included).
+    pricing = PricingContext()
+    site_config = pricing.site_config
+    flights = pricing.prime(flights)
 
     # Use locked-in values if finalized, else use capped property
     def flight_costs(f):
@@ -368,6 +368,13 @@ ALLOWED_HOSTS = os.getenv("DJANGO_ALLOWED_HOSTS", "localhost,127.0.0.1").split("
 if not DEBUG:
     SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 
+# Duty roster: run OR-Tools roster proposals inside the request instead of
+# queueing them for the process_roster_generation_jobs cron job. Useful for
+# local development and e2e tests that have no cron worker.
+ROSTER_GENERATION_INLINE = (
+    os.getenv("ROSTER_GENERATION_INLINE", "false").lower() == "true"
+)
+
 
 #############################################################
 # Email Configuration
@@ -16,12 +16,20 @@ from functools import wraps
 
 from django.conf import settings
 from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET
 
-from siteconfig.models import MailingList, MembershipStatus, SiteConfiguration
+from siteconfig.models import MembershipStatus
 
 from .models import Member
+from .utils.mailing_lists import (
+    diff_email_lists,
+    evaluate_email_lists,
+    get_email_lists_snapshot,
+    remember_email_lists,
+)
 
 
 def api_key_required(view_func):
@@ -78,56 +86,46 @@ def email_lists(request):
             ...
         },
         "whitelist": ["email1@example.com", "email2@example.com", ...],
-        "bypass_lists": ["treasurer", "webmaster", ...]
+        "bypass_lists": ["treasurer", "webmaster", ...],
+        "version": "<sha256 of lists, whitelist and bypass_lists>"
     }
 
     Lists are now dynamically generated from the MailingList model in siteconfig.
     Each list's subscribers are determined by the criteria configured in the admin.
+    All lists are evaluated together in memory from a single member query (see
+    members.utils.mailing_lists).
 
     The whitelist contains all emails that are allowed to send to mailing lists
     (all active members plus manually whitelisted addresses).
 
     bypass_lists contains names of lists that should accept mail from anyone
     (still requires SPF PASS, but bypasses sender whitelist).
+
+    version is a hash of the rest of the response and doubles as the ETag, so
+    a request with a matching If-None-Match gets 304 Not Modified.
+
+    ?since=<version> asks for only the changes since that version:
+    {
+        "diff": true,
+        "since": "<old version>",
+        "version": "<new version>",
+        "lists": {"members": {"added": [...], "removed": [...]}, ...},
+        "removed_lists": ["oldlist", ...],
+        "whitelist": {"added": [...], "removed": [...]},
+        "bypass_lists": ["treasurer", ...]
+    }
+    Only changed lists are included. When the server no longer knows the
+    old version, the full response above is returned instead.
     """
-    # Get all active mailing lists
-    mailing_lists = MailingList.objects.filter(is_active=True)
-
-    # Build lists data - each list requires a subscriber query, but this is
-    # unavoidable since criteria are dynamic and require different queries
-    lists_data = {ml.name: ml.get_subscriber_emails() for ml in mailing_lists}
-
-    # Bypass lists - lists that accept mail from anyone (not just whitelisted senders)
-    bypass_lists = [ml.name for ml in mailing_lists if ml.bypass_whitelist]
-
-    # Whitelist = all active member emails + manual whitelist additions
-    active_members = get_active_members()
-    member_emails = list(active_members.values_list("email", flat=True))
-
-    # Parse manual whitelist from siteconfig (one email per line)
-    manual_emails = []
-    config = SiteConfiguration.objects.first()
-    if config and config.manual_whitelist:
-        from django.core.exceptions import ValidationError
-        from django.core.validators import validate_email
-
-        for line in config.manual_whitelist.strip().split("\n"):
-            email = line.strip().lower()
-            if email:
-                try:
-                    validate_email(email)
-                    manual_emails.append(email)
-                except ValidationError:
-                    # Silently skip invalid emails - they won't be included
-                    pass
-
-    # Combine and dedupe whitelist
-    whitelist = sorted(set(member_emails + manual_emails))
-
-    return JsonResponse(
-        {
-            "lists": lists_data,
-            "whitelist": whitelist,
-            "bypass_lists": bypass_lists,
-        }
-    )
+    payload = evaluate_email_lists()
+    remember_email_lists(payload)
+    etag = quote_etag(payload["version"])
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        previous = get_email_lists_snapshot(request.GET.get("since"))
+        if previous is not None:
+            payload = diff_email_lists(previous, payload)
+        response = JsonResponse(payload)
+    response["ETag"] = etag
+    return response
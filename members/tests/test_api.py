@@ -4,7 +4,9 @@ import pytest
 from django.test import Client, override_settings
 from django.urls import reverse
 
+from logsheet.models import Glider
 from members.models import Member
+from members.utils.mailing_lists import evaluate_email_lists
 from siteconfig.models import MailingList, MailingListCriterion, MembershipStatus
 
 
@@ -514,3 +516,161 @@ class TestEmailListsAPI:
         assert "bypass_lists" in data
         assert data["bypass_lists"] == []
         assert isinstance(data["bypass_lists"], list)
+
+
+@pytest.mark.django_db
+class TestEvaluateEmailLists:
+    """The in-memory evaluator must match MailingList.get_subscriber_emails()."""
+
+    @pytest.fixture
+    def club(self, membership_statuses):
+        def member(username, last_name, **flags):
+            return Member.objects.create_user(
+                username=username,
+                email=f"{username}@example.com",
+                password="testpass123",
+                first_name=username.title(),
+                last_name=last_name,
+                membership_status=flags.pop("membership_status", "Full Member"),
+                **flags,
+            )
+
+        owner = member("owner", "Zulu", duty_officer=True)
+        member("instr", "Alpha", instructor=True, treasurer=True)
+        member("tow", "Mike", towpilot=True, instructor=True)
+        member("plain", "Bravo")
+        member("lapsed", "Charlie", instructor=True, membership_status="Non-Member")
+        member("noemail", "Delta", instructor=True)
+        Member.objects.filter(username="noemail").update(email="")
+        glider = Glider.objects.create(
+            n_number="N1", competition_number="P1", club_owned=False, is_active=True
+        )
+        glider.owners.add(owner)
+
+        MailingList.objects.create(
+            name="members", criteria=[MailingListCriterion.ACTIVE_MEMBER]
+        )
+        MailingList.objects.create(
+            name="ops",
+            criteria=[
+                MailingListCriterion.INSTRUCTOR,
+                MailingListCriterion.TOWPILOT,
+                MailingListCriterion.DUTY_OFFICER,
+            ],
+        )
+        MailingList.objects.create(
+            name="owners",
+            criteria=[MailingListCriterion.PRIVATE_GLIDER_OWNER],
+            bypass_whitelist=True,
+        )
+        MailingList.objects.create(name="bogus", criteria=["not_a_criterion"])
+        MailingList.objects.create(
+            name="off", criteria=[MailingListCriterion.ACTIVE_MEMBER], is_active=False
+        )
+
+    def test_matches_per_list_queries(self, club):
+        result = evaluate_email_lists()
+
+        expected = {
+            ml.name: ml.get_subscriber_emails()
+            for ml in MailingList.objects.filter(is_active=True)
+        }
+        assert result["lists"] == expected
+        assert result["lists"]["ops"] == [
+            "instr@example.com",
+            "tow@example.com",
+            "owner@example.com",
+        ]
+        assert result["bypass_lists"] == ["owners"]
+
+    def test_query_count_does_not_grow_with_lists(
+        self, club, django_assert_max_num_queries
+    ):
+        for index in range(10):
+            MailingList.objects.create(
+                name=f"extra-{index}", criteria=[MailingListCriterion.INSTRUCTOR]
+            )
+
+        with django_assert_max_num_queries(5):
+            evaluate_email_lists()
+
+    @override_settings(M2S_MAIL_API_KEY="test-api-key-12345")
+    def test_version_changes_only_with_content(self, api_client, club):
+        url = reverse("api_email_lists")
+
+        first = api_client.get(url, HTTP_X_API_KEY="test-api-key-12345").json()
+        second = api_client.get(url, HTTP_X_API_KEY="test-api-key-12345").json()
+        Member.objects.filter(username="plain").update(towpilot=True)
+        third = api_client.get(url, HTTP_X_API_KEY="test-api-key-12345").json()
+
+        assert first["version"] == second["version"]
+        assert third["version"] != first["version"]
+
+
+@pytest.mark.django_db
+class TestEmailListsConditionalAndDiff:
+    """ETag and ?since= support for the mail sync script."""
+
+    @pytest.fixture(autouse=True)
+    def api_key(self, settings):
+        settings.M2S_MAIL_API_KEY = "test-api-key-12345"
+
+    def get(self, api_client, **extra):
+        params = extra.pop("params", {})
+        return api_client.get(
+            reverse("api_email_lists"),
+            params,
+            HTTP_X_API_KEY="test-api-key-12345",
+            **extra,
+        )
+
+    def test_matching_etag_returns_not_modified(
+        self, api_client, default_mailing_lists, active_member
+    ):
+        first = self.get(api_client)
+        etag = first["ETag"]
+
+        assert etag == f'"{first.json()["version"]}"'
+        second = self.get(api_client, HTTP_IF_NONE_MATCH=etag)
+        assert second.status_code == 304
+        assert second["ETag"] == etag
+
+        Member.objects.filter(pk=active_member.pk).update(instructor=True)
+        third = self.get(api_client, HTTP_IF_NONE_MATCH=etag)
+        assert third.status_code == 200
+        assert third["ETag"] != etag
+
+    def test_since_returns_only_changes(
+        self,
+        api_client,
+        default_mailing_lists,
+        active_member,
+        instructor_member,
+        towpilot_member,
+    ):
+        old_version = self.get(api_client).json()["version"]
+        Member.objects.filter(pk=active_member.pk).update(instructor=True)
+        Member.objects.filter(pk=instructor_member.pk).update(instructor=False)
+        MailingList.objects.filter(name="board").delete()
+
+        data = self.get(api_client, params={"since": old_version}).json()
+
+        assert data["diff"] is True
+        assert data["since"] == old_version
+        assert data["lists"] == {
+            "instructors": {
+                "added": [active_member.email],
+                "removed": [instructor_member.email],
+            }
+        }
+        assert data["removed_lists"] == ["board"]
+        assert data["whitelist"] == {"added": [], "removed": []}
+        assert data["version"] == self.get(api_client).json()["version"]
+
+    def test_unknown_since_returns_full_payload(
+        self, api_client, default_mailing_lists, active_member
+    ):
+        data = self.get(api_client, params={"since": "no-such-version"}).json()
+
+        assert "diff" not in data
+        assert active_member.email in data["lists"]["members"]
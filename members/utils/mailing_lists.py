@@ -0,0 +1,204 @@
+"""
+In-memory evaluation of every active mailing list at once.
+
+``MailingList.get_subscribers()`` runs one OR-query per list. The mail server
+sync asks for all lists every few minutes, so ``evaluate_email_lists`` loads
+the candidate members once, packs each member's matching criteria into an
+integer bitmask, and resolves every list by ANDing that mask with the list's
+criteria mask. The query count is fixed regardless of how many lists exist.
+
+Results match ``MailingList.get_subscriber_emails()`` exactly, including the
+``last_name, first_name`` ordering.
+
+Every evaluated payload is remembered in the cache under its ``version`` for a
+day, so a client that already holds an earlier version can be sent only the
+addresses added and removed since then (``diff_email_lists``). A version no
+longer in the cache (expired, or evaluated by another worker with a
+per-process cache) gets the full payload instead.
+"""
+
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+
+from logsheet.models import Glider
+from members.models import Member
+from siteconfig.models import (
+    MAILING_LIST_ROLE_FIELDS,
+    MailingList,
+    MailingListCriterion,
+    MembershipStatus,
+    SiteConfiguration,
+)
+
+EMAIL_LISTS_SNAPSHOT_TIMEOUT = 60 * 60 * 24
+
+CRITERION_BITS = {
+    criterion: 1 << bit for bit, criterion in enumerate(MailingListCriterion.values)
+}
+
+
+def criteria_mask(criteria):
+    """Bitmask of a list's criteria; unknown codes match nobody."""
+    mask = 0
+    for criterion in criteria or ():
+        mask |= CRITERION_BITS.get(criterion, 0)
+    return mask
+
+
+def parse_manual_whitelist(text):
+    """Valid, lower-cased addresses from the one-per-line manual whitelist."""
+    emails = []
+    for line in (text or "").strip().split("\n"):
+        email = line.strip().lower()
+        if not email:
+            continue
+        try:
+            validate_email(email)
+        except ValidationError:
+            # Silently skip invalid emails - they won't be included
+            continue
+        emails.append(email)
+    return emails
+
+
+def _member_rows(active_statuses):
+    """
+    (email, last_name, first_name, criteria mask) for every member that can
+    receive list mail, in list order.
+    """
+    role_fields = list(MAILING_LIST_ROLE_FIELDS.items())
+    glider_owner_ids = set(
+        Glider.owners.through.objects.filter(
+            glider__club_owned=False, glider__is_active=True
+        ).values_list("member_id", flat=True)
+    )
+    members = (
+        Member.objects.filter(membership_status__in=active_statuses, is_active=True)
+        .exclude(email="")
+        .exclude(email__isnull=True)
+        .order_by("last_name", "first_name")
+        .values_list(
+            "pk",
+            "email",
+            "last_name",
+            "first_name",
+            *(field for _, field in role_fields),
+        )
+    )
+    active_bit = CRITERION_BITS[MailingListCriterion.ACTIVE_MEMBER]
+    owner_bit = CRITERION_BITS[MailingListCriterion.PRIVATE_GLIDER_OWNER]
+    rows = []
+    for pk, email, last_name, first_name, *flags in members:
+        mask = active_bit
+        for (criterion, _), flag in zip(role_fields, flags):
+            if flag:
+                mask |= CRITERION_BITS[criterion]
+        if pk in glider_owner_ids:
+            mask |= owner_bit
+        rows.append((email, last_name, first_name, mask))
+    return rows
+
+
+def _subscriber_emails(rows, mask):
+    emails = []
+    seen = set()
+    for email, last_name, first_name, member_mask in rows:
+        if not member_mask & mask:
+            continue
+        # get_subscribers() applies DISTINCT over the selected email and the
+        # ordering columns; mirror that rather than deduping on email alone.
+        key = (email, last_name, first_name)
+        if key not in seen:
+            seen.add(key)
+            emails.append(email)
+    return emails
+
+
+def email_lists_version(payload):
+    """Stable hash of an email lists payload, for cheap change detection."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def evaluate_email_lists():
+    """
+    Build the mail-sync payload for all active lists with a fixed number of
+    queries.
+
+    Returns a dict with ``lists``, ``whitelist``, ``bypass_lists`` and a
+    ``version`` hash of the other three.
+    """
+    active_statuses = list(MembershipStatus.get_active_statuses())
+    mailing_lists = list(
+        MailingList.objects.filter(is_active=True).values_list(
+            "name", "criteria", "bypass_whitelist"
+        )
+    )
+    rows = _member_rows(active_statuses)
+
+    lists = {
+        name: _subscriber_emails(rows, criteria_mask(criteria))
+        for name, criteria, _ in mailing_lists
+    }
+    bypass_lists = [name for name, _, bypass in mailing_lists if bypass]
+
+    # Whitelist = all active member emails + manual whitelist additions
+    config = SiteConfiguration.objects.only("manual_whitelist").first()
+    manual_emails = parse_manual_whitelist(config.manual_whitelist if config else "")
+    whitelist = sorted({email for email, *_ in rows} | set(manual_emails))
+
+    payload = {"lists": lists, "whitelist": whitelist, "bypass_lists": bypass_lists}
+    payload["version"] = email_lists_version(payload)
+    return payload
+
+
+def _snapshot_key(version):
+    return f"members:email_lists:{version}"
+
+
+def remember_email_lists(payload):
+    """Keep ``payload`` so later requests can diff against its version."""
+    cache.add(_snapshot_key(payload["version"]), payload, EMAIL_LISTS_SNAPSHOT_TIMEOUT)
+
+
+def get_email_lists_snapshot(version):
+    """Payload previously served as ``version``, or None if it is gone."""
+    if not version:
+        return None
+    return cache.get(_snapshot_key(version))
+
+
+def _changes(old, new):
+    old_set, new_set = set(old), set(new)
+    return {
+        "added": [email for email in new if email not in old_set],
+        "removed": [email for email in old if email not in new_set],
+    }
+
+
+def diff_email_lists(old, new):
+    """
+    Changes between two payloads from ``evaluate_email_lists``.
+
+    Only lists whose membership changed appear under ``lists``; a new list
+    shows all its addresses as added, and lists that disappeared are named in
+    ``removed_lists``. ``bypass_lists`` is short and always sent whole.
+    """
+    lists = {}
+    for name, emails in new["lists"].items():
+        changes = _changes(old["lists"].get(name, []), emails)
+        if changes["added"] or changes["removed"] or name not in old["lists"]:
+            lists[name] = changes
+    return {
+        "diff": True,
+        "since": old["version"],
+        "version": new["version"],
+        "lists": lists,
+        "removed_lists": [name for name in old["lists"] if name not in new["lists"]],
+        "whitelist": _changes(old["whitelist"], new["whitelist"]),
+        "bypass_lists": new["bypass_lists"],
+    }
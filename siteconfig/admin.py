@@ -212,6 +212,9 @@ class SiteConfigurationAdmin(AdminHelperMixin, admin.ModelAdmin):
                     "commercial_rides_enabled",
                     "duty_default_max_assignments_per_month",
                     "use_ortools_scheduler",
+                    "ortools_search_workers",
+                    "ortools_random_seed",
+                    "ortools_log_search_progress",
                     "enable_dynamic_duty_roles",
                 ),
                 "classes": ("collapse",),
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.16 on 2026-10-16 22:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("siteconfig", "0051_siteconfiguration_visiting_pilot_max_visits_per_year"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="siteconfiguration",
+            name="ortools_log_search_progress",
+            field=models.BooleanField(
+                default=False,
+                help_text="Capture the CP-SAT search log into the application log for debugging slow or unexpected roster solves.",
+                verbose_name="Capture OR-Tools Search Log",
+            ),
+        ),
+        migrations.AddField(
+            model_name="siteconfiguration",
+            name="ortools_random_seed",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Optional CP-SAT random seed. With a single search worker the same seed and inputs produce the same roster (if the solve finishes within its time limit).",
+                null=True,
+                verbose_name="OR-Tools Random Seed",
+            ),
+        ),
+        migrations.AddField(
+            model_name="siteconfiguration",
+            name="ortools_search_workers",
+            field=models.PositiveSmallIntegerField(
+                default=4,
+                help_text="Number of parallel CP-SAT search workers. Use several for fast portfolio search, or 1 together with a random seed to reproduce a roster exactly.",
+                verbose_name="OR-Tools Search Workers",
+            ),
+        ),
+    ]
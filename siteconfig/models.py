@@ -40,6 +40,22 @@ class MailingListCriterion(models.TextChoices):
     PRIVATE_GLIDER_OWNER = "private_glider_owner", "Private Glider Owner"
 
 
+# Mailing list criteria backed by a boolean role field on Member.
+MAILING_LIST_ROLE_FIELDS = {
+    MailingListCriterion.INSTRUCTOR: "instructor",
+    MailingListCriterion.TOWPILOT: "towpilot",
+    MailingListCriterion.DUTY_OFFICER: "duty_officer",
+    MailingListCriterion.ASSISTANT_DUTY_OFFICER: "assistant_duty_officer",
+    MailingListCriterion.DIRECTOR: "director",
+    MailingListCriterion.SECRETARY: "secretary",
+    MailingListCriterion.TREASURER: "treasurer",
+    MailingListCriterion.WEBMASTER: "webmaster",
+    MailingListCriterion.MEMBER_MANAGER: "member_manager",
+    MailingListCriterion.ROSTERMEISTER: "rostermeister",
+    MailingListCriterion.SAFETY_OFFICER: "safety_officer",
+}
+
+
 class ReservationLimitPeriod(models.TextChoices):
     """Primary reservation-cap period for glider reservations."""
 
@@ -171,23 +187,8 @@ class MailingList(models.Model):
         if criterion == MailingListCriterion.ACTIVE_MEMBER:
             return base_active
 
-        # Boolean role fields on Member model
-        boolean_fields = {
-            MailingListCriterion.INSTRUCTOR: "instructor",
-            MailingListCriterion.TOWPILOT: "towpilot",
-            MailingListCriterion.DUTY_OFFICER: "duty_officer",
-            MailingListCriterion.ASSISTANT_DUTY_OFFICER: "assistant_duty_officer",
-            MailingListCriterion.DIRECTOR: "director",
-            MailingListCriterion.SECRETARY: "secretary",
-            MailingListCriterion.TREASURER: "treasurer",
-            MailingListCriterion.WEBMASTER: "webmaster",
-            MailingListCriterion.MEMBER_MANAGER: "member_manager",
-            MailingListCriterion.ROSTERMEISTER: "rostermeister",
-            MailingListCriterion.SAFETY_OFFICER: "safety_officer",
-        }
-
-        if criterion in boolean_fields:
-            field = boolean_fields[criterion]
+        if criterion in MAILING_LIST_ROLE_FIELDS:
+            field = MAILING_LIST_ROLE_FIELDS[criterion]
             return base_active & Q(**{field: True})
 
         if criterion == MailingListCriterion.PRIVATE_GLIDER_OWNER:
@@ -326,6 +327,32 @@ class SiteConfiguration(models.Model):
             "Disable this flag to instantly roll back to legacy scheduler if needed."
         ),
     )
+    ortools_search_workers = models.PositiveSmallIntegerField(
+        default=4,
+        verbose_name="OR-Tools Search Workers",
+        help_text=(
+            "Number of parallel CP-SAT search workers. Use several for fast portfolio "
+            "search, or 1 together with a random seed to reproduce a roster exactly."
+        ),
+    )
+    ortools_random_seed = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="OR-Tools Random Seed",
+        help_text=(
+            "Optional CP-SAT random seed. With a single search worker the same seed "
+            "and inputs produce the same roster (if the solve finishes within its "
+            "time limit)."
+        ),
+    )
+    ortools_log_search_progress = models.BooleanField(
+        default=False,
+        verbose_name="Capture OR-Tools Search Log",
+        help_text=(
+            "Capture the CP-SAT search log into the application log for debugging "
+            "slow or unexpected roster solves."
+        ),
+    )
     enable_dynamic_duty_roles = models.BooleanField(
         default=False,
         verbose_name="Enable Dynamic Duty Roles",
@@ -259,6 +259,7 @@ class M2SSyncManager {
         try {
             // Prepare request payload
             const payload = {
+                mode: 'bulk',
                 flights: items.map(item => ({
                     idempotencyKey: item.idempotencyKey,
                     action: item.action,
@@ -0,0 +1,97 @@
+"""
+Version tokens for cache keys, shared by every worker process.
+
+Cached values are stored under keys that embed one or more version tokens.
+Bumping a token makes every entry built from the old one unreachable; the
+entry then simply expires.
+
+The Django cache is local to each process, so the tokens live in the
+database (``utils.models.CacheVersion``): a bump made while handling one
+request is seen by every worker and pod on its next lookup, at the cost of
+one indexed query per lookup. Bumps made inside a transaction only become
+visible when it commits, together with the data they describe. A name that
+has never been bumped has version ``"0"``.
+"""
+
+import threading
+import uuid
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Now
+
+from .models import CacheVersion
+
+UNVERSIONED = "0"
+
+_commit_bumps = threading.local()
+
+
+def get_cache_versions(names):
+    """Return {name: version token} for ``names`` with one query."""
+    names = set(names)
+    versions = dict(
+        CacheVersion.objects.filter(name__in=names).values_list("name", "version")
+    )
+    return {name: versions.get(name, UNVERSIONED) for name in names}
+
+
+def get_cache_versions_with_prefix(prefix):
+    """
+    Return {name: version token} for every bumped name starting with
+    ``prefix``, with one query. Names never bumped are absent; their
+    version is ``UNVERSIONED``.
+    """
+    return dict(
+        CacheVersion.objects.filter(name__startswith=prefix).values_list(
+            "name", "version"
+        )
+    )
+
+
+def get_cache_version(name):
+    """Return the current version token for ``name``."""
+    return get_cache_versions([name])[name]
+
+
+def bump_cache_versions(names):
+    """Give every name in ``names`` a new version token."""
+    for name in set(names):
+        version = uuid.uuid4().hex
+        rows = CacheVersion.objects.filter(name=name)
+        if rows.update(version=version, updated_at=Now()):
+            continue
+        try:
+            with transaction.atomic():
+                CacheVersion.objects.create(name=name, version=version)
+        except IntegrityError:
+            # Created concurrently by another worker.
+            rows.update(version=version, updated_at=Now())
+
+
+def bump_cache_version(name):
+    """Give ``name`` a new version token."""
+    bump_cache_versions([name])
+
+
+def _bump_once(bumped, names):
+    # ``bumped`` is shared by the callbacks of one commit.
+    names = set(names) - bumped
+    bumped.update(names)
+    if names:
+        bump_cache_versions(names)
+
+
+def bump_cache_versions_on_commit(names):
+    """
+    Bump ``names`` once the current transaction commits.
+
+    For changes saved row by row (a bulk sync, a logsheet import): a name
+    bumped many times in one transaction is written once. Each call
+    registers its own callback, so a rollback drops its bumps too.
+    """
+    bumped = getattr(_commit_bumps, "names", None)
+    if bumped is None or bumped:
+        # A non-empty set belongs to a commit whose callbacks already ran.
+        bumped = _commit_bumps.names = set()
+    transaction.on_commit(partial(_bump_once, bumped, list(names)))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.16 on 2026-10-17 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("utils", "0002_alter_cronjoblock_locked_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CacheVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Name of the versioned key family",
+                        max_length=150,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "version",
+                    models.CharField(help_text="Current version token", max_length=32),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Cache Version",
+                "verbose_name_plural": "Cache Versions",
+            },
+        ),
+    ]
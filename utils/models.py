@@ -54,3 +54,26 @@ class CronJobLock(models.Model):
             cls.objects.filter(expires_at__lt=timezone.now()).delete()
             return expired_count
         return 0
+
+
+class CacheVersion(models.Model):
+    """
+    Version token shared by every worker process for a family of cache keys.
+
+    The Django cache is local to each process, so the tokens that cache keys
+    embed live here instead (see ``utils/cache.py``): bumping a token in one
+    worker makes the old entries unreachable in all of them.
+    """
+
+    name = models.CharField(
+        max_length=150, unique=True, help_text="Name of the versioned key family"
+    )
+    version = models.CharField(max_length=32, help_text="Current version token")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Cache Version"
+        verbose_name_plural = "Cache Versions"
+
+    def __str__(self):
+        return f"{self.name} ({self.version})"
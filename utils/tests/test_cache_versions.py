@@ -0,0 +1,90 @@
+"""
+Tests for the shared cache version tokens in utils/cache.py.
+"""
+
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from utils.cache import (
+    UNVERSIONED,
+    bump_cache_version,
+    bump_cache_versions,
+    bump_cache_versions_on_commit,
+    get_cache_version,
+    get_cache_versions,
+    get_cache_versions_with_prefix,
+)
+
+
+@pytest.mark.django_db
+def test_unknown_names_are_unversioned():
+    assert get_cache_version("never-bumped") == UNVERSIONED
+
+
+@pytest.mark.django_db
+def test_bump_changes_only_the_named_versions():
+    bump_cache_versions(["a", "b"])
+    before = get_cache_versions(["a", "b", "c"])
+
+    bump_cache_version("a")
+    after = get_cache_versions(["a", "b", "c"])
+
+    assert after["a"] not in (before["a"], UNVERSIONED)
+    assert after["b"] == before["b"]
+    assert after["c"] == UNVERSIONED
+
+
+@pytest.mark.django_db
+def test_prefix_lookup_returns_only_bumped_names_with_the_prefix():
+    bump_cache_versions(["family", "family:1", "family:2", "other"])
+    expected = get_cache_versions(["family", "family:1", "family:2"])
+
+    with CaptureQueriesContext(connection) as queries:
+        versions = get_cache_versions_with_prefix("family")
+
+    assert len(queries) == 1
+    assert versions == expected
+
+
+@pytest.mark.django_db
+def test_versions_do_not_depend_on_the_local_cache():
+    bump_cache_version("shared")
+    version = get_cache_version("shared")
+
+    # Another worker process starts with an empty local cache.
+    cache.clear()
+
+    assert get_cache_version("shared") == version
+
+
+@pytest.mark.django_db
+def test_bumps_on_commit_are_written_once_per_transaction(
+    django_capture_on_commit_callbacks,
+):
+    bump_cache_version("bulk")
+    before = get_cache_version("bulk")
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        for _ in range(5):
+            bump_cache_versions_on_commit(["bulk"])
+    assert get_cache_version("bulk") == before
+
+    with CaptureQueriesContext(connection) as queries:
+        for callback in callbacks:
+            callback()
+
+    assert get_cache_version("bulk") != before
+    assert len([q for q in queries if "UPDATE" in q["sql"]]) == 1
+
+
+@pytest.mark.django_db
+def test_bumps_on_commit_are_dropped_on_rollback(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                bump_cache_versions_on_commit(["rolled-back"])
+                raise RuntimeError
+
+    assert get_cache_version("rolled-back") == UNVERSIONED